@@ -55,6 +55,32 @@ class SemanticSearch:
         logger.info(f"Semantic search: '{query}' → {len(results)} results")
         return results
     
+    async def search_many(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Semantic search for several queries in one round trip.
+        
+        Args:
+            queries: Natural language queries
+            k: Number of results per query
+            filter: Metadata filter
+            
+        Returns:
+            One list of matching documents per query
+        """
+        results = await self.vector_store.similarity_search_batch(
+            queries=queries,
+            k=k,
+            filter=filter,
+        )
+        
+        logger.info(f"Semantic search: {len(queries)} queries → {sum(map(len, results))} results")
+        return results
+    
     async def search_contracts(
         self,
         query: str,
@@ -2,30 +2,72 @@
 ChromaDB Vector Store
 
 Manages vector storage and retrieval using ChromaDB.
+
+ChromaDB's local client is synchronous (disk I/O + HNSW updates). Every
+collection call runs on a bounded thread pool (CHROMA_WORKERS threads), so
+semantic search from the AI endpoints never stalls unrelated HTTP /
+WebSocket traffic on the same worker. Concurrent add_documents() calls
+are coalesced: writes arriving within CHROMA_ADD_BATCH_WINDOW_MS are sent
+as one upsert (up to CHROMA_ADD_MAX_BATCH documents).
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 import chromadb
-from chromadb.config import Settings
 from langchain_openai import OpenAIEmbeddings
 
+from backend.core.settings.config import settings
+
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# CHROMA THREAD POOL
+# ============================================================================
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_chroma_executor() -> ThreadPoolExecutor:
+    """Get the process-wide ChromaDB pool (CHROMA_WORKERS threads)."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.CHROMA_WORKERS,
+            thread_name_prefix="chroma",
+        )
+    return _executor
+
+
+def shutdown_chroma_executor() -> None:
+    """Stop the ChromaDB pool (application shutdown / tests)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+# A pending add: (embeddings, documents, metadatas, ids, caller's future)
+_PendingAdd = Tuple[List[List[float]], List[str], List[Optional[Dict[str, Any]]], List[str], asyncio.Future]
+
+
 class ChromaDBStore:
     """
     ChromaDB vector store for semantic search.
     
     Features:
-    - Document embedding storage
-    - Semantic similarity search
+    - Document embedding storage (coalesced, batched upserts)
+    - Semantic similarity search (single and multi-query)
     - Multi-collection support
     - Metadata filtering
+    - Never blocks the event loop
     """
     
     def __init__(
@@ -33,6 +75,7 @@ class ChromaDBStore:
         persist_directory: Optional[str] = None,
         collection_name: str = "erp_documents",
         embedding_model: Optional[OpenAIEmbeddings] = None,
+        client: Optional[Any] = None,
     ):
         self.persist_directory = persist_directory or os.getenv(
             "CHROMA_PERSIST_DIR",
@@ -40,24 +83,54 @@ class ChromaDBStore:
         )
         self.collection_name = collection_name
         
-        # Initialize ChromaDB client
-        self.client = chromadb.Client(
-            Settings(
-                chroma_db_impl="duckdb+parquet",
-                persist_directory=self.persist_directory,
-            )
-        )
+        # Client and collection are opened lazily on the Chroma pool
+        self._client = client
+        self._collection = None
         
         # Initialize embedding model
         self.embedding_model = embedding_model or OpenAIEmbeddings()
         
-        # Get or create collection
-        self.collection = self.client.get_or_create_collection(
-            name=collection_name,
-            metadata={"hnsw:space": "cosine"},
-        )
+        # Write coalescing
+        self.batch_window = settings.CHROMA_ADD_BATCH_WINDOW_MS / 1000
+        self.max_batch = settings.CHROMA_ADD_MAX_BATCH
+        self._pending: List[_PendingAdd] = []
+        self._pending_count = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        
+        self.metrics = {"adds": 0, "upserts": 0, "queries": 0}
+    
+    # ========================================================================
+    # EXECUTION
+    # ========================================================================
+    
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = chromadb.PersistentClient(path=self.persist_directory)
+        return self._client
+    
+    @property
+    def collection(self):
+        """The Chroma collection (blocking on first access; call from the pool)."""
+        if self._collection is None:
+            self._collection = self.client.get_or_create_collection(
+                name=self.collection_name,
+                metadata={"hnsw:space": "cosine"},
+            )
+            logger.info(f"Initialized ChromaDB store: {self.collection_name}")
+        return self._collection
+    
+    async def _run(self, method: str, **kwargs) -> Any:
+        """Call collection.<method>(**kwargs) on the Chroma pool."""
+        def call():
+            return getattr(self.collection, method)(**kwargs)
         
-        logger.info(f"Initialized ChromaDB store: {collection_name}")
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_chroma_executor(), call)
+    
+    # ========================================================================
+    # WRITES
+    # ========================================================================
     
     async def add_documents(
         self,
@@ -68,71 +141,87 @@ class ChromaDBStore:
         """
         Add documents to vector store.
         
+        Concurrent calls are merged into one upsert; this returns once the
+        batch containing these documents has been written.
+        
         Args:
             documents: List of document texts
             metadatas: Optional metadata for each document
             ids: Optional IDs for documents (auto-generated if None)
-            
+        
         Returns:
             List of document IDs
         """
+        if not documents:
+            return []
+        
         # Generate embeddings
         embeddings = await self.embedding_model.aembed_documents(documents)
         
         # Generate IDs if not provided
         if ids is None:
-            import uuid
             ids = [str(uuid.uuid4()) for _ in documents]
         
-        # Add to collection
-        self.collection.add(
-            embeddings=embeddings,
-            documents=documents,
-            metadatas=metadatas,
-            ids=ids,
-        )
+        loop = asyncio.get_running_loop()
+        written = loop.create_future()
+        self._pending.append((embeddings, documents, metadatas or [None] * len(documents), ids, written))
+        self._pending_count += len(documents)
+        self.metrics["adds"] += 1
+        
+        if self._pending_count >= self.max_batch:
+            self._schedule_flush(0)
+        elif self._flush_handle is None:
+            self._schedule_flush(self.batch_window)
         
-        logger.info(f"Added {len(documents)} documents to {self.collection_name}")
+        await written
         return ids
     
-    async def similarity_search(
-        self,
-        query: str,
-        k: int = 5,
-        filter: Optional[Dict[str, Any]] = None,
-    ) -> List[Dict[str, Any]]:
-        """
-        Search for similar documents.
-        
-        Args:
-            query: Query text
-            k: Number of results
-            filter: Metadata filter
-            
-        Returns:
-            List of results with document, metadata, distance
-        """
-        # Generate query embedding
-        query_embedding = await self.embedding_model.aembed_query(query)
-        
-        # Search
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=k,
-            where=filter,
-        )
+    def _schedule_flush(self, delay: float) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._flush_handle = loop.call_later(delay, lambda: asyncio.ensure_future(self._flush()))
+    
+    async def _flush(self) -> None:
+        """Write all pending adds, max_batch documents per upsert."""
+        self._flush_handle = None
+        pending, self._pending, self._pending_count = self._pending, [], 0
         
-        # Format results
-        formatted_results = []
-        for i in range(len(results["ids"][0])):
-            formatted_results.append({
-                "id": results["ids"][0][i],
-                "document": results["documents"][0][i],
-                "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                "distance": results["distances"][0][i] if results["distances"] else 0.0,
-            })
+        batch: List[_PendingAdd] = []
+        size = 0
+        for add in pending:
+            if batch and size + len(add[1]) > self.max_batch:
+                await self._upsert(batch)
+                batch, size = [], 0
+            batch.append(add)
+            size += len(add[1])
+        if batch:
+            await self._upsert(batch)
+    
+    async def _upsert(self, batch: List[_PendingAdd]) -> None:
+        """One upsert for a group of adds; resolves each caller's future."""
+        try:
+            await self._run(
+                "upsert",
+                embeddings=[e for add in batch for e in add[0]],
+                documents=[d for add in batch for d in add[1]],
+                metadatas=[m for add in batch for m in add[2]],
+                ids=[i for add in batch for i in add[3]],
+            )
+            self.metrics["upserts"] += 1
+            logger.info(f"Added {sum(len(add[1]) for add in batch)} documents to {self.collection_name}")
+            error = None
+        except Exception as e:
+            logger.error(f"ChromaDB upsert failed for {self.collection_name}: {e}")
+            error = e
         
-        return formatted_results
+        for *_, written in batch:
+            if written.done():
+                continue
+            if error is None:
+                written.set_result(None)
+            else:
+                written.set_exception(error)
     
     async def delete_documents(self, ids: List[str]):
         """
@@ -141,7 +230,7 @@ class ChromaDBStore:
         Args:
             ids: Document IDs to delete
         """
-        self.collection.delete(ids=ids)
+        await self._run("delete", ids=ids)
         logger.info(f"Deleted {len(ids)} documents from {self.collection_name}")
     
     async def update_document(
@@ -168,28 +257,137 @@ class ChromaDBStore:
         if metadata:
             update_data["metadatas"] = [metadata]
         
-        self.collection.update(**update_data)
+        await self._run("update", **update_data)
         logger.info(f"Updated document {id}")
     
-    def get_collection_stats(self) -> Dict[str, Any]:
+    # ========================================================================
+    # SEARCH
+    # ========================================================================
+    
+    async def similarity_search(
+        self,
+        query: str,
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Search for similar documents.
+        
+        Args:
+            query: Query text
+            k: Number of results
+            filter: Metadata filter
+        
+        Returns:
+            List of results with document, metadata, distance
+        """
+        results = await self.similarity_search_batch([query], k=k, filter=filter)
+        return results[0]
+    
+    async def similarity_search_batch(
+        self,
+        queries: List[str],
+        k: int = 5,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for several queries with one embedding call and one query.
+        
+        Args:
+            queries: Query texts
+            k: Number of results per query
+            filter: Metadata filter (applied to every query)
+        
+        Returns:
+            One result list per query, in order
+        """
+        if not queries:
+            return []
+        
+        # Generate query embeddings
+        if len(queries) == 1:
+            query_embeddings = [await self.embedding_model.aembed_query(queries[0])]
+        else:
+            query_embeddings = await self.embedding_model.aembed_documents(queries)
+        
+        # Search
+        results = await self._run(
+            "query",
+            query_embeddings=query_embeddings,
+            n_results=k,
+            where=filter,
+        )
+        self.metrics["queries"] += 1
+        
+        return [self._format_results(results, q) for q in range(len(queries))]
+    
+    @staticmethod
+    def _format_results(results: Dict[str, Any], q: int) -> List[Dict[str, Any]]:
+        """Results for the q-th query of a Chroma query response."""
+        formatted_results = []
+        for i in range(len(results["ids"][q])):
+            formatted_results.append({
+                "id": results["ids"][q][i],
+                "document": results["documents"][q][i],
+                "metadata": (results["metadatas"][q][i] if results["metadatas"] else None) or {},
+                "distance": results["distances"][q][i] if results["distances"] else 0.0,
+            })
+        return formatted_results
+    
+    # ========================================================================
+    # ADMIN
+    # ========================================================================
+    
+    async def get_collection_stats(self) -> Dict[str, Any]:
         """Get collection statistics"""
-        count = self.collection.count()
+        count = await self._run("count")
         return {
             "collection_name": self.collection_name,
             "document_count": count,
             "persist_directory": self.persist_directory,
         }
     
-    def clear_collection(self):
+    async def clear_collection(self):
         """Clear all documents from collection"""
-        self.client.delete_collection(self.collection_name)
-        self.collection = self.client.get_or_create_collection(
-            name=self.collection_name,
-            metadata={"hnsw:space": "cosine"},
-        )
+        def recreate():
+            self.client.delete_collection(self.collection_name)
+            self._collection = None
+            return self.collection
+        
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(get_chroma_executor(), recreate)
         logger.warning(f"Cleared collection {self.collection_name}")
 
 
+# ============================================================================
+# PROCESS-WIDE STORES
+# ============================================================================
+
+_stores: Dict[Tuple[str, str], ChromaDBStore] = {}
+
+
+def get_chroma_store(collection_name: str, persist_directory: Optional[str] = None) -> ChromaDBStore:
+    """
+    Get the process-wide store for a collection.
+    
+    One store (client, collection handle and write batcher) per collection,
+    instead of opening the on-disk client on every request.
+    """
+    key = (collection_name, persist_directory or "")
+    store = _stores.get(key)
+    if store is None:
+        store = _stores[key] = ChromaDBStore(
+            persist_directory=persist_directory,
+            collection_name=collection_name,
+        )
+    return store
+
+
+def reset_chroma_stores() -> None:
+    """Drop the process-wide stores (tests)."""
+    _stores.clear()
+
+
 # Predefined collections for different document types
 class Collections:
     """Common ChromaDB collections"""
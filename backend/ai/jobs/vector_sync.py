@@ -3,46 +3,329 @@ Vector Embedding Sync Jobs
 
 Background jobs to sync embeddings when requirements/availabilities are created or updated.
 Listens to event bus and generates embeddings asynchronously.
+
+Pipeline (events and backfill alike):
+
+    DB page -> text + SHA-256 -> drop rows whose stored text_hash matches
+            -> EMBEDDING_BATCH_SIZE texts per model call (inference thread)
+            -> one multi-row INSERT ... ON CONFLICT DO UPDATE + commit per batch
+               (rows the model failed on are not written and retried next sync)
+
+Encoding runs off the event loop, overlapped with reading the next page;
+at most EMBEDDING_PIPELINE_DEPTH encoded batches wait for the writer, so a
+slow database throttles the reader instead of buffering vectors. Stats
+report throughput (rows/sec) and how long the reader was held back.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import hashlib
-from typing import Optional
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
 from uuid import UUID
-from datetime import datetime
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 from backend.ai.services.embedding_service import get_embedding_service
 from backend.core.events.base import BaseEvent
+from backend.core.settings.config import settings
 
 logger = logging.getLogger(__name__)
 
+REQUIREMENT = "requirement"
+AVAILABILITY = "availability"
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 of the embedded text (stored to detect changes)."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _quality_terms(params: Optional[Mapping[str, Any]]) -> List[str]:
+    return [f"{key}:{value}" for key, value in (params or {}).items()]
+
+
+def requirement_text(row: Mapping[str, Any]) -> str:
+    """Text to embed for a requirement row (commodity + variety + quality)."""
+    parts = [row["commodity_name"], row["variety_name"]]
+    parts += _quality_terms(row["quality_requirements"])
+    return " ".join(filter(None, parts))
+
+
+def availability_text(row: Mapping[str, Any]) -> str:
+    """Text to embed for an availability row (commodity + quality + location)."""
+    parts = [row["commodity_name"]]
+    parts += _quality_terms(row["quality_params"])
+    parts += [row["state"], row["district"]]
+    return " ".join(filter(None, parts))
+
+
+@dataclass
+class _Pending:
+    """A row whose embedding must be (re)generated."""
+    id: UUID
+    text: str
+    text_hash: str
+
 
 class EmbeddingSyncJob:
     """
     Sync embeddings for requirements and availabilities.
-    
+
     Triggered by events:
     - requirement.created
     - requirement.updated
     - availability.created
     - availability.updated
-    
+
     Features:
-    - Async embedding generation
+    - Encoding on the inference thread (never on the event loop)
     - Text hashing to avoid duplicate work
-    - Automatic retry on failure
-    - Batch processing support
+    - Model-sized batches, one bulk upsert per batch
+    - Bounded pipeline with throughput / back-pressure stats
     """
-    
-    def __init__(self, db: AsyncSession):
+
+    def __init__(self, db: AsyncSession, embedding_service=None):
         self.db = db
-        self.embedding_service = get_embedding_service()
-    
+        self.embedding_service = embedding_service or get_embedding_service()
+        self.batch_size = settings.EMBEDDING_BATCH_SIZE
+        self.pipeline_depth = settings.EMBEDDING_PIPELINE_DEPTH
+        # Reader and writer share one session; never use it concurrently
+        self._db_lock = asyncio.Lock()
+
+    # ========================================================================
+    # SOURCES
+    # ========================================================================
+
+    @staticmethod
+    def _target(kind: str):
+        """(embedding model, foreign key column) for kind."""
+        # Import here to avoid circular dependency
+        if kind == REQUIREMENT:
+            from backend.modules.trade_desk.models.requirement_embedding import RequirementEmbedding
+            return RequirementEmbedding, RequirementEmbedding.requirement_id
+        from backend.modules.trade_desk.models.availability_embedding import AvailabilityEmbedding
+        return AvailabilityEmbedding, AvailabilityEmbedding.availability_id
+
+    @staticmethod
+    def _source_query(kind: str):
+        """(model, column-only select feeding requirement_text/availability_text)."""
+        from backend.modules.settings.commodities.models import Commodity, CommodityVariety
+
+        if kind == REQUIREMENT:
+            from backend.modules.trade_desk.models.requirement import Requirement
+            query = (
+                select(
+                    Requirement.id,
+                    Commodity.name.label("commodity_name"),
+                    CommodityVariety.name.label("variety_name"),
+                    Requirement.quality_requirements,
+                )
+                .outerjoin(Commodity, Commodity.id == Requirement.commodity_id)
+                .outerjoin(CommodityVariety, CommodityVariety.id == Requirement.variety_id)
+            )
+            return Requirement, query
+
+        from backend.modules.settings.locations.models import Location
+        from backend.modules.trade_desk.models.availability import Availability
+        query = (
+            select(
+                Availability.id,
+                Commodity.name.label("commodity_name"),
+                Availability.quality_params,
+                Location.state,
+                Location.district,
+            )
+            .outerjoin(Commodity, Commodity.id == Availability.commodity_id)
+            .outerjoin(Location, Location.id == Availability.location_id)
+        )
+        return Availability, query
+
+    @staticmethod
+    def _text(kind: str, row: Mapping[str, Any]) -> str:
+        return requirement_text(row) if kind == REQUIREMENT else availability_text(row)
+
+    async def _load_text(self, kind: str, entity_id: UUID) -> Optional[str]:
+        model, query = self._source_query(kind)
+        result = await self.db.execute(query.where(model.id == entity_id))
+        row = result.mappings().first()
+        return self._text(kind, row) if row else None
+
+    async def _source_pages(self, kind: str, page_size: int) -> AsyncIterator[List[Tuple[UUID, str]]]:
+        """Yield (id, text) pages of non-deleted rows, keyset-paginated by id."""
+        model, query = self._source_query(kind)
+        query = query.where(model.status != 'DELETED').order_by(model.id).limit(page_size)
+        last_id = None
+        while True:
+            page_query = query if last_id is None else query.where(model.id > last_id)
+            async with self._db_lock:
+                rows = (await self.db.execute(page_query)).mappings().all()
+            if not rows:
+                return
+            yield [(row["id"], self._text(kind, row)) for row in rows]
+            last_id = rows[-1]["id"]
+
+    # ========================================================================
+    # PIPELINE
+    # ========================================================================
+
+    async def _dirty(
+        self,
+        kind: str,
+        items: Sequence[Tuple[UUID, str]],
+        force_refresh: bool
+    ) -> List[_Pending]:
+        """Hash items and drop those whose stored embedding is up to date."""
+        pending = [_Pending(item_id, text, text_hash(text)) for item_id, text in items]
+        if force_refresh or not pending:
+            return pending
+
+        model, key = self._target(kind)
+        async with self._db_lock:
+            result = await self.db.execute(
+                select(key, model.text_hash).where(key.in_([p.id for p in pending]))
+            )
+            stored = dict(result.all())
+        return [p for p in pending if stored.get(p.id) != p.text_hash]
+
+    async def _write(self, kind: str, batch: List[_Pending], vectors) -> None:
+        """Upsert one encoded batch in a single statement and commit."""
+        model, key = self._target(kind)
+        stmt = pg_insert(model).values([
+            {
+                "id": uuid.uuid4(),
+                key.key: pending.id,
+                "embedding": vector.tolist(),
+                "text_hash": pending.text_hash,
+                "model_version": self.embedding_service.model_name,
+            }
+            for pending, vector in zip(batch, vectors)
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[key.key],
+            set_={
+                "embedding": stmt.excluded.embedding,
+                "text_hash": stmt.excluded.text_hash,
+                "model_version": stmt.excluded.model_version,
+                "updated_at": func.now(),
+            },
+        )
+        async with self._db_lock:
+            try:
+                await self.db.execute(stmt)
+                await self.db.commit()
+            except Exception:
+                await self.db.rollback()
+                raise
+
+    async def _run(
+        self,
+        kind: str,
+        pages: AsyncIterator[Sequence[Tuple[UUID, str]]],
+        force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Sync embeddings for pages of (id, text).
+
+        Returns:
+            Stats: processed / success / failed / skipped rows, rows_per_second
+            (rows embedded and written), backpressure_seconds (time the reader
+            waited for the writer) and max_queue_depth
+        """
+        stats = {
+            "processed": 0,
+            "success": 0,
+            "failed": 0,
+            "skipped": 0,
+            "rows_per_second": 0.0,
+            "backpressure_seconds": 0.0,
+            "max_queue_depth": 0,
+            "elapsed_seconds": 0.0,
+        }
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.pipeline_depth)
+        started = time.perf_counter()
+
+        async def writer() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                batch, encoding = item
+                pending = len(batch)
+                try:
+                    vectors = await encoding
+                    # encode_batch returns all-zero vectors when the model fails;
+                    # storing them under the current text_hash would skip the rows
+                    # forever, so leave them unwritten (retried on the next sync)
+                    encoded = [(row, vector) for row, vector in zip(batch, vectors) if vector.any()]
+                    if len(encoded) < pending:
+                        logger.error(f"Model returned no embedding for {pending - len(encoded)} {kind} rows")
+                        stats["failed"] += pending - len(encoded)
+                        pending = len(encoded)
+                    if encoded:
+                        await self._write(kind, [row for row, _ in encoded], [vector for _, vector in encoded])
+                        stats["success"] += pending
+                except Exception as e:
+                    logger.error(f"Failed to sync {pending} {kind} embeddings: {e}")
+                    stats["failed"] += pending
+
+        writer_task = asyncio.create_task(writer())
+        try:
+            async for page in pages:
+                stats["processed"] += len(page)
+                dirty = await self._dirty(kind, page, force_refresh)
+                stats["skipped"] += len(page) - len(dirty)
+
+                for i in range(0, len(dirty), self.batch_size):
+                    batch = dirty[i:i + self.batch_size]
+                    encoding = asyncio.ensure_future(self.embedding_service.encode_batch_async(
+                        [p.text for p in batch], batch_size=self.batch_size
+                    ))
+                    waited = time.perf_counter()
+                    await queue.put((batch, encoding))
+                    stats["backpressure_seconds"] += time.perf_counter() - waited
+                    stats["max_queue_depth"] = max(stats["max_queue_depth"], queue.qsize())
+
+            await queue.put(None)
+            await writer_task
+        except BaseException:
+            writer_task.cancel()
+            raise
+
+        elapsed = time.perf_counter() - started
+        stats["elapsed_seconds"] = round(elapsed, 3)
+        stats["backpressure_seconds"] = round(stats["backpressure_seconds"], 3)
+        stats["rows_per_second"] = round(stats["success"] / elapsed, 1) if elapsed else 0.0
+        return stats
+
+    async def sync_embeddings(
+        self,
+        kind: str,
+        items: Sequence[Tuple[UUID, str]],
+        force_refresh: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Generate and store embeddings for many rows of one kind.
+
+        Args:
+            kind: "requirement" or "availability"
+            items: (id, text to embed) pairs
+            force_refresh: Re-embed even if the stored text_hash matches
+
+        Returns:
+            Stats dict (see _run)
+        """
+        async def single_page():
+            yield items
+
+        return await self._run(kind, single_page(), force_refresh)
+
     async def sync_requirement_embedding(
         self,
         requirement_id: UUID,
@@ -51,73 +334,24 @@ class EmbeddingSyncJob:
     ) -> bool:
         """
         Generate and store embedding for requirement.
-        
+
         Args:
             requirement_id: Requirement UUID
             requirement_text: Text to embed (commodity + variety + quality params)
             force_refresh: Force regeneration even if exists
-            
+
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Import here to avoid circular dependency
-            from backend.modules.trade_desk.models.requirement_embedding import RequirementEmbedding
-            
-            # Calculate text hash to detect changes
-            text_hash = hashlib.sha256(requirement_text.encode()).hexdigest()
-            
-            # Check if embedding already exists with same hash
-            if not force_refresh:
-                existing = await self.db.execute(
-                    select(RequirementEmbedding).where(
-                        RequirementEmbedding.requirement_id == requirement_id
-                    )
-                )
-                existing_emb = existing.scalar_one_or_none()
-                
-                if existing_emb and existing_emb.text_hash == text_hash:
-                    logger.debug(f"Embedding for requirement {requirement_id} already up-to-date")
-                    return True
-            
-            # Generate embedding
-            logger.info(f"Generating embedding for requirement {requirement_id}")
-            embedding_vector = self.embedding_service.encode(requirement_text)
-            
-            # Convert numpy array to list for pgvector
-            embedding_list = embedding_vector.tolist()
-            
-            # Upsert embedding
-            existing = await self.db.execute(
-                select(RequirementEmbedding).where(
-                    RequirementEmbedding.requirement_id == requirement_id
-                )
+            stats = await self.sync_embeddings(
+                REQUIREMENT, [(requirement_id, requirement_text)], force_refresh
             )
-            existing_emb = existing.scalar_one_or_none()
-            
-            if existing_emb:
-                # Update
-                existing_emb.embedding = embedding_list
-                existing_emb.text_hash = text_hash
-                existing_emb.updated_at = datetime.utcnow()
-            else:
-                # Insert
-                new_emb = RequirementEmbedding(
-                    requirement_id=requirement_id,
-                    embedding=embedding_list,
-                    text_hash=text_hash,
-                )
-                self.db.add(new_emb)
-            
-            await self.db.commit()
-            logger.info(f"Successfully synced embedding for requirement {requirement_id}")
-            return True
-        
         except Exception as e:
             logger.error(f"Failed to sync embedding for requirement {requirement_id}: {e}")
-            await self.db.rollback()
             return False
-    
+        return stats["failed"] == 0
+
     async def sync_availability_embedding(
         self,
         availability_id: UUID,
@@ -126,256 +360,102 @@ class EmbeddingSyncJob:
     ) -> bool:
         """
         Generate and store embedding for availability.
-        
+
         Args:
             availability_id: Availability UUID
-            availability_text: Text to embed (commodity + variety + quality params)
+            availability_text: Text to embed (commodity + quality params + location)
             force_refresh: Force regeneration even if exists
-            
+
         Returns:
             True if successful, False otherwise
         """
         try:
-            from backend.modules.trade_desk.models.availability_embedding import AvailabilityEmbedding
-            
-            # Calculate text hash
-            text_hash = hashlib.sha256(availability_text.encode()).hexdigest()
-            
-            # Check if already exists
-            if not force_refresh:
-                existing = await self.db.execute(
-                    select(AvailabilityEmbedding).where(
-                        AvailabilityEmbedding.availability_id == availability_id
-                    )
-                )
-                existing_emb = existing.scalar_one_or_none()
-                
-                if existing_emb and existing_emb.text_hash == text_hash:
-                    logger.debug(f"Embedding for availability {availability_id} already up-to-date")
-                    return True
-            
-            # Generate embedding
-            logger.info(f"Generating embedding for availability {availability_id}")
-            embedding_vector = self.embedding_service.encode(availability_text)
-            embedding_list = embedding_vector.tolist()
-            
-            # Upsert
-            existing = await self.db.execute(
-                select(AvailabilityEmbedding).where(
-                    AvailabilityEmbedding.availability_id == availability_id
-                )
+            stats = await self.sync_embeddings(
+                AVAILABILITY, [(availability_id, availability_text)], force_refresh
             )
-            existing_emb = existing.scalar_one_or_none()
-            
-            if existing_emb:
-                existing_emb.embedding = embedding_list
-                existing_emb.text_hash = text_hash
-                existing_emb.updated_at = datetime.utcnow()
-            else:
-                new_emb = AvailabilityEmbedding(
-                    availability_id=availability_id,
-                    embedding=embedding_list,
-                    text_hash=text_hash,
-                )
-                self.db.add(new_emb)
-            
-            await self.db.commit()
-            logger.info(f"Successfully synced embedding for availability {availability_id}")
-            return True
-        
         except Exception as e:
             logger.error(f"Failed to sync embedding for availability {availability_id}: {e}")
-            await self.db.rollback()
             return False
-    
+        return stats["failed"] == 0
+
+    # ========================================================================
+    # EVENTS
+    # ========================================================================
+
     async def handle_requirement_event(self, event: BaseEvent) -> None:
         """
         Handle requirement created/updated event.
-        
-        Extracts text from requirement and generates embedding.
+
+        Builds the requirement's text and generates its embedding.
         """
         try:
-            from backend.modules.trade_desk.repositories.requirement_repository import RequirementRepository
-            
             requirement_id = event.aggregate_id
-            
-            # Fetch requirement
-            repo = RequirementRepository(self.db)
-            requirement = await repo.get(requirement_id)
-            
-            if not requirement:
+            requirement_text = await self._load_text(REQUIREMENT, requirement_id)
+
+            if requirement_text is None:
                 logger.warning(f"Requirement {requirement_id} not found for embedding sync")
                 return
-            
-            # Build text for embedding
-            text_parts = [
-                requirement.commodity.name if requirement.commodity else "",
-                requirement.variety.name if requirement.variety else "",
-            ]
-            
-            # Add quality parameters
-            if requirement.quality_params:
-                for key, value in requirement.quality_params.items():
-                    text_parts.append(f"{key}:{value}")
-            
-            # Add location if available
-            if requirement.delivery_location:
-                text_parts.append(requirement.delivery_location.get('state', ''))
-                text_parts.append(requirement.delivery_location.get('district', ''))
-            
-            requirement_text = " ".join(filter(None, text_parts))
-            
-            # Sync embedding
+
             await self.sync_requirement_embedding(requirement_id, requirement_text)
-        
+
         except Exception as e:
             logger.error(f"Error handling requirement event: {e}")
-    
+
     async def handle_availability_event(self, event: BaseEvent) -> None:
         """
         Handle availability created/updated event.
-        
-        Extracts text from availability and generates embedding.
+
+        Builds the availability's text and generates its embedding.
         """
         try:
-            from backend.modules.trade_desk.repositories.availability_repository import AvailabilityRepository
-            
             availability_id = event.aggregate_id
-            
-            # Fetch availability
-            repo = AvailabilityRepository(self.db)
-            availability = await repo.get(availability_id)
-            
-            if not availability:
+            availability_text = await self._load_text(AVAILABILITY, availability_id)
+
+            if availability_text is None:
                 logger.warning(f"Availability {availability_id} not found for embedding sync")
                 return
-            
-            # Build text for embedding
-            text_parts = [
-                availability.commodity.name if availability.commodity else "",
-                availability.variety.name if availability.variety else "",
-            ]
-            
-            # Add quality parameters
-            if availability.quality_params:
-                for key, value in availability.quality_params.items():
-                    text_parts.append(f"{key}:{value}")
-            
-            # Add location
-            if availability.location:
-                text_parts.append(availability.location.get('state', ''))
-                text_parts.append(availability.location.get('district', ''))
-            
-            availability_text = " ".join(filter(None, text_parts))
-            
-            # Sync embedding
+
             await self.sync_availability_embedding(availability_id, availability_text)
-        
+
         except Exception as e:
             logger.error(f"Error handling availability event: {e}")
-    
-    async def backfill_all_embeddings(self, batch_size: int = 100) -> dict:
+
+    # ========================================================================
+    # BACKFILL
+    # ========================================================================
+
+    async def backfill_all_embeddings(self, batch_size: int = 100, force_refresh: bool = False) -> dict:
         """
         Backfill embeddings for all existing requirements and availabilities.
-        
-        Use this for initial data migration or after model updates.
-        
+
+        Use this for initial data migration or after model updates
+        (force_refresh=True). Rows whose text is unchanged are skipped.
+
         Args:
-            batch_size: Number of records to process at once
-            
+            batch_size: Rows read from the database per page
+            force_refresh: Re-embed rows even if their text is unchanged
+
         Returns:
-            Statistics dict with success/failure counts
+            Statistics dict with processed/success/failed/skipped counts,
+            rows_per_second and backpressure_seconds per kind
         """
-        stats = {
-            "requirements_processed": 0,
-            "requirements_success": 0,
-            "requirements_failed": 0,
-            "availabilities_processed": 0,
-            "availabilities_success": 0,
-            "availabilities_failed": 0,
-        }
-        
+        stats = {}
+
         try:
-            from backend.modules.trade_desk.models.requirement import Requirement
-            from backend.modules.trade_desk.models.availability import Availability
-            
-            # Process requirements
-            logger.info("Starting requirement embedding backfill...")
-            offset = 0
-            while True:
-                result = await self.db.execute(
-                    select(Requirement)
-                    .where(Requirement.status != 'DELETED')
-                    .limit(batch_size)
-                    .offset(offset)
-                )
-                requirements = result.scalars().all()
-                
-                if not requirements:
-                    break
-                
-                for req in requirements:
-                    stats["requirements_processed"] += 1
-                    
-                    text_parts = [
-                        req.commodity.name if req.commodity else "",
-                        req.variety.name if req.variety else "",
-                    ]
-                    if req.quality_params:
-                        for k, v in req.quality_params.items():
-                            text_parts.append(f"{k}:{v}")
-                    
-                    req_text = " ".join(filter(None, text_parts))
-                    
-                    success = await self.sync_requirement_embedding(req.id, req_text)
-                    if success:
-                        stats["requirements_success"] += 1
-                    else:
-                        stats["requirements_failed"] += 1
-                
-                offset += batch_size
-                logger.info(f"Processed {stats['requirements_processed']} requirements...")
-            
-            # Process availabilities
-            logger.info("Starting availability embedding backfill...")
-            offset = 0
-            while True:
-                result = await self.db.execute(
-                    select(Availability)
-                    .where(Availability.status != 'DELETED')
-                    .limit(batch_size)
-                    .offset(offset)
+            for kind, prefix in ((REQUIREMENT, "requirements"), (AVAILABILITY, "availabilities")):
+                logger.info(f"Starting {kind} embedding backfill...")
+                kind_stats = await self._run(kind, self._source_pages(kind, batch_size), force_refresh)
+                logger.info(
+                    f"{kind} backfill: {kind_stats['success']}/{kind_stats['processed']} embedded "
+                    f"({kind_stats['skipped']} unchanged, {kind_stats['failed']} failed) at "
+                    f"{kind_stats['rows_per_second']} rows/sec, reader held back "
+                    f"{kind_stats['backpressure_seconds']}s"
                 )
-                availabilities = result.scalars().all()
-                
-                if not availabilities:
-                    break
-                
-                for avail in availabilities:
-                    stats["availabilities_processed"] += 1
-                    
-                    text_parts = [
-                        avail.commodity.name if avail.commodity else "",
-                        avail.variety.name if avail.variety else "",
-                    ]
-                    if avail.quality_params:
-                        for k, v in avail.quality_params.items():
-                            text_parts.append(f"{k}:{v}")
-                    
-                    avail_text = " ".join(filter(None, text_parts))
-                    
-                    success = await self.sync_availability_embedding(avail.id, avail_text)
-                    if success:
-                        stats["availabilities_success"] += 1
-                    else:
-                        stats["availabilities_failed"] += 1
-                
-                offset += batch_size
-                logger.info(f"Processed {stats['availabilities_processed']} availabilities...")
-            
+                stats.update({f"{prefix}_{name}": value for name, value in kind_stats.items()})
+
             logger.info(f"Backfill complete: {stats}")
             return stats
-        
+
         except Exception as e:
             logger.error(f"Backfill failed: {e}")
             stats["error"] = str(e)
@@ -74,6 +74,7 @@ class AIResponse:
     - cost: Actual cost in USD
     - guardrail_passed: Whether request passed guardrails
     - memory_loaded: Whether memory was loaded successfully
+    - cached: Served from the response cache (no model call)
     """
     result: Any
     provider: AIProvider
@@ -90,6 +91,7 @@ class AIResponse:
     cost: float = 0.0
     guardrail_passed: bool = True
     memory_loaded: bool = False
+    cached: bool = False
     
     def __post_init__(self):
         if self.timestamp is None:
@@ -106,6 +108,7 @@ class BaseAIOrchestrator(ABC):
     Enhanced with:
     - Guardrails integration (rate limiting, cost control)
     - Memory loading (conversation history, user context)
+    - Response cache with single-flight execution (ai/orchestrators/cache.py)
     - Automatic usage tracking
     """
     
@@ -114,15 +117,19 @@ class BaseAIOrchestrator(ABC):
         provider: AIProvider,
         enable_guardrails: bool = True,
         enable_memory: bool = True,
+        enable_cache: bool = True,
+        response_cache=None,
         **config
     ):
         """Initialize orchestrator with provider and features."""
         self.provider = provider
         self.enable_guardrails = enable_guardrails
         self.enable_memory = enable_memory
+        self.enable_cache = enable_cache
         self.config = config
         self._guardrails = None
         self._memory_loader = None
+        self._response_cache = response_cache
     
     async def execute(self, request: AIRequest) -> AIResponse:
         """
@@ -134,7 +141,8 @@ class BaseAIOrchestrator(ABC):
         Flow:
         1. Check guardrails (rate limit, cost, content)
         2. Load memory (conversation history, user context)
-        3. Execute AI request (provider-specific)
+        3. Execute AI request (provider-specific), unless an identical
+           request is cached or already in flight
         4. Record usage (tokens, cost)
         5. Return response
         
@@ -189,8 +197,18 @@ class BaseAIOrchestrator(ABC):
             except Exception as e:
                 logger.warning(f"Failed to load memory: {e}")
         
-        # Step 3: Execute provider-specific request
-        response = await self._execute_impl(request)
+        # Step 3: Execute provider-specific request (cached / single-flight)
+        response = None
+        if self.enable_cache:
+            from backend.ai.orchestrators.cache import is_cacheable
+            
+            if is_cacheable(request):
+                cache = self._get_response_cache()
+                key = cache.key(request, self.provider, self.config.get("model_name"))
+                response = await cache.get_or_execute(key, lambda: self._execute_impl(request))
+        
+        if response is None:
+            response = await self._execute_impl(request)
         
         # Step 4: Record usage
         if self.enable_guardrails and request.user_id:
@@ -226,6 +244,8 @@ class BaseAIOrchestrator(ABC):
             "config": {k: v for k, v in self.config.items() if k not in ['api_key', 'secret']},
             "guardrails_enabled": self.enable_guardrails,
             "memory_enabled": self.enable_memory,
+            "cache_enabled": self.enable_cache,
+            "cache": self._get_response_cache().stats() if self.enable_cache else None,
         }
     
     async def _get_guardrails(self):
@@ -239,6 +259,15 @@ class BaseAIOrchestrator(ABC):
         
         return self._guardrails
     
+    def _get_response_cache(self):
+        """Lazy load the response cache (process-wide unless one was injected)."""
+        if self._response_cache is None:
+            from backend.ai.orchestrators.cache import get_ai_response_cache
+            
+            self._response_cache = get_ai_response_cache()
+        
+        return self._response_cache
+    
     async def _get_memory_loader(self):
         """Lazy load memory loader."""
         if self._memory_loader is None:
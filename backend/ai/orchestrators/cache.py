@@ -0,0 +1,284 @@
+"""
+AI Response Cache
+
+Identical prompts ("suggest price", "explain this match") from many users
+used to re-run the full completion. BaseAIOrchestrator.execute() now looks
+responses up here first:
+
+- Key: SHA-256 of the normalised prompt (whitespace collapsed), task type,
+  provider, model and sampling parameters, plus any context, conversation
+  history and user context the request carries (so per-user chats only hit
+  their own entries)
+- Storage: Redis (AI_RESPONSE_CACHE_TTL_SECONDS), shared by all workers;
+  an in-process LRU when no Redis is configured (tests, scripts)
+- Single-flight: concurrent identical requests in one process share one
+  in-flight model call; failures reach every waiter and are not cached
+
+A request opts out with metadata={"cache": False}. Cached responses come
+back with cached=True, tokens_used=0 and cost=0.0, so guardrails count the
+request but not the spend.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+from backend.ai.orchestrators.base import AIProvider, AIRequest, AIResponse, AITaskType
+from backend.core.settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse runs of whitespace and trim."""
+    return _WHITESPACE.sub(" ", prompt).strip()
+
+
+def is_cacheable(request: AIRequest) -> bool:
+    """Whether the request may be answered from the cache."""
+    return not (request.metadata and request.metadata.get("cache") is False)
+
+
+class AIResponseCache:
+    """Redis (or in-process LRU) response cache with single-flight execution."""
+
+    KEY_PREFIX = "ai:response"
+
+    def __init__(
+        self,
+        redis: Optional[aioredis.Redis] = None,
+        ttl: int = 3600,
+        local_size: int = 1000,
+    ):
+        self.redis = redis
+        self.ttl = ttl
+        self.local_size = local_size
+        self._local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "errors": 0,
+            "redis_errors": 0,
+            "hit_latency_ms": 0.0,
+            "miss_latency_ms": 0.0,
+        }
+
+    def key(self, request: AIRequest, provider: AIProvider, default_model: Optional[str] = None) -> str:
+        """Cache key of a request (after memory has been loaded into it)."""
+        material = {
+            "prompt": normalize_prompt(request.prompt),
+            "task_type": request.task_type.value,
+            "provider": provider.value,
+            "model": request.model or default_model,
+            "temperature": request.temperature,
+            "max_tokens": request.max_tokens,
+            "context": request.context,
+            "history": request.conversation_history,
+            "user_context": request.user_context,
+        }
+        digest = hashlib.sha256(json.dumps(material, sort_keys=True, default=str).encode()).hexdigest()
+        return f"{self.KEY_PREFIX}:{digest}"
+
+    async def get_or_execute(
+        self,
+        key: str,
+        execute: Callable[[], Awaitable[AIResponse]],
+    ) -> AIResponse:
+        """
+        Return the cached response for key, or run execute() once for all
+        concurrent callers and cache its result.
+
+        Args:
+            key: Cache key (see key())
+            execute: Calls the model
+
+        Returns:
+            AIResponse (cached=True unless this call ran the model)
+        """
+        start = time.perf_counter()
+        cached = await self._read(key)
+        if cached is not None:
+            self.metrics["hits"] += 1
+            self.metrics["hit_latency_ms"] += (time.perf_counter() - start) * 1000
+            return self._from_cache(cached, start)
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.metrics["coalesced"] += 1
+            try:
+                response = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+                # The leading caller was cancelled: run it ourselves
+                return await self.get_or_execute(key, execute)
+            return self._shared(response, start)
+
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight[key] = loop.create_future()
+        # Nobody may be waiting; never log "exception was never retrieved"
+        inflight.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.metrics["misses"] += 1
+        try:
+            response = await execute()
+            # Stored before the in-flight slot is released, so a request
+            # arriving in between cannot miss both
+            payload = self._to_cache(response)
+            if payload is not None:
+                await self._write(key, payload)
+        except asyncio.CancelledError:
+            inflight.cancel()
+            raise
+        except BaseException as e:
+            inflight.set_exception(e)
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            self.metrics["miss_latency_ms"] += (time.perf_counter() - start) * 1000
+
+        inflight.set_result(response)
+        return response
+
+    # ========================================================================
+    # STORAGE
+    # ========================================================================
+
+    async def _read(self, key: str) -> Optional[str]:
+        if self.redis is None:
+            cached = self._local.get(key)
+            if cached is None:
+                return None
+            if cached[0] <= time.monotonic():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+            return cached[1]
+
+        try:
+            raw = await self.redis.get(key)
+        except Exception as e:
+            # Redis down: behave like no cache
+            self.metrics["redis_errors"] += 1
+            logger.warning(f"AI response cache read failed: {e}")
+            return None
+        return raw.decode() if isinstance(raw, bytes) else raw
+
+    async def _write(self, key: str, payload: str) -> None:
+        if self.redis is None:
+            self._local[key] = (time.monotonic() + self.ttl, payload)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+            return
+
+        try:
+            await self.redis.set(key, payload, ex=self.ttl)
+        except Exception as e:
+            self.metrics["redis_errors"] += 1
+            logger.warning(f"AI response cache write failed: {e}")
+
+    def _to_cache(self, response: AIResponse) -> Optional[str]:
+        """Serialise the reusable part of a response (None if not JSON-able)."""
+        try:
+            return json.dumps({
+                "result": response.result,
+                "provider": response.provider.value,
+                "model": response.model,
+                "task_type": response.task_type.value,
+                "confidence": response.confidence,
+                "reasoning": response.reasoning,
+            })
+        except (TypeError, ValueError) as e:
+            self.metrics["errors"] += 1
+            logger.debug(f"AI response not cacheable: {e}")
+            return None
+
+    @staticmethod
+    def _from_cache(payload: str, start: float) -> AIResponse:
+        data = json.loads(payload)
+        return AIResponse(
+            result=data["result"],
+            provider=AIProvider(data["provider"]),
+            model=data["model"],
+            task_type=AITaskType(data["task_type"]),
+            confidence=data["confidence"],
+            reasoning=data["reasoning"],
+            tokens_used=0,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            request_id=str(uuid.uuid4()),
+            cost=0.0,
+            cached=True,
+        )
+
+    @staticmethod
+    def _shared(response: AIResponse, start: float) -> AIResponse:
+        """A coalesced caller's copy of the leading caller's response."""
+        return replace(
+            response,
+            tokens_used=0,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            request_id=str(uuid.uuid4()),
+            timestamp=None,
+            cost=0.0,
+            cached=True,
+        )
+
+    # ========================================================================
+    # OBSERVABILITY
+    # ========================================================================
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters plus hit ratio and mean hit / miss latency."""
+        hits, misses = self.metrics["hits"], self.metrics["misses"]
+        served = hits + misses + self.metrics["coalesced"]
+        return {
+            **self.metrics,
+            "hit_ratio": (hits + self.metrics["coalesced"]) / served if served else 0.0,
+            "avg_hit_latency_ms": self.metrics["hit_latency_ms"] / hits if hits else 0.0,
+            "avg_miss_latency_ms": self.metrics["miss_latency_ms"] / misses if misses else 0.0,
+            "backend": "redis" if self.redis is not None else "local",
+        }
+
+    def clear_local(self) -> None:
+        self._local.clear()
+
+
+# ============================================================================
+# PROCESS-WIDE CACHE
+# ============================================================================
+
+_response_cache: Optional[AIResponseCache] = None
+
+
+def get_ai_response_cache() -> AIResponseCache:
+    """Get the process-wide AI response cache (Redis at settings.REDIS_URL)."""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = AIResponseCache(
+            redis=aioredis.from_url(settings.REDIS_URL, decode_responses=True),
+            ttl=settings.AI_RESPONSE_CACHE_TTL_SECONDS,
+            local_size=settings.AI_RESPONSE_CACHE_LOCAL_SIZE,
+        )
+    return _response_cache
+
+
+def reset_ai_response_cache() -> None:
+    """Drop the process-wide cache (tests)."""
+    global _response_cache
+    _response_cache = None
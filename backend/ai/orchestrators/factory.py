@@ -12,6 +12,7 @@ import os
 
 from backend.ai.orchestrators.base import BaseAIOrchestrator, AIProvider
 from backend.ai.orchestrators.langchain_adapter import LangChainOrchestratorAdapter
+from backend.core.settings.config import settings
 
 
 # Singleton instance
@@ -73,6 +74,7 @@ def get_orchestrator(
                 api_key=config.get("api_key") or os.getenv("OPENAI_API_KEY"),
                 model_name=config.get("model_name", "gpt-4-turbo-preview"),
                 temperature=config.get("temperature", 0.7),
+                enable_cache=config.get("enable_cache", settings.AI_RESPONSE_CACHE_ENABLED),
             )
         elif provider == AIProvider.ANTHROPIC:
             # Future: Anthropic adapter
@@ -32,9 +32,18 @@ class LangChainOrchestratorAdapter(BaseAIOrchestrator):
         api_key: Optional[str] = None,
         model_name: str = "gpt-4-turbo-preview",
         temperature: float = 0.7,
+        enable_cache: bool = True,
+        response_cache=None,
         **kwargs
     ):
-        super().__init__(provider=AIProvider.OPENAI, api_key=api_key, model_name=model_name, temperature=temperature)
+        super().__init__(
+            provider=AIProvider.OPENAI,
+            enable_cache=enable_cache,
+            response_cache=response_cache,
+            api_key=api_key,
+            model_name=model_name,
+            temperature=temperature,
+        )
         
         # Wrap existing LangChainOrchestrator (NO changes to it)
         self._langchain = LangChainOrchestrator(
@@ -101,7 +110,7 @@ class LangChainOrchestratorAdapter(BaseAIOrchestrator):
         )
         
         # Simple text generation
-        response = chat_model.invoke(request.prompt)
+        response = await chat_model.ainvoke(request.prompt)
         return response.content
     
     async def _execute_classification(self, request: AIRequest) -> Dict[str, Any]:
@@ -112,7 +121,7 @@ class LangChainOrchestratorAdapter(BaseAIOrchestrator):
             temperature=0.0,  # Classification needs deterministic results
         )
         
-        response = chat_model.invoke(request.prompt)
+        response = await chat_model.ainvoke(request.prompt)
         
         # Parse classification result
         # In real implementation, use structured output
@@ -128,7 +137,7 @@ class LangChainOrchestratorAdapter(BaseAIOrchestrator):
             temperature=0.0,  # Scoring needs consistency
         )
         
-        response = chat_model.invoke(request.prompt)
+        response = await chat_model.ainvoke(request.prompt)
         
         # Parse score from response
         # In real implementation, use structured output or function calling
@@ -145,7 +154,7 @@ class LangChainOrchestratorAdapter(BaseAIOrchestrator):
             temperature=request.temperature or 0.5,
         )
         
-        response = chat_model.invoke(request.prompt)
+        response = await chat_model.ainvoke(request.prompt)
         
         return {
             "recommendation": response.content,
@@ -192,7 +201,7 @@ class LangChainOrchestratorAdapter(BaseAIOrchestrator):
             if context_summary:
                 messages.insert(0, SystemMessage(content=f"User context: {context_summary}"))
         
-        response = chat_model.invoke(messages)
+        response = await chat_model.ainvoke(messages)
         return response.content
     
     async def health_check(self) -> bool:
@@ -200,7 +209,7 @@ class LangChainOrchestratorAdapter(BaseAIOrchestrator):
         try:
             # Simple health check
             chat_model = self._langchain.get_chat_model()
-            response = chat_model.invoke("ping")
+            response = await chat_model.ainvoke("ping")
             return True
         except Exception:
             return False
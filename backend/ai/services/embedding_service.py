@@ -11,14 +11,21 @@ Model: all-MiniLM-L6-v2
 - Quality: 95% of large models at 5% the size
 
 Cost: $0/month (runs locally)
+
+Inference is CPU/GPU-bound and synchronous. From async code use
+encode_async / encode_batch_async: they run on a dedicated single-thread
+executor, so model calls are serialized (torch already parallelizes one
+forward pass across cores) and never block the event loop.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
-from functools import lru_cache
+from functools import lru_cache, partial
 import numpy as np
 
 from sentence_transformers import SentenceTransformer
@@ -26,6 +33,29 @@ from sentence_transformers import SentenceTransformer
 logger = logging.getLogger(__name__)
 
 
+# ============================================================================
+# INFERENCE THREAD
+# ============================================================================
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_embedding_executor() -> ThreadPoolExecutor:
+    """Get the process-wide inference thread (one model call at a time)."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding")
+    return _executor
+
+
+def shutdown_embedding_executor() -> None:
+    """Stop the inference thread (worker shutdown / tests)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
 class EmbeddingService:
     """
     Local embedding generation service.
@@ -178,6 +208,26 @@ class EmbeddingService:
             # Return zero vectors on error
             return np.zeros((len(texts), self.EMBEDDING_DIM), dtype=np.float32)
     
+    async def encode_async(self, text: str, normalize: bool = True) -> np.ndarray:
+        """encode() on the inference thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_embedding_executor(), partial(self.encode, text, normalize=normalize)
+        )
+    
+    async def encode_batch_async(
+        self,
+        texts: List[str],
+        batch_size: int = 32,
+        normalize: bool = True
+    ) -> np.ndarray:
+        """encode_batch() on the inference thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            get_embedding_executor(),
+            partial(self.encode_batch, texts, batch_size=batch_size, normalize=normalize)
+        )
+    
     def similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """
         Calculate cosine similarity between two embeddings.
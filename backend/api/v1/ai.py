@@ -9,8 +9,9 @@ from pydantic import BaseModel, Field
 
 from backend.core.auth.dependencies import get_current_user
 from backend.core.settings.config import settings as Settings, settings as get_settings
-from backend.ai.embeddings.chromadb.store import ChromaDBStore, Collections
+from backend.ai.embeddings.chromadb.store import ChromaDBStore, Collections, get_chroma_store
 from backend.ai.embeddings.chromadb.search import SemanticSearch
+from backend.ai.orchestrators.cache import get_ai_response_cache
 from backend.ai.orchestrators.langchain.orchestrator import LangChainOrchestrator
 from backend.ai.orchestrators.langchain.agents import (
     TradeAssistant,
@@ -97,12 +98,9 @@ class AnalyzeDocumentResponse(BaseModel):
 # ============================================================================
 
 
-def get_vector_store(settings: Settings = Depends(get_settings)) -> ChromaDBStore:
-    """Get ChromaDB vector store instance"""
-    return ChromaDBStore(
-        collection_name=Collections.TRADE_DOCUMENTS,
-        persist_directory=settings.CHROMADB_PERSIST_DIR
-    )
+def get_vector_store() -> ChromaDBStore:
+    """Get the process-wide ChromaDB vector store (persist dir: CHROMA_PERSIST_DIR)"""
+    return get_chroma_store(Collections.TRADE_DOCUMENTS)
 
 
 def get_semantic_search(
@@ -322,8 +320,9 @@ async def health_check(
             "status": "healthy",
             "vector_store": {
                 "collection": vector_store.collection_name,
-                "document_count": stats.get("count", 0),
+                "document_count": stats.get("document_count", 0),
             },
+            "response_cache": get_ai_response_cache().stats(),
             "models": {
                 "llm": "gpt-4-turbo-preview",
                 "embeddings": "text-embedding-3-small"
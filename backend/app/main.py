@@ -144,12 +144,13 @@ def create_app() -> FastAPI:
 			print("ℹ Tracing enabled but no endpoint configured (set OTEL_EXPORTER_OTLP_ENDPOINT or GCP_PROJECT_ID)")
 	else:
 		print("ℹ OpenTelemetry tracing disabled (set ENABLE_TRACING=true to enable)")
-	# Middlewares (order matters: RequestID → Idempotency → Auth → Isolation → Security → CORS)
-	app.add_middleware(RequestIDMiddleware)
-	app.add_middleware(IdempotencyMiddleware)  # Add idempotency BEFORE auth (caching layer)
-	app.add_middleware(AuthMiddleware)
-	app.add_middleware(DataIsolationMiddleware)
+	# Middlewares (request order: CORS → RequestID → Auth → Idempotency → Isolation → Security)
+	# add_middleware wraps the stack, so the LAST added runs FIRST: register innermost first
 	app.add_middleware(SecureHeadersMiddleware)
+	app.add_middleware(DataIsolationMiddleware)  # Needs request.state.user; sets the RLS context
+	app.add_middleware(IdempotencyMiddleware)  # Inside auth: cache keys are scoped to the principal
+	app.add_middleware(AuthMiddleware)
+	app.add_middleware(RequestIDMiddleware)
 	# CORS
 	origins = [o.strip() for o in settings.ALLOWED_ORIGINS.split(",") if o.strip()]
 	app.add_middleware(
@@ -247,6 +248,36 @@ def create_app() -> FastAPI:
 			traceback.print_exc()
 			# Don't fail app startup if AI initialization fails
 	
+	# Matching workers (set MATCHING_WORKERS_IN_PROCESS=false when running
+	# backend.workers.matching_worker as a separate deployment)
+	run_matching_workers = os.getenv("MATCHING_WORKERS_IN_PROCESS", "true").lower() == "true"
+	
+	@app.on_event("startup")
+	async def startup_matching_workers():
+		"""Start the long-lived matching service workers."""
+		if not run_matching_workers:
+			return
+		try:
+			from backend.modules.trade_desk.services.matching_service import start_background_matching
+			
+			await start_background_matching()
+		except Exception as e:
+			print(f"⚠️  Failed to start matching workers: {e}")
+	
+	@app.on_event("shutdown")
+	async def shutdown_matching_workers():
+		"""Drain matching workers on shutdown."""
+		from backend.modules.trade_desk.services.matching_service import stop_background_matching
+		
+		await stop_background_matching()
+	
+	@app.on_event("shutdown")
+	async def shutdown_password_hashing():
+		"""Stop the password hashing thread pool."""
+		from backend.core.auth.passwords import shutdown_hash_executor
+		
+		shutdown_hash_executor()
+	
 	return app
 
 
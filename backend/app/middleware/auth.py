@@ -6,7 +6,8 @@ This middleware is required before DataIsolationMiddleware can run.
 
 Key Features:
 1. JWT token validation using existing auth system
-2. User loading with all required isolation fields
+2. User loading with all required isolation fields (cached, see
+   core/auth/principal_cache.py - no DB round trip on cache hits)
 3. Sets request.state.user for downstream middleware
 4. Skips public/health endpoints
 5. Returns 401 for invalid/missing tokens
@@ -15,12 +16,12 @@ Key Features:
 from __future__ import annotations
 
 import logging
-from typing import Callable
 
-from fastapi import HTTPException, Request, Response, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request, Response, status
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from backend.core.auth.jwt import decode_token
+from backend.core.auth.principal_cache import get_principal_cache
 from backend.db.async_session import AsyncSessionLocal
 from backend.modules.settings.repositories.settings_repositories import UserRepository
 
@@ -51,11 +52,11 @@ SKIP_AUTH_PATHS = {
 }
 
 
-class AuthMiddleware(BaseHTTPMiddleware):
+class AuthMiddleware:
     """
-    Authentication middleware that validates JWT tokens and loads user data.
+    Authentication middleware (pure ASGI) that validates JWT tokens and loads user data.
     
-    Sets request.state.user with:
+    Sets request.state.user (an AuthenticatedPrincipal) with:
     - user.id (UUID)
     - user.user_type (SUPER_ADMIN | INTERNAL | EXTERNAL)
     - user.business_partner_id (UUID | None)
@@ -71,12 +72,29 @@ class AuthMiddleware(BaseHTTPMiddleware):
     - RBAC checks (permission validation)
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Process each request through authentication"""
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        request = Request(scope)
+        response = await self._authenticate(request)
+        if response is not None:
+            await response(scope, receive, send)
+            return
+        
+        # Proceed to next middleware/handler
+        await self.app(scope, receive, send)
+
+    async def _authenticate(self, request: Request) -> Response | None:
+        """Set request.state.user, or return the error response to send"""
         
         # Skip authentication for public endpoints
         if self._should_skip_auth(request):
-            return await call_next(request)
+            return None
         
         # Extract and validate token
         token = self._extract_token(request)
@@ -109,46 +127,46 @@ class AuthMiddleware(BaseHTTPMiddleware):
                 media_type="application/json",
             )
         
-        # Load user from database with all isolation fields
-        async with AsyncSessionLocal() as db:
-            try:
-                user_repo = UserRepository(db)
-                user = await user_repo.get_by_id(user_id)
-                
-                if user is None:
-                    logger.warning(f"User {user_id} not found")
-                    return Response(
-                        content='{"detail":"User not found"}',
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        media_type="application/json",
-                    )
-                
-                if not user.is_active:
-                    logger.warning(f"Inactive user {user_id} attempted access")
-                    return Response(
-                        content='{"detail":"User account is inactive"}',
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        media_type="application/json",
-                    )
-                
-                # Set user on request state for downstream middleware/handlers
-                request.state.user = user
-                
-                logger.debug(
-                    f"Authenticated user {user.id} ({user.user_type}) for {request.method} {request.url.path}"
-                )
-                
-            except Exception as e:
-                logger.error(f"Error loading user: {e}")
-                return Response(
-                    content='{"detail":"Authentication error"}',
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    media_type="application/json",
-                )
+        # Load user with all isolation fields (principal cache, DB on miss)
+        try:
+            user = await get_principal_cache().get(user_id, lambda: self._load_user(user_id))
+        except Exception as e:
+            logger.error(f"Error loading user: {e}")
+            return Response(
+                content='{"detail":"Authentication error"}',
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                media_type="application/json",
+            )
         
-        # Proceed to next middleware/handler
-        response = await call_next(request)
-        return response
+        if user is None:
+            logger.warning(f"User {user_id} not found")
+            return Response(
+                content='{"detail":"User not found"}',
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                media_type="application/json",
+            )
+        
+        if not user.is_active:
+            logger.warning(f"Inactive user {user_id} attempted access")
+            return Response(
+                content='{"detail":"User account is inactive"}',
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                media_type="application/json",
+            )
+        
+        # Set user on request state for downstream middleware/handlers
+        request.state.user = user
+        
+        logger.debug(
+            f"Authenticated user {user.id} ({user.user_type}) for {request.method} {request.url.path}"
+        )
+        return None
+    
+    @staticmethod
+    async def _load_user(user_id: str):
+        """Load user from database (principal cache miss)"""
+        async with AsyncSessionLocal() as db:
+            return await UserRepository(db).get_by_id(user_id)
     
     def _should_skip_auth(self, request: Request) -> bool:
         """Check if request path should skip authentication"""
@@ -8,27 +8,69 @@ Usage:
     Add header: Idempotency-Key: <unique-uuid>
     
     First request: Executes normally, caches response
-    Duplicate request: Returns cached response immediately
+    Concurrent duplicate: Waits for the first request's response
+    Later duplicate: Returns cached response immediately
+
+While the first request runs, an "in-progress" marker (SET NX) is held on
+the key and kept alive by a heartbeat for as long as the handler runs.
+Duplicates poll for the cached response instead of re-running
+the handler; if the first request ends without a cacheable response
+(error, non-JSON, too large) the marker is released and the next
+duplicate executes. Duplicates still waiting after LOCK_WAIT_TIMEOUT get
+409 with Retry-After.
+
+Responses are stored zlib-compressed (status + minimal headers + raw
+body), capped at MAX_STORED_BYTES.
+
+Runs inside AuthMiddleware: keys are scoped to the authenticated
+principal, and requests without one (public routes) are never cached or
+replayed.
 """
 
-from typing import Callable, Optional
-from fastapi import Request, Response, status
-from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-import json
+import asyncio
 import hashlib
-import redis.asyncio as aioredis
+import json
+import uuid
+import zlib
 from datetime import timedelta
+from typing import List, Optional, Tuple
+
+import redis.asyncio as aioredis
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from backend.core.settings.config import settings
 
 
-class IdempotencyMiddleware(BaseHTTPMiddleware):
+# Stored payload: MAGIC + zlib(len(meta) (4 bytes) + meta JSON + body)
+_MAGIC = b"IZ1"
+
+# Per-request / per-hop headers not worth storing or replaying
+_VOLATILE_HEADERS = {
+    b"content-length",
+    b"date",
+    b"server",
+    b"x-request-id",
+    b"x-idempotency-cache",
+    b"set-cookie",
+}
+
+
+class _StillInProgress(Exception):
+    """A concurrent request with the same key has not finished in time."""
+
+
+class IdempotencyMiddleware:
     """
-    Middleware to handle idempotent requests using Redis cache.
+    Pure ASGI middleware to handle idempotent requests using Redis cache.
     
     Safe HTTP methods (GET, HEAD, OPTIONS) are always idempotent.
     Unsafe methods (POST, PUT, PATCH, DELETE) require Idempotency-Key header.
+    
+    Response bodies stream through untouched; a copy is captured only for
+    keyed requests whose response is cacheable (2xx/3xx JSON up to
+    MAX_CACHED_BODY_BYTES), and stored once the last chunk has been sent.
     """
     
     # Methods that require idempotency keys
@@ -40,112 +82,289 @@ class IdempotencyMiddleware(BaseHTTPMiddleware):
     # How long to cache idempotency responses (24 hours)
     CACHE_TTL = timedelta(hours=24)
     
-    def __init__(self, app, redis_url: Optional[str] = None):
-        super().__init__(app)
+    # Larger responses are passed through without caching
+    MAX_CACHED_BODY_BYTES = 1024 * 1024
+    
+    # Compressed payloads above this are not stored
+    MAX_STORED_BYTES = 256 * 1024
+    
+    # In-progress marker: expires if the owner dies mid-request, and is
+    # re-extended every LOCK_HEARTBEAT_INTERVAL while the handler runs
+    LOCK_TTL = timedelta(seconds=30)
+    LOCK_HEARTBEAT_INTERVAL = timedelta(seconds=10)
+    
+    # How long a concurrent duplicate waits for the first response
+    LOCK_WAIT_TIMEOUT = timedelta(seconds=10)
+    LOCK_POLL_INTERVAL = 0.05  # seconds, doubles up to 0.5
+    
+    # Delete the marker only if we still own it
+    _RELEASE_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+    
+    # Extend the marker only if we still own it
+    _EXTEND_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+    
+    def __init__(self, app: ASGIApp, redis_url: Optional[str] = None):
+        self.app = app
         self.redis_url = redis_url or settings.REDIS_URL
         self._redis: Optional[aioredis.Redis] = None
+        self._release = None
+        self._extend = None
     
     async def get_redis(self) -> aioredis.Redis:
-        """Get or create Redis connection."""
+        """Get or create Redis connection (binary - payloads are compressed)."""
         if self._redis is None:
-            self._redis = await aioredis.from_url(
-                self.redis_url,
-                encoding="utf-8",
-                decode_responses=True
-            )
+            self._redis = await aioredis.from_url(self.redis_url)
         return self._redis
     
-    def _generate_cache_key(self, idempotency_key: str, request: Request) -> str:
+    def _generate_cache_key(self, idempotency_key: str, method: str, path: str, principal_id: str) -> str:
         """
         Generate cache key from idempotency key and request details.
         
-        Include method + path to prevent key reuse across different endpoints.
+        Include the principal so one user can never replay another user's
+        response, and method + path to prevent key reuse across endpoints.
         """
         # Hash the combination to keep keys consistent length
-        key_data = f"{request.method}:{request.url.path}:{idempotency_key}"
+        key_data = f"{principal_id}:{method}:{path}:{idempotency_key}"
         hash_suffix = hashlib.sha256(key_data.encode()).hexdigest()[:16]
         return f"idempotency:{hash_suffix}"
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process request with idempotency checking.
         
         NO BUSINESS LOGIC - pure caching layer.
         """
-        # Skip idempotency for safe methods
-        if request.method in self.SAFE_METHODS:
-            return await call_next(request)
+        # Skip idempotency for non-HTTP scopes and safe methods
+        if scope["type"] != "http" or scope["method"] in self.SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
         
         # Get idempotency key from header
-        idempotency_key = request.headers.get("Idempotency-Key")
+        idempotency_key = Headers(scope=scope).get("Idempotency-Key")
         
         # For unsafe methods, idempotency key is optional but recommended
         # We won't enforce it to avoid breaking existing clients
         if not idempotency_key:
             # No key provided - process normally without caching
-            return await call_next(request)
+            await self.app(scope, receive, send)
+            return
+        
+        # Only authenticated requests are cached (request.state.user from AuthMiddleware)
+        principal = scope.get("state", {}).get("user")
+        if principal is None:
+            await self.app(scope, receive, send)
+            return
         
-        # Check cache for existing response
         redis = await self.get_redis()
-        cache_key = self._generate_cache_key(idempotency_key, request)
-        
-        cached_response = await redis.get(cache_key)
-        
-        if cached_response:
-            # Return cached response - this is a duplicate request
-            cached_data = json.loads(cached_response)
-            return JSONResponse(
-                content=cached_data["body"],
-                status_code=cached_data["status_code"],
-                headers={
-                    **cached_data.get("headers", {}),
-                    "X-Idempotency-Cache": "HIT"
-                }
+        cache_key = self._generate_cache_key(
+            idempotency_key, scope["method"], scope["path"], str(principal.id)
+        )
+        lock_key = f"{cache_key}:lock"
+        lock_token = uuid.uuid4().hex
+        
+        # Replay a cached response, or wait while another request owns the key
+        try:
+            cached = await self._acquire_or_wait(redis, cache_key, lock_key, lock_token)
+        except _StillInProgress:
+            response = JSONResponse(
+                {"detail": "A request with this Idempotency-Key is still in progress"},
+                status_code=409,
+                headers={"Retry-After": "1"},
             )
+            await response(scope, receive, send)
+            return
+        
+        if cached is not None:
+            await self._send_cached(cached, send)
+            return
+        
+        heartbeat = asyncio.create_task(self._heartbeat(redis, lock_key, lock_token))
+        try:
+            await self._execute_and_capture(scope, receive, send, redis, cache_key)
+        finally:
+            heartbeat.cancel()
+            await self._release_lock(redis, lock_key, lock_token)
+    
+    # ========================================================================
+    # IN-PROGRESS MARKER
+    # ========================================================================
+    
+    async def _acquire_or_wait(
+        self,
+        redis: aioredis.Redis,
+        cache_key: str,
+        lock_key: str,
+        lock_token: str,
+    ) -> Optional[bytes]:
+        """
+        Return the cached payload, or None once this request owns the key.
         
-        # Process request normally
-        response = await call_next(request)
+        Raises:
+            _StillInProgress: Waited LOCK_WAIT_TIMEOUT without a result
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.LOCK_WAIT_TIMEOUT.total_seconds()
+        interval = self.LOCK_POLL_INTERVAL
         
-        # Cache successful responses only (2xx and 3xx)
-        if 200 <= response.status_code < 400:
-            # Read response body
-            response_body = b""
-            async for chunk in response.body_iterator:
-                response_body += chunk
+        while True:
+            cached = await redis.get(cache_key)
+            if cached:
+                return cached
+            
+            acquired = await redis.set(
+                lock_key, lock_token, nx=True, px=int(self.LOCK_TTL.total_seconds() * 1000)
+            )
+            if acquired:
+                # A response may have landed between GET and SET NX
+                cached = await redis.get(cache_key)
+                if cached:
+                    await self._release_lock(redis, lock_key, lock_token)
+                    return cached
+                return None
             
-            # Parse JSON body
+            if loop.time() >= deadline:
+                raise _StillInProgress()
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, 0.5)
+    
+    async def _heartbeat(self, redis: aioredis.Redis, lock_key: str, lock_token: str) -> None:
+        """Keep the marker alive while the handler runs, so a retry never re-executes it"""
+        if self._extend is None:
+            self._extend = redis.register_script(self._EXTEND_SCRIPT)
+        ttl_ms = int(self.LOCK_TTL.total_seconds() * 1000)
+        while True:
+            await asyncio.sleep(self.LOCK_HEARTBEAT_INTERVAL.total_seconds())
             try:
-                body_json = json.loads(response_body.decode())
-            except (json.JSONDecodeError, UnicodeDecodeError):
-                # Can't cache non-JSON responses
-                body_json = None
+                if not await self._extend(keys=[lock_key], args=[lock_token, ttl_ms]):
+                    return  # Marker lost (expired or released) - nothing left to extend
+            except aioredis.RedisError:
+                continue  # Transient; the TTL still covers the next attempt
+    
+    async def _release_lock(self, redis: aioredis.Redis, lock_key: str, lock_token: str) -> None:
+        if self._release is None:
+            self._release = redis.register_script(self._RELEASE_SCRIPT)
+        await self._release(keys=[lock_key], args=[lock_token])
+    
+    # ========================================================================
+    # CAPTURE / STORE / REPLAY
+    # ========================================================================
+    
+    async def _execute_and_capture(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        redis: aioredis.Redis,
+        cache_key: str,
+    ) -> None:
+        """Run the handler, streaming the response and storing a cacheable copy"""
+        status_code = 0
+        response_headers: List[Tuple[bytes, bytes]] = []
+        chunks: Optional[List[bytes]] = None
+        captured = 0
+        
+        async def send_and_capture(message: Message) -> None:
+            nonlocal status_code, response_headers, chunks, captured
             
-            if body_json is not None:
-                # Cache response
-                cache_data = {
-                    "status_code": response.status_code,
-                    "body": body_json,
-                    "headers": dict(response.headers)
-                }
-                
-                await redis.setex(
-                    cache_key,
-                    int(self.CACHE_TTL.total_seconds()),
-                    json.dumps(cache_data)
-                )
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                # Cache successful JSON responses only (2xx and 3xx)
+                if 200 <= status_code < 400 and headers.get("content-type", "").startswith("application/json"):
+                    chunks = []
+                    headers["X-Idempotency-Cache"] = "MISS"
+                response_headers = list(message["headers"])
             
-            # Recreate response with consumed body
-            return JSONResponse(
-                content=body_json if body_json is not None else response_body.decode(),
-                status_code=response.status_code,
-                headers={
-                    **dict(response.headers),
-                    "X-Idempotency-Cache": "MISS"
-                }
-            )
+            elif message["type"] == "http.response.body" and chunks is not None:
+                body = message.get("body", b"")
+                captured += len(body)
+                if captured > self.MAX_CACHED_BODY_BYTES:
+                    chunks = None  # Too large to cache, keep streaming
+                else:
+                    chunks.append(body)
+                    if not message.get("more_body", False):
+                        await send(message)
+                        await self._store(redis, cache_key, status_code, response_headers, b"".join(chunks))
+                        return
+            
+            await send(message)
+        
+        await self.app(scope, receive, send_and_capture)
+    
+    async def _store(
+        self,
+        redis: aioredis.Redis,
+        cache_key: str,
+        status_code: int,
+        raw_headers: List[Tuple[bytes, bytes]],
+        body: bytes,
+    ) -> None:
+        payload = self._encode(status_code, raw_headers, body)
+        if len(payload) > self.MAX_STORED_BYTES:
+            return
+        await redis.setex(cache_key, int(self.CACHE_TTL.total_seconds()), payload)
+    
+    @staticmethod
+    def _encode(status_code: int, raw_headers: List[Tuple[bytes, bytes]], body: bytes) -> bytes:
+        meta = json.dumps({
+            "s": status_code,
+            "h": [
+                [name.decode("latin-1"), value.decode("latin-1")]
+                for name, value in raw_headers
+                if name.lower() not in _VOLATILE_HEADERS
+            ],
+        }, separators=(",", ":")).encode()
+        return _MAGIC + zlib.compress(len(meta).to_bytes(4, "big") + meta + body)
+    
+    @staticmethod
+    def _decode(payload: bytes) -> Tuple[int, List[Tuple[str, str]], bytes]:
+        """(status, headers, body) from a stored payload"""
+        if isinstance(payload, bytes) and payload.startswith(_MAGIC):
+            raw = zlib.decompress(payload[len(_MAGIC):])
+            meta_length = int.from_bytes(raw[:4], "big")
+            meta = json.loads(raw[4:4 + meta_length])
+            return meta["s"], [tuple(h) for h in meta["h"]], raw[4 + meta_length:]
+        
+        # Uncompressed JSON entries written by earlier versions
+        cached_data = json.loads(payload)
+        if "content" in cached_data:
+            body = cached_data["content"].encode()
+        else:
+            body = json.dumps(cached_data["body"]).encode()
+        headers = [
+            (name, value)
+            for name, value in cached_data.get("headers", {}).items()
+            if name.lower().encode("latin-1") not in _VOLATILE_HEADERS
+        ]
+        return cached_data["status_code"], headers, body
+    
+    @classmethod
+    async def _send_cached(cls, payload: bytes, send: Send) -> None:
+        status_code, stored_headers, body = cls._decode(payload)
+        
+        headers = MutableHeaders(raw=[
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in stored_headers
+        ])
+        headers["content-length"] = str(len(body))
+        headers["X-Idempotency-Cache"] = "HIT"
         
-        # Don't cache error responses
-        return response
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": headers.raw,
+        })
+        await send({"type": "http.response.body", "body": body})
     
     async def cleanup(self):
         """Close Redis connection on shutdown."""
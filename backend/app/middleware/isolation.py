@@ -6,7 +6,8 @@ CRITICAL SECURITY MIDDLEWARE - Enforces data isolation for all API requests.
 Responsibilities:
 1. Extract authenticated user from request
 2. Set security context based on user_type
-3. Configure PostgreSQL Row Level Security (RLS)
+3. Provide the context for PostgreSQL Row Level Security (RLS) - applied
+   per transaction by db/async_session.py in one set_config() call
 4. Log all data access (GDPR compliance)
 5. Enforce module-level access control (RBAC)
 
@@ -27,12 +28,9 @@ Date: November 22, 2025
 
 from __future__ import annotations
 
-from typing import Callable
-
 from fastapi import HTTPException, Request, status
-from sqlalchemy.orm import Session
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from backend.core.audit.logger import log_data_access, log_isolation_violation
 from backend.core.security.context import (
@@ -43,16 +41,16 @@ from backend.core.security.context import (
 )
 
 
-class DataIsolationMiddleware(BaseHTTPMiddleware):
+class DataIsolationMiddleware:
     """
-    Data Isolation Middleware - Enforces business partner isolation.
+    Data Isolation Middleware (pure ASGI) - Enforces business partner isolation.
     
     Flow:
     1. Check if path requires authentication
     2. Get authenticated user from request.state.user
     3. Validate user object
     4. Set security context (ContextVars)
-    5. Configure PostgreSQL RLS session variables
+    5. RLS variables follow the context (set at transaction begin)
     6. Log access (GDPR compliance)
     7. Check module access (RBAC)
     8. Process request
@@ -88,25 +86,40 @@ class DataIsolationMiddleware(BaseHTTPMiddleware):
     ]
     
     def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
+        self.app = app
     
-    async def dispatch(self, request: Request, call_next: Callable):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process request with data isolation.
         
+        Rejections (401/403/500) are sent as {"detail": ...} JSON responses.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        try:
+            self._enforce(Request(scope))
+        except HTTPException as e:
+            response = JSONResponse({"detail": e.detail}, status_code=e.status_code, headers=e.headers)
+            await response(scope, receive, send)
+            return
+        
+        await self.app(scope, receive, send)
+    
+    def _enforce(self, request: Request) -> None:
+        """
+        Set security context for the request or reject it.
+        
         Args:
             request: FastAPI request
-            call_next: Next middleware in chain
-        
-        Returns:
-            Response from next middleware
         
         Raises:
             HTTPException: 401 if not authenticated, 403 if access denied
         """
         # Skip public endpoints
         if self._is_public_path(request.url.path):
-            return await call_next(request)
+            return
         
         # Get authenticated user (set by auth middleware - must run before this)
         user = getattr(request.state, 'user', None)
@@ -120,17 +133,9 @@ class DataIsolationMiddleware(BaseHTTPMiddleware):
         # Validate user object has required fields
         self._validate_user_object(user)
         
-        # Get database session (for RLS configuration)
-        db: Session = getattr(request.state, 'db', None)
-        if not db:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Database session not available",
-            )
-        
-        # Set security context and configure RLS
+        # Set security context (also drives the RLS variables)
         try:
-            self._configure_isolation(user, db)
+            self._configure_isolation(user)
         except SecurityError as e:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -157,11 +162,6 @@ class DataIsolationMiddleware(BaseHTTPMiddleware):
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Access denied to module: {module}",
             )
-        
-        # Process request
-        response = await call_next(request)
-        
-        return response
     
     def _is_public_path(self, path: str) -> bool:
         """
@@ -207,13 +207,16 @@ class DataIsolationMiddleware(BaseHTTPMiddleware):
                 detail="Invalid user object: missing 'user_type'",
             )
     
-    def _configure_isolation(self, user, db: Session) -> None:
+    def _configure_isolation(self, user) -> None:
         """
-        Configure security context and PostgreSQL RLS.
+        Configure security context.
+        
+        PostgreSQL RLS variables are derived from this context when each
+        transaction begins (see db/async_session.py), so they are always
+        transaction-local and never leak across pooled connections.
         
         Args:
             user: Authenticated user
-            db: Database session
         
         Raises:
             SecurityError: If user configuration invalid
@@ -229,13 +232,6 @@ class DataIsolationMiddleware(BaseHTTPMiddleware):
                 organization_id=None,
                 allowed_modules=getattr(user, 'allowed_modules', None),
             )
-            
-            # Set PostgreSQL RLS variables
-            self._set_postgres_rls(
-                db,
-                user_id=user.id,
-                user_type='SUPER_ADMIN',
-            )
         
         elif user_type == UserType.INTERNAL:
             # Internal user - must have organization_id
@@ -252,14 +248,6 @@ class DataIsolationMiddleware(BaseHTTPMiddleware):
                 organization_id=org_id,
                 allowed_modules=getattr(user, 'allowed_modules', None),
             )
-            
-            # Set PostgreSQL RLS variables
-            self._set_postgres_rls(
-                db,
-                user_id=user.id,
-                user_type='INTERNAL',
-                organization_id=org_id,
-            )
         
         elif user_type == UserType.EXTERNAL:
             # External user - must have business_partner_id
@@ -276,50 +264,10 @@ class DataIsolationMiddleware(BaseHTTPMiddleware):
                 organization_id=None,
                 allowed_modules=getattr(user, 'allowed_modules', None),
             )
-            
-            # Set PostgreSQL RLS variables
-            self._set_postgres_rls(
-                db,
-                user_id=user.id,
-                user_type='EXTERNAL',
-                business_partner_id=bp_id,
-            )
         
         else:
             raise SecurityError(f"Invalid user_type: {user.user_type}")
     
-    def _set_postgres_rls(
-        self,
-        db: Session,
-        user_id,
-        user_type: str,
-        business_partner_id = None,
-        organization_id = None,
-    ) -> None:
-        """
-        Set PostgreSQL session variables for Row Level Security.
-        
-        These variables are used in RLS policies to filter data at database level.
-        Provides second layer of security (defense in depth).
-        
-        Args:
-            db: Database session
-            user_id: User UUID
-            user_type: SUPER_ADMIN, INTERNAL, or EXTERNAL
-            business_partner_id: Business partner UUID (for EXTERNAL)
-            organization_id: Organization UUID (for INTERNAL)
-        """
-        # Set base variables
-        db.execute(f"SET app.user_id = '{user_id}'")
-        db.execute(f"SET app.user_type = '{user_type}'")
-        
-        # Set type-specific variables
-        if business_partner_id:
-            db.execute(f"SET app.business_partner_id = '{business_partner_id}'")
-        
-        if organization_id:
-            db.execute(f"SET app.organization_id = '{organization_id}'")
-    
     def _log_access(self, user, request: Request) -> None:
         """
         Log API access for compliance (GDPR Article 30).
@@ -1,39 +1,63 @@
 from __future__ import annotations
 
 import uuid
-from typing import Callable
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from backend.core.audit.logger import request_id_ctx
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+# Conservative defaults suitable for APIs
+_SECURE_HEADERS = (
+    ("X-Content-Type-Options", "nosniff"),
+    ("X-Frame-Options", "DENY"),
+    ("Referrer-Policy", "no-referrer"),
+    ("Permissions-Policy", "geolocation=(), microphone=(), camera=()"),
+    ("Strict-Transport-Security", "max-age=63072000; includeSubDomains; preload"),
+    # Basic CSP for APIs (no inline/script execution)
+    ("Content-Security-Policy", "default-src 'none'"),
+)
+
+
+class RequestIDMiddleware:
+    """Pure ASGI: propagate/assign X-Request-ID (body passes through untouched)."""
+
     def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
+        self.app = app
 
-    async def dispatch(self, request: Request, call_next: Callable):
-        rid = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rid = Headers(scope=scope).get("X-Request-ID") or str(uuid.uuid4())
         request_id_ctx.set(rid)
-        response = await call_next(request)
-        response.headers["X-Request-ID"] = rid
-        return response
 
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-ID"] = rid
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
+
+
+class SecureHeadersMiddleware:
+    """Pure ASGI: add security headers to the response start message."""
 
-class SecureHeadersMiddleware(BaseHTTPMiddleware):
     def __init__(self, app: ASGIApp) -> None:
-        super().__init__(app)
-
-    async def dispatch(self, request: Request, call_next: Callable):
-        response = await call_next(request)
-        # Conservative defaults suitable for APIs
-        response.headers.setdefault("X-Content-Type-Options", "nosniff")
-        response.headers.setdefault("X-Frame-Options", "DENY")
-        response.headers.setdefault("Referrer-Policy", "no-referrer")
-        response.headers.setdefault("Permissions-Policy", "geolocation=(), microphone=(), camera=()")
-        response.headers.setdefault("Strict-Transport-Security", "max-age=63072000; includeSubDomains; preload")
-        # Basic CSP for APIs (no inline/script execution)
-        response.headers.setdefault("Content-Security-Policy", "default-src 'none'")
-        return response
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_secure_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for name, value in _SECURE_HEADERS:
+                    headers.setdefault(name, value)
+            await send(message)
+
+        await self.app(scope, receive, send_with_secure_headers)
@@ -46,7 +46,7 @@ def audit_log(
     rid = request_id_ctx.get()
     if rid:
         payload["request_id"] = rid
-    logger.info(json.dumps(payload), extra={"audit": True, "action": action})
+    logger.info(json.dumps(payload, default=str), extra={"audit": True, "action": action})
     return correlation_id
 
 
@@ -95,7 +95,7 @@ def log_data_access(
     if rid:
         payload["request_id"] = rid
     
-    logger.info(json.dumps(payload), extra={"audit": True, "action": "data_access"})
+    logger.info(json.dumps(payload, default=str), extra={"audit": True, "action": "data_access"})
 
 
 def log_data_export(
@@ -131,7 +131,7 @@ def log_data_export(
     if rid:
         payload["request_id"] = rid
     
-    logger.warning(json.dumps(payload), extra={"audit": True, "action": "data_export"})
+    logger.warning(json.dumps(payload, default=str), extra={"audit": True, "action": "data_export"})
 
 
 def log_data_deletion(
@@ -175,7 +175,7 @@ def log_data_deletion(
     
     # Use ERROR level for hard deletes (permanent)
     log_level = logger.error if is_hard_delete else logger.warning
-    log_level(json.dumps(payload), extra={"audit": True, "action": "data_deletion"})
+    log_level(json.dumps(payload, default=str), extra={"audit": True, "action": "data_deletion"})
 
 
 def log_cross_branch_invoice(
@@ -208,7 +208,7 @@ def log_cross_branch_invoice(
     if rid:
         payload["request_id"] = rid
     
-    logger.info(json.dumps(payload), extra={"audit": True, "action": "cross_branch_invoice"})
+    logger.info(json.dumps(payload, default=str), extra={"audit": True, "action": "cross_branch_invoice"})
 
 
 def log_isolation_violation(
@@ -247,5 +247,5 @@ def log_isolation_violation(
     if rid:
         payload["request_id"] = rid
     
-    logger.error(json.dumps(payload), extra={"audit": True, "action": "isolation_violation"})
+    logger.error(json.dumps(payload, default=str), extra={"audit": True, "action": "isolation_violation"})
 
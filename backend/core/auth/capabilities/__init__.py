@@ -1,5 +1,6 @@
 """Capability-Based Authorization Module"""
 
+from backend.core.auth.capabilities.cache import CapabilityCache, get_capability_cache
 from backend.core.auth.capabilities.decorators import RequireCapability, check_capability, require_capability
 from backend.core.auth.capabilities.definitions import CAPABILITY_METADATA, Capabilities
 from backend.core.auth.capabilities.models import Capability, RoleCapability, UserCapability
@@ -13,6 +14,8 @@ __all__ = [
     "RoleCapability",
     "CapabilityService",
     "get_capability_service",
+    "CapabilityCache",
+    "get_capability_cache",
     "RequireCapability",
     "require_capability",
     "check_capability",
@@ -0,0 +1,160 @@
+"""
+Effective Capability Cache
+
+Capability checks (RequireCapability, require_capability, check_capability)
+need a user's effective capability set - direct grants that are neither
+revoked nor expired, plus everything inherited from the user's roles.
+The set is resolved from the database once and cached in two tiers:
+
+1. In-process LRU (CAPABILITY_CACHE_LOCAL_TTL_SECONDS, a few seconds)
+2. Redis (CAPABILITY_CACHE_REDIS_TTL_SECONDS), shared by all workers
+
+Entries never outlive the earliest expires_at among the user's direct
+grants, so temporal capabilities disappear on time.
+
+Invalidation uses version stamps in Redis (see core/auth/versioned_cache.py):
+- per user: bumped when a capability is granted to / revoked from the user
+  or the user gains a role
+- roles: ONE global stamp, bumped when a role's capabilities change. Every
+  cached set records the roles stamp it was built under and is ignored
+  once it differs (role changes are rare; users per role are unbounded).
+
+Fills are written only if neither stamp changed while the set was being
+loaded. Other processes' local entries expire within the local TTL.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, FrozenSet, Iterable, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+from backend.core.auth.versioned_cache import VersionedCache
+from backend.core.settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# loader() -> (capability codes, earliest expires_at of a direct grant or None)
+CapabilityLoader = Callable[[], Awaitable[Tuple[Iterable[str], Optional[datetime]]]]
+
+
+class CapabilityCache(VersionedCache[FrozenSet[str]]):
+    """Two-tier (local LRU + Redis) cache of effective capability sets."""
+
+    KEY_PREFIX = "auth:capabilities"
+    CACHE_NAME = "Capability"
+
+    @property
+    def roles_version_key(self) -> str:
+        return f"{self.KEY_PREFIX}:roles:version"
+
+    async def get(self, user_id: Any, loader: CapabilityLoader) -> FrozenSet[str]:
+        """
+        Get the effective capability codes of user_id, calling loader() on a miss.
+
+        Args:
+            user_id: User ID
+            loader: Resolves (codes, earliest direct-grant expiry) from the database
+
+        Returns:
+            Frozen set of capability codes
+        """
+        user_id = str(user_id)
+        now = time.time()
+        cached = self._local_get(user_id, now)
+        if cached is not None:
+            return cached
+
+        data_key, version_key = self._keys(user_id)
+        user_version = roles_version = "0"
+        if self.redis is not None:
+            try:
+                raw, stored_user_version, stored_roles_version = await self.redis.mget(
+                    data_key, version_key, self.roles_version_key
+                )
+                user_version = self._text(stored_user_version) or "0"
+                roles_version = self._text(stored_roles_version) or "0"
+                if raw is not None:
+                    entry = json.loads(self._text(raw))
+                    expires = entry["x"]
+                    if entry["r"] == roles_version and (expires is None or expires > now):
+                        codes = frozenset(entry["c"])
+                        self._remember(user_id, codes, expires, now)
+                        self.metrics["redis_hits"] += 1
+                        return codes
+            except Exception as e:
+                # Redis down: behave like no cache
+                self.metrics["redis_errors"] += 1
+                logger.warning(f"Capability cache read failed: {e}")
+
+        self.metrics["misses"] += 1
+        loaded, valid_until = await loader()
+        codes = frozenset(loaded)
+        expires = valid_until.replace(tzinfo=valid_until.tzinfo or timezone.utc).timestamp() if valid_until else None
+        self._remember(user_id, codes, expires, now)
+
+        ttl = self.redis_ttl if expires is None else min(self.redis_ttl, math.ceil(expires - now))
+        if ttl > 0:
+            await self._fill_redis(
+                [data_key, version_key, self.roles_version_key],
+                [user_version, roles_version],
+                json.dumps({"c": sorted(codes), "x": expires, "r": roles_version}),
+                ttl,
+            )
+        return codes
+
+    def _remember(self, user_id: str, codes: FrozenSet[str], expires: Optional[float], now: float) -> None:
+        deadline = now + self.local_ttl
+        if expires is not None:
+            deadline = min(deadline, expires)
+        self._remember_local(user_id, codes, deadline)
+
+    async def invalidate_roles(self) -> None:
+        """Drop every cached set (a role's capabilities changed)."""
+        self._local.clear()
+        self.metrics["invalidations"] += 1
+        if self.redis is None:
+            return
+
+        try:
+            await self.redis.incr(self.roles_version_key)
+        except Exception as e:
+            self.metrics["redis_errors"] += 1
+            logger.error(f"Capability cache role invalidation failed: {e}")
+
+    def invalidate_roles_on_commit(self, db: Any) -> None:
+        """Invalidate all users after the session commits (local entries dropped now)."""
+        self._local.clear()
+        self._after_commit(db, self.invalidate_roles)
+
+
+# ============================================================================
+# PROCESS-WIDE CACHE
+# ============================================================================
+
+_capability_cache: Optional[CapabilityCache] = None
+
+
+def get_capability_cache() -> CapabilityCache:
+    """Get the process-wide capability cache (Redis at settings.REDIS_URL)."""
+    global _capability_cache
+    if _capability_cache is None:
+        _capability_cache = CapabilityCache(
+            redis=aioredis.from_url(settings.REDIS_URL, decode_responses=True),
+            local_ttl=settings.CAPABILITY_CACHE_LOCAL_TTL_SECONDS,
+            local_size=settings.CAPABILITY_CACHE_LOCAL_SIZE,
+            redis_ttl=settings.CAPABILITY_CACHE_REDIS_TTL_SECONDS,
+        )
+    return _capability_cache
+
+
+def reset_capability_cache() -> None:
+    """Drop the process-wide cache (tests)."""
+    global _capability_cache
+    _capability_cache = None
@@ -83,17 +83,15 @@ class RequireCapability:
         user_id = current_user["id"]
         capability_service = CapabilityService(db)
         
-        for capability in self.capabilities:
+        # One cached lookup, then O(1) membership per capability
+        granted = await capability_service.get_user_capabilities(user_id)
+        
+        for cap_code in cap_codes:
             # Skip public capabilities in the check
-            cap_code = capability.value if isinstance(capability, Capabilities) else capability
             if cap_code in public_capability_values:
                 continue
-                
-            has_capability = await capability_service.user_has_capability(
-                user_id, capability
-            )
             
-            if not has_capability:
+            if cap_code not in granted:
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail=f"Missing required capability: {cap_code}",
@@ -133,15 +131,11 @@ def require_capability(*capabilities: Capabilities | str):
             if not session:
                 raise ValueError("Cannot determine session for capability check")
             
-            # Check capabilities
-            capability_service = CapabilityService(session)
+            # Check capabilities (one cached lookup for all of them)
+            granted = await CapabilityService(session).get_user_capabilities(user_id)
             for capability in capabilities:
-                has_capability = await capability_service.user_has_capability(
-                    user_id, capability
-                )
-                
-                if not has_capability:
-                    cap_code = capability.value if isinstance(capability, Capabilities) else capability
+                cap_code = capability.value if isinstance(capability, Capabilities) else capability
+                if cap_code not in granted:
                     raise HTTPException(
                         status_code=status.HTTP_403_FORBIDDEN,
                         detail=f"Missing required capability: {cap_code}",
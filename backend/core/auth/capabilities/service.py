@@ -8,16 +8,17 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
-from typing import List, Optional, Set
-import json
+from typing import FrozenSet, Optional, Set, Tuple
 
 from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 import redis.asyncio as redis
 
+from backend.core.auth.capabilities.cache import CapabilityCache, get_capability_cache
 from backend.core.auth.capabilities.definitions import Capabilities
 from backend.core.auth.capabilities.models import Capability, RoleCapability, UserCapability
 from backend.core.outbox import OutboxRepository
+from backend.modules.settings.models.settings_models import UserRole
 
 
 class CapabilityService:
@@ -31,10 +32,18 @@ class CapabilityService:
     - Get all capabilities for a user
     """
     
-    def __init__(self, session: AsyncSession, redis_client: Optional[redis.Redis] = None):
+    def __init__(
+        self,
+        session: AsyncSession,
+        redis_client: Optional[redis.Redis] = None,
+        cache: Optional[CapabilityCache] = None,
+    ):
         self.session = session
         self.redis = redis_client
         self.outbox_repo = OutboxRepository(session)
+        if cache is None:
+            cache = CapabilityCache(redis=redis_client) if redis_client is not None else get_capability_cache()
+        self.cache = cache
     
     async def user_has_capability(
         self,
@@ -48,6 +57,9 @@ class CapabilityService:
         1. Direct user capabilities
         2. Inherited role capabilities
         
+        Resolved from the cached effective capability set (see
+        get_user_capabilities) - no queries on a cache hit.
+        
         Args:
             user_id: User ID to check
             capability_code: Capability code (e.g., "AVAILABILITY_CREATE")
@@ -58,60 +70,34 @@ class CapabilityService:
         if isinstance(capability_code, Capabilities):
             capability_code = capability_code.value
         
-        # Get capability ID
-        capability = await self._get_capability_by_code(capability_code)
-        if not capability:
-            return False
-        
-        # Check direct user capability
-        user_cap_query = select(UserCapability).where(
-            and_(
-                UserCapability.user_id == user_id,
-                UserCapability.capability_id == capability.id,
-                UserCapability.revoked_at.is_(None),
-                or_(
-                    UserCapability.expires_at.is_(None),
-                    UserCapability.expires_at > datetime.utcnow()
-                )
-            )
-        )
-        result = await self.session.execute(user_cap_query)
-        if result.scalar_one_or_none():
-            return True
-        
-        # Check role-based capability
-        # Get user's roles
-        from backend.modules.auth.models import User, UserRole
-        
-        user_roles_query = select(UserRole.role_id).where(UserRole.user_id == user_id)
-        role_ids_result = await self.session.execute(user_roles_query)
-        role_ids = [row[0] for row in role_ids_result.fetchall()]
+        return capability_code in await self.get_user_capabilities(user_id)
+    
+    async def get_user_capabilities(self, user_id: uuid.UUID) -> FrozenSet[str]:
+        """
+        Get all capabilities for a user (direct + inherited from roles).
         
-        if not role_ids:
-            return False
+        Served from the capability cache; loaded from the database on a miss.
         
-        # Check if any role has the capability
-        role_cap_query = select(RoleCapability).where(
-            and_(
-                RoleCapability.role_id.in_(role_ids),
-                RoleCapability.capability_id == capability.id,
-            )
-        )
-        result = await self.session.execute(role_cap_query)
-        return result.scalar_one_or_none() is not None
+        Returns:
+            Frozen set of capability codes
+        """
+        return await self.cache.get(user_id, lambda: self._load_user_capabilities(user_id))
     
-    async def get_user_capabilities(self, user_id: uuid.UUID) -> Set[str]:
+    async def _load_user_capabilities(
+        self,
+        user_id: uuid.UUID,
+    ) -> Tuple[Set[str], Optional[datetime]]:
         """
-        Get all capabilities for a user (direct + inherited from roles).
+        Resolve the effective capability set from the database.
         
         Returns:
-            Set of capability codes
+            (capability codes, earliest expires_at among the direct grants)
         """
         capabilities = set()
         
         # Get direct capabilities
         direct_query = (
-            select(Capability.code)
+            select(Capability.code, UserCapability.expires_at)
             .join(UserCapability)
             .where(
                 and_(
@@ -125,11 +111,13 @@ class CapabilityService:
             )
         )
         direct_result = await self.session.execute(direct_query)
-        capabilities.update(row[0] for row in direct_result.fetchall())
+        expiries = []
+        for code, expires_at in direct_result.fetchall():
+            capabilities.add(code)
+            if expires_at is not None:
+                expiries.append(expires_at)
         
         # Get role-based capabilities
-        from backend.modules.auth.models import UserRole
-        
         role_query = (
             select(Capability.code)
             .join(RoleCapability)
@@ -139,7 +127,7 @@ class CapabilityService:
         role_result = await self.session.execute(role_query)
         capabilities.update(row[0] for row in role_result.fetchall())
         
-        return capabilities
+        return capabilities, min(expiries, default=None)
     
     async def grant_capability_to_user(
         self,
@@ -186,6 +174,7 @@ class CapabilityService:
             existing.granted_by = granted_by
             existing.reason = reason
             await self.session.flush()
+            self.cache.invalidate_on_commit(self.session, user_id)
             return existing
         
         # Create new
@@ -200,6 +189,7 @@ class CapabilityService:
         self.session.add(user_capability)
         await self.session.flush()
         await self.session.refresh(user_capability)
+        self.cache.invalidate_on_commit(self.session, user_id)
         
         return user_capability
     
@@ -228,6 +218,7 @@ class CapabilityService:
         if user_capability:
             user_capability.revoked_at = datetime.utcnow()
             await self.session.flush()
+            self.cache.invalidate_on_commit(self.session, user_id)
     
     async def grant_capability_to_role(
         self,
@@ -251,8 +242,9 @@ class CapabilityService:
             )
         )
         result = await self.session.execute(existing_query)
-        if result.scalar_one_or_none():
-            return result.scalar_one()
+        existing = result.scalar_one_or_none()
+        if existing:
+            return existing
         
         # Create new
         role_capability = RoleCapability(
@@ -264,6 +256,7 @@ class CapabilityService:
         self.session.add(role_capability)
         await self.session.flush()
         await self.session.refresh(role_capability)
+        self.cache.invalidate_roles_on_commit(self.session)
         
         return role_capability
     
@@ -292,6 +285,7 @@ class CapabilityService:
         if role_capability:
             await self.session.delete(role_capability)
             await self.session.flush()
+            self.cache.invalidate_roles_on_commit(self.session)
     
     async def _get_capability_by_code(self, code: str) -> Optional[Capability]:
         """Helper to get capability by code"""
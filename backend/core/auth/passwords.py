@@ -1,23 +1,104 @@
+"""
+Password / PIN hashing.
+
+bcrypt and pbkdf2 take tens to hundreds of milliseconds per call by
+design. From async code, use the *_async methods: they run on a dedicated
+thread pool (PASSWORD_HASH_WORKERS threads - both algorithms release the
+GIL) so login storms queue up behind each other instead of freezing the
+event loop for every other request and WebSocket on the worker.
+
+Rehash on upgrade: every supported scheme can be verified, the configured
+PASSWORD_SCHEME (and PASSWORD_HASH_ROUNDS, if set) is the target.
+verify_and_update_async() returns a replacement hash whenever the stored
+one uses another scheme or fewer rounds; callers persist it.
+"""
+
 from __future__ import annotations
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
 from passlib.context import CryptContext
 
 from backend.core.settings.config import settings
 
 
-def _context() -> CryptContext:
-    scheme = settings.PASSWORD_SCHEME.lower()
-    if scheme == "bcrypt":
-        return CryptContext(schemes=["bcrypt"], deprecated="auto")
-    return CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+_SCHEMES = ("bcrypt", "pbkdf2_sha256")
+
+
+def _context(scheme: Optional[str] = None) -> CryptContext:
+    scheme = (scheme or settings.PASSWORD_SCHEME).lower()
+    if scheme not in _SCHEMES:
+        scheme = "pbkdf2_sha256"
+    policy = {}
+    if settings.PASSWORD_HASH_ROUNDS:
+        # Hashes below the configured cost are flagged for rehash
+        policy[f"{scheme}__default_rounds"] = settings.PASSWORD_HASH_ROUNDS
+        policy[f"{scheme}__min_rounds"] = settings.PASSWORD_HASH_ROUNDS
+    # Default scheme first; the others stay verifiable but deprecated
+    schemes = [scheme] + [s for s in _SCHEMES if s != scheme]
+    return CryptContext(schemes=schemes, default=scheme, deprecated="auto", **policy)
+
+
+# ============================================================================
+# HASHING THREAD POOL
+# ============================================================================
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_hash_executor() -> ThreadPoolExecutor:
+    """Get the process-wide hashing pool (PASSWORD_HASH_WORKERS threads)."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            thread_name_prefix="password-hash",
+        )
+    return _executor
+
+
+def shutdown_hash_executor() -> None:
+    """Stop the hashing pool (application shutdown / tests)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
 
 
 class PasswordHasher:
-    def __init__(self) -> None:
-        self._ctx = _context()
+    def __init__(self, scheme: Optional[str] = None) -> None:
+        self._ctx = _context(scheme)
 
     def hash(self, password: str) -> str:
         return self._ctx.hash(password)
 
     def verify(self, password: str, hashed: str) -> bool:
         return self._ctx.verify(password, hashed)
+
+    def needs_update(self, hashed: str) -> bool:
+        return self._ctx.needs_update(hashed)
+
+    async def hash_async(self, password: str) -> str:
+        """hash() on the hashing pool."""
+        return await self._run(self._ctx.hash, password)
+
+    async def verify_async(self, password: str, hashed: str) -> bool:
+        """verify() on the hashing pool."""
+        return await self._run(self._ctx.verify, password, hashed)
+
+    async def verify_and_update_async(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify on the hashing pool and rehash if the stored hash is outdated.
+
+        Returns:
+            (valid, new_hash) - new_hash is None unless valid and the stored
+            hash should be replaced with it
+        """
+        return await self._run(self._ctx.verify_and_update, password, hashed)
+
+    @staticmethod
+    async def _run(func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_hash_executor(), func, *args)
@@ -0,0 +1,173 @@
+"""
+Authenticated Principal Cache
+
+AuthMiddleware needs the isolation fields of the caller (user_type,
+business_partner_id, organization_id, allowed_modules, is_active) on every
+request. Instead of a pool checkout + user SELECT per request, principals
+are cached in two tiers:
+
+1. In-process LRU (PRINCIPAL_CACHE_LOCAL_TTL_SECONDS, a few seconds)
+2. Redis (PRINCIPAL_CACHE_REDIS_TTL_SECONDS), shared by all workers
+
+Each user has a version stamp in Redis (core/auth/versioned_cache.py).
+invalidate() bumps it and deletes the cached principal; cache fills are
+written only if the version did not change while the user was being
+loaded, so a fill racing an invalidation can never re-cache stale data.
+Other processes' local entries expire within the local TTL.
+
+Invalidated from the session revocation paths (core/jwt/session.py) and
+user state changes (sub-user enable/disable).
+
+No secrets (password/PIN hashes) are cached.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, List, Optional
+from uuid import UUID
+
+import redis.asyncio as aioredis
+
+from backend.core.auth.versioned_cache import VersionedCache
+from backend.core.settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class AuthenticatedPrincipal:
+    """Read-only snapshot of a user, set as request.state.user."""
+    id: UUID
+    user_type: str
+    business_partner_id: Optional[UUID]
+    organization_id: Optional[UUID]
+    parent_user_id: Optional[UUID]
+    allowed_modules: Optional[List[str]]
+    email: Optional[str]
+    mobile_number: Optional[str]
+    full_name: Optional[str]
+    role: Optional[str]
+    is_active: bool
+    is_verified: bool
+    two_fa_enabled: bool
+
+    _UUID_FIELDS = ("id", "business_partner_id", "organization_id", "parent_user_id")
+
+    @classmethod
+    def from_user(cls, user: Any) -> "AuthenticatedPrincipal":
+        return cls(
+            id=user.id,
+            user_type=user.user_type,
+            business_partner_id=user.business_partner_id,
+            organization_id=user.organization_id,
+            parent_user_id=getattr(user, "parent_user_id", None),
+            allowed_modules=list(user.allowed_modules) if user.allowed_modules is not None else None,
+            email=user.email,
+            mobile_number=getattr(user, "mobile_number", None),
+            full_name=user.full_name,
+            role=getattr(user, "role", None),
+            is_active=bool(user.is_active),
+            is_verified=bool(getattr(user, "is_verified", False)),
+            two_fa_enabled=bool(getattr(user, "two_fa_enabled", False)),
+        )
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        for field in self._UUID_FIELDS:
+            if data[field] is not None:
+                data[field] = str(data[field])
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str) -> "AuthenticatedPrincipal":
+        data = json.loads(raw)
+        for field in cls._UUID_FIELDS:
+            if data.get(field) is not None:
+                data[field] = UUID(data[field])
+        return cls(**data)
+
+
+class PrincipalCache(VersionedCache[AuthenticatedPrincipal]):
+    """Two-tier (local LRU + Redis) cache of AuthenticatedPrincipals."""
+
+    KEY_PREFIX = "auth:principal"
+    CACHE_NAME = "Principal"
+
+    async def get(
+        self,
+        user_id: str,
+        loader: Callable[[], Awaitable[Optional[Any]]],
+    ) -> Optional[AuthenticatedPrincipal]:
+        """
+        Get the principal for user_id, calling loader() (-> User | None) on a miss.
+
+        Args:
+            user_id: Token subject
+            loader: Loads the User from the database
+
+        Returns:
+            AuthenticatedPrincipal, or None if the user does not exist
+        """
+        user_id = str(user_id)
+        cached = self._local_get(user_id, time.monotonic())
+        if cached is not None:
+            return cached
+
+        data_key, version_key = self._keys(user_id)
+        version = "0"
+        if self.redis is not None:
+            try:
+                raw, stored_version = await self.redis.mget(data_key, version_key)
+                version = self._text(stored_version) or "0"
+                if raw is not None:
+                    principal = AuthenticatedPrincipal.from_json(self._text(raw))
+                    self._remember(user_id, principal)
+                    self.metrics["redis_hits"] += 1
+                    return principal
+            except Exception as e:
+                # Redis down: behave like no cache
+                self.metrics["redis_errors"] += 1
+                logger.warning(f"Principal cache read failed: {e}")
+
+        self.metrics["misses"] += 1
+        user = await loader()
+        if user is None:
+            return None
+
+        principal = AuthenticatedPrincipal.from_user(user)
+        self._remember(user_id, principal)
+        await self._fill_redis([data_key, version_key], [version], principal.to_json(), self.redis_ttl)
+        return principal
+
+    def _remember(self, user_id: str, principal: AuthenticatedPrincipal) -> None:
+        self._remember_local(user_id, principal, time.monotonic() + self.local_ttl)
+
+
+# ============================================================================
+# PROCESS-WIDE CACHE
+# ============================================================================
+
+_principal_cache: Optional[PrincipalCache] = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get the process-wide principal cache (Redis at settings.REDIS_URL)."""
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache(
+            redis=aioredis.from_url(settings.REDIS_URL, decode_responses=True),
+            local_ttl=settings.PRINCIPAL_CACHE_LOCAL_TTL_SECONDS,
+            local_size=settings.PRINCIPAL_CACHE_LOCAL_SIZE,
+            redis_ttl=settings.PRINCIPAL_CACHE_REDIS_TTL_SECONDS,
+        )
+    return _principal_cache
+
+
+def reset_principal_cache() -> None:
+    """Drop the process-wide cache (tests)."""
+    global _principal_cache
+    _principal_cache = None
@@ -0,0 +1,137 @@
+"""
+Version-Stamped Two-Tier Cache
+
+Shared by the per-user auth caches (core/auth/principal_cache.py,
+core/auth/capabilities/cache.py). Values are cached in two tiers:
+
+1. In-process LRU, each entry with its own deadline
+2. Redis, shared by all workers
+
+Every cached key has a version stamp in Redis. invalidate() bumps it and
+deletes the cached value; fills run a script that writes only if all
+version stamps read before loading are unchanged, so a fill racing an
+invalidation can never re-cache stale data. Other processes' local
+entries expire on their deadline.
+
+Subclasses implement get() (what to read, how to load and encode) on top
+of _local_get / _remember_local / _fill_redis.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, List, Optional, Tuple, TypeVar
+
+import redis.asyncio as aioredis
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+V = TypeVar("V")
+
+
+class VersionedCache(Generic[V]):
+    """Local LRU + Redis cache invalidated through per-key version stamps."""
+
+    KEY_PREFIX = "cache"
+    CACHE_NAME = "Versioned"  # Log messages: "<CACHE_NAME> cache ... failed"
+
+    # KEYS = [data, version stamp...], ARGV = [expected version..., payload, ttl]:
+    # SET the payload only if every stamp is still the one read before loading
+    _FILL_SCRIPT = """
+    for i = 2, #KEYS do
+        if (redis.call('GET', KEYS[i]) or '0') ~= ARGV[i - 1] then return 0 end
+    end
+    redis.call('SET', KEYS[1], ARGV[#KEYS], 'EX', ARGV[#KEYS + 1])
+    return 1
+    """
+
+    def __init__(
+        self,
+        redis: Optional[aioredis.Redis] = None,
+        local_ttl: float = 5.0,
+        local_size: int = 10000,
+        redis_ttl: int = 300,
+    ):
+        self.redis = redis
+        self.local_ttl = local_ttl
+        self.local_size = local_size
+        self.redis_ttl = redis_ttl
+        self._local: "OrderedDict[str, Tuple[float, V]]" = OrderedDict()
+        self._fill = redis.register_script(self._FILL_SCRIPT) if redis is not None else None
+        self.metrics = {"local_hits": 0, "redis_hits": 0, "misses": 0, "invalidations": 0, "redis_errors": 0}
+
+    def _keys(self, key: str) -> Tuple[str, str]:
+        """(data key, version stamp key) in Redis."""
+        return f"{self.KEY_PREFIX}:{key}", f"{self.KEY_PREFIX}:version:{key}"
+
+    def _local_get(self, key: str, now: float) -> Optional[V]:
+        cached = self._local.get(key)
+        if cached is None or cached[0] <= now:
+            return None
+        self._local.move_to_end(key)
+        self.metrics["local_hits"] += 1
+        return cached[1]
+
+    def _remember_local(self, key: str, value: V, deadline: float) -> None:
+        self._local[key] = (deadline, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.local_size:
+            self._local.popitem(last=False)
+
+    async def _fill_redis(self, keys: List[str], versions: List[str], payload: str, ttl: int) -> None:
+        """Store payload unless one of the version stamps changed (best-effort)."""
+        if self._fill is None:
+            return
+        try:
+            await self._fill(keys=keys, args=[*versions, payload, ttl])
+        except Exception as e:
+            self.metrics["redis_errors"] += 1
+            logger.warning(f"{self.CACHE_NAME} cache fill failed: {e}")
+
+    async def invalidate(self, key: Any) -> None:
+        """Drop the cached value everywhere (bumps the version stamp)."""
+        key = str(key)
+        self._local.pop(key, None)
+        self.metrics["invalidations"] += 1
+        if self.redis is None:
+            return
+
+        data_key, version_key = self._keys(key)
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.incr(version_key)
+                pipe.delete(data_key)
+                await pipe.execute()
+        except Exception as e:
+            self.metrics["redis_errors"] += 1
+            logger.error(f"{self.CACHE_NAME} cache invalidation failed for {key}: {e}")
+
+    def invalidate_on_commit(self, db: Any, key: Any) -> None:
+        """
+        Invalidate after the session commits (changes not yet visible).
+
+        The local entry is dropped immediately; Redis is invalidated once the
+        new state is committed so no request can re-cache the old row.
+        """
+        self._local.pop(str(key), None)
+        self._after_commit(db, lambda: self.invalidate(key))
+
+    @staticmethod
+    def _after_commit(db: Any, invalidation: Callable[[], Awaitable[None]]) -> None:
+        loop = asyncio.get_running_loop()
+
+        def _on_commit(_session) -> None:
+            loop.create_task(invalidation())
+
+        event.listen(db.sync_session, "after_commit", _on_commit, once=True)
+
+    def clear_local(self) -> None:
+        self._local.clear()
+
+    @staticmethod
+    def _text(value: Any) -> Optional[str]:
+        """Redis clients may or may not be created with decode_responses."""
+        return value.decode() if isinstance(value, bytes) else value
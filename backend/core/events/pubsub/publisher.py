@@ -6,6 +6,7 @@ Publishes domain events to Google Cloud Pub/Sub topics.
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
@@ -13,7 +14,7 @@ from typing import Any, Dict, List, Optional
 
 from google.cloud import pubsub_v1
 from google.cloud.pubsub_v1 import PublisherClient
-from google.cloud.pubsub_v1.types import BatchSettings
+from google.cloud.pubsub_v1.types import BatchSettings, PublisherOptions
 
 from backend.core.events.pubsub.schemas import DomainEvent, EventType
 
@@ -54,7 +55,11 @@ class PubSubPublisher:
                 max_messages=max_batch_size,
             ) if enable_batching else None
             
-            self.client = PublisherClient(batch_settings=batch_settings)
+            # Ordering keys (aggregate_id) are only honoured with ordering enabled
+            self.client = PublisherClient(
+                batch_settings=batch_settings,
+                publisher_options=PublisherOptions(enable_message_ordering=True),
+            )
         
         # Topic cache
         self._topic_paths: Dict[str, str] = {}
@@ -125,7 +130,8 @@ class PubSubPublisher:
                 priority=event.priority.value,
             )
             
-            message_id = future.result()
+            # Resolved by the client's batch thread; don't block the loop
+            message_id = await asyncio.wrap_future(future)
             
             logger.info(
                 f"Published event {event.id} (type={event.event_type.value}) "
@@ -136,6 +142,10 @@ class PubSubPublisher:
         
         except Exception as e:
             logger.error(f"Failed to publish event {event.id}: {e}")
+            if ordering_key:
+                # A failed ordered publish pauses the key until resumed;
+                # the outbox retries this event before any later one
+                self.client.resume_publish(topic_path, ordering_key)
             raise
     
     async def publish_batch(
@@ -0,0 +1,5 @@
+"""Streaming Export Module"""
+
+from backend.core.export.streaming import XLSX_MEDIA_TYPE, stream_csv, stream_xlsx
+
+__all__ = ["XLSX_MEDIA_TYPE", "stream_csv", "stream_xlsx"]
@@ -24,6 +24,7 @@ import redis.asyncio as redis
 
 from backend.core.jwt.device import DeviceFingerprint
 from backend.core.auth.jwt import create_token, decode_token
+from backend.core.auth.principal_cache import get_principal_cache
 from backend.core.settings.config import settings
 
 
@@ -328,6 +329,7 @@ class SessionService:
         
         # Remove from cache
         await self.redis.delete(f"session:{session.id}")
+        await get_principal_cache().invalidate(user_id)
     
     async def revoke_all_sessions(self, user_id: UUID, except_session_id: Optional[UUID] = None):
         """
@@ -359,6 +361,7 @@ class SessionService:
             await self.redis.delete(f"session:{session.id}")
         
         await self.db.commit()
+        await get_principal_cache().invalidate(user_id)
     
     async def cleanup_expired_sessions(self):
         """
@@ -387,6 +390,9 @@ class SessionService:
         
         await self.db.commit()
         
+        for user_id in {session.user_id for session in expired_sessions}:
+            await get_principal_cache().invalidate(user_id)
+        
         return len(expired_sessions)
     
     # Private helper methods
@@ -1,7 +1,7 @@
 """Outbox Pattern Module"""
 
-from backend.core.outbox.models import EventOutbox, OutboxStatus
+from backend.core.outbox.models import EventOutbox, OutboxPartition, OutboxStatus
 from backend.core.outbox.repository import OutboxRepository
 from backend.core.outbox.worker import OutboxWorker
 
-__all__ = ["EventOutbox", "OutboxStatus", "OutboxRepository", "OutboxWorker"]
+__all__ = ["EventOutbox", "OutboxPartition", "OutboxStatus", "OutboxRepository", "OutboxWorker"]
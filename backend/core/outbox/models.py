@@ -97,3 +97,23 @@ class EventOutbox(Base):
             f"<EventOutbox(id={self.id}, event_type={self.event_type}, "
             f"status={self.status}, retry_count={self.retry_count})>"
         )
+
+
+class OutboxPartition(Base):
+    """
+    Lease rows for partitioned outbox draining.
+    
+    Events are assigned to partition (hashtext(aggregate_id) % N). A worker
+    claims some partitions per batch with SELECT ... FOR UPDATE SKIP LOCKED;
+    the row locks last until the batch commits, so every aggregate is
+    drained by exactly one worker at a time (per-aggregate order preserved)
+    while different partitions are drained in parallel by other processes.
+    """
+    
+    __tablename__ = "event_outbox_partitions"
+    
+    partition_no = Column(Integer, primary_key=True, autoincrement=False)
+    last_claimed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    def __repr__(self):
+        return f"<OutboxPartition(partition_no={self.partition_no}, last_claimed_at={self.last_claimed_at})>"
@@ -8,12 +8,27 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence
 
-from sqlalchemy import select, update
+from sqlalchemy import String, and_, case, cast, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.core.outbox.models import EventOutbox, OutboxStatus
+from backend.core.outbox.models import EventOutbox, OutboxPartition, OutboxStatus
+
+
+# Postgres channel notified (on commit) for every new outbox event.
+# OutboxWorker LISTENs on it instead of sleeping a full poll interval.
+OUTBOX_NOTIFY_CHANNEL = "event_outbox"
+
+# Default number of aggregate hash partitions (see OutboxPartition)
+DEFAULT_PARTITION_COUNT = 16
+
+
+def partition_of(partition_count: int):
+    """SQL expression: outbox partition of EventOutbox.aggregate_id."""
+    # Mask the sign bit rather than abs(): abs(-2^31) overflows int4
+    return (func.hashtext(cast(EventOutbox.aggregate_id, String)).op("&")(0x7FFFFFFF)) % partition_count
 
 
 class OutboxRepository:
@@ -84,24 +99,93 @@ class OutboxRepository:
         self.session.add(event)
         await self.session.flush()
         await self.session.refresh(event)
+        await self._notify_workers()
         
         return event
     
+    async def add_events_bulk(self, events: Sequence[dict]) -> int:
+        """
+        Add many events in ONE multi-row INSERT.
+        
+        Same transactional contract as add_event(). Events whose
+        idempotency_key already exists are skipped (ON CONFLICT DO NOTHING),
+        so replaying a batch is safe.
+        
+        Args:
+            events: Dicts with the add_event() keyword arguments
+        
+        Returns:
+            Number of events inserted
+        """
+        if not events:
+            return 0
+        
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "aggregate_id": event["aggregate_id"],
+                "aggregate_type": event["aggregate_type"],
+                "event_type": event["event_type"],
+                "payload": event["payload"],
+                "event_metadata": event.get("metadata"),
+                "topic_name": event["topic_name"],
+                "idempotency_key": event.get("idempotency_key"),
+                "version": event.get("version", 1),
+                "status": OutboxStatus.PENDING,
+                "retry_count": 0,
+                "max_retries": 5,
+            }
+            for event in events
+        ]
+        stmt = (
+            pg_insert(EventOutbox)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=[EventOutbox.idempotency_key])
+            .returning(EventOutbox.id)
+        )
+        result = await self.session.execute(stmt)
+        inserted = len(result.fetchall())
+        if inserted:
+            await self._notify_workers()
+        return inserted
+    
+    async def _notify_workers(self) -> None:
+        """
+        NOTIFY listening outbox workers.
+        
+        Delivered only when the surrounding transaction commits (so workers
+        never wake for rolled-back events), and Postgres collapses identical
+        notifications within one transaction into a single wake-up.
+        """
+        bind = self.session.bind
+        if bind is None or bind.dialect.name != "postgresql":
+            return
+        await self.session.execute(select(func.pg_notify(OUTBOX_NOTIFY_CHANNEL, "")))
+    
     async def get_pending_events(
         self,
         limit: int = 100,
         lock: bool = True,
+        partitions: Optional[Sequence[int]] = None,
+        partition_count: int = DEFAULT_PARTITION_COUNT,
     ) -> List[EventOutbox]:
         """
         Get pending events ready for publishing.
         
+        An event is only returned once every older PENDING event of the same
+        aggregate is gone (published or permanently failed), so a retry
+        backoff holds back the rest of its aggregate instead of reordering it.
+        
         Args:
             limit: Maximum number of events to fetch
             lock: Whether to lock rows for update (prevents concurrent processing)
+            partitions: Only events of these aggregate partitions (see claim_partitions)
+            partition_count: Total partitions the hash is taken modulo
         
         Returns:
-            List of pending events
+            List of pending events (oldest first)
         """
+        earlier = EventOutbox.__table__.alias("earlier")
         query = (
             select(EventOutbox)
             .where(EventOutbox.status == OutboxStatus.PENDING)
@@ -109,16 +193,72 @@ class OutboxRepository:
                 (EventOutbox.next_retry_at.is_(None)) |
                 (EventOutbox.next_retry_at <= datetime.utcnow())
             )
+            .where(
+                ~select(earlier.c.id)
+                .where(
+                    and_(
+                        earlier.c.aggregate_id == EventOutbox.aggregate_id,
+                        earlier.c.status == OutboxStatus.PENDING,
+                        earlier.c.created_at < EventOutbox.created_at,
+                    )
+                )
+                .exists()
+            )
             .order_by(EventOutbox.created_at.asc())
             .limit(limit)
         )
         
+        if partitions is not None:
+            query = query.where(partition_of(partition_count).in_(list(partitions)))
+        
         if lock:
             query = query.with_for_update(skip_locked=True)
         
         result = await self.session.execute(query)
         return list(result.scalars().all())
     
+    async def ensure_partitions(self, partition_count: int) -> None:
+        """Create missing partition lease rows (idempotent, run on worker start)."""
+        await self.session.execute(
+            pg_insert(OutboxPartition)
+            .values([{"partition_no": n} for n in range(partition_count)])
+            .on_conflict_do_nothing(index_elements=[OutboxPartition.partition_no])
+        )
+        await self.session.flush()
+    
+    async def claim_partitions(
+        self,
+        partition_count: int = DEFAULT_PARTITION_COUNT,
+        max_partitions: int = 4,
+    ) -> List[int]:
+        """
+        Claim up to max_partitions aggregate partitions for this transaction.
+        
+        Partitions held by other workers are skipped (SKIP LOCKED); the
+        least recently drained ones are claimed first so no partition starves.
+        Claims are released when the transaction commits or rolls back.
+        
+        Returns:
+            Claimed partition numbers (empty if all are busy)
+        """
+        result = await self.session.execute(
+            select(OutboxPartition.partition_no)
+            .where(OutboxPartition.partition_no < partition_count)
+            .order_by(OutboxPartition.last_claimed_at.asc().nulls_first())
+            .limit(max_partitions)
+            .with_for_update(skip_locked=True)
+        )
+        claimed = list(result.scalars().all())
+        
+        if claimed:
+            await self.session.execute(
+                update(OutboxPartition)
+                .where(OutboxPartition.partition_no.in_(claimed))
+                .values(last_claimed_at=func.now())
+                .execution_options(synchronize_session=False)
+            )
+        return claimed
+    
     async def mark_as_processing(self, event_id: uuid.UUID) -> None:
         """Mark an event as currently being processed"""
         await self.session.execute(
@@ -152,6 +292,68 @@ class OutboxRepository:
         )
         await self.session.flush()
     
+    async def mark_published_bulk(self, message_ids: Dict[uuid.UUID, str]) -> None:
+        """
+        Mark a batch of events as published with one UPDATE.
+        
+        Args:
+            message_ids: outbox event ID -> Pub/Sub message ID
+        """
+        if not message_ids:
+            return
+        await self.session.execute(
+            update(EventOutbox)
+            .where(EventOutbox.id.in_(list(message_ids)))
+            .values(
+                status=OutboxStatus.PUBLISHED,
+                published_at=datetime.utcnow(),
+                message_id=case(message_ids, value=EventOutbox.id),
+                last_error=None,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.flush()
+    
+    async def mark_failed_bulk(self, errors: Dict[uuid.UUID, str]) -> None:
+        """
+        Record a failed publish attempt for a batch of events with one UPDATE.
+        
+        Same retry policy as mark_as_failed(schedule_retry=True): back to
+        PENDING with exponential backoff (max 1 hour), FAILED once
+        max_retries is reached.
+        
+        Args:
+            errors: outbox event ID -> error message
+        """
+        if not errors:
+            return
+        
+        retry_count = EventOutbox.retry_count + 1
+        exhausted = retry_count >= EventOutbox.max_retries
+        backoff_seconds = func.least(func.power(2, retry_count) * 60, 3600)
+        
+        await self.session.execute(
+            update(EventOutbox)
+            .where(EventOutbox.id.in_(list(errors)))
+            .values(
+                retry_count=retry_count,
+                last_error=case(
+                    {event_id: message[:1000] for event_id, message in errors.items()},
+                    value=EventOutbox.id,
+                ),
+                status=case(
+                    (exhausted, OutboxStatus.FAILED.name),
+                    else_=OutboxStatus.PENDING.name,
+                ).cast(EventOutbox.status.type),
+                next_retry_at=case(
+                    (exhausted, None),
+                    else_=func.now() + func.make_interval(0, 0, 0, 0, 0, 0, backoff_seconds),
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.flush()
+    
     async def mark_as_failed(
         self,
         event_id: uuid.UUID,
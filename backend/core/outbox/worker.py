@@ -1,21 +1,27 @@
 """
 Outbox Worker
 
-Background worker that polls the outbox table and publishes events to GCP Pub/Sub.
-Runs as a separate Cloud Run service with scheduled Cloud Run Jobs.
+Background worker that drains the outbox table and publishes events to GCP Pub/Sub.
+Runs as a separate Cloud Run service (woken by Postgres NOTIFY) or as
+scheduled Cloud Run Jobs.
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
-from typing import Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
 from google.cloud import pubsub_v1
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.core.outbox.models import EventOutbox
-from backend.core.outbox.repository import OutboxRepository
+from backend.core.outbox.repository import (
+    DEFAULT_PARTITION_COUNT,
+    OUTBOX_NOTIFY_CHANNEL,
+    OutboxRepository,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -30,10 +36,18 @@ class OutboxWorker:
     3. Cloud Functions (triggered by Cloud Scheduler)
     
     The worker:
-    1. Fetches pending events from outbox
-    2. Publishes each event to configured Pub/Sub topic
-    3. Updates outbox status (PUBLISHED or FAILED)
+    1. Claims some aggregate hash partitions and fetches their pending
+       events (both FOR UPDATE SKIP LOCKED), so any number of worker
+       processes drain disjoint partitions in parallel
+    2. Publishes the batch concurrently across aggregates and in order
+       within each aggregate (futures awaited without blocking the loop)
+    3. Updates outbox status with one bulk UPDATE per outcome
     4. Retries failed events with exponential backoff
+    
+    run_forever() wakes on NOTIFY event_outbox (sent by
+    OutboxRepository.add_event on commit) and drains back-to-back while
+    batches come back full or partitions remain unvisited since the wake-up
+    (see drain()); poll_interval is only a safety net.
     """
     
     def __init__(
@@ -41,14 +55,25 @@ class OutboxWorker:
         session: AsyncSession,
         project_id: str,
         batch_size: int = 100,
+        publish_timeout: float = 30.0,
+        publisher: Optional[Any] = None,
+        partition_count: int = DEFAULT_PARTITION_COUNT,
+        max_partitions: int = 4,
     ):
         self.session = session
         self.project_id = project_id
         self.batch_size = batch_size
+        self.publish_timeout = publish_timeout
+        self.partition_count = partition_count
+        self.max_partitions = max_partitions
         self.repository = OutboxRepository(session)
         
         # Initialize Pub/Sub publisher
-        self.publisher = pubsub_v1.PublisherClient()
+        self.publisher = publisher or pubsub_v1.PublisherClient()
+        
+        self._wakeup = asyncio.Event()
+        self._listen_connection = None
+        self.last_claimed_partitions: List[int] = []
     
     async def process_batch(self) -> int:
         """
@@ -57,50 +82,88 @@ class OutboxWorker:
         Returns:
             Number of events processed
         """
-        # Fetch pending events (locks rows to prevent concurrent processing)
+        # Partition and row locks are held until commit, so no separate
+        # PROCESSING write is needed
+        self.last_claimed_partitions = []
+        partitions = await self.repository.claim_partitions(
+            partition_count=self.partition_count,
+            max_partitions=self.max_partitions,
+        )
+        self.last_claimed_partitions = partitions
+        if not partitions:
+            logger.debug("All outbox partitions are claimed by other workers")
+            await self.session.commit()
+            return 0
+        
         events = await self.repository.get_pending_events(
             limit=self.batch_size,
             lock=True,
+            partitions=partitions,
+            partition_count=self.partition_count,
         )
         
         if not events:
-            logger.info("No pending events to process")
+            logger.debug(f"No pending events in partitions {partitions}")
+            await self.session.commit()
             return 0
         
-        logger.info(f"Processing {len(events)} pending events")
+        logger.info(f"Processing {len(events)} pending events (partitions {partitions})")
         
-        processed_count = 0
-        for event in events:
-            try:
-                await self._process_event(event)
-                processed_count += 1
-            except Exception as e:
-                logger.error(
-                    f"Error processing event {event.id}: {e}",
-                    exc_info=True,
-                )
-                await self.repository.mark_as_failed(
-                    event.id,
-                    error_message=str(e),
-                    schedule_retry=True,
-                )
+        published, failed = await publish_in_aggregate_order(events, self._process_event)
+        
+        await self.repository.mark_published_bulk(published)
+        await self.repository.mark_failed_bulk(failed)
         
         # Commit all status updates
         await self.session.commit()
         
-        logger.info(f"Successfully processed {processed_count}/{len(events)} events")
-        return processed_count
+        logger.info(f"Successfully processed {len(published)}/{len(events)} events")
+        return len(published)
+    
+    async def drain(self) -> int:
+        """
+        Process batches until every partition has been visited once.
+        
+        Each batch only claims max_partitions of the partition_count
+        partitions, so a single batch after a wake-up would leave events in
+        the unclaimed partitions waiting for the next poll. Keeps going while
+        batches come back full or new partitions are claimed; stops once all
+        partitions were visited or the rest are held by other workers.
+        
+        Returns:
+            Number of events processed
+        """
+        total = 0
+        visited: Set[int] = set()
+        while True:
+            processed = 0
+            try:
+                processed = await self.process_batch()
+            except Exception as e:
+                logger.error(f"Error in worker loop: {e}", exc_info=True)
+                await self.session.rollback()
+            total += processed
+            
+            newly_visited = set(self.last_claimed_partitions) - visited
+            visited |= newly_visited
+            
+            # Full batch: there is probably more, don't wait
+            if processed >= self.batch_size:
+                continue
+            if newly_visited and len(visited) < self.partition_count:
+                continue
+            return total
     
-    async def _process_event(self, event: EventOutbox) -> None:
+    async def _process_event(self, event: EventOutbox) -> Tuple[Optional[str], Optional[str]]:
         """
-        Process a single event by publishing to Pub/Sub.
+        Publish a single event to Pub/Sub.
         
         Args:
             event: Outbox event to process
-        """
-        # Mark as processing
-        await self.repository.mark_as_processing(event.id)
         
+        Returns:
+            (message_id, None) on success, (None, error) on failure
+        """
         # Build Pub/Sub topic path
         topic_path = self.publisher.topic_path(self.project_id, event.topic_name)
         
@@ -126,32 +189,77 @@ class OutboxWorker:
         if event.idempotency_key:
             attributes["idempotency_key"] = event.idempotency_key
         
-        # Publish to Pub/Sub (synchronous call)
         try:
-            import json
+            # publish() only enqueues into the client's batch; the RPC runs on
+            # the client's threads and resolves the returned future
             future = self.publisher.publish(
                 topic_path,
                 data=json.dumps(message_data).encode("utf-8"),
                 **attributes,
             )
-            
-            # Wait for publish to complete
-            message_id = future.result(timeout=30)
-            
-            # Mark as published
-            await self.repository.mark_as_published(event.id, message_id)
-            
-            logger.info(
-                f"Published event {event.id} to {event.topic_name} "
-                f"(message_id: {message_id})"
+            message_id = await asyncio.wait_for(
+                _await_future(future),
+                timeout=self.publish_timeout,
             )
-        
         except Exception as e:
             logger.error(
-                f"Failed to publish event {event.id} to {event.topic_name}: {e}",
-                exc_info=True,
+                f"Failed to publish event {event.id} to {event.topic_name}: {e!r}",
             )
-            raise  # Re-raise to trigger retry logic
+            return None, str(e) or type(e).__name__
+        
+        logger.debug(
+            f"Published event {event.id} to {event.topic_name} "
+            f"(message_id: {message_id})"
+        )
+        return message_id, None
+    
+    # ========================================================================
+    # WAKE-UPS (LISTEN/NOTIFY)
+    # ========================================================================
+    
+    async def _listen(self) -> bool:
+        """
+        LISTEN for new-event notifications on a dedicated connection.
+        
+        Returns:
+            False if the driver has no LISTEN support (worker keeps polling)
+        """
+        bind = self.session.bind
+        if bind is None or bind.dialect.name != "postgresql":
+            return False
+        
+        try:
+            connection = await bind.connect()
+            raw = await connection.get_raw_connection()
+            driver = getattr(raw, "driver_connection", None)
+            if not hasattr(driver, "add_listener"):
+                await connection.close()
+                return False
+            await driver.add_listener(OUTBOX_NOTIFY_CHANNEL, self._on_notify)
+        except Exception as e:
+            logger.warning(f"Outbox LISTEN unavailable, polling only: {e}")
+            return False
+        
+        self._listen_connection = connection
+        return True
+    
+    def _on_notify(self, *args) -> None:
+        self._wakeup.set()
+    
+    async def _unlisten(self) -> None:
+        if self._listen_connection is None:
+            return
+        try:
+            await self._listen_connection.close()
+        finally:
+            self._listen_connection = None
+    
+    async def _wait_for_events(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
     
     async def run_forever(self, poll_interval: int = 60) -> None:
         """
@@ -160,18 +268,23 @@ class OutboxWorker:
         This is useful for Cloud Run services that run continuously.
         
         Args:
-            poll_interval: Seconds to wait between polling cycles
+            poll_interval: Max seconds between polls when no NOTIFY arrives
+                (retry backoffs expiring, LISTEN connection unavailable)
         """
-        logger.info(f"Starting outbox worker (poll_interval={poll_interval}s)")
+        await self.repository.ensure_partitions(self.partition_count)
+        await self.session.commit()
+        listening = await self._listen()
+        logger.info(
+            f"Starting outbox worker (poll_interval={poll_interval}s, "
+            f"listen={'on' if listening else 'off'})"
+        )
         
-        while True:
-            try:
-                await self.process_batch()
-            except Exception as e:
-                logger.error(f"Error in worker loop: {e}", exc_info=True)
-            
-            # Wait before next poll
-            await asyncio.sleep(poll_interval)
+        try:
+            while True:
+                await self.drain()
+                await self._wait_for_events(poll_interval)
+        finally:
+            await self._unlisten()
     
     async def cleanup_old_events(self, days: int = 30) -> int:
         """
@@ -223,7 +336,8 @@ async def run_outbox_worker_service(
     """
     Entry point for Cloud Run Service.
     
-    Runs continuously, polling every poll_interval seconds.
+    Runs continuously, woken by NOTIFY on new events; poll_interval is
+    only the fallback for retries and lost connections.
     
     Usage in Cloud Run Service:
         from backend.core.outbox.worker import run_outbox_worker_service
@@ -239,3 +353,66 @@ async def run_outbox_worker_service(
     """
     worker = OutboxWorker(session, project_id)
     await worker.run_forever(poll_interval=poll_interval)
+
+
+async def publish_in_aggregate_order(
+    events: Sequence[EventOutbox],
+    publish: Callable[[EventOutbox], Awaitable[Tuple[Optional[str], Optional[str]]]],
+) -> Tuple[Dict[Any, str], Dict[Any, str]]:
+    """
+    Publish events concurrently across aggregates, sequentially within one.
+    
+    Once an event fails, the rest of its aggregate is left PENDING (and
+    held back by get_pending_events) so subscribers never see them out of
+    order.
+    
+    Args:
+        events: Pending events, oldest first
+        publish: Coroutine returning (message_id, None) or (None, error)
+    
+    Returns:
+        (published event ID -> message ID, failed event ID -> error)
+    """
+    chains: Dict[Any, List[EventOutbox]] = {}
+    for event in events:
+        chains.setdefault(event.aggregate_id, []).append(event)
+    
+    published: Dict[Any, str] = {}
+    failed: Dict[Any, str] = {}
+    
+    async def drain(chain: List[EventOutbox]) -> None:
+        for event in chain:
+            message_id, error = await publish(event)
+            if error is not None:
+                failed[event.id] = error
+                return
+            published[event.id] = message_id
+    
+    await asyncio.gather(*(drain(chain) for chain in chains.values()))
+    return published, failed
+
+
+async def _await_future(future) -> Any:
+    """
+    Await a concurrent.futures-style future (Pub/Sub publish) without
+    blocking the event loop on .result().
+    """
+    loop = asyncio.get_running_loop()
+    waiter = loop.create_future()
+    
+    def _resolve(done) -> None:
+        if waiter.done():
+            return
+        exception = done.exception()
+        if exception is not None:
+            waiter.set_exception(exception)
+        else:
+            waiter.set_result(done.result())
+    
+    def _on_done(done) -> None:
+        # Runs on the publisher's thread; the loop may be gone after a timeout
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(_resolve, done)
+    
+    future.add_done_callback(_on_done)
+    return await waiter
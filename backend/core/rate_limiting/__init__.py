@@ -7,13 +7,14 @@ Supports burst protection, AI cost tracking, and tiered limits.
 
 from .limiter import AdvancedRateLimiter, RateLimitConfig, RateLimitTier
 from .middleware import RateLimitMiddleware
-from .storage import RateLimitStorage, RedisRateLimitStorage
+from .storage import RateLimitRule, RateLimitStorage, RedisRateLimitStorage
 
 __all__ = [
     "AdvancedRateLimiter",
     "RateLimitConfig",
     "RateLimitTier",
     "RateLimitMiddleware",
+    "RateLimitRule",
     "RateLimitStorage",
     "RedisRateLimitStorage",
 ]
@@ -3,16 +3,23 @@ Advanced Rate Limiter
 
 Multi-tier rate limiting with per-user, per-endpoint, per-IP limits.
 Supports burst protection, cost tracking, and tiered limits.
+
+All windows of a request are checked with one storage call
+(RateLimitStorage.check_rules - a single Lua/GCRA script on Redis).
+Optionally, tokens are leased from Redis in small batches and spent
+in-process, so hot keys far from their limits skip Redis entirely.
 """
 
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from enum import Enum
-from typing import Optional
+from typing import List, Optional, Tuple
 
-from backend.core.rate_limiting.storage import RateLimitStorage
+from backend.core.rate_limiting.storage import RateLimitRule, RateLimitStorage, RuleCheck
 
 logger = logging.getLogger(__name__)
 
@@ -104,6 +111,15 @@ class RateLimitResult:
     limit_type: Optional[str] = None  # Which limit was hit (minute/hour/day/burst)
 
 
+@dataclass
+class _Lease:
+    """Tokens already consumed in storage, spendable in-process."""
+    tokens: int
+    expires_at: float
+    next_size: int
+    result: Optional[RateLimitResult] = None
+
+
 class AdvancedRateLimiter:
     """
     Advanced multi-tier rate limiter.
@@ -114,7 +130,14 @@ class AdvancedRateLimiter:
     - Per-IP limits (DDoS protection)
     - Burst protection
     - AI cost tracking
-    - Sliding window algorithm
+    - All windows checked in one storage round trip (GCRA on Redis)
+    - Optional local token leases (local_lease_size > 1)
+    
+    Local leases: when a request is admitted, up to local_lease_size tokens
+    are consumed in storage at once and the surplus is spent in-process for
+    local_lease_ttl seconds. The lease shrinks to a quarter of the smallest
+    remaining quota, so near the limit every request goes to Redis and
+    limits are never exceeded (unspent leased tokens are simply forfeited).
     
     Usage:
         limiter = AdvancedRateLimiter(redis_storage)
@@ -128,8 +151,18 @@ class AdvancedRateLimiter:
             raise HTTPException(429, headers={"Retry-After": str(result.retry_after)})
     """
     
-    def __init__(self, storage: RateLimitStorage):
+    def __init__(
+        self,
+        storage: RateLimitStorage,
+        local_lease_size: int = 0,
+        local_lease_ttl: float = 1.0,
+        max_local_leases: int = 10000,
+    ):
         self.storage = storage
+        self.local_lease_size = local_lease_size
+        self.local_lease_ttl = local_lease_ttl
+        self.max_local_leases = max_local_leases
+        self._leases: "OrderedDict[Tuple[str, ...], _Lease]" = OrderedDict()
     
     async def check_limit(
         self,
@@ -142,12 +175,13 @@ class AdvancedRateLimiter:
         """
         Check if request is within rate limits.
         
-        Checks multiple limits in order:
+        Checks multiple limits (one storage call):
         1. Burst limit (very short window)
         2. Per-minute limit
         3. Per-hour limit
         4. Per-day limit
-        5. AI cost limit (if ai_cost_cents > 0)
+        5. Per-IP limit
+        6. AI cost limit (if ai_cost_cents > 0)
         
         Returns first limit that is exceeded.
         
@@ -162,141 +196,162 @@ class AdvancedRateLimiter:
             RateLimitResult indicating if allowed and remaining quota
         """
         config = TIER_CONFIGS.get(tier, TIER_CONFIGS[RateLimitTier.FREE])
+        rules = self._build_rules(config, user_id, endpoint, ip_address, ai_cost_cents)
         
-        # Check burst limit (10 second window)
-        if user_id:
-            result = await self._check_window(
-                key=self._make_key(user_id, endpoint, "burst"),
-                window_seconds=10,
-                max_requests=config.burst_size,
-                limit_type="burst",
+        if not rules:
+            return RateLimitResult(
+                allowed=True,
+                limit=config.requests_per_minute,
+                remaining=config.requests_per_minute,
+                reset_timestamp=0,
             )
-            if not result.allowed:
-                return result
         
-        # Check per-minute limit
-        if user_id:
-            result = await self._check_window(
-                key=self._make_key(user_id, endpoint, "minute"),
-                window_seconds=60,
-                max_requests=config.requests_per_minute,
-                limit_type="minute",
-            )
-            if not result.allowed:
+        # AI cost requests always go to storage (cost varies per request)
+        lease_key = (
+            tuple(rule.key for rule in rules)
+            if self.local_lease_size > 1 and ai_cost_cents == 0
+            else None
+        )
+        if lease_key is not None:
+            result = self._spend_lease(lease_key)
+            if result is not None:
                 return result
         
-        # Check per-hour limit
-        if user_id:
-            result = await self._check_window(
-                key=self._make_key(user_id, endpoint, "hour"),
-                window_seconds=3600,
-                max_requests=config.requests_per_hour,
-                limit_type="hour",
-            )
-            if not result.allowed:
-                return result
+        lease = self._leases.get(lease_key) if lease_key is not None else None
+        batch = lease.next_size if lease is not None else 1
         
-        # Check per-day limit
-        if user_id:
-            result = await self._check_window(
-                key=self._make_key(user_id, endpoint, "day"),
-                window_seconds=86400,
-                max_requests=config.requests_per_day,
-                limit_type="day",
+        rejected, checks = await self.storage.check_rules(self._scaled(rules, batch))
+        if rejected is not None and batch > 1:
+            # Whole batch didn't fit - this request alone might
+            batch = 1
+            rejected, checks = await self.storage.check_rules(rules)
+        
+        if rejected is not None:
+            if lease_key is not None:
+                self._store_lease(lease_key, tokens=0, next_size=1)
+            return self._to_result(rules[rejected], checks[rejected])
+        
+        result = self._admitted_result(rules, checks)
+        if lease_key is not None:
+            headroom = min(check.remaining for check in checks)
+            self._store_lease(
+                lease_key,
+                tokens=batch - 1,
+                next_size=max(1, min(self.local_lease_size, headroom // 4)),
+                result=result,
             )
-            if not result.allowed:
-                return result
+        return result
+    
+    def _build_rules(
+        self,
+        config: RateLimitConfig,
+        user_id: Optional[str],
+        endpoint: Optional[str],
+        ip_address: Optional[str],
+        ai_cost_cents: int,
+    ) -> List[RateLimitRule]:
+        """Windows that apply to this request, in check order"""
+        rules = []
+        if user_id:
+            for window_type, window_seconds, max_requests in (
+                ("burst", 10, config.burst_size),
+                ("minute", 60, config.requests_per_minute),
+                ("hour", 3600, config.requests_per_hour),
+                ("day", 86400, config.requests_per_day),
+            ):
+                rules.append(RateLimitRule(
+                    key=self._make_key(user_id, endpoint, window_type),
+                    window_seconds=window_seconds,
+                    max_requests=max_requests,
+                    limit_type=window_type,
+                ))
         
-        # Check IP-based limit (DDoS protection)
+        # IP-based limit (DDoS protection)
         if ip_address:
-            result = await self._check_window(
+            rules.append(RateLimitRule(
                 key=f"ip:{ip_address}:minute",
                 window_seconds=60,
                 max_requests=100,  # 100 req/min per IP
                 limit_type="ip_minute",
-            )
-            if not result.allowed:
-                return result
+            ))
         
-        # Check AI cost limit
+        # AI cost limit: consumes cost_cents units of the daily budget
         if ai_cost_cents > 0 and user_id:
-            result = await self._check_ai_cost(
-                user_id=user_id,
-                cost_cents=ai_cost_cents,
-                max_cost_cents=config.ai_cost_limit_per_day,
-            )
-            if not result.allowed:
-                return result
-        
-        # All limits passed
+            rules.append(RateLimitRule(
+                key=f"ai_cost:{user_id}:day",
+                window_seconds=86400,
+                max_requests=config.ai_cost_limit_per_day,
+                limit_type="ai_cost",
+                cost=ai_cost_cents,
+            ))
+        return rules
+    
+    @staticmethod
+    def _scaled(rules: List[RateLimitRule], batch: int) -> List[RateLimitRule]:
+        if batch == 1:
+            return rules
+        return [replace(rule, cost=rule.cost * batch) for rule in rules]
+    
+    @staticmethod
+    def _to_result(rule: RateLimitRule, check: RuleCheck) -> RateLimitResult:
         return RateLimitResult(
-            allowed=True,
-            limit=config.requests_per_minute,
-            remaining=config.requests_per_minute,
-            reset_timestamp=0,
+            allowed=check.allowed,
+            limit=rule.max_requests,
+            remaining=check.remaining,
+            reset_timestamp=check.reset_timestamp,
+            retry_after=check.retry_after,
+            limit_type=rule.limit_type,
         )
     
-    async def _check_window(
+    def _admitted_result(
         self,
-        key: str,
-        window_seconds: int,
-        max_requests: int,
-        limit_type: str,
+        rules: List[RateLimitRule],
+        checks: List[RuleCheck],
     ) -> RateLimitResult:
-        """Check a single time window limit"""
-        current, remaining, reset = await self.storage.increment(
-            key=key,
-            window_seconds=window_seconds,
-            max_requests=max_requests,
-        )
-        
-        allowed = current <= max_requests
-        retry_after = None if allowed else (reset - int(__import__('time').time()))
+        """Headers report the per-minute window (IP window when anonymous)"""
+        for rule, check in zip(rules, checks):
+            if rule.limit_type in ("minute", "ip_minute"):
+                result = self._to_result(rule, check)
+                result.limit_type = None
+                return result
+        result = self._to_result(rules[0], checks[0])
+        result.limit_type = None
+        return result
+    
+    # ========================================================================
+    # LOCAL LEASES
+    # ========================================================================
+    
+    def _spend_lease(self, lease_key: Tuple[str, ...]) -> Optional[RateLimitResult]:
+        """Admit from an in-process lease, or None to go to storage"""
+        lease = self._leases.get(lease_key)
+        if lease is None or lease.tokens <= 0 or lease.result is None:
+            return None
+        if time.monotonic() >= lease.expires_at:
+            lease.tokens = 0
+            return None
         
-        return RateLimitResult(
-            allowed=allowed,
-            limit=max_requests,
-            remaining=remaining,
-            reset_timestamp=reset,
-            retry_after=retry_after,
-            limit_type=limit_type,
-        )
+        lease.tokens -= 1
+        self._leases.move_to_end(lease_key)
+        lease.result = replace(lease.result, remaining=max(0, lease.result.remaining - 1))
+        return lease.result
     
-    async def _check_ai_cost(
+    def _store_lease(
         self,
-        user_id: str,
-        cost_cents: int,
-        max_cost_cents: int,
-    ) -> RateLimitResult:
-        """
-        Check AI cost limit for the day.
-        
-        Tracks cumulative AI API costs to prevent runaway spending.
-        """
-        key = f"ai_cost:{user_id}:day"
-        
-        # Increment cost
-        current, remaining, reset = await self.storage.increment(
-            key=key,
-            window_seconds=86400,
-            max_requests=max_cost_cents,
-        )
-        
-        # Note: We're using increment as a counter, not request count
-        # So we need to track the actual cost differently
-        # For now, simplified - each "request" = cost_cents
-        
-        allowed = current <= max_cost_cents
-        retry_after = None if allowed else (reset - int(__import__('time').time()))
-        
-        return RateLimitResult(
-            allowed=allowed,
-            limit=max_cost_cents,
-            remaining=max(0, max_cost_cents - current),
-            reset_timestamp=reset,
-            retry_after=retry_after,
-            limit_type="ai_cost",
+        lease_key: Tuple[str, ...],
+        tokens: int,
+        next_size: int,
+        result: Optional[RateLimitResult] = None,
+    ) -> None:
+        self._leases[lease_key] = _Lease(
+            tokens=tokens,
+            expires_at=time.monotonic() + self.local_lease_ttl,
+            next_size=next_size,
+            result=result,
         )
+        self._leases.move_to_end(lease_key)
+        while len(self._leases) > self.max_local_leases:
+            self._leases.popitem(last=False)
     
     def _make_key(
         self,
@@ -336,18 +391,10 @@ class AdvancedRateLimiter:
             - burst_count: Requests in last 10 seconds
         """
         return {
-            "burst_count": await self.storage.get_count(
-                self._make_key(user_id, endpoint, "burst")
-            ),
-            "minute_count": await self.storage.get_count(
-                self._make_key(user_id, endpoint, "minute")
-            ),
-            "hour_count": await self.storage.get_count(
-                self._make_key(user_id, endpoint, "hour")
-            ),
-            "day_count": await self.storage.get_count(
-                self._make_key(user_id, endpoint, "day")
-            ),
+            f"{window_type}_count": await self.storage.get_rule_count(
+                self._make_key(user_id, endpoint, window_type)
+            )
+            for window_type in ("burst", "minute", "hour", "day")
         }
     
     async def reset_user_limits(
@@ -365,3 +412,8 @@ class AdvancedRateLimiter:
         
         # Reset AI cost
         await self.storage.reset(f"ai_cost:{user_id}:day")
+        
+        # Drop local leases for this user's keys
+        prefix = self._make_key(user_id, endpoint, "")
+        for lease_key in [k for k in self._leases if k[0].startswith(prefix)]:
+            del self._leases[lease_key]
@@ -2,18 +2,47 @@
 Rate Limit Storage
 
 Abstract storage interface and Redis implementation for rate limiting.
-Uses sliding window algorithm for accurate rate limiting.
+
+check_rules() evaluates every window of a request (burst/minute/hour/day/
+IP/AI cost) in one call. The Redis implementation runs them all in one
+Lua script using GCRA (generic cell rate algorithm): each key holds only
+its theoretical arrival time, so state is O(1) per key regardless of the
+limit, and a request is admitted or rejected atomically across all
+windows (rejected requests consume nothing).
+
+increment() (sliding window ZSET) is kept for single-window callers.
 """
 
 from __future__ import annotations
 
+import math
 import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
 
 from redis.asyncio import Redis
 
 
+@dataclass(frozen=True)
+class RateLimitRule:
+    """One window of a rate limit check."""
+    key: str
+    window_seconds: int
+    max_requests: int
+    limit_type: str
+    cost: int = 1  # Units consumed (requests, or AI cost cents)
+
+
+@dataclass
+class RuleCheck:
+    """Outcome of one rule."""
+    allowed: bool
+    remaining: int
+    reset_timestamp: int
+    retry_after: Optional[int] = None
+
+
 class RateLimitStorage(ABC):
     """Abstract storage interface for rate limiting"""
     
@@ -46,6 +75,41 @@ class RateLimitStorage(ABC):
     async def reset(self, key: str) -> None:
         """Reset counter for key"""
         pass
+    
+    async def check_rules(
+        self,
+        rules: Sequence[RateLimitRule],
+    ) -> Tuple[Optional[int], List[RuleCheck]]:
+        """
+        Check and consume several windows for one request.
+        
+        Default: one increment() per rule, stopping at the first rejection.
+        Storages that can do better (RedisRateLimitStorage) override this.
+        
+        Returns:
+            (index of first rejected rule or None, per-rule results)
+        """
+        checks: List[RuleCheck] = []
+        for index, rule in enumerate(rules):
+            current, remaining, reset = await self.increment(
+                key=rule.key,
+                window_seconds=rule.window_seconds,
+                max_requests=rule.max_requests,
+            )
+            allowed = current <= rule.max_requests
+            checks.append(RuleCheck(
+                allowed=allowed,
+                remaining=remaining,
+                reset_timestamp=reset,
+                retry_after=None if allowed else max(1, reset - int(time.time())),
+            ))
+            if not allowed:
+                return index, checks
+        return None, checks
+    
+    async def get_rule_count(self, key: str) -> int:
+        """Units currently counted against a check_rules() key (default: get_count)."""
+        return await self.get_count(key)
 
 
 class RedisRateLimitStorage(RateLimitStorage):
@@ -62,8 +126,96 @@ class RedisRateLimitStorage(RateLimitStorage):
     4. Check if count exceeds limit
     """
     
+    # GCRA over all rules of a request, all-or-nothing, one round trip.
+    # KEYS: one hash per rule {tat = theoretical arrival time in ms}
+    # ARGV: (max_requests, window_ms, cost) per rule
+    # Returns: {first rejected index or 0, now_ms, then per rule:
+    #           remaining, reset_ms, retry_after_ms}
+    _GCRA_SCRIPT = """
+    local time = redis.call('TIME')
+    local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+    local rejected = 0
+    local tats = {}
+    local out = {0, now}
+    
+    for i = 1, #KEYS do
+        local limit = tonumber(ARGV[3 * i - 2])
+        local window = tonumber(ARGV[3 * i - 1])
+        local cost = tonumber(ARGV[3 * i])
+        local interval = window / limit
+        
+        local tat = tonumber(redis.call('HGET', KEYS[i], 'tat') or now)
+        if tat < now then tat = now end
+        local new_tat = tat + cost * interval
+        local allow_at = new_tat - window
+        
+        if now < allow_at then
+            if rejected == 0 then rejected = i end
+            tats[i] = tat
+            out[#out + 1] = math.max(0, math.floor((window - (tat - now)) / interval))
+            out[#out + 1] = math.ceil(tat)
+            out[#out + 1] = math.ceil(allow_at - now)
+        else
+            tats[i] = new_tat
+            out[#out + 1] = math.max(0, math.floor((window - (new_tat - now)) / interval))
+            out[#out + 1] = math.ceil(new_tat)
+            out[#out + 1] = 0
+        end
+    end
+    
+    if rejected == 0 then
+        for i = 1, #KEYS do
+            local interval = tonumber(ARGV[3 * i - 1]) / tonumber(ARGV[3 * i - 2])
+            redis.call('HSET', KEYS[i], 'tat', tostring(tats[i]), 'interval', tostring(interval))
+            redis.call('PEXPIRE', KEYS[i], math.max(1, math.ceil(tats[i] - now)))
+        end
+    end
+    
+    out[1] = rejected
+    return out
+    """
+    
+    # GCRA state lives beside (not in) the sliding window ZSETs
+    GCRA_PREFIX = "gcra:"
+    
     def __init__(self, redis: Redis):
         self.redis = redis
+        self._gcra = redis.register_script(self._GCRA_SCRIPT)
+    
+    async def check_rules(
+        self,
+        rules: Sequence[RateLimitRule],
+    ) -> Tuple[Optional[int], List[RuleCheck]]:
+        """All windows in a single EVALSHA (GCRA, O(1) state per key)."""
+        if not rules:
+            return None, []
+        
+        args: List[int] = []
+        for rule in rules:
+            args.extend((rule.max_requests, rule.window_seconds * 1000, rule.cost))
+        
+        out = await self._gcra(keys=[self.GCRA_PREFIX + rule.key for rule in rules], args=args)
+        rejected = int(out[0]) - 1 if int(out[0]) else None
+        
+        checks = []
+        for index in range(len(rules)):
+            remaining, reset_ms, retry_ms = (int(v) for v in out[2 + 3 * index: 5 + 3 * index])
+            allowed = rejected is None or (index != rejected and retry_ms == 0)
+            checks.append(RuleCheck(
+                allowed=allowed,
+                remaining=remaining,
+                reset_timestamp=math.ceil(reset_ms / 1000),
+                retry_after=math.ceil(retry_ms / 1000) if retry_ms else None,
+            ))
+        return rejected, checks
+    
+    async def get_rule_count(self, key: str) -> int:
+        """Units counted against a GCRA key: outstanding time / emission interval."""
+        tat, interval = await self.redis.hmget(self.GCRA_PREFIX + key, "tat", "interval")
+        if tat is None or interval is None:
+            return 0
+        outstanding_ms = float(tat) - time.time() * 1000
+        return max(0, math.ceil(outstanding_ms / float(interval)))
     
     async def increment(
         self,
@@ -114,8 +266,8 @@ class RedisRateLimitStorage(RateLimitStorage):
         return count or 0
     
     async def reset(self, key: str) -> None:
-        """Delete the sorted set to reset"""
-        await self.redis.delete(key)
+        """Delete the sorted set and GCRA state to reset"""
+        await self.redis.delete(key, self.GCRA_PREFIX + key)
     
     async def increment_fixed_window(
         self,
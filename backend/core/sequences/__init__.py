@@ -0,0 +1,6 @@
+"""Document Sequence Module"""
+
+from backend.core.sequences.allocator import SequenceAllocator, get_sequence_allocator, reset_sequence_allocator
+from backend.core.sequences.models import DocumentSequence
+
+__all__ = ["DocumentSequence", "SequenceAllocator", "get_sequence_allocator", "reset_sequence_allocator"]
@@ -0,0 +1,133 @@
+"""
+Sequence Allocator - gap-tolerant, contention-free document numbering.
+
+Each process reserves BLOCKS of values from document_sequences and hands
+them out from memory, so allocating a number costs no query on the hot
+path and one short statement per block:
+
+    INSERT ... VALUES (name, period, 1 + block)
+    ON CONFLICT (sequence_name, period)
+    DO UPDATE SET next_value = document_sequences.next_value + block
+    RETURNING next_value
+
+The reservation commits in its own transaction (not the caller's), so the
+row lock is held for one statement only, and a rolled-back business
+transaction can never hand the same block to another process. Values are
+therefore unique across all workers and nodes, increasing within a
+process, but NOT gapless: numbers reserved by a process that exits, or
+used by a transaction that rolls back, are skipped.
+
+Usage:
+    allocator = get_sequence_allocator()
+    value = await allocator.next_value("trade_number", "2025")   # 1, 2, ...
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from backend.core.settings.config import settings
+
+
+_RESERVE_BLOCK = text(
+    "INSERT INTO document_sequences (sequence_name, period, next_value) "
+    "VALUES (:name, :period, 1 + :count) "
+    "ON CONFLICT (sequence_name, period) DO UPDATE "
+    "SET next_value = document_sequences.next_value + :count, updated_at = NOW() "
+    "RETURNING next_value"
+)
+
+
+@dataclass
+class _Block:
+    next: int
+    end: int  # Exclusive
+
+
+class SequenceAllocator:
+    """
+    Hands out values of named, per-period sequences from reserved blocks.
+
+    Args:
+        engine: Async engine for reservations (default: db.async_session.async_engine)
+        block_size: Values reserved per round trip (per sequence and period)
+    """
+
+    def __init__(self, engine: Optional[AsyncEngine] = None, block_size: int = 50):
+        if block_size < 1:
+            raise ValueError("block_size must be >= 1")
+        self._engine = engine
+        self.block_size = block_size
+        self._blocks: Dict[Tuple[str, str], _Block] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self.metrics = {"allocated": 0, "reservations": 0}
+
+    async def next_value(self, name: str, period: str = "") -> int:
+        """
+        Allocate the next value of sequence `name` for `period`.
+
+        Args:
+            name: Sequence name (e.g. "trade_number")
+            period: Numbering period (e.g. "2025"); each period starts at 1
+
+        Returns:
+            Unique positive integer
+        """
+        key = (name, period)
+        block = self._blocks.get(key)
+        if block is None or block.next >= block.end:
+            lock = self._locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                # Another task may have refilled while we waited
+                block = self._blocks.get(key)
+                if block is None or block.next >= block.end:
+                    first = await self._reserve(name, period, self.block_size)
+                    block = _Block(next=first, end=first + self.block_size)
+                    self._blocks[key] = block
+                    self.metrics["reservations"] += 1
+
+        value = block.next
+        block.next += 1
+        self.metrics["allocated"] += 1
+        return value
+
+    async def _reserve(self, name: str, period: str, count: int) -> int:
+        """Reserve `count` values in an autonomous transaction; returns the first."""
+        engine = self._engine
+        if engine is None:
+            from backend.db.async_session import async_engine as engine
+
+        async with engine.begin() as conn:
+            result = await conn.execute(_RESERVE_BLOCK, {"name": name, "period": period, "count": count})
+            next_unreserved = result.scalar_one()
+        return next_unreserved - count
+
+    def discard(self) -> None:
+        """Forget reserved blocks (their remaining values are skipped)."""
+        self._blocks.clear()
+
+
+# ============================================================================
+# PROCESS-WIDE ALLOCATOR
+# ============================================================================
+
+_sequence_allocator: Optional[SequenceAllocator] = None
+
+
+def get_sequence_allocator() -> SequenceAllocator:
+    """Get the process-wide sequence allocator (SEQUENCE_BLOCK_SIZE blocks)."""
+    global _sequence_allocator
+    if _sequence_allocator is None:
+        _sequence_allocator = SequenceAllocator(block_size=settings.SEQUENCE_BLOCK_SIZE)
+    return _sequence_allocator
+
+
+def reset_sequence_allocator() -> None:
+    """Drop the process-wide allocator (tests)."""
+    global _sequence_allocator
+    _sequence_allocator = None
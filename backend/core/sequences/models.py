@@ -0,0 +1,28 @@
+"""
+Document Sequence Counters
+
+One row per (sequence_name, period) - e.g. ('trade_number', '2025') -
+holding the next unreserved value. SequenceAllocator reserves blocks of
+values by advancing next_value in a single INSERT ... ON CONFLICT
+statement; no row is ever read-modified-written in Python.
+"""
+
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Column, DateTime, String, text
+
+from backend.db.session import Base
+
+
+class DocumentSequence(Base):
+    """Per-period counter row for human-readable document numbers."""
+    
+    __tablename__ = "document_sequences"
+    
+    sequence_name = Column(String(64), primary_key=True)
+    period = Column(String(16), primary_key=True)  # '2025', '2025-26', or '' for never-resetting series
+    next_value = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=text("NOW()"))
+    
+    def __repr__(self):
+        return f"<DocumentSequence({self.sequence_name}/{self.period}, next_value={self.next_value})>"
@@ -14,9 +14,41 @@ class AppSettings(BaseSettings):
     ACCESS_TOKEN_EXPIRES_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRES_DAYS: int = 7
     PASSWORD_SCHEME: str = "bcrypt"  # bcrypt|pbkdf2_sha256
+    PASSWORD_HASH_ROUNDS: int | None = None  # Cost for PASSWORD_SCHEME; weaker hashes are rehashed on login
+    PASSWORD_HASH_WORKERS: int = 4  # Hashing thread pool size (concurrent hash/verify per worker)
     ALLOWED_ORIGINS: str = "*"  # comma-separated for CORS
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Authenticated principal cache (AuthMiddleware): in-process LRU + Redis
+    PRINCIPAL_CACHE_LOCAL_TTL_SECONDS: float = 5.0
+    PRINCIPAL_CACHE_LOCAL_SIZE: int = 10000
+    PRINCIPAL_CACHE_REDIS_TTL_SECONDS: int = 300
+    
+    # Effective capability sets (CapabilityService): in-process LRU + Redis
+    CAPABILITY_CACHE_LOCAL_TTL_SECONDS: float = 5.0
+    CAPABILITY_CACHE_LOCAL_SIZE: int = 10000
+    CAPABILITY_CACHE_REDIS_TTL_SECONDS: int = 300
+    
+    # Document numbers (core/sequences): values reserved per round trip per worker
+    SEQUENCE_BLOCK_SIZE: int = 50
+    
+    # Embedding sync (ai/jobs/vector_sync): texts per model call, encoded batches queued ahead of the writer
+    EMBEDDING_BATCH_SIZE: int = 64
+    EMBEDDING_PIPELINE_DEPTH: int = 2
+    
+    # ChromaDB store (ai/embeddings/chromadb): pool threads, add coalescing window and max upsert size
+    CHROMA_WORKERS: int = 2
+    CHROMA_ADD_BATCH_WINDOW_MS: float = 10.0
+    CHROMA_ADD_MAX_BATCH: int = 1000
+    
+    # AI response cache (ai/orchestrators/cache): Redis TTL, in-process LRU size when Redis is not configured
+    AI_RESPONSE_CACHE_ENABLED: bool = True
+    AI_RESPONSE_CACHE_TTL_SECONDS: int = 3600
+    AI_RESPONSE_CACHE_LOCAL_SIZE: int = 1000
+    
+    # Requirement/availability enrichment (trade_desk/services/enrichment): timeout of optional steps before their fallback is used
+    ENRICHMENT_STEP_TIMEOUT_SECONDS: float = 2.0
+    
     # Default organization for new signups (multi-commodity support)
     DEFAULT_ORGANIZATION_NAME: str = "Default Trading Co"
     
@@ -3,9 +3,14 @@ WebSocket Connection Manager
 
 Manages WebSocket connections with:
 - Connection lifecycle (connect, disconnect)
-- Message broadcasting
+- Message broadcasting (serialize once, non-blocking fan-out)
 - Channel subscriptions
 - Redis pub/sub for horizontal scaling
+
+Every connection has a bounded send queue drained by its own sender task
+(the only writer on that socket). A broadcast serializes the message once
+and enqueues the same JSON string for every recipient, so one slow client
+never stalls a channel; full queues are handled by SlowConsumerPolicy.
 """
 
 from __future__ import annotations
@@ -13,9 +18,11 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import time
+from collections import OrderedDict, deque
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 
 from fastapi import WebSocket, WebSocketDisconnect
@@ -80,6 +87,88 @@ class WebSocketMessage(BaseModel):
         }
 
 
+class SlowConsumerPolicy(str, Enum):
+    """What to do when a connection's send queue is full"""
+    
+    DROP_OLDEST = "drop_oldest"  # Keep latest state (price ticks)
+    DROP_NEWEST = "drop_newest"  # Keep what is already queued
+    DISCONNECT = "disconnect"  # Close socket; client reconnects and resyncs
+
+
+class ChannelMetrics:
+    """Fan-out counters and delivery latency samples for one channel."""
+    
+    def __init__(self, sample_size: int = 1000):
+        self.broadcasts = 0
+        self.recipients = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.last_enqueue_ms = 0.0
+        # enqueue-to-sent latency per delivery (seconds)
+        self.latencies: Deque[float] = deque(maxlen=sample_size)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        samples = sorted(self.latencies)
+        
+        def percentile(p: float) -> float:
+            if not samples:
+                return 0.0
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 3)
+        
+        return {
+            "broadcasts": self.broadcasts,
+            "recipients": self.recipients,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "last_enqueue_ms": round(self.last_enqueue_ms, 3),
+            "latency_p50_ms": percentile(0.50),
+            "latency_p99_ms": percentile(0.99),
+            "latency_max_ms": percentile(1.0),
+        }
+
+
+class _ConnectionSender:
+    """Bounded send queue + single writer task for one WebSocket."""
+    
+    def __init__(
+        self,
+        manager: "ConnectionManager",
+        connection_id: str,
+        websocket: WebSocket,
+        queue_size: int,
+    ):
+        self.manager = manager
+        self.connection_id = connection_id
+        self.websocket = websocket
+        # (payload, channel, enqueued_at)
+        self.queue: asyncio.Queue[Tuple[str, Optional[str], float]] = asyncio.Queue(maxsize=queue_size)
+        self.closed = False
+        self.task = asyncio.create_task(self._run())
+    
+    async def _run(self) -> None:
+        # wait_for() can swallow a cancel that lands as the send completes
+        # (Python < 3.12), so the flag ends the loop as well
+        while not self.closed:
+            payload, channel, enqueued_at = await self.queue.get()
+            try:
+                await asyncio.wait_for(
+                    self.websocket.send_text(payload),
+                    timeout=self.manager.send_timeout,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Send failed, dropping connection {self.connection_id}: {e!r}")
+                self.manager._schedule_disconnect(self.connection_id)
+                return
+            self.manager._record_delivery(channel, time.perf_counter() - enqueued_at)
+    
+    def close(self) -> None:
+        self.closed = True
+        if asyncio.current_task() is not self.task:
+            self.task.cancel()
+
+
 class ConnectionManager:
     """
     Manages WebSocket connections.
@@ -87,11 +176,18 @@ class ConnectionManager:
     Features:
     - Connection tracking
     - Channel subscriptions
-    - Message broadcasting
+    - Message broadcasting (serialize once, per-connection send queues)
+    - Slow consumer handling and per-channel fan-out metrics
     - Redis pub/sub for scaling
     """
     
-    def __init__(self, redis: Optional[Redis] = None):
+    def __init__(
+        self,
+        redis: Optional[Redis] = None,
+        send_queue_size: int = 256,
+        send_timeout: float = 10.0,
+        slow_consumer_policy: SlowConsumerPolicy = SlowConsumerPolicy.DROP_OLDEST,
+    ):
         # Active connections: {user_id: {connection_id: WebSocket}}
         self.active_connections: Dict[UUID, Dict[str, WebSocket]] = {}
         
@@ -105,9 +201,23 @@ class ConnectionManager:
         self.redis = redis
         self._pubsub_task: Optional[asyncio.Task] = None
         
+        # Outbound: {connection_id: sender}
+        self.send_queue_size = send_queue_size
+        self.send_timeout = send_timeout
+        self.slow_consumer_policy = SlowConsumerPolicy(slow_consumer_policy)
+        self._senders: Dict[str, _ConnectionSender] = {}
+        self._closing: Set[str] = set()
+        
+        # Multi-channel messages from other instances arrive once per
+        # channel: {message_id: connection_ids already sent to}
+        self._remote_deliveries: "OrderedDict[str, Set[str]]" = OrderedDict()
+        self._remote_dedup_size = 1024
+        
         # Stats
         self.total_connections = 0
         self.total_messages_sent = 0
+        self.total_messages_dropped = 0
+        self.channel_metrics: Dict[str, ChannelMetrics] = {}
     
     async def connect(
         self,
@@ -135,6 +245,9 @@ class ConnectionManager:
             self.active_connections[user_id] = {}
         
         self.active_connections[user_id][connection_id] = websocket
+        self._senders[connection_id] = _ConnectionSender(
+            self, connection_id, websocket, self.send_queue_size
+        )
         
         # Store metadata
         self.connection_metadata[connection_id] = {
@@ -177,9 +290,14 @@ class ConnectionManager:
         user_id = metadata["user_id"]
         
         # Unsubscribe from all channels
-        for channel in metadata["channels"]:
+        for channel in list(metadata["channels"]):
             await self.unsubscribe(connection_id, channel)
         
+        sender = self._senders.pop(connection_id, None)
+        if sender is not None:
+            sender.close()
+        self._closing.discard(connection_id)
+        
         # Remove connection
         if user_id in self.active_connections:
             if connection_id in self.active_connections[user_id]:
@@ -250,6 +368,7 @@ class ConnectionManager:
             # Clean up empty channels
             if not self.channel_subscriptions[channel]:
                 del self.channel_subscriptions[channel]
+                self.channel_metrics.pop(channel, None)
         
         metadata["channels"].discard(channel)
         
@@ -273,15 +392,17 @@ class ConnectionManager:
             return
         
         connections = self.active_connections[user_id]
+        payload = message.model_dump_json()
+        started = time.perf_counter()
         
         if connection_id:
             # Send to specific connection
             if connection_id in connections:
-                await self._send_message(connections[connection_id], message)
+                self._enqueue(connection_id, payload, message.channel, started)
         else:
             # Send to all user's connections
-            for ws in connections.values():
-                await self._send_message(ws, message)
+            for conn_id in list(connections):
+                self._enqueue(conn_id, payload, message.channel, started)
     
     async def broadcast_to_channel(
         self,
@@ -302,19 +423,61 @@ class ConnectionManager:
         
         message.channel = channel
         
-        for user_id in self.channel_subscriptions[channel]:
-            if exclude_user and user_id == exclude_user:
-                continue
-            
-            await self.send_personal_message(message, user_id)
+        # Serialize once; every recipient (and Redis) gets the same string
+        payload = message.model_dump_json()
+        self._fan_out(channel, payload, exclude_user)
         
         # Publish to Redis for other instances
         if self.redis:
             await self.redis.publish(
                 f"websocket:channel:{channel}",
-                message.model_dump_json(),
+                payload,
             )
     
+    async def broadcast_to_channels(
+        self,
+        channels: Iterable[str],
+        message: WebSocketMessage,
+        exclude_user: Optional[UUID] = None,
+    ) -> int:
+        """
+        Broadcast one message to the union of several channels' subscribers.
+        
+        Each connection receives it once, labelled with the first channel
+        in `channels` it is subscribed to (so list specific channels before
+        global ones). Redis publishes go out in one pipelined round trip;
+        other instances dedup by message id.
+        
+        Args:
+            channels: Channel names, most specific first
+            message: Message to send
+            exclude_user: Optional user to exclude from broadcast
+        
+        Returns:
+            Number of local connections the message was queued for
+        """
+        channels = list(dict.fromkeys(channels))
+        delivered: Set[str] = set()
+        payloads: Dict[str, str] = {}
+        
+        for channel in channels:
+            if channel not in self.channel_subscriptions and not self.redis:
+                continue
+            # One serialization per channel label, not per recipient
+            message.channel = channel
+            payloads[channel] = message.model_dump_json()
+            if channel in self.channel_subscriptions:
+                self._fan_out(channel, payloads[channel], exclude_user, delivered)
+        
+        # Publish to Redis for other instances (single round trip)
+        if self.redis and payloads:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for channel, payload in payloads.items():
+                    pipe.publish(f"websocket:channel:{channel}", payload)
+                await pipe.execute()
+        
+        return len(delivered)
+    
     async def broadcast_to_all(
         self,
         message: WebSocketMessage,
@@ -327,25 +490,140 @@ class ConnectionManager:
             message: Message to send
             exclude_user: Optional user to exclude
         """
-        for user_id in self.active_connections.keys():
+        payload = message.model_dump_json()
+        started = time.perf_counter()
+        
+        for user_id, connections in list(self.active_connections.items()):
             if exclude_user and user_id == exclude_user:
                 continue
             
-            await self.send_personal_message(message, user_id)
+            for connection_id in list(connections):
+                self._enqueue(connection_id, payload, message.channel, started)
     
-    async def _send_message(self, websocket: WebSocket, message: WebSocketMessage):
+    def _fan_out(
+        self,
+        channel: str,
+        payload: str,
+        exclude_user: Optional[UUID] = None,
+        delivered: Optional[Set[str]] = None,
+    ) -> int:
         """
-        Send message through WebSocket.
+        Queue an already-serialized message for every local channel subscriber.
+        
+        Never awaits: sockets are written by their sender tasks concurrently.
         
         Args:
-            websocket: WebSocket instance
-            message: Message to send
+            delivered: Connection IDs to skip; queued ones are added to it
+                (dedup across the channels of one multi-channel broadcast)
+        
+        Returns:
+            Number of connections the message was queued for
         """
+        started = time.perf_counter()
+        metrics = self.channel_metrics.setdefault(channel, ChannelMetrics())
+        
+        queued = 0
+        for user_id in list(self.channel_subscriptions.get(channel, ())):
+            if exclude_user and user_id == exclude_user:
+                continue
+            for connection_id in list(self.active_connections.get(user_id, ())):
+                if delivered is not None:
+                    if connection_id in delivered:
+                        continue
+                    delivered.add(connection_id)
+                if self._enqueue(connection_id, payload, channel, started):
+                    queued += 1
+        
+        metrics.broadcasts += 1
+        metrics.recipients += queued
+        metrics.last_enqueue_ms = (time.perf_counter() - started) * 1000
+        return queued
+    
+    def _enqueue(
+        self,
+        connection_id: str,
+        payload: str,
+        channel: Optional[str],
+        enqueued_at: float,
+    ) -> bool:
+        """
+        Put a payload on a connection's send queue, applying the slow
+        consumer policy when it is full.
+        
+        Returns:
+            True if the payload was queued
+        """
+        sender = self._senders.get(connection_id)
+        if sender is None or connection_id in self._closing:
+            return False
+        
+        item = (payload, channel, enqueued_at)
+        try:
+            sender.queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            pass
+        
+        if self.slow_consumer_policy == SlowConsumerPolicy.DROP_OLDEST:
+            _, dropped_channel, _ = sender.queue.get_nowait()
+            sender.queue.put_nowait(item)
+            self._record_drop(dropped_channel)
+            return True
+        
+        self._record_drop(channel)
+        if self.slow_consumer_policy == SlowConsumerPolicy.DISCONNECT:
+            logger.warning(f"Slow consumer, disconnecting connection={connection_id}")
+            self._schedule_disconnect(connection_id, code=1013)
+        return False
+    
+    def _schedule_disconnect(self, connection_id: str, code: int = 1011) -> None:
+        """Close and forget a connection without blocking the caller."""
+        if connection_id in self._closing or connection_id not in self.connection_metadata:
+            return
+        self._closing.add(connection_id)
+        
+        async def _close() -> None:
+            sender = self._senders.get(connection_id)
+            if sender is not None:
+                try:
+                    await sender.websocket.close(code=code)
+                except Exception:
+                    pass  # Already gone
+            await self.disconnect(connection_id)
+        
+        asyncio.create_task(_close())
+    
+    def _record_delivery(self, channel: Optional[str], latency: float) -> None:
+        self.total_messages_sent += 1
+        if channel is not None and channel in self.channel_metrics:
+            metrics = self.channel_metrics[channel]
+            metrics.delivered += 1
+            metrics.latencies.append(latency)
+    
+    def _record_drop(self, channel: Optional[str]) -> None:
+        self.total_messages_dropped += 1
+        if channel is not None and channel in self.channel_metrics:
+            self.channel_metrics[channel].dropped += 1
+    
+    def _remote_delivered(self, payload: str) -> Optional[Set[str]]:
+        """Connections that already got this message id from another channel."""
         try:
-            await websocket.send_text(message.model_dump_json())
-            self.total_messages_sent += 1
-        except Exception as e:
-            logger.error(f"Failed to send message: {e}")
+            message_id = json.loads(payload).get("id")
+        except (ValueError, AttributeError):
+            return None
+        if not message_id:
+            return None
+        
+        delivered = self._remote_deliveries.get(message_id)
+        if delivered is None:
+            delivered = self._remote_deliveries[message_id] = set()
+            if len(self._remote_deliveries) > self._remote_dedup_size:
+                self._remote_deliveries.popitem(last=False)
+        return delivered
+    
+    def get_channel_metrics(self, channel: str) -> Dict[str, Any]:
+        """Fan-out metrics for one channel (empty snapshot if never broadcast)."""
+        return self.channel_metrics.get(channel, ChannelMetrics()).snapshot()
     
     def get_stats(self) -> Dict[str, Any]:
         """Get connection statistics"""
@@ -359,10 +637,15 @@ class ConnectionManager:
             "total_connections": total_connections_count,
             "total_channels": len(self.channel_subscriptions),
             "total_messages_sent": self.total_messages_sent,
+            "total_messages_dropped": self.total_messages_dropped,
             "channels": {
                 channel: len(users)
                 for channel, users in self.channel_subscriptions.items()
             },
+            "channel_metrics": {
+                channel: metrics.snapshot()
+                for channel, metrics in self.channel_metrics.items()
+            },
         }
     
     async def start_redis_listener(self):
@@ -379,13 +662,14 @@ class ConnectionManager:
                     # Parse channel from pattern
                     channel = message["channel"].decode().split(":")[-1]
                     
-                    # Parse message
-                    ws_message = WebSocketMessage.model_validate_json(message["data"])
+                    # Already serialized by the publishing instance
+                    payload = message["data"]
+                    if isinstance(payload, bytes):
+                        payload = payload.decode()
                     
                     # Broadcast locally (this instance only)
                     if channel in self.channel_subscriptions:
-                        for user_id in self.channel_subscriptions[channel]:
-                            await self.send_personal_message(ws_message, user_id)
+                        self._fan_out(channel, payload, delivered=self._remote_delivered(payload))
                 
                 except Exception as e:
                     logger.error(f"Redis message error: {e}")
@@ -2,13 +2,31 @@
 Database Session Management
 
 Provides async database session factory for FastAPI dependency injection
+
+Row Level Security context: every transaction started by an
+AsyncSessionLocal session applies the request's isolation variables
+(app.user_id, app.user_type, app.business_partner_id, app.organization_id,
+from core/security/context.py) in ONE transaction-local set_config()
+statement. Values vanish at COMMIT/ROLLBACK, so pooled connections (and
+PgBouncer transaction mode) never carry another request's context.
+Policies should read them with current_setting('app.x', true) - unset
+values are ''.
 """
 
 import os
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Dict, Optional
 
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from backend.core.security.context import (
+    current_business_partner_id,
+    current_organization_id,
+    current_user_id,
+    current_user_type,
+)
 
 
 # Get database URL from environment or use default
@@ -23,10 +41,49 @@ async_engine = create_async_engine(
     max_overflow=20
 )
 
+# All isolation variables in one round trip; is_local=true -> transaction scoped
+_SET_RLS_CONTEXT = text(
+    "SELECT set_config('app.user_id', :user_id, true), "
+    "set_config('app.user_type', :user_type, true), "
+    "set_config('app.business_partner_id', :business_partner_id, true), "
+    "set_config('app.organization_id', :organization_id, true)"
+)
+
+
+def rls_context_parameters() -> Optional[Dict[str, str]]:
+    """set_config() parameters for the current security context (None if unset)"""
+    user_id = current_user_id.get()
+    if user_id is None:
+        return None
+    
+    user_type = current_user_type.get()
+    business_partner_id = current_business_partner_id.get()
+    organization_id = current_organization_id.get()
+    return {
+        "user_id": str(user_id),
+        "user_type": getattr(user_type, "value", user_type) or "",
+        "business_partner_id": str(business_partner_id) if business_partner_id else "",
+        "organization_id": str(organization_id) if organization_id else "",
+    }
+
+
+class RLSSession(Session):
+    """Session that applies the RLS context at the start of every transaction."""
+
+
+@event.listens_for(RLSSession, "after_begin")
+def _apply_rls_context(session, transaction, connection) -> None:
+    # Runs on the connection checked out for this transaction, inside it
+    parameters = rls_context_parameters()
+    if parameters is not None:
+        connection.execute(_SET_RLS_CONTEXT, parameters)
+
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     async_engine,
     class_=AsyncSession,
+    sync_session_class=RLSSession,
     expire_on_commit=False,
     autocommit=False,
     autoflush=False
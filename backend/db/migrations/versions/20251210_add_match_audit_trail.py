@@ -0,0 +1,61 @@
+"""add_match_audit_trail_table
+
+Persistent match audit trail (explainability + duplicate time window).
+
+Revision ID: 20251210_match_audit
+Revises: 20251204_trade_engine
+Create Date: 2025-12-10
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+
+# revision identifiers, used by Alembic.
+revision = '20251210_match_audit'
+down_revision = '20251204_trade_engine'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create match_audit_trail table."""
+    
+    op.create_table(
+        'match_audit_trail',
+        sa.Column('id', UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+        sa.Column('requirement_id', UUID(), nullable=False),
+        sa.Column('availability_id', UUID(), nullable=False),
+        sa.Column('commodity_id', UUID(), nullable=True),
+        sa.Column('triggered_by', sa.String(20), nullable=False),
+        sa.Column('duplicate_key', sa.String(200), nullable=False),
+        
+        # Scores
+        sa.Column('score', sa.Numeric(5, 4), nullable=False, comment='Final score after WARN penalty'),
+        sa.Column('base_score', sa.Numeric(5, 4), nullable=False),
+        sa.Column('warn_penalty_applied', sa.Boolean(), nullable=False, server_default='false'),
+        sa.Column('risk_status', sa.String(20), nullable=True),
+        
+        # Explainability
+        sa.Column('score_breakdown', JSONB, nullable=True),
+        sa.Column('pass_fail', JSONB, nullable=True),
+        sa.Column('risk_details', JSONB, nullable=True),
+        
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')),
+        
+        # No FKs: bulk-copied append-only log, must outlive deleted postings
+        sa.PrimaryKeyConstraint('id'),
+    )
+    
+    op.create_index('ix_match_audit_trail_requirement_id', 'match_audit_trail', ['requirement_id'])
+    op.create_index('ix_match_audit_trail_availability_id', 'match_audit_trail', ['availability_id'])
+    # Duplicate window lookup: recent pairs per commodity
+    op.create_index('ix_match_audit_trail_commodity_created', 'match_audit_trail', ['commodity_id', 'created_at'])
+
+
+def downgrade() -> None:
+    """Drop match_audit_trail table."""
+    op.drop_table('match_audit_trail')
@@ -0,0 +1,53 @@
+"""add_outbox_partitions_table
+
+Partition leases for parallel, per-aggregate ordered outbox draining.
+
+Revision ID: 20251211_outbox_partitions
+Revises: 20251210_match_audit
+Create Date: 2025-12-11
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20251211_outbox_partitions'
+down_revision = '20251210_match_audit'
+branch_labels = None
+depends_on = None
+
+
+# Seeded rows; workers add more on start if configured with a higher count
+DEFAULT_PARTITION_COUNT = 16
+
+
+def upgrade() -> None:
+    """Create event_outbox_partitions and seed the default partitions."""
+    
+    op.create_table(
+        'event_outbox_partitions',
+        sa.Column('partition_no', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('last_claimed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('partition_no'),
+    )
+    op.execute(
+        f"INSERT INTO event_outbox_partitions (partition_no) "
+        f"SELECT generate_series(0, {DEFAULT_PARTITION_COUNT - 1})"
+    )
+    
+    # Oldest-first scan of pending events per aggregate (ordering guard)
+    op.create_index(
+        'ix_event_outbox_aggregate_pending',
+        'event_outbox',
+        ['aggregate_id', 'created_at'],
+        postgresql_where=sa.text("status = 'PENDING'"),
+    )
+
+
+def downgrade() -> None:
+    """Drop event_outbox_partitions."""
+    op.drop_index('ix_event_outbox_aggregate_pending', table_name='event_outbox')
+    op.drop_table('event_outbox_partitions')
@@ -0,0 +1,48 @@
+"""add_document_sequences_table
+
+Per-period counter rows for block-reserved document numbers
+(core/sequences). Seeds the trade_number counters from existing trades so
+new numbers continue after the highest TR-{year}-NNNNN already issued.
+
+Revision ID: 20251212_document_sequences
+Revises: 20251211_outbox_partitions
+Create Date: 2025-12-12
+
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20251212_document_sequences'
+down_revision = '20251211_outbox_partitions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Create document_sequences and seed trade_number per year."""
+
+    op.create_table(
+        'document_sequences',
+        sa.Column('sequence_name', sa.String(length=64), nullable=False),
+        sa.Column('period', sa.String(length=16), nullable=False),
+        sa.Column('next_value', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.PrimaryKeyConstraint('sequence_name', 'period'),
+    )
+    op.execute(
+        "INSERT INTO document_sequences (sequence_name, period, next_value) "
+        "SELECT 'trade_number', split_part(trade_number, '-', 2), "
+        "       MAX(CAST(split_part(trade_number, '-', 3) AS BIGINT)) + 1 "
+        "FROM trades "
+        "WHERE trade_number ~ '^TR-[0-9]{4}-[0-9]+$' "
+        "GROUP BY split_part(trade_number, '-', 2)"
+    )
+
+
+def downgrade() -> None:
+    """Drop document_sequences."""
+    op.drop_table('document_sequences')
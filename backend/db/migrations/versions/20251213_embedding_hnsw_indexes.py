@@ -0,0 +1,48 @@
+"""embedding_hnsw_indexes
+
+Replace the ivfflat cosine indexes on requirement_embeddings and
+availability_embeddings with HNSW. The ivfflat indexes were built when the
+tables were empty, so their list centroids are meaningless and recall at
+the default probes=1 is poor; HNSW needs no training data and keeps recall
+high as rows are added. Requires pgvector >= 0.5.0.
+
+Revision ID: 20251213_embedding_hnsw
+Revises: 20251212_document_sequences
+Create Date: 2025-12-13
+
+"""
+from __future__ import annotations
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '20251213_embedding_hnsw'
+down_revision = '20251212_document_sequences'
+branch_labels = None
+depends_on = None
+
+
+_TABLES = ('requirement_embeddings', 'availability_embeddings')
+
+
+def upgrade() -> None:
+    """Swap ivfflat for HNSW (vector_cosine_ops)."""
+    for table in _TABLES:
+        op.execute(f'DROP INDEX IF EXISTS ix_{table}_vector')
+        op.execute(
+            f'CREATE INDEX ix_{table}_vector '
+            f'ON {table} USING hnsw (embedding vector_cosine_ops) '
+            'WITH (m = 16, ef_construction = 64)'
+        )
+
+
+def downgrade() -> None:
+    """Restore the ivfflat indexes."""
+    for table in _TABLES:
+        op.execute(f'DROP INDEX IF EXISTS ix_{table}_vector')
+        op.execute(
+            f'CREATE INDEX ix_{table}_vector '
+            f'ON {table} USING ivfflat (embedding vector_cosine_ops) '
+            'WITH (lists = 100)'
+        )
@@ -0,0 +1,67 @@
+"""
+pgvector HNSW scan settings
+
+An HNSW index scan yields at most hnsw.ef_search candidates (default 40)
+and WHERE filters / OFFSET are applied to those afterwards, so a filtered
+or paginated "ORDER BY embedding <=> :q" query silently returns short or
+empty pages once the answer lies beyond the first ef_search neighbours.
+
+widen_hnsw_scan() raises ef_search to cover the rows the query needs
+(skip + limit) and, on pgvector >= 0.8, turns on iterative scans so the
+index keeps searching until enough rows pass the filters. Both are set
+transaction-locally (set_config(..., true)) in one statement, so pooled
+connections never keep them.
+"""
+
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# pgvector's default and maximum for hnsw.ef_search
+HNSW_DEFAULT_EF_SEARCH = 40
+HNSW_MAX_EF_SEARCH = 1000
+
+_SET_EF_SEARCH = text("SELECT set_config('hnsw.ef_search', :ef_search, true)")
+_SET_EF_SEARCH_ITERATIVE = text(
+    "SELECT set_config('hnsw.ef_search', :ef_search, true), "
+    "set_config('hnsw.iterative_scan', 'strict_order', true)"
+)
+
+# None until probed; iterative scans need pgvector >= 0.8
+_iterative_scan_supported: Optional[bool] = None
+
+
+async def _supports_iterative_scan(db: AsyncSession) -> bool:
+    global _iterative_scan_supported
+    if _iterative_scan_supported is None:
+        result = await db.execute(
+            text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+        )
+        version = result.scalar_one_or_none()
+        try:
+            major, minor = (int(part) for part in str(version).split(".")[:2])
+        except ValueError:
+            major, minor = 0, 0
+        _iterative_scan_supported = (major, minor) >= (0, 8)
+    return _iterative_scan_supported
+
+
+async def widen_hnsw_scan(db: AsyncSession, rows_needed: int) -> None:
+    """
+    Let the next HNSW-ordered query in this transaction return rows_needed rows.
+
+    Args:
+        db: Session the vector query will run on (same transaction)
+        rows_needed: skip + limit of the query
+    """
+    ef_search = min(max(rows_needed, HNSW_DEFAULT_EF_SEARCH), HNSW_MAX_EF_SEARCH)
+    statement = _SET_EF_SEARCH_ITERATIVE if await _supports_iterative_scan(db) else _SET_EF_SEARCH
+    await db.execute(statement, {"ef_search": str(ef_search)})
+
+
+def reset_iterative_scan_probe() -> None:
+    """Forget the probed pgvector version (tests / extension upgrades)."""
+    global _iterative_scan_supported
+    _iterative_scan_supported = None
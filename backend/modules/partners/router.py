@@ -841,85 +841,56 @@ async def export_partners(
     state: Optional[str] = None,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
-    db: AsyncSession = Depends(get_db),
     organization_id: UUID = Depends(get_current_organization_id)
 ):
     """
-    Export partners to Excel or CSV.
+    Export partners to Excel (.xlsx) or CSV.
     
-    Uses PartnerAnalyticsService for clean architecture (15-year design).
+    Streams rows from a server-side cursor straight into the response, one
+    chunk at a time. The export opens its own session: request-scoped
+    dependencies are closed before a StreamingResponse body is sent.
     """
     from fastapi.responses import StreamingResponse
-    import io
-    import csv
     from datetime import datetime
     
-    # Use analytics service
-    analytics_service = PartnerAnalyticsService(db)
+    from backend.core.export import XLSX_MEDIA_TYPE, stream_csv, stream_xlsx
+    from backend.db.async_session import AsyncSessionLocal
+    from backend.modules.partners.services.analytics import EXPORT_HEADERS
     
     # Parse dates
     date_from_dt = datetime.fromisoformat(date_from) if date_from else None
     date_to_dt = datetime.fromisoformat(date_to) if date_to else None
     
-    # Get export data
-    partners = await analytics_service.get_export_data(
-        organization_id=organization_id,
-        partner_type=partner_type,
-        status=status,
-        kyc_status=kyc_status,
-        state=state,
-        date_from=date_from_dt,
-        date_to=date_to_dt,
-    )
-    
-    # Create CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Headers
-    writer.writerow([
-        'Business Name', 'GSTIN', 'PAN', 'Partner Type', 'Status', 
-        'KYC Status', 'KYC Expiry', 'Risk Score', 'Risk Category',
-        'State', 'Contact Person', 'Email', 'Phone', 'Created At'
-    ])
-    
-    # Data
-    for p in partners:
-        writer.writerow([
-            p.legal_business_name,
-            p.tax_id_number,
-            p.pan_number,
-            p.partner_type,
-            p.status,
-            p.kyc_status,
-            p.kyc_expiry_date.isoformat() if p.kyc_expiry_date else '',
-            p.risk_score or '',
-            p.risk_category or '',
-            p.primary_state or '',
-            p.primary_contact_person,
-            p.primary_contact_email,
-            p.primary_contact_phone,
-            p.created_at.isoformat()
-        ])
-    
-    output.seek(0)
+    async def row_chunks():
+        async with AsyncSessionLocal() as session:
+            analytics_service = PartnerAnalyticsService(session)
+            async for chunk in analytics_service.iter_export_rows(
+                organization_id=organization_id,
+                entity_class=entity_class,
+                status=status,
+                kyc_status=kyc_status,
+                state=state,
+                date_from=date_from_dt,
+                date_to=date_to_dt,
+            ):
+                yield chunk
+    
+    stamp = datetime.now().strftime('%Y%m%d')
     
     if format == "excel":
-        # For Excel, you'd use openpyxl or pandas
-        # For now, return CSV with Excel mime type
         return StreamingResponse(
-            iter([output.getvalue()]),
-            media_type="application/vnd.ms-excel",
+            stream_xlsx(EXPORT_HEADERS, row_chunks(), sheet_name="Partners"),
+            media_type=XLSX_MEDIA_TYPE,
             headers={
-                "Content-Disposition": f"attachment; filename=partners_{datetime.now().strftime('%Y%m%d')}.csv"
+                "Content-Disposition": f"attachment; filename=partners_{stamp}.xlsx"
             }
         )
     else:
         return StreamingResponse(
-            iter([output.getvalue()]),
+            stream_csv(EXPORT_HEADERS, row_chunks()),
             media_type="text/csv",
             headers={
-                "Content-Disposition": f"attachment; filename=partners_{datetime.now().strftime('%Y%m%d')}.csv"
+                "Content-Disposition": f"attachment; filename=partners_{stamp}.csv"
             }
         )
 
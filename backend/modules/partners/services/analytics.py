@@ -7,7 +7,7 @@ Extracted from router to maintain clean architecture for 15 years.
 NO business logic changes - pure extraction.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 from uuid import UUID
 from datetime import datetime, timedelta
 
@@ -21,6 +21,31 @@ from backend.modules.partners.enums import PartnerStatus, KYCStatus, RiskCategor
 from backend.modules.partners.schemas import DashboardStats
 
 
+# Partner export: header -> column (selected as plain columns, not entities)
+EXPORT_HEADERS = [
+    'Business Name', 'GSTIN', 'PAN', 'Partner Type', 'Status',
+    'KYC Status', 'KYC Expiry', 'Risk Score', 'Risk Category',
+    'State', 'Contact Person', 'Email', 'Phone', 'Created At'
+]
+EXPORT_COLUMNS = [
+    BusinessPartner.legal_name,
+    BusinessPartner.tax_id_number,
+    BusinessPartner.pan_number,
+    BusinessPartner.entity_class,
+    BusinessPartner.status,
+    BusinessPartner.kyc_status,
+    BusinessPartner.kyc_expiry_date,
+    BusinessPartner.risk_score,
+    BusinessPartner.risk_category,
+    BusinessPartner.primary_state,
+    BusinessPartner.primary_contact_name,
+    BusinessPartner.primary_contact_email,
+    BusinessPartner.primary_contact_phone,
+    BusinessPartner.created_at,
+]
+EXPORT_CHUNK_SIZE = 1000
+
+
 class PartnerAnalyticsService:
     """
     Service for partner analytics and reporting.
@@ -156,7 +181,7 @@ class PartnerAnalyticsService:
             "monthly_trend": monthly_trend,
         }
     
-    async def get_export_data(
+    async def iter_export_rows(
         self,
         organization_id: UUID,
         entity_class: Optional[str] = None,
@@ -165,17 +190,20 @@ class PartnerAnalyticsService:
         state: Optional[str] = None,
         date_from: Optional[datetime] = None,
         date_to: Optional[datetime] = None,
-    ) -> List[BusinessPartner]:
+        chunk_size: int = EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[List[tuple]]:
         """
-        Get partners for export (Excel/CSV).
+        Stream partners for export (Excel/CSV) in chunks.
         
-        Returns:
-            List of partner records matching filters
+        Reads only the EXPORT_COLUMNS through a server-side cursor, so
+        memory stays bounded by chunk_size whatever the partner count.
+        Partners are not organization-scoped (see PartnerRepository.list_all);
+        organization_id is accepted for API symmetry.
+        
+        Yields:
+            Lists of up to chunk_size rows, in EXPORT_HEADERS order
         """
-        query = select(BusinessPartner).where(
-            BusinessPartner.organization_id == organization_id,
-            BusinessPartner.is_deleted == False
-        )
+        query = select(*EXPORT_COLUMNS).where(BusinessPartner.is_deleted == False)
         
         if entity_class:
             query = query.where(BusinessPartner.entity_class == entity_class)
@@ -190,8 +218,10 @@ class PartnerAnalyticsService:
         if date_to:
             query = query.where(BusinessPartner.created_at <= date_to)
         
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        query = query.order_by(BusinessPartner.created_at).execution_options(yield_per=chunk_size)
+        result = await self.db.stream(query)
+        async for partition in result.partitions(chunk_size):
+            yield [tuple(row) for row in partition]
     
     async def get_dashboard_stats_response(
         self,
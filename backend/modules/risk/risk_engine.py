@@ -18,7 +18,7 @@ Key Features:
 """
 
 from decimal import Decimal
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Set, Tuple
 from uuid import UUID
 from datetime import datetime, date
 
@@ -55,6 +55,11 @@ class RiskEngine:
     RATING_WEIGHT = 0.30  # 30%
     PERFORMANCE_WEIGHT = 0.30  # 30%
     
+    # Neutral values for partner data not on file (rating/performance
+    # scores are not stored on BusinessPartner yet)
+    DEFAULT_PARTNER_RATING = Decimal("4.0")
+    DEFAULT_PERFORMANCE_SCORE = 75
+    
     def __init__(self, db: AsyncSession):
         self.db = db
     
@@ -470,6 +475,116 @@ class RiskEngine:
             seller_partner_id=availability.seller_id
         )
         
+        return self._build_trade_risk(
+            requirement=requirement,
+            availability=availability,
+            trade_value=trade_value,
+            buyer_assessment=buyer_assessment,
+            seller_assessment=seller_assessment,
+            party_link_check=party_link_check
+        )
+    
+    async def assess_trade_risk_batch(
+        self,
+        requirement: Requirement,
+        availabilities: List[Availability],
+        trade_terms: Dict[UUID, Tuple[Decimal, Decimal]],
+        user_id: Optional[UUID],
+        buyer_data: Optional[Dict[str, Any]] = None,
+        seller_data: Optional[Dict[UUID, Dict[str, Any]]] = None
+    ) -> Dict[UUID, Dict[str, Any]]:
+        """
+        Assess bilateral risk for one requirement against many availabilities.
+        
+        Same result per pair as assess_trade_risk(), but:
+        - Buyer and all sellers are fetched with a single IN (...) query,
+          used for both their credit data and party links
+        - Buyer side is assessed once for the whole run
+        - Party links are memoized per seller_id
+        
+        Args:
+            requirement: Buyer's requirement
+            availabilities: Candidate availabilities
+            trade_terms: availability_id -> (trade_quantity, trade_price)
+            user_id: User performing assessment
+            buyer_data: Buyer credit/rating/performance data
+                (default: loaded from the buyer's partner record)
+            seller_data: seller_id -> seller credit/rating/performance data
+                (sellers not given are loaded from their partner records)
+            
+        Returns:
+            Dict of availability_id -> bilateral risk assessment
+        """
+        if not availabilities:
+            return {}
+        
+        partners = await self._load_partners(
+            {requirement.buyer_partner_id} | {a.seller_id for a in availabilities}
+        )
+        if buyer_data is None:
+            buyer_data = self._partner_risk_data(partners.get(requirement.buyer_partner_id))
+        seller_data = seller_data or {}
+        
+        # Buyer side: identical for every pair
+        buyer_assessment = await self.assess_buyer_risk(
+            requirement=requirement,
+            buyer_credit_limit=buyer_data["credit_limit"],
+            buyer_current_exposure=buyer_data["current_exposure"],
+            buyer_rating=buyer_data["rating"],
+            buyer_payment_performance=buyer_data["payment_performance"],
+            user_id=user_id
+        )
+        
+        # Party links: one query for all candidate sellers
+        party_links = await self.check_party_links_batch(
+            buyer_partner_id=requirement.buyer_partner_id,
+            seller_partner_ids=[a.seller_id for a in availabilities],
+            partners=partners
+        )
+        
+        results = {}
+        for availability in availabilities:
+            trade_quantity, trade_price = trade_terms[availability.id]
+            seller = seller_data.get(availability.seller_id)
+            if seller is None:
+                seller = seller_data[availability.seller_id] = self._partner_risk_data(
+                    partners.get(availability.seller_id)
+                )
+            
+            seller_assessment = await self.assess_seller_risk(
+                availability=availability,
+                seller_credit_limit=seller["credit_limit"],
+                seller_current_exposure=seller["current_exposure"],
+                seller_rating=seller["rating"],
+                seller_delivery_performance=seller["delivery_performance"],
+                user_id=user_id
+            )
+            
+            results[availability.id] = self._build_trade_risk(
+                requirement=requirement,
+                availability=availability,
+                trade_value=trade_quantity * trade_price,
+                # Copy: _build_trade_risk appends pair-specific risk factors
+                buyer_assessment={
+                    **buyer_assessment,
+                    "risk_factors": list(buyer_assessment["risk_factors"])
+                },
+                seller_assessment=seller_assessment,
+                party_link_check=party_links[availability.seller_id]
+            )
+        
+        return results
+    
+    def _build_trade_risk(
+        self,
+        requirement: Requirement,
+        availability: Availability,
+        trade_value: Decimal,
+        buyer_assessment: Dict[str, Any],
+        seller_assessment: Dict[str, Any],
+        party_link_check: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Combine buyer/seller assessments and party links into trade risk."""
         # ====================================================================
         # Check internal trade blocking (same branch)
         # ====================================================================
@@ -822,6 +937,65 @@ class RiskEngine:
         buyer = buyer_result.scalar_one_or_none()
         seller = seller_result.scalar_one_or_none()
         
+        return self._evaluate_party_links(buyer, seller)
+    
+    async def check_party_links_batch(
+        self,
+        buyer_partner_id: UUID,
+        seller_partner_ids: List[UUID],
+        partners: Optional[Dict[UUID, BusinessPartner]] = None
+    ) -> Dict[UUID, Dict[str, Any]]:
+        """
+        Check party links between one buyer and many sellers.
+        
+        Fetches the buyer and all sellers with a single IN (...) query,
+        unless the caller already loaded them (`partners`, keyed by ID).
+        
+        Returns:
+            Dict of seller_partner_id -> check_party_links() result
+        """
+        unique_seller_ids = set(seller_partner_ids)
+        
+        if partners is None:
+            partners = await self._load_partners(unique_seller_ids | {buyer_partner_id})
+        
+        buyer = partners.get(buyer_partner_id)
+        return {
+            seller_id: self._evaluate_party_links(buyer, partners.get(seller_id))
+            for seller_id in unique_seller_ids
+        }
+    
+    async def _load_partners(self, partner_ids: Set[UUID]) -> Dict[UUID, BusinessPartner]:
+        """Fetch partners with one IN (...) query, keyed by ID."""
+        query = select(BusinessPartner).where(BusinessPartner.id.in_(partner_ids))
+        result = await self.db.execute(query)
+        return {partner.id: partner for partner in result.scalars().all()}
+    
+    def _partner_risk_data(self, partner: Optional[BusinessPartner]) -> Dict[str, Any]:
+        """
+        Credit/rating/performance data for assess_buyer_risk/assess_seller_risk.
+        
+        No credit limit on file counts as no credit headroom; missing
+        rating/performance scores fall back to neutral defaults.
+        """
+        return {
+            "credit_limit": (partner.credit_limit if partner else None) or Decimal(0),
+            "current_exposure": (partner.credit_utilized if partner else None) or Decimal(0),
+            "rating": getattr(partner, "rating", None) or self.DEFAULT_PARTNER_RATING,
+            "payment_performance": (
+                getattr(partner, "payment_performance_score", None) or self.DEFAULT_PERFORMANCE_SCORE
+            ),
+            "delivery_performance": (
+                getattr(partner, "delivery_performance_score", None) or self.DEFAULT_PERFORMANCE_SCORE
+            ),
+        }
+    
+    def _evaluate_party_links(
+        self,
+        buyer: Optional[BusinessPartner],
+        seller: Optional[BusinessPartner]
+    ) -> Dict[str, Any]:
+        """Compare two loaded partners for ownership links (see check_party_links)."""
         if not buyer or not seller:
             return {
                 "linked": False,
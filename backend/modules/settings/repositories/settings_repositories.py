@@ -6,6 +6,7 @@ from uuid import UUID
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.core.auth.capabilities.cache import get_capability_cache
 from backend.modules.settings.organization.models import Organization
 from backend.modules.settings.models.settings_models import (
 	Permission,
@@ -207,6 +208,8 @@ class UserRoleRepository(BaseRepo):
 		ur = await self.db.get(UserRole, {"user_id": user_id, "role_id": role_id})
 		if ur is None:
 			self.db.add(UserRole(user_id=user_id, role_id=role_id))
+			# Role-inherited capabilities changed for this user
+			get_capability_cache().invalidate_on_commit(self.db, user_id)
 
 
 class RefreshTokenRepository(BaseRepo):
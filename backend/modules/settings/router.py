@@ -198,14 +198,14 @@ async def change_password(
     hasher = PasswordHasher()
     
     # Verify old password
-    if not hasher.verify(payload.old_password, current_user.password_hash):
+    if not await hasher.verify_async(payload.old_password, current_user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Current password is incorrect"
         )
     
     # Update password
-    current_user.password_hash = hasher.hash(payload.new_password)
+    current_user.password_hash = await hasher.hash_async(payload.new_password)
     await db.flush()
     
     # Revoke all sessions for security
@@ -11,6 +11,7 @@ import redis.asyncio as redis
 
 from backend.core.auth.capabilities.definitions import Capabilities
 from backend.core.auth.passwords import PasswordHasher
+from backend.core.auth.principal_cache import get_principal_cache
 from backend.core.auth.jwt import create_token
 from backend.core.settings.config import settings
 from backend.core.outbox import OutboxRepository
@@ -98,7 +99,7 @@ class AuthService:
 		# Use configurable organization name for multi-commodity support
 		org_name = settings.DEFAULT_ORGANIZATION_NAME
 		org = await self.org_repo.get_by_name(org_name) or await self.org_repo.create(org_name)
-		hashed = self.hasher.hash(password)
+		hashed = await self.hasher.hash_async(password)
 		user = await self.user_repo.create(org.id, email, full_name, hashed)
 		return user
 
@@ -117,8 +118,11 @@ class AuthService:
 		
 		if not user.is_active:
 			raise ValueError(ERR_ACCOUNT_INACTIVE)
-		if not self.hasher.verify(password, user.password_hash):
+		valid, new_hash = await self.hasher.verify_and_update_async(password, user.password_hash)
+		if not valid:
 			raise ValueError(ERR_INVALID_CREDENTIALS)
+		if new_hash:
+			user.password_hash = new_hash  # Hash parameters upgraded; flushed with the refresh token
 		access_minutes = settings.ACCESS_TOKEN_EXPIRES_MINUTES
 		refresh_days = settings.REFRESH_TOKEN_EXPIRES_DAYS
 		access = create_token(str(user.id), str(user.organization_id), minutes=access_minutes, token_type="access")
@@ -217,7 +221,8 @@ class AuthService:
 		Revoke all sessions for a user (called on password change).
 		This forces re-authentication on all devices.
 		"""
-		await self.logout_all_devices(user_id)
+		get_principal_cache().invalidate_on_commit(self.db, user_id)
+		return await self.logout_all_devices(user_id)
 
 	async def create_sub_user(
 		self,
@@ -250,7 +255,7 @@ class AuthService:
 		if pin:
 			if not re.match(r'^\d{4,6}$', pin):
 				raise ValueError("PIN must be 4-6 digits")
-			pin_hash = self.hasher.hash(pin)
+			pin_hash = await self.hasher.hash_async(pin)
 		
 		# Create sub-user (repository enforces max 2 limit and validations)
 		sub_user = await self.user_repo.create_sub_user(
@@ -308,6 +313,7 @@ class AuthService:
 		
 		await self.db.delete(sub_user)
 		await self.db.flush()
+		get_principal_cache().invalidate_on_commit(self.db, sub_user_id)
 
 	async def disable_sub_user(self, parent_user_id: str, sub_user_id: str) -> User:
 		"""Disable a sub-user (only if owned by parent)."""
@@ -321,6 +327,7 @@ class AuthService:
 			raise ValueError("You can only disable your own sub-users")
 		
 		await self.user_repo.disable_sub_user(UUID(sub_user_id))
+		get_principal_cache().invalidate_on_commit(self.db, sub_user_id)
 		
 		# Emit event
 		sub_user.emit_event(
@@ -347,6 +354,7 @@ class AuthService:
 			raise ValueError("You can only enable your own sub-users")
 		
 		await self.user_repo.enable_sub_user(UUID(sub_user_id))
+		get_principal_cache().invalidate_on_commit(self.db, sub_user_id)
 		
 		# Emit event
 		sub_user.emit_event(
@@ -371,7 +379,7 @@ class AuthService:
 			raise ValueError("PIN must be 4-6 digits")
 		
 		# Hash the PIN
-		pin_hash = self.hasher.hash(pin)
+		pin_hash = await self.hasher.hash_async(pin)
 		
 		# Enable 2FA
 		await self.user_repo.enable_2fa(UUID(user_id), pin_hash)
@@ -385,8 +393,11 @@ class AuthService:
 		if not user.two_fa_enabled or not user.pin_hash:
 			raise ValueError("2FA not enabled for this user")
 		
-		if not self.hasher.verify(pin, user.pin_hash):
+		valid, new_hash = await self.hasher.verify_and_update_async(pin, user.pin_hash)
+		if not valid:
 			raise ValueError("Invalid PIN")
+		if new_hash:
+			user.pin_hash = new_hash
 		
 		# Issue tokens
 		access_minutes = settings.ACCESS_TOKEN_EXPIRES_MINUTES
@@ -436,7 +447,8 @@ class AuthService:
 			raise ValueError("User account is inactive")
 		
 		# Verify password
-		if not self.hasher.verify(password, user.password_hash):
+		valid, new_hash = await self.hasher.verify_and_update_async(password, user.password_hash)
+		if not valid:
 			lockout_info = await lockout_service.record_failed_attempt(email)
 			if lockout_info["locked"]:
 				raise ValueError(lockout_info["message"])
@@ -444,6 +456,8 @@ class AuthService:
 		
 		# Clear failed attempts on successful password verification
 		await lockout_service.clear_failed_attempts(email)
+		if new_hash:
+			user.password_hash = new_hash  # Hash parameters upgraded
 		
 		# Check if 2FA is enabled
 		if user.two_fa_enabled:
@@ -86,6 +86,11 @@ class MatchingConfig:
     DUPLICATE_TIME_WINDOW_MINUTES: int = 5
     DUPLICATE_SIMILARITY_THRESHOLD: float = 0.95  # 95% param match
     
+    # Match audit trail (buffered bulk writes, also backs the duplicate window)
+    MATCH_AUDIT_FLUSH_INTERVAL_MS: int = 500
+    MATCH_AUDIT_FLUSH_ROWS: int = 500  # Flush early once this many rows are buffered
+    MATCH_AUDIT_MAX_BUFFER_ROWS: int = 50000  # Oldest rows dropped beyond this (DB down)
+    
     # ========================================================================
     # NOTIFICATION SETTINGS
     # ========================================================================
@@ -104,10 +109,22 @@ class MatchingConfig:
     # PERFORMANCE TUNING
     # ========================================================================
     
-    MATCH_BATCH_SIZE: int = 100  # For high-volume scenarios
-    MATCH_BATCH_DELAY_MS: int = 1000  # 1s micro-batching
+    MATCH_BATCH_SIZE: int = 100  # Max queued requests coalesced into one batch
+    MATCH_BATCH_DELAY_MS: int = 1000  # 1s coalescing window (HIGH priority never waits)
     MAX_CONCURRENT_MATCHES: int = 50  # Max results per search
     
+    # Background matching workers (shared queue across API/worker processes)
+    MATCH_WORKER_COUNT: int = 4  # Concurrent workers per process
+    MATCH_QUEUE_BACKEND: str = "redis"  # "redis" (durable, shared) or "memory"
+    MATCH_QUEUE_LEASE_SECONDS: int = 300  # Requeue if worker dies mid-match
+    MATCH_QUEUE_POLL_INTERVAL_MS: int = 250  # Empty-queue poll interval
+    
+    # In-memory candidate index (commodity/state/geo cell) used by workers
+    CANDIDATE_INDEX_ENABLED: bool = True
+    CANDIDATE_INDEX_CELL_KM: float = 50.0  # Grid cell size
+    CANDIDATE_INDEX_REFRESH_SECONDS: int = 900  # Full reload to reconcile missed events
+    CANDIDATE_INDEX_SYNC_OVERLAP_SECONDS: int = 60  # Re-read window for late-committing writes
+    
     # ========================================================================
     # RISK WARN PENALTY
     # ========================================================================
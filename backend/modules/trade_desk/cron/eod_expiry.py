@@ -4,17 +4,27 @@ EOD (End of Day) Expiry Cron Job
 Automatically expires availabilities and requirements past their EOD cutoff time.
 
 DESIGN:
-- Timezone-aware expiry (respects location.timezone)
+- Timezone-aware expiry (eod_cutoff is pre-calculated per location timezone, stored in UTC)
 - Runs every hour via APScheduler
 - Updates status: ACTIVE → EXPIRED
-- Emits events for notifications
+- Emits events for notifications (transactional outbox)
+- Set-based and chunked: no ORM objects are loaded
 
-WORKFLOW:
-1. Find availabilities/requirements with eod_cutoff <= NOW() (UTC)
-2. Join with settings_locations to get timezone
-3. Calculate timezone-adjusted EOD (midnight in that timezone)
-4. Update status to EXPIRED
-5. Emit 'availability.expired' or 'requirement.expired' event
+WORKFLOW (per chunk of CHUNK_SIZE rows, one short transaction each):
+1. UPDATE ... SET status = 'EXPIRED' WHERE id IN (
+       SELECT id ... WHERE eod_cutoff <= NOW() (UTC) AND status is live
+       ORDER BY eod_cutoff LIMIT n FOR UPDATE SKIP LOCKED
+   ) RETURNING id, ...
+2. ONE multi-row INSERT of 'AvailabilityExpired' / 'RequirementExpired'
+   events into the outbox
+3. COMMIT - status change and events land together
+
+RESUMABLE:
+- Every chunk commits on its own; an interrupted run leaves the rest
+  live and the next run (or a re-run) continues from there
+- Rows locked by concurrent writers are skipped, not waited on, and
+  picked up by the next run
+- Outbox idempotency keys ('<type>:<id>:eod') make a replayed chunk a no-op
 
 TIMEZONE SUPPORT:
 - Mumbai (Asia/Kolkata): EOD = 11:59 PM IST
@@ -25,19 +35,18 @@ TIMEZONE SUPPORT:
 
 import logging
 from datetime import datetime, timezone
-from typing import List
-from uuid import UUID
+from typing import Any, Dict, List, Optional, Sequence
 
 import pytz
-from sqlalchemy import select, and_, update
+from sqlalchemy import and_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
+from backend.core.outbox import OutboxRepository
+from backend.db.async_session import AsyncSessionLocal
 from backend.modules.trade_desk.models.availability import Availability
 from backend.modules.trade_desk.models.requirement import Requirement
 from backend.modules.trade_desk.enums import AvailabilityStatus, RequirementStatus
 from backend.modules.settings.locations.models import Location
-from backend.core.database import get_async_session
 
 logger = logging.getLogger(__name__)
 
@@ -46,17 +55,33 @@ class EODExpiryJob:
     """
     End of Day expiry management with timezone awareness.
     
-    Automatically expires positions past their EOD cutoff.
+    Automatically expires positions past their EOD cutoff, in chunks.
     """
     
-    def __init__(self, db: AsyncSession):
+    # Rows expired (and events written) per transaction
+    CHUNK_SIZE = 1000
+    
+    # Live statuses (not already EXPIRED/SOLD/FULFILLED/CANCELLED, not DRAFT/BLOCKED)
+    EXPIRABLE_AVAILABILITY_STATUSES = (
+        AvailabilityStatus.ACTIVE.value,
+        AvailabilityStatus.RESERVED.value,
+    )
+    EXPIRABLE_REQUIREMENT_STATUSES = (
+        RequirementStatus.ACTIVE.value,
+        RequirementStatus.PARTIALLY_FULFILLED.value,
+    )
+    
+    def __init__(self, db: AsyncSession, chunk_size: int = CHUNK_SIZE):
         """
         Initialize EOD expiry job.
         
         Args:
-            db: Async SQLAlchemy session
+            db: Async SQLAlchemy session (committed once per chunk)
+            chunk_size: Rows expired per transaction
         """
         self.db = db
+        self.chunk_size = chunk_size
+        self.outbox_repo = OutboxRepository(db)
     
     async def expire_availabilities(self) -> int:
         """
@@ -67,50 +92,32 @@ class EODExpiryJob:
         """
         now_utc = datetime.now(timezone.utc)
         
-        # Query availabilities with eod_cutoff <= now_utc
-        # Status must be ACTIVE or AVAILABLE (not already EXPIRED/SOLD/CANCELLED)
-        query = (
-            select(Availability)
-            .options(selectinload(Availability.location))
+        due = (
+            select(Availability.id)
             .where(
                 and_(
-                    Availability.status.in_([
-                        AvailabilityStatus.ACTIVE.value,
-                        AvailabilityStatus.AVAILABLE.value,
-                        AvailabilityStatus.PARTIALLY_SOLD.value
-                    ]),
+                    Availability.status.in_(self.EXPIRABLE_AVAILABILITY_STATUSES),
                     Availability.eod_cutoff <= now_utc
                 )
             )
+            .order_by(Availability.eod_cutoff)
+            .limit(self.chunk_size)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(Availability)
+            .where(Availability.id.in_(due.scalar_subquery()))
+            .values(status=AvailabilityStatus.EXPIRED.value, updated_at=now_utc)
+            .returning(Availability.id, Availability.seller_partner_id, Availability.eod_cutoff)
+            .execution_options(synchronize_session=False)
         )
         
-        result = await self.db.execute(query)
-        availabilities = result.scalars().all()
-        
-        expired_count = 0
-        
-        for availability in availabilities:
-            # Log expiry with timezone info
-            location_tz = "UTC"
-            if availability.location and availability.location.timezone:
-                location_tz = availability.location.timezone
-            
-            logger.info(
-                f"Expiring availability {availability.id}: "
-                f"EOD cutoff {availability.eod_cutoff} (location timezone: {location_tz})"
-            )
-            
-            # Update status to EXPIRED
-            availability.status = AvailabilityStatus.EXPIRED.value
-            availability.updated_at = now_utc
-            
-            # Emit event (will be handled by event bus)
-            await self._emit_availability_expired_event(availability.id)
-            
-            expired_count += 1
-        
-        # Commit all updates
-        await self.db.commit()
+        expired_count = await self._expire_in_chunks(
+            stmt,
+            lambda rows: self._expired_events(
+                rows, "Availability", "availability", "seller_id", now_utc
+            ),
+        )
         
         logger.info(f"Expired {expired_count} availabilities at {now_utc}")
         
@@ -125,47 +132,34 @@ class EODExpiryJob:
         """
         now_utc = datetime.now(timezone.utc)
         
-        # Query requirements with eod_cutoff <= now_utc
-        # Status must be ACTIVE or PENDING_APPROVAL (not already EXPIRED/FULFILLED/CANCELLED)
-        query = (
-            select(Requirement)
+        # Note: Requirements don't have location directly, they have delivery_locations JSONB
+        # EOD cutoff is already pre-calculated and stored in UTC
+        due = (
+            select(Requirement.id)
             .where(
                 and_(
-                    Requirement.status.in_([
-                        RequirementStatus.ACTIVE.value,
-                        RequirementStatus.PENDING_APPROVAL.value,
-                        RequirementStatus.PARTIALLY_FULFILLED.value
-                    ]),
+                    Requirement.status.in_(self.EXPIRABLE_REQUIREMENT_STATUSES),
                     Requirement.eod_cutoff <= now_utc
                 )
             )
+            .order_by(Requirement.eod_cutoff)
+            .limit(self.chunk_size)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(Requirement)
+            .where(Requirement.id.in_(due.scalar_subquery()))
+            .values(status=RequirementStatus.EXPIRED.value, updated_at=now_utc)
+            .returning(Requirement.id, Requirement.buyer_partner_id, Requirement.eod_cutoff)
+            .execution_options(synchronize_session=False)
         )
         
-        result = await self.db.execute(query)
-        requirements = result.scalars().all()
-        
-        expired_count = 0
-        
-        for requirement in requirements:
-            # Note: Requirements don't have location directly, they have delivery_locations JSONB
-            # EOD cutoff is already pre-calculated and stored in UTC
-            
-            logger.info(
-                f"Expiring requirement {requirement.id}: "
-                f"EOD cutoff {requirement.eod_cutoff}"
-            )
-            
-            # Update status to EXPIRED
-            requirement.status = RequirementStatus.EXPIRED.value
-            requirement.updated_at = now_utc
-            
-            # Emit event (will be handled by event bus)
-            await self._emit_requirement_expired_event(requirement.id)
-            
-            expired_count += 1
-        
-        # Commit all updates
-        await self.db.commit()
+        expired_count = await self._expire_in_chunks(
+            stmt,
+            lambda rows: self._expired_events(
+                rows, "Requirement", "requirement", "buyer_id", now_utc
+            ),
+        )
         
         logger.info(f"Expired {expired_count} requirements at {now_utc}")
         
@@ -211,41 +205,86 @@ class EODExpiryJob:
         
         return result
     
-    async def _emit_availability_expired_event(self, availability_id: UUID) -> None:
+    async def _expire_in_chunks(self, stmt, build_events) -> int:
         """
-        Emit availability.expired event.
+        Run the chunked UPDATE ... RETURNING until a short chunk.
+        
+        Each chunk's status change and outbox events commit together; on
+        failure the current chunk rolls back and earlier chunks stay done.
         
         Args:
-            availability_id: Availability UUID
+            stmt: UPDATE ... RETURNING (id, partner_id, eod_cutoff) limited to chunk_size
+            build_events: rows -> outbox event dicts
+        
+        Returns:
+            Total rows expired
+        """
+        total = 0
+        while True:
+            try:
+                rows = (await self.db.execute(stmt)).all()
+                if rows:
+                    await self.outbox_repo.add_events_bulk(build_events(rows))
+                await self.db.commit()
+            except Exception:
+                await self.db.rollback()
+                raise
+            
+            total += len(rows)
+            if rows:
+                logger.info(f"EOD expiry chunk: {len(rows)} rows (total {total})")
+            if len(rows) < self.chunk_size:
+                return total
+    
+    @staticmethod
+    def _cutoff_key(eod_cutoff: Optional[datetime]) -> str:
         """
-        # TODO: Integrate with event bus
-        # For now, just log
-        logger.info(f"Event: availability.expired - {availability_id}")
+        UTC form of the cutoff for idempotency keys.
         
-        # When event bus is integrated:
-        # await event_bus.emit('availability.expired', {
-        #     'availability_id': str(availability_id),
-        #     'expired_at': datetime.now(timezone.utc).isoformat(),
-        #     'reason': 'EOD_CUTOFF'
-        # })
+        A position that is re-activated and expires again on a later cutoff
+        must get a new key, or its second event is dropped as a duplicate.
+        """
+        if eod_cutoff is None:
+            return "none"
+        if eod_cutoff.tzinfo is None:
+            eod_cutoff = eod_cutoff.replace(tzinfo=timezone.utc)  # Stored in UTC
+        return eod_cutoff.astimezone(timezone.utc).isoformat()
     
-    async def _emit_requirement_expired_event(self, requirement_id: UUID) -> None:
+    @staticmethod
+    def _expired_events(
+        rows: Sequence[Any],
+        aggregate_type: str,
+        name: str,
+        partner_key: str,
+        expired_at: datetime,
+    ) -> List[Dict[str, Any]]:
         """
-        Emit requirement.expired event.
+        Outbox rows for '<Aggregate>Expired' events.
         
         Args:
-            requirement_id: Requirement UUID
+            rows: (id, partner_id, eod_cutoff) tuples from RETURNING
+            aggregate_type: "Availability" or "Requirement"
+            name: Lower-case name used in payload keys and topic
+            partner_key: Payload key for the partner ID
+            expired_at: Job run time (UTC)
         """
-        # TODO: Integrate with event bus
-        # For now, just log
-        logger.info(f"Event: requirement.expired - {requirement_id}")
-        
-        # When event bus is integrated:
-        # await event_bus.emit('requirement.expired', {
-        #     'requirement_id': str(requirement_id),
-        #     'expired_at': datetime.now(timezone.utc).isoformat(),
-        #     'reason': 'EOD_CUTOFF'
-        # })
+        return [
+            {
+                "aggregate_id": row_id,
+                "aggregate_type": aggregate_type,
+                "event_type": f"{aggregate_type}Expired",
+                "payload": {
+                    f"{name}_id": str(row_id),
+                    partner_key: str(partner_id) if partner_id else None,
+                    "eod_cutoff": eod_cutoff.isoformat() if eod_cutoff else None,
+                    "expired_at": expired_at.isoformat(),
+                    "reason": "EOD_CUTOFF",
+                },
+                "topic_name": f"{name}-events",
+                "idempotency_key": f"{name}.expired:{row_id}:eod:{EODExpiryJob._cutoff_key(eod_cutoff)}",
+            }
+            for row_id, partner_id, eod_cutoff in rows
+        ]
 
 
 # ========================================================================
@@ -281,7 +320,7 @@ async def run_eod_expiry_job():
     scheduler.start()
     ```
     """
-    async for db in get_async_session():
+    async with AsyncSessionLocal() as db:
         try:
             eod_job = EODExpiryJob(db)
             result = await eod_job.run_eod_expiry()
@@ -290,8 +329,6 @@ async def run_eod_expiry_job():
         except Exception as e:
             logger.error(f"EOD expiry job failed: {e}", exc_info=True)
             raise
-        finally:
-            await db.close()
 
 
 # ========================================================================
@@ -3,17 +3,24 @@ Trade Desk Matching Engine Module
 
 Intelligent bilateral matching system with:
 - Location-first hard filtering
+- In-memory candidate index (commodity/state/geo cell)
 - Multi-factor scoring (quality/price/delivery/risk)
 - Event-driven real-time triggers  
 - Atomic partial allocation
-- Duplicate detection
+- Duplicate detection (buffered match audit trail)
 """
 
+from .audit_writer import MatchAuditWriter, get_match_audit_writer
+from .candidate_index import CandidateIndex, get_candidate_index
 from .matching_engine import MatchingEngine, MatchResult
 from .scoring import MatchScorer
 from .validators import MatchValidator
 
 __all__ = [
+    "MatchAuditWriter",
+    "get_match_audit_writer",
+    "CandidateIndex",
+    "get_candidate_index",
     "MatchingEngine",
     "MatchResult",
     "MatchScorer",
@@ -0,0 +1,313 @@
+"""
+Buffered Match Audit Trail Writer
+
+Keeps match_audit_trail writes off the matching hot path:
+- record() only appends rows to an in-process buffer
+- a background task flushes every MATCH_AUDIT_FLUSH_INTERVAL_MS (or as soon
+  as MATCH_AUDIT_FLUSH_ROWS are buffered) with one COPY (asyncpg) or one
+  multi-row INSERT per flush
+- recent_duplicate_keys() answers the duplicate time window from buffered
+  and written rows plus one indexed (commodity_id, created_at) query per
+  matching run
+
+Rows are best-effort: if the database is unavailable they are retried on
+the next flush, and the oldest rows are dropped once MATCH_AUDIT_MAX_BUFFER_ROWS
+is exceeded (audit must never stall matching).
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from backend.modules.trade_desk.models.match_audit_trail import MatchAuditTrail
+
+logger = logging.getLogger(__name__)
+
+
+# COPY column order (must match _to_row)
+_COLUMNS = (
+    "id",
+    "requirement_id",
+    "availability_id",
+    "commodity_id",
+    "triggered_by",
+    "duplicate_key",
+    "score",
+    "base_score",
+    "warn_penalty_applied",
+    "risk_status",
+    "score_breakdown",
+    "pass_fail",
+    "risk_details",
+    "created_at",
+)
+
+_JSON_COLUMNS = {"score_breakdown", "pass_fail", "risk_details"}
+
+
+def _json_default(value: Any) -> Any:
+    # Decimals/UUIDs/datetimes inside risk details
+    return str(value)
+
+
+def _jsonable(value: Any) -> Any:
+    return json.loads(json.dumps(value, default=_json_default)) if value is not None else None
+
+
+class MatchAuditWriter:
+    """Process-wide buffered writer for match_audit_trail."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker,
+        flush_interval: float = 0.5,
+        flush_rows: int = 500,
+        max_buffer_rows: int = 50_000,
+        duplicate_window_minutes: int = 5
+    ):
+        self._session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.flush_rows = flush_rows
+        self.max_buffer_rows = max_buffer_rows
+        self.duplicate_window = timedelta(minutes=duplicate_window_minutes)
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._flush_requested = asyncio.Event()
+        self._flusher: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._flushing: List[Dict[str, Any]] = []  # Rows of the flush in progress
+
+        # Keys of rows this process has committed (ts = row age on the monotonic clock);
+        # keys of rows still buffered are read from the buffer, so dropped rows never count
+        self._recent: Dict[Any, Deque[Tuple[float, str]]] = defaultdict(deque)  # commodity -> (ts, key)
+
+        self.metrics = {"rows_buffered": 0, "rows_written": 0, "rows_dropped": 0, "flushes": 0, "flush_errors": 0}
+
+    # ========================================================================
+    # WRITE PATH
+    # ========================================================================
+
+    def record(self, matches: Iterable[Any], triggered_by: str) -> None:
+        """
+        Buffer MatchResults of one matching run (non-blocking).
+
+        Args:
+            matches: MatchResult objects
+            triggered_by: "requirement" or "availability"
+        """
+        now = datetime.now(timezone.utc)
+        rows = [self._to_row(match, triggered_by, now) for match in matches]
+        if not rows:
+            return
+
+        self._buffer.extend(rows)
+        self.metrics["rows_buffered"] += len(rows)
+
+        overflow = len(self._buffer) - self.max_buffer_rows
+        if overflow > 0:
+            del self._buffer[:overflow]
+            self.metrics["rows_dropped"] += overflow
+            logger.warning(f"Match audit buffer full, dropped {overflow} oldest rows")
+
+        self._ensure_flusher()
+        if len(self._buffer) >= self.flush_rows:
+            self._flush_requested.set()
+
+    @staticmethod
+    def _to_row(match: Any, triggered_by: str, created_at: datetime) -> Dict[str, Any]:
+        requirement = getattr(match, "requirement", None)
+        return {
+            "id": uuid.uuid4(),
+            "requirement_id": match.requirement_id,
+            "availability_id": match.availability_id,
+            "commodity_id": getattr(requirement, "commodity_id", None),
+            "triggered_by": triggered_by,
+            "duplicate_key": match.duplicate_detection_key or "",
+            "score": Decimal(str(round(float(match.score), 4))),
+            "base_score": Decimal(str(round(float(match.base_score), 4))),
+            "warn_penalty_applied": bool(match.warn_penalty_applied),
+            "risk_status": match.risk_status,
+            "score_breakdown": match.score_breakdown,
+            "pass_fail": match.pass_fail,
+            "risk_details": match.risk_details,
+            "created_at": created_at,
+        }
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._flush_requested.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_requested.clear()
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write all buffered rows in one statement. Returns rows written."""
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+            rows, self._buffer = self._buffer, []
+            self._flushing = rows
+
+            try:
+                async with self._session_factory() as db:
+                    if not await self._copy_rows(db, rows):
+                        await db.execute(insert(MatchAuditTrail), [
+                            {k: _jsonable(v) if k in _JSON_COLUMNS else v for k, v in row.items()}
+                            for row in rows
+                        ])
+                    await db.commit()
+            except Exception as e:
+                # Put back in front of anything buffered meanwhile; cap applies
+                self._buffer = (rows + self._buffer)[-self.max_buffer_rows:]
+                self.metrics["flush_errors"] += 1
+                logger.error(f"Match audit flush failed ({len(rows)} rows): {e}")
+                return 0
+            finally:
+                self._flushing = []
+
+            self._remember_written(rows)
+            self.metrics["flushes"] += 1
+            self.metrics["rows_written"] += len(rows)
+            return len(rows)
+
+    @staticmethod
+    async def _copy_rows(db, rows: List[Dict[str, Any]]) -> bool:
+        """COPY via asyncpg when available. Returns False to fall back to INSERT."""
+        connection = await db.connection()
+        raw = await connection.get_raw_connection()
+        driver = getattr(raw, "driver_connection", None)
+        if not hasattr(driver, "copy_records_to_table"):
+            return False
+
+        records = [
+            tuple(
+                json.dumps(row[column], default=_json_default)
+                if column in _JSON_COLUMNS and row[column] is not None
+                else row[column]
+                for column in _COLUMNS
+            )
+            for row in rows
+        ]
+        await driver.copy_records_to_table(
+            MatchAuditTrail.__tablename__,
+            records=records,
+            columns=list(_COLUMNS)
+        )
+        return True
+
+    async def close(self) -> None:
+        """Stop background flushing and write what is left."""
+        if self._flusher is not None:
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+            self._flusher = None
+        await self.flush()
+
+    # ========================================================================
+    # DUPLICATE WINDOW
+    # ========================================================================
+
+    def _remember_written(self, rows: List[Dict[str, Any]]) -> None:
+        """Keep keys of committed rows for the duplicate window."""
+        now = datetime.now(timezone.utc)
+        monotonic_now = time.monotonic()
+        for row in rows:
+            written_at = monotonic_now - (now - row["created_at"]).total_seconds()
+            self._recent[row["commodity_id"]].append((written_at, row["duplicate_key"]))
+        for commodity_id in {row["commodity_id"] for row in rows}:
+            self._prune_recent(commodity_id)
+
+    def _prune_recent(self, commodity_id) -> None:
+        recent = self._recent.get(commodity_id)
+        if recent is None:
+            return
+        cutoff = time.monotonic() - self.duplicate_window.total_seconds()
+        while recent and recent[0][0] < cutoff:
+            recent.popleft()
+        if not recent:
+            del self._recent[commodity_id]
+
+    async def recent_duplicate_keys(self, commodity_id, db=None) -> Set[str]:
+        """
+        Duplicate keys matched for this commodity inside the time window.
+
+        Buffered/just-written keys come from memory; other processes' rows
+        from one indexed query on (commodity_id, created_at), run in a
+        savepoint so a failed lookup does not abort the caller's transaction.
+        """
+        self._prune_recent(commodity_id)
+        keys = {key for _, key in self._recent.get(commodity_id, ())}
+        since = datetime.now(timezone.utc) - self.duplicate_window
+        for rows in (self._flushing, self._buffer):
+            keys.update(
+                row["duplicate_key"] for row in rows
+                if row["commodity_id"] == commodity_id and row["created_at"] >= since
+            )
+
+        if db is None or commodity_id is None:
+            return keys
+
+        try:
+            async with db.begin_nested():
+                result = await db.execute(
+                    select(MatchAuditTrail.duplicate_key).where(
+                        and_(
+                            MatchAuditTrail.commodity_id == commodity_id,
+                            MatchAuditTrail.created_at >= since
+                        )
+                    ).distinct()
+                )
+                keys.update(result.scalars().all())
+        except Exception as e:
+            # Missing table / DB hiccup: fall back to in-process window only
+            logger.warning(f"Duplicate window lookup failed: {e}")
+        return keys
+
+
+# ============================================================================
+# PROCESS-WIDE WRITER
+# ============================================================================
+
+_audit_writer: Optional[MatchAuditWriter] = None
+
+
+def get_match_audit_writer() -> MatchAuditWriter:
+    """Get the process-wide audit writer (bound to AsyncSessionLocal)."""
+    global _audit_writer
+    if _audit_writer is None:
+        from backend.db.async_session import AsyncSessionLocal
+        from backend.modules.trade_desk.config.matching_config import get_matching_config
+
+        config = get_matching_config()
+        _audit_writer = MatchAuditWriter(
+            session_factory=AsyncSessionLocal,
+            flush_interval=config.MATCH_AUDIT_FLUSH_INTERVAL_MS / 1000,
+            flush_rows=config.MATCH_AUDIT_FLUSH_ROWS,
+            max_buffer_rows=config.MATCH_AUDIT_MAX_BUFFER_ROWS,
+            duplicate_window_minutes=config.DUPLICATE_TIME_WINDOW_MINUTES
+        )
+    return _audit_writer
+
+
+async def close_match_audit_writer() -> None:
+    """Flush and drop the process-wide writer (shutdown)."""
+    global _audit_writer
+    if _audit_writer is None:
+        return
+    await _audit_writer.close()
+    _audit_writer = None
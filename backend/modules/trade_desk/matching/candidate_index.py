@@ -0,0 +1,494 @@
+"""
+In-Memory Candidate Index
+
+Incrementally maintained (commodity_id, state, geo cell) index over ACTIVE
+availabilities and requirements, so candidate retrieval is a radius query
+instead of a table scan plus per-pair Python filtering.
+
+Applies exactly the rules of MatchingEngine._location_matches:
+1. Exact location_id match
+2. States must agree when both are known (cross-state BLOCKED)
+3. Same city, or within the buyer location's max_distance_km
+4. Requirement without delivery_locations matches nothing (same as the
+   DB search path, which needs a delivery location to query by)
+
+Fed by MatchingService (entities it processes for created/updated events,
+evicted once no longer ACTIVE) and warmed/reconciled with load().
+Rows written by other processes (API nodes, other workers) since the last
+load are pulled in by MatchingEngine before each lookup - see
+sync_window() / mark_synced().
+The index only narrows candidates - callers still load rows by id with a
+status filter, so stale entries are harmless and get evicted on read.
+"""
+
+import logging
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.modules.trade_desk.enums import AvailabilityStatus, RequirementStatus
+from backend.modules.trade_desk.matching.scoring import haversine_km
+
+logger = logging.getLogger(__name__)
+
+
+KM_PER_DEGREE = 111.32
+
+@dataclass(frozen=True)
+class IndexedPoint:
+    """One indexed location of an entity (availabilities have one, requirements many)."""
+    entity_id: UUID
+    location_id: Optional[str]
+    state: str  # Normalised (strip + upper), "" when unknown
+    city: str
+    latitude: Optional[float]
+    longitude: Optional[float]
+    max_distance_km: float = 0.0  # Buyer points only
+
+
+def _norm(value) -> str:
+    return value.strip().upper() if isinstance(value, str) else ""
+
+
+def _coord(value) -> Optional[float]:
+    # Mirrors all([lat, lon, ...]) in _location_matches: 0/None means unknown
+    if not value:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _points_match(buyer: IndexedPoint, seller: IndexedPoint, distance_km: Optional[float]) -> bool:
+    """Location rule for one buyer location vs the seller location."""
+    if buyer.location_id and buyer.location_id == seller.location_id:
+        return True
+    if buyer.state and seller.state and buyer.state != seller.state:
+        return False
+    if not (buyer.city and seller.city):
+        return False
+    if buyer.city == seller.city:
+        return True
+    return distance_km is not None and distance_km <= buyer.max_distance_km
+
+
+class _SpatialSide:
+    """Point storage for one entity type, bucketed by commodity/state/cell."""
+
+    def __init__(self, cell_deg: float):
+        self.cell_deg = cell_deg
+        self.commodity_of: Dict[UUID, UUID] = {}
+        self.points: Dict[UUID, List[IndexedPoint]] = {}
+        self.by_commodity: Dict[UUID, Set[UUID]] = defaultdict(set)
+        self.by_location: Dict[Tuple[UUID, str], Set[UUID]] = defaultdict(set)
+        self.by_city: Dict[Tuple[UUID, str], Set[IndexedPoint]] = defaultdict(set)
+        self.cells: Dict[Tuple[UUID, str, int, int], Set[IndexedPoint]] = defaultdict(set)
+        self.states: Dict[UUID, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.max_radius_km: Dict[UUID, float] = defaultdict(float)
+
+    def __len__(self) -> int:
+        return len(self.commodity_of)
+
+    def cell_of(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return math.floor(latitude / self.cell_deg), math.floor(longitude / self.cell_deg)
+
+    def add(self, entity_id: UUID, commodity_id: UUID, points: List[IndexedPoint]) -> None:
+        self.remove(entity_id)
+        self.commodity_of[entity_id] = commodity_id
+        self.points[entity_id] = points
+        self.by_commodity[commodity_id].add(entity_id)
+
+        for point in points:
+            if point.location_id:
+                self.by_location[(commodity_id, point.location_id)].add(entity_id)
+            if not point.city:
+                continue  # City-less points only ever match by location_id
+            self.by_city[(commodity_id, point.city)].add(point)
+            self.states[commodity_id][point.state] += 1
+            if point.latitude is not None and point.longitude is not None:
+                cell_y, cell_x = self.cell_of(point.latitude, point.longitude)
+                self.cells[(commodity_id, point.state, cell_y, cell_x)].add(point)
+            # Never shrinks on remove; only widens the reverse search area
+            self.max_radius_km[commodity_id] = max(self.max_radius_km[commodity_id], point.max_distance_km)
+
+    def remove(self, entity_id: UUID) -> bool:
+        commodity_id = self.commodity_of.pop(entity_id, None)
+        if commodity_id is None:
+            return False
+
+        self.by_commodity[commodity_id].discard(entity_id)
+        for point in self.points.pop(entity_id, []):
+            if point.location_id:
+                self.by_location[(commodity_id, point.location_id)].discard(entity_id)
+            if not point.city:
+                continue
+            self.by_city[(commodity_id, point.city)].discard(point)
+            self.states[commodity_id][point.state] -= 1
+            if point.latitude is not None and point.longitude is not None:
+                cell_y, cell_x = self.cell_of(point.latitude, point.longitude)
+                self.cells[(commodity_id, point.state, cell_y, cell_x)].discard(point)
+        return True
+
+    def points_within(
+        self,
+        commodity_id: UUID,
+        state: str,
+        latitude: float,
+        longitude: float,
+        radius_km: float
+    ) -> Set[IndexedPoint]:
+        """Points in state-compatible cells overlapping the radius (superset)."""
+        if radius_km <= 0:
+            return set()
+
+        if state:
+            states = [s for s in (state, "") if self.states[commodity_id].get(s)]
+        else:
+            states = [s for s, count in self.states[commodity_id].items() if count > 0]
+
+        dlat = radius_km / KM_PER_DEGREE
+        dlon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+        min_y, min_x = self.cell_of(latitude - dlat, longitude - dlon)
+        max_y, max_x = self.cell_of(latitude + dlat, longitude + dlon)
+
+        found: Set[IndexedPoint] = set()
+        if (max_y - min_y + 1) * (max_x - min_x + 1) > len(self.by_commodity[commodity_id]):
+            # Radius wider than the data - cheaper to walk the commodity's points
+            for entity_id in self.by_commodity[commodity_id]:
+                for point in self.points[entity_id]:
+                    if point.city and point.latitude is not None and point.state in states:
+                        found.add(point)
+            return found
+
+        for s in states:
+            for cell_y in range(min_y, max_y + 1):
+                for cell_x in range(min_x, max_x + 1):
+                    bucket = self.cells.get((commodity_id, s, cell_y, cell_x))
+                    if bucket:
+                        found |= bucket
+        return found
+
+
+class CandidateIndex:
+    """
+    Candidate lookup for the matching engine.
+
+    Usage:
+        index = get_candidate_index()
+        await index.load(db)                        # warm-up / reconcile
+        index.upsert_availability(availability)     # created/updated events
+        index.remove(entity_id)                     # expired/cancelled/sold
+        index.sync_window(side, commodity_id)       # rows changed by other processes
+        index.mark_synced(side, commodity_id, now)  # ... once upserted
+        ids = index.availability_ids_for(requirement)
+    """
+
+    def __init__(
+        self,
+        cell_km: float = 50.0,
+        default_max_distance_km: float = 50.0,
+        sync_overlap_seconds: float = 60.0
+    ):
+        cell_deg = cell_km / KM_PER_DEGREE
+        self.default_max_distance_km = default_max_distance_km
+        self.sync_overlap = timedelta(seconds=sync_overlap_seconds)
+        self._availabilities = _SpatialSide(cell_deg)
+        self._requirements = _SpatialSide(cell_deg)
+        self.ready = False
+        self.loaded_at: Optional[datetime] = None
+        self._synced_at: Dict[Tuple[str, UUID], datetime] = {}
+
+    # ========================================================================
+    # MAINTENANCE
+    # ========================================================================
+
+    def upsert_availability(self, availability) -> None:
+        """Index (or re-index) an ACTIVE availability; evicts any other status."""
+        if _norm(availability.status) != AvailabilityStatus.ACTIVE.value:
+            self.remove(availability.id)
+            return
+
+        location = getattr(availability, "location", None)
+        points = []
+        if location is not None:
+            points.append(self._seller_point(
+                availability.id,
+                availability.location_id,
+                location.state,
+                location.city,
+                location.latitude,
+                location.longitude
+            ))
+        self._availabilities.add(availability.id, availability.commodity_id, points)
+
+    def upsert_requirement(self, requirement) -> None:
+        """Index (or re-index) an ACTIVE requirement; evicts any other status."""
+        if _norm(requirement.status) != RequirementStatus.ACTIVE.value:
+            self.remove(requirement.id)
+            return
+
+        delivery_locations = requirement.delivery_locations or []
+        points = [self._buyer_point(requirement.id, loc) for loc in delivery_locations]
+        self._requirements.add(requirement.id, requirement.commodity_id, points)
+
+    def remove(self, entity_id: UUID) -> None:
+        """Evict an availability or requirement (no-op if not indexed)."""
+        if not self._availabilities.remove(entity_id):
+            self._requirements.remove(entity_id)
+
+    def remove_many(self, entity_ids: Iterable[UUID]) -> None:
+        for entity_id in entity_ids:
+            self.remove(entity_id)
+
+    def clear(self) -> None:
+        cell_deg = self._availabilities.cell_deg
+        self._availabilities = _SpatialSide(cell_deg)
+        self._requirements = _SpatialSide(cell_deg)
+        self.ready = False
+        self.loaded_at = None
+        self._synced_at = {}
+
+    async def load(self, db: AsyncSession) -> None:
+        """
+        (Re)build the index from the database.
+
+        Two projection-only queries; used on worker start and periodically
+        to pick up changes made by processes that don't feed this index.
+        """
+        from backend.modules.settings.locations.models import Location
+        from backend.modules.trade_desk.models import Availability, Requirement
+
+        started_at = datetime.now(timezone.utc)
+        availability_rows = await db.execute(
+            select(
+                Availability.id,
+                Availability.commodity_id,
+                Availability.location_id,
+                Location.state,
+                Location.city,
+                Location.latitude,
+                Location.longitude
+            )
+            .outerjoin(Location, Location.id == Availability.location_id)
+            .where(
+                and_(
+                    Availability.status == AvailabilityStatus.ACTIVE.value,
+                    Availability.is_deleted == False  # noqa: E712
+                )
+            )
+        )
+        requirement_rows = await db.execute(
+            select(
+                Requirement.id,
+                Requirement.commodity_id,
+                Requirement.delivery_locations
+            ).where(Requirement.status == RequirementStatus.ACTIVE.value)
+        )
+
+        cell_deg = self._availabilities.cell_deg
+        availabilities = _SpatialSide(cell_deg)
+        for row in availability_rows:
+            points = []
+            if row.location_id is not None:
+                points.append(self._seller_point(
+                    row.id, row.location_id, row.state, row.city, row.latitude, row.longitude
+                ))
+            availabilities.add(row.id, row.commodity_id, points)
+
+        requirements = _SpatialSide(cell_deg)
+        for row in requirement_rows:
+            delivery_locations = row.delivery_locations or []
+            requirements.add(
+                row.id,
+                row.commodity_id,
+                [self._buyer_point(row.id, loc) for loc in delivery_locations]
+            )
+
+        # Swap in one step so concurrent lookups never see a half-built index
+        self._availabilities = availabilities
+        self._requirements = requirements
+        self.loaded_at = started_at
+        self._synced_at = {}
+        self.ready = True
+
+        logger.info(
+            f"Candidate index loaded: {len(availabilities)} availabilities, "
+            f"{len(requirements)} requirements"
+        )
+
+    # ========================================================================
+    # CROSS-PROCESS CATCH-UP
+    # ========================================================================
+
+    def sync_window(self, side: str, commodity_id: UUID) -> Tuple[datetime, datetime]:
+        """
+        (since, now) for fetching rows of one side/commodity changed elsewhere.
+
+        since starts at the last load() and advances with mark_synced();
+        it is pushed back by sync_overlap so rows whose transaction committed
+        after a previous catch-up (but stamped earlier) are not missed.
+        """
+        now = datetime.now(timezone.utc)
+        synced_at = self._synced_at.get((side, commodity_id), self.loaded_at or now)
+        return synced_at - self.sync_overlap, now
+
+    def mark_synced(self, side: str, commodity_id: UUID, at: datetime) -> None:
+        """Record that rows of side/commodity changed before `at` are indexed."""
+        self._synced_at[(side, commodity_id)] = at
+
+    # ========================================================================
+    # QUERIES
+    # ========================================================================
+
+    def availability_ids_for(self, requirement) -> Set[UUID]:
+        """ACTIVE availabilities whose location passes the requirement's location rules."""
+        side = self._availabilities
+        commodity_id = requirement.commodity_id
+        if not requirement.delivery_locations:
+            return set()
+
+        result: Set[UUID] = set()
+        for loc in requirement.delivery_locations:
+            buyer = self._buyer_point(requirement.id, loc)
+            if buyer.location_id:
+                result |= side.by_location.get((commodity_id, buyer.location_id), set())
+            if not buyer.city:
+                continue
+
+            candidates = set(side.by_city.get((commodity_id, buyer.city), ()))
+            if buyer.latitude is not None and buyer.longitude is not None:
+                candidates |= side.points_within(
+                    commodity_id, buyer.state, buyer.latitude, buyer.longitude, buyer.max_distance_km
+                )
+            for seller, distance in self._with_distances(buyer, candidates):
+                if seller.entity_id not in result and _points_match(buyer, seller, distance):
+                    result.add(seller.entity_id)
+        return result
+
+    def requirement_ids_for(self, availability) -> Set[UUID]:
+        """ACTIVE requirements with a delivery location accepting this availability."""
+        side = self._requirements
+        commodity_id = availability.commodity_id
+        result: Set[UUID] = set()
+
+        location = getattr(availability, "location", None)
+        if location is None:
+            return result
+
+        seller = self._seller_point(
+            availability.id,
+            availability.location_id,
+            location.state,
+            location.city,
+            location.latitude,
+            location.longitude
+        )
+        if seller.location_id:
+            result |= side.by_location.get((commodity_id, seller.location_id), set())
+        if not seller.city:
+            return result
+
+        candidates = set(side.by_city.get((commodity_id, seller.city), ()))
+        if seller.latitude is not None and seller.longitude is not None:
+            candidates |= side.points_within(
+                commodity_id, seller.state, seller.latitude, seller.longitude,
+                side.max_radius_km.get(commodity_id, 0.0)
+            )
+        for buyer, distance in self._with_distances(seller, candidates):
+            if buyer.entity_id not in result and _points_match(buyer, seller, distance):
+                result.add(buyer.entity_id)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "availabilities": len(self._availabilities),
+            "requirements": len(self._requirements),
+            "ready": self.ready,
+        }
+
+    # ========================================================================
+    # HELPERS
+    # ========================================================================
+
+    def _seller_point(self, entity_id, location_id, state, city, latitude, longitude) -> IndexedPoint:
+        return IndexedPoint(
+            entity_id=entity_id,
+            location_id=str(location_id) if location_id else None,
+            state=_norm(state),
+            city=_norm(city),
+            latitude=_coord(latitude),
+            longitude=_coord(longitude)
+        )
+
+    def _buyer_point(self, entity_id: UUID, loc: Dict) -> IndexedPoint:
+        location_id = loc.get("location_id")
+        max_distance_km = loc.get("max_distance_km", self.default_max_distance_km)
+        if max_distance_km is None:
+            max_distance_km = self.default_max_distance_km
+        return IndexedPoint(
+            entity_id=entity_id,
+            location_id=str(location_id) if location_id else None,
+            state=_norm(loc.get("state")),
+            city=_norm(loc.get("city")),
+            latitude=_coord(loc.get("latitude")),
+            longitude=_coord(loc.get("longitude")),
+            max_distance_km=float(max_distance_km)
+        )
+
+    @staticmethod
+    def _with_distances(
+        origin: IndexedPoint,
+        candidates: Set[IndexedPoint]
+    ) -> List[Tuple[IndexedPoint, Optional[float]]]:
+        """Pair candidates with their distance to origin (one vectorized haversine)."""
+        candidates = list(candidates)
+        if origin.latitude is None or origin.longitude is None:
+            return [(point, None) for point in candidates]
+
+        located = [p for p in candidates if p.latitude is not None and p.longitude is not None]
+        distances: Dict[IndexedPoint, float] = {}
+        if located:
+            km = haversine_km(
+                origin.latitude,
+                origin.longitude,
+                np.array([p.latitude for p in located]),
+                np.array([p.longitude for p in located])
+            )
+            distances = dict(zip(located, km.tolist()))
+        return [(point, distances.get(point)) for point in candidates]
+
+
+# ============================================================================
+# PROCESS-WIDE INDEX
+# ============================================================================
+
+_candidate_index: Optional[CandidateIndex] = None
+
+
+def get_candidate_index() -> CandidateIndex:
+    """Get the process-wide candidate index (created lazily, not loaded)."""
+    global _candidate_index
+    if _candidate_index is None:
+        from backend.modules.trade_desk.config.matching_config import get_matching_config
+
+        config = get_matching_config()
+        _candidate_index = CandidateIndex(
+            cell_km=config.CANDIDATE_INDEX_CELL_KM,
+            default_max_distance_km=config.MAX_DISTANCE_KM or 50,
+            sync_overlap_seconds=config.CANDIDATE_INDEX_SYNC_OVERLAP_SECONDS
+        )
+    return _candidate_index
+
+
+def reset_candidate_index() -> None:
+    """Drop the process-wide index (tests / config reload)."""
+    global _candidate_index
+    _candidate_index = None
@@ -29,6 +29,8 @@ from backend.modules.trade_desk.repositories.availability_repository import Avai
 from backend.modules.risk.risk_engine import RiskEngine
 from backend.modules.trade_desk.config.matching_config import MatchingConfig, get_matching_config
 from backend.modules.trade_desk.matching.scoring import MatchScorer
+from backend.modules.trade_desk.matching.candidate_index import CandidateIndex
+from backend.modules.trade_desk.matching.audit_writer import MatchAuditWriter
 from backend.modules.trade_desk.matching.validators import MatchValidator
 
 logger = logging.getLogger(__name__)
@@ -99,13 +101,17 @@ class MatchingEngine:
         risk_engine: RiskEngine,
         requirement_repo: RequirementRepository,
         availability_repo: AvailabilityRepository,
-        config: Optional[MatchingConfig] = None
+        config: Optional[MatchingConfig] = None,
+        candidate_index: Optional[CandidateIndex] = None,
+        audit_writer: Optional[MatchAuditWriter] = None
     ):
         self.db = db
         self.risk_engine = risk_engine
         self.requirement_repo = requirement_repo
         self.availability_repo = availability_repo
         self.config = config or get_matching_config()
+        self.candidate_index = candidate_index
+        self.audit_writer = audit_writer
         self.scorer = MatchScorer(config=self.config)
         self.validator = MatchValidator(db=db, risk_engine=risk_engine, config=self.config)
     
@@ -139,9 +145,9 @@ class MatchingEngine:
         #            "latitude": 21.1, "longitude": 79.0, "max_distance_km": 50}]
         
         if not requirement.delivery_locations:
-            # No location specified - match all (fallback)
+            # No location specified - nothing to match against (same as the DB search path)
             logger.warning(f"Requirement {requirement.id} has no delivery_locations")
-            return True
+            return False
         
         # Get seller's location details (with eager loading)
         seller_location = availability.location if hasattr(availability, 'location') else None
@@ -214,6 +220,19 @@ class MatchingEngine:
         )
         return False  # BLOCKED - no relevant location match
     
+    @staticmethod
+    def _delivery_location_ids(requirement: Requirement) -> List[UUID]:
+        """Valid location_ids of the buyer's delivery_locations (DB search keys)."""
+        location_ids = []
+        for loc in requirement.delivery_locations or []:
+            loc_id = loc.get("location_id")
+            if loc_id:
+                try:
+                    location_ids.append(UUID(str(loc_id)))
+                except (ValueError, TypeError):
+                    logger.warning(f"Invalid location_id in delivery_locations: {loc_id}")
+        return location_ids
+    
     def _calculate_haversine_distance(
         self, lat1: float, lon1: float, lat2: float, lon2: float
     ) -> float:
@@ -249,6 +268,55 @@ class MatchingEngine:
         
         return distance
     
+    # ========================================================================
+    # CANDIDATE INDEX LOOKUP
+    # ========================================================================
+    
+    def _index_ready(self) -> bool:
+        return self.candidate_index is not None and self.candidate_index.ready
+    
+    async def _sync_index(self, side: str, commodity_id: UUID) -> None:
+        """
+        Index rows of one side/commodity written since the last catch-up.
+        
+        The index is per process: availabilities/requirements created or
+        changed on another API node or worker would otherwise stay invisible
+        until the next full reload.
+        """
+        since, now = self.candidate_index.sync_window(side, commodity_id)
+        if side == "availability":
+            for availability in await self.availability_repo.get_changed_since(
+                commodity_id, since, load_relationships=True
+            ):
+                self.candidate_index.upsert_availability(availability)
+        else:
+            for requirement in await self.requirement_repo.get_changed_since(commodity_id, since):
+                self.candidate_index.upsert_requirement(requirement)
+        self.candidate_index.mark_synced(side, commodity_id, now)
+    
+    async def _indexed_availabilities(self, requirement: Requirement) -> List[Availability]:
+        """Load index candidates by id; evict ones no longer ACTIVE."""
+        await self._sync_index("availability", requirement.commodity_id)
+        candidate_ids = self.candidate_index.availability_ids_for(requirement)
+        candidates = await self.availability_repo.get_by_ids(
+            list(candidate_ids),
+            load_relationships=True
+        )
+        self.candidate_index.remove_many(candidate_ids - {a.id for a in candidates})
+        return candidates
+    
+    async def _indexed_requirements(self, availability: Availability) -> List[Requirement]:
+        """Load index candidates by id; evict ones no longer ACTIVE."""
+        await self._sync_index("requirement", availability.commodity_id)
+        candidate_ids = self.candidate_index.requirement_ids_for(availability)
+        candidates = await self.requirement_repo.get_by_ids(
+            list(candidate_ids),
+            statuses=["ACTIVE"],
+            load_relationships=True
+        )
+        self.candidate_index.remove_many(candidate_ids - {r.id for r in candidates})
+        return candidates
+    
     # ========================================================================
     # INTERNATIONAL TRADE COMPATIBILITY FILTER
     # ========================================================================
@@ -321,9 +389,9 @@ class MatchingEngine:
         
         CRITICAL FLOW:
         1. Fetch requirement with location data
-        2. Query availabilities FILTERED BY LOCATION (DB-level)
+        2. Query availabilities FILTERED BY LOCATION (candidate index, DB fallback)
         3. For each candidate, apply location hard filter
-        4. ONLY THEN calculate scores
+        4. ONLY THEN calculate scores (batched via MatchScorer.score_candidates)
         5. Apply duplicate detection
         6. Validate risk
         7. Sort and return top matches
@@ -338,53 +406,48 @@ class MatchingEngine:
             List of MatchResult objects sorted by score (best first)
         """
         # Get requirement with eager loading
-        requirement = await self.requirement_repo.get_by_id(
-            requirement_id,
-            include_relations=["commodity", "buyer_partner"]
-        )
+        requirement = await self.requirement_repo.get_by_id(requirement_id, load_relationships=True)
         
         if not requirement:
             raise ValueError(f"Requirement {requirement_id} not found")
         
         # Get commodity-specific min score
         if min_score is None:
-            commodity_code = requirement.commodity.code if requirement.commodity else "default"
+            commodity = getattr(requirement, "commodity", None)  # Not mapped on Requirement
+            commodity_code = commodity.code if commodity else "default"
             min_score = self.config.get_min_score_threshold(commodity_code)
         
         logger.info(f"Finding matches for requirement {requirement_id}, min_score={min_score}")
         
-        # Step 1: LOCATION-FIRST FILTER (DB query level)
-        # Extract location IDs from buyer's delivery_locations
-        location_ids = []
-        if requirement.delivery_locations:
-            for loc in requirement.delivery_locations:
-                loc_id = loc.get("location_id")
-                if loc_id:
-                    try:
-                        location_ids.append(UUID(loc_id))
-                    except (ValueError, TypeError):
-                        logger.warning(f"Invalid location_id in delivery_locations: {loc_id}")
-        
-        if not location_ids:
-            logger.warning(f"Requirement {requirement_id} has no valid delivery locations")
-            return []
-        
-        # Query availabilities filtered by location
-        candidate_availabilities = await self.availability_repo.search_by_location(
-            location_ids=location_ids,
-            commodity_id=requirement.commodity_id,
-            status="AVAILABLE",
-            include_relations=["location", "seller", "commodity"]
-        )
+        # Step 1: LOCATION-FIRST FILTER
+        if self._index_ready():
+            # Radius query against the in-memory index (location rules already applied)
+            candidate_availabilities = await self._indexed_availabilities(requirement)
+            location_checked = True
+        else:
+            # DB query level: extract location IDs from buyer's delivery_locations
+            location_ids = self._delivery_location_ids(requirement)
+            
+            if not location_ids:
+                logger.warning(f"Requirement {requirement_id} has no valid delivery locations")
+                return []
+            
+            # Query ACTIVE availabilities filtered by location
+            candidate_availabilities = await self.availability_repo.get_by_locations(
+                location_ids,
+                requirement.commodity_id,
+                status="ACTIVE",
+                load_relationships=True
+            )
+            location_checked = False
         
         logger.info(f"Found {len(candidate_availabilities)} location-matched candidates")
         
-        matches = []
-        seen_duplicates: Set[str] = set()
-        
+        # Steps 2-3: Hard filters (no scoring needed for rejected candidates)
+        filtered: List[Availability] = []
         for availability in candidate_availabilities:
             # Step 2: Hard location filter (application level - redundant safety check)
-            if not self._location_matches(requirement, availability):
+            if not location_checked and not self._location_matches(requirement, availability):
                 logger.debug(f"Location filter blocked: req={requirement_id}, avail={availability.id}")
                 continue  # SKIP - no scoring needed
             
@@ -393,62 +456,51 @@ class MatchingEngine:
                 logger.debug(f"Country filter blocked: req={requirement_id}, avail={availability.id}")
                 continue  # SKIP - incompatible countries
             
+            filtered.append(availability)
+        
+        # Step 4: Score all surviving candidates in one vectorized pass
+        score_results = await self.scorer.score_candidates(
+            requirement=requirement,
+            availabilities=filtered,
+            risk_engine=self.risk_engine if include_risk_check else None
+        )
+        
+        matches = []
+        seen_duplicates = await self._recent_duplicate_keys(requirement.commodity_id)
+        
+        for availability, score_result in zip(filtered, score_results):
+            if score_result is None:
+                continue  # Scoring error (already logged)
+            
             # Step 3: Duplicate detection
             dup_key = self._generate_duplicate_key(requirement, availability)
             if await self._is_duplicate(dup_key, seen_duplicates, requirement_id, availability.id):
                 logger.debug(f"Duplicate detected: {dup_key}")
                 continue  # SKIP duplicate
             
-            # Step 4: Calculate match score
-            try:
-                score_result = await self.scorer.calculate_match_score(
-                    requirement=requirement,
-                    availability=availability,
-                    risk_engine=self.risk_engine if include_risk_check else None
-                )
-                
-                # Check if match was blocked by risk
-                if score_result.get("blocked", False):
-                    logger.info(f"Match blocked by risk: req={requirement_id}, avail={availability.id}")
-                    continue
-                
-                # Step 5: Filter by min score
-                if score_result["total_score"] < min_score:
-                    logger.debug(f"Score too low: {score_result['total_score']} < {min_score}")
-                    continue
-                
-                # Step 6: Create match result with audit trail
-                match = MatchResult(
-                    requirement_id=requirement.id,
-                    availability_id=availability.id,
-                    score=score_result["total_score"],
-                    base_score=score_result["base_score"],
-                    warn_penalty_applied=score_result.get("warn_penalty_applied", False),
-                    warn_penalty_value=score_result.get("warn_penalty_value", 0.0),
-                    score_breakdown=score_result["breakdown"],
-                    pass_fail=score_result["pass_fail"],
-                    risk_status=score_result.get("risk_details", {}).get("risk_status", "UNKNOWN"),
-                    risk_details=score_result.get("risk_details", {}),
-                    location_filter_passed=True,
-                    duplicate_detection_key=dup_key,
-                    requirement=requirement,
-                    availability=availability
-                )
-                
-                matches.append(match)
-                seen_duplicates.add(dup_key)
-                
-            except Exception as e:
-                logger.error(f"Error scoring match: req={requirement_id}, avail={availability.id}, error={e}")
+            # Check if match was blocked by risk
+            if score_result.get("blocked", False):
+                logger.info(f"Match blocked by risk: req={requirement_id}, avail={availability.id}")
+                continue
+            
+            # Step 5: Filter by min score
+            if score_result["total_score"] < min_score:
+                logger.debug(f"Score too low: {score_result['total_score']} < {min_score}")
                 continue
+            
+            # Step 6: Create match result with audit trail
+            match = self._build_match_result(requirement, availability, score_result, dup_key)
+            
+            matches.append(match)
+            seen_duplicates.add(dup_key)
         
         # Step 7: Sort by score (best first)
         matches.sort(key=lambda m: m.score, reverse=True)
         
         logger.info(f"Found {len(matches)} valid matches for requirement {requirement_id}")
         
-        # Step 8: Store audit trail (async, don't block)
-        asyncio.create_task(self._save_match_audit_trail(matches, requirement))
+        # Step 8: Store audit trail (buffered, flushed in bulk off the hot path)
+        self._save_match_audit_trail(matches, "requirement")
         
         return matches[:max_results]
     
@@ -465,10 +517,7 @@ class MatchingEngine:
         Same location-first logic as find_matches_for_requirement.
         """
         # Get availability with eager loading
-        availability = await self.availability_repo.get_by_id(
-            availability_id,
-            include_relations=["location", "commodity", "seller"]
-        )
+        availability = await self.availability_repo.get_by_id(availability_id, load_relationships=True)
         
         if not availability:
             raise ValueError(f"Availability {availability_id} not found")
@@ -480,23 +529,29 @@ class MatchingEngine:
         
         logger.info(f"Finding matches for availability {availability_id}, min_score={min_score}")
         
-        # Step 1: LOCATION-FIRST FILTER (DB query level)
-        # Search requirements that include seller's location in their delivery_locations
-        candidate_requirements = await self.requirement_repo.search_by_location(
-            location_id=availability.location_id,
-            commodity_id=availability.commodity_id,
-            status="ACTIVE",
-            include_relations=["commodity", "buyer_partner"]
-        )
+        # Step 1: LOCATION-FIRST FILTER
+        if self._index_ready():
+            # Reverse radius query - no scan of the requirements table
+            candidate_requirements = await self._indexed_requirements(availability)
+            location_checked = True
+        else:
+            # DB query level: requirements that include seller's location in their delivery_locations
+            candidate_requirements = await self.requirement_repo.get_by_delivery_locations(
+                [availability.location_id],
+                availability.commodity_id,
+                statuses=["ACTIVE"],
+                load_relationships=True
+            ) if availability.location_id else []
+            location_checked = False
         
         logger.info(f"Found {len(candidate_requirements)} location-matched candidates")
         
         matches = []
-        seen_duplicates: Set[str] = set()
+        seen_duplicates = await self._recent_duplicate_keys(availability.commodity_id)
         
         for requirement in candidate_requirements:
             # Step 2: Hard location filter
-            if not self._location_matches(requirement, availability):
+            if not location_checked and not self._location_matches(requirement, availability):
                 continue
             
             # Step 2.5: Country compatibility filter (international trade)
@@ -525,22 +580,7 @@ class MatchingEngine:
                     continue
                 
                 # Step 6: Create match result
-                match = MatchResult(
-                    requirement_id=requirement.id,
-                    availability_id=availability.id,
-                    score=score_result["total_score"],
-                    base_score=score_result["base_score"],
-                    warn_penalty_applied=score_result.get("warn_penalty_applied", False),
-                    warn_penalty_value=score_result.get("warn_penalty_value", 0.0),
-                    score_breakdown=score_result["breakdown"],
-                    pass_fail=score_result["pass_fail"],
-                    risk_status=score_result.get("risk_details", {}).get("risk_status", "UNKNOWN"),
-                    risk_details=score_result.get("risk_details", {}),
-                    location_filter_passed=True,
-                    duplicate_detection_key=dup_key,
-                    requirement=requirement,
-                    availability=availability
-                )
+                match = self._build_match_result(requirement, availability, score_result, dup_key)
                 
                 matches.append(match)
                 seen_duplicates.add(dup_key)
@@ -554,11 +594,182 @@ class MatchingEngine:
         
         logger.info(f"Found {len(matches)} valid matches for availability {availability_id}")
         
-        # Store audit trail (async)
-        asyncio.create_task(self._save_match_audit_trail(matches, availability))
+        # Store audit trail (buffered)
+        self._save_match_audit_trail(matches, "availability")
         
         return matches[:max_results]
     
+    def _build_match_result(
+        self,
+        requirement: Requirement,
+        availability: Availability,
+        score_result: Dict[str, Any],
+        dup_key: str
+    ) -> MatchResult:
+        """MatchResult with full scoring breakdown for audit trail."""
+        return MatchResult(
+            requirement_id=requirement.id,
+            availability_id=availability.id,
+            score=score_result["total_score"],
+            base_score=score_result["base_score"],
+            warn_penalty_applied=score_result.get("warn_penalty_applied", False),
+            warn_penalty_value=score_result.get("warn_penalty_value", 0.0),
+            score_breakdown=score_result["breakdown"],
+            pass_fail=score_result["pass_fail"],
+            risk_status=score_result.get("risk_details", {}).get("risk_status", "UNKNOWN"),
+            risk_details=score_result.get("risk_details", {}),
+            location_filter_passed=True,
+            duplicate_detection_key=dup_key,
+            requirement=requirement,
+            availability=availability
+        )
+    
+    # ========================================================================
+    # MICRO-BATCHED MATCHING (coalesced per commodity)
+    # ========================================================================
+    
+    async def find_matches_batch(
+        self,
+        requirements: List[Requirement],
+        availabilities: List[Availability],
+        include_risk_check: bool = True,
+        max_results: int = 50
+    ) -> Dict[UUID, List[MatchResult]]:
+        """
+        Match a burst of new requirements/availabilities of ONE commodity.
+        
+        Instead of one find_matches_for_* pass per entity (each re-reading
+        the same counterparties), both sides are loaded once and every
+        requirement row is scored against all its compatible availability
+        columns in one vectorized call - i.e. one pass over the bipartite
+        score matrix. Pairs where neither side is new are skipped.
+        
+        Args:
+            requirements: New/changed ACTIVE requirements (same commodity)
+            availabilities: New/changed ACTIVE availabilities (same commodity)
+            include_risk_check: Whether to validate with risk engine
+            max_results: Maximum matches returned per entity
+            
+        Returns:
+            {entity_id: [MatchResult, ...]} for every input entity, best first
+        """
+        if not requirements and not availabilities:
+            return {}
+        
+        commodity_id = (requirements or availabilities)[0].commodity_id
+        new_requirement_ids = {r.id for r in requirements}
+        new_availability_ids = {a.id for a in availabilities}
+        
+        # Step 1: Load counterparties once per side
+        if self._index_ready():
+            if requirements:
+                await self._sync_index("availability", commodity_id)
+            if availabilities:
+                await self._sync_index("requirement", commodity_id)
+            allowed_for_requirement = {
+                r.id: self.candidate_index.availability_ids_for(r) for r in requirements
+            }
+            allowed_for_availability = {
+                a.id: self.candidate_index.requirement_ids_for(a) for a in availabilities
+            }
+            availability_ids = set().union(*allowed_for_requirement.values()) - new_availability_ids
+            requirement_ids = set().union(*allowed_for_availability.values()) - new_requirement_ids
+            other_availabilities = await self.availability_repo.get_by_ids(
+                list(availability_ids), load_relationships=True
+            ) if requirements else []
+            other_requirements = await self.requirement_repo.get_by_ids(
+                list(requirement_ids), statuses=["ACTIVE"], load_relationships=True
+            ) if availabilities else []
+            self.candidate_index.remove_many(availability_ids - {a.id for a in other_availabilities})
+            self.candidate_index.remove_many(requirement_ids - {r.id for r in other_requirements})
+        else:
+            # Same location-keyed DB search as the per-entity paths, one
+            # query per side for the union of the batch's locations
+            allowed_for_requirement = allowed_for_availability = None
+            delivery_location_ids = {
+                location_id for r in requirements for location_id in self._delivery_location_ids(r)
+            }
+            seller_location_ids = {a.location_id for a in availabilities if a.location_id}
+            other_availabilities = await self.availability_repo.get_by_locations(
+                list(delivery_location_ids), commodity_id, load_relationships=True
+            ) if delivery_location_ids else []
+            other_requirements = await self.requirement_repo.get_by_delivery_locations(
+                list(seller_location_ids), commodity_id, statuses=["ACTIVE"], load_relationships=True
+            ) if seller_location_ids else []
+        
+        rows = requirements + [r for r in other_requirements if r.id not in new_requirement_ids]
+        columns = availabilities + [a for a in other_availabilities if a.id not in new_availability_ids]
+        
+        logger.info(
+            f"Batch matching commodity {commodity_id}: "
+            f"{len(requirements)} new requirements x {len(columns)} availabilities, "
+            f"{len(availabilities)} new availabilities x {len(rows)} requirements"
+        )
+        
+        def pair_allowed(requirement: Requirement, availability: Availability) -> bool:
+            # At least one side must be new; location then country hard filters
+            requirement_new = requirement.id in new_requirement_ids
+            availability_new = availability.id in new_availability_ids
+            if not (requirement_new or availability_new):
+                return False
+            if allowed_for_requirement is not None:
+                location_ok = (
+                    (requirement_new and availability.id in allowed_for_requirement[requirement.id])
+                    or (availability_new and requirement.id in allowed_for_availability[availability.id])
+                )
+            else:
+                location_ok = self._location_matches(requirement, availability)
+            return location_ok and self._country_compatible(requirement, availability)
+        
+        # Step 2: Score matrix, one vectorized row per requirement
+        results: Dict[UUID, List[MatchResult]] = {
+            entity_id: [] for entity_id in new_requirement_ids | new_availability_ids
+        }
+        recent_duplicates = await self._recent_duplicate_keys(commodity_id)
+        seen_duplicates: Dict[UUID, Set[str]] = {}
+        
+        for requirement in rows:
+            row_columns = [a for a in columns if pair_allowed(requirement, a)]
+            if not row_columns:
+                continue
+            
+            commodity = getattr(requirement, "commodity", None) or getattr(row_columns[0], "commodity", None)
+            min_score = self.config.get_min_score_threshold(commodity.code if commodity else "default")
+            
+            score_results = await self.scorer.score_candidates(
+                requirement=requirement,
+                availabilities=row_columns,
+                risk_engine=self.risk_engine if include_risk_check else None
+            )
+            
+            for availability, score_result in zip(row_columns, score_results):
+                if score_result is None or score_result.get("blocked", False):
+                    continue
+                if score_result["total_score"] < min_score:
+                    continue
+                
+                # Duplicate detection per new entity (same as per-entity passes)
+                dup_key = self._generate_duplicate_key(requirement, availability)
+                match = None
+                for entity_id in (requirement.id, availability.id):
+                    if entity_id not in results:
+                        continue
+                    seen = seen_duplicates.setdefault(entity_id, set(recent_duplicates))
+                    if await self._is_duplicate(dup_key, seen, requirement.id, availability.id):
+                        continue
+                    seen.add(dup_key)
+                    match = match or self._build_match_result(requirement, availability, score_result, dup_key)
+                    results[entity_id].append(match)
+        
+        # Step 3: Best first per entity + audit trail
+        for entity_id, matches in results.items():
+            matches.sort(key=lambda m: m.score, reverse=True)
+            entity_type = "requirement" if entity_id in new_requirement_ids else "availability"
+            self._save_match_audit_trail(matches, entity_type)
+            results[entity_id] = matches[:max_results]
+        
+        return results
+    
     # ========================================================================
     # DUPLICATE DETECTION ⭐ CRITICAL
     # ========================================================================
@@ -589,17 +800,17 @@ class MatchingEngine:
         """
         Check if match is duplicate within time window.
         
-        Uses in-memory cache + DB check for recent duplicates.
+        seen_duplicates holds keys matched in this run, pre-seeded by
+        _recent_duplicate_keys() with keys from the audit trail window
+        (one indexed query per run, not one per pair).
         """
-        # In-memory check (current session)
-        if dup_key in seen_duplicates:
-            return True
-        
-        # DB check for recent duplicates (within time window)
-        # Future: Query match_audit_trail table
-        # For now, rely on in-memory check only
-        
-        return False
+        return dup_key in seen_duplicates
+    
+    async def _recent_duplicate_keys(self, commodity_id: Optional[UUID]) -> Set[str]:
+        """Keys matched for this commodity within DUPLICATE_TIME_WINDOW_MINUTES."""
+        if self.audit_writer is None:
+            return set()
+        return await self.audit_writer.recent_duplicate_keys(commodity_id, self.db)
     
     # ========================================================================
     # ATOMIC PARTIAL ALLOCATION ⭐ CRITICAL
@@ -694,23 +905,22 @@ class MatchingEngine:
     # AUDIT TRAIL ⭐ CRITICAL
     # ========================================================================
     
-    async def _save_match_audit_trail(
+    def _save_match_audit_trail(
         self,
         matches: List[MatchResult],
-        entity: Any  # Requirement or Availability
+        triggered_by: str  # "requirement" or "availability"
     ) -> None:
         """
         Save detailed audit trail for explainability.
         
-        Stores:
+        Stores (match_audit_trail):
         - Full score breakdown
         - Risk assessment details
         - Location filter results
-        - Duplicate detection results
-        - Allocation status
+        - Duplicate detection key (backs the duplicate time window)
         
-        Future: Insert into match_audit_trail table
+        Only buffers rows; MatchAuditWriter flushes them in bulk.
         """
-        # Placeholder - will implement when audit table is created
-        logger.debug(f"Audit trail: {len(matches)} matches for entity {entity.id}")
-        pass
+        if self.audit_writer is None or not matches:
+            return
+        self.audit_writer.record(matches, triggered_by=triggered_by)
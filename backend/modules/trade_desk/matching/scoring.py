@@ -15,8 +15,11 @@ CRITICAL: WARN risk status applies 10% GLOBAL penalty to final score.
 
 import logging
 from decimal import Decimal
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Sequence, Tuple
 from math import radians, sin, cos, sqrt, atan2
+from uuid import UUID
+
+import numpy as np
 
 from backend.modules.trade_desk.models.requirement import Requirement
 from backend.modules.trade_desk.models.availability import Availability
@@ -26,6 +29,28 @@ from backend.modules.trade_desk.services.ml_match_scorer import MLMatchScorer
 
 logger = logging.getLogger(__name__)
 
+EARTH_RADIUS_KM = 6371.0
+
+
+def _is_number(value: Any) -> bool:
+    """True for int/float/Decimal values (bool excluded)."""
+    return isinstance(value, (int, float, Decimal)) and not isinstance(value, bool)
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """
+    Vectorized Haversine distance in kilometers.
+    
+    Accepts scalars or broadcastable NumPy arrays (degrees).
+    NaN inputs propagate to NaN distances.
+    """
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    dlat = lat2 - lat1
+    dlon = lon2 - lon1
+    a = np.sin(dlat / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+    return EARTH_RADIUS_KM * c
+
 
 class MatchScorer:
     """
@@ -78,12 +103,43 @@ class MatchScorer:
         price_result = self.calculate_price_score(requirement, availability)
         delivery_result = self.calculate_delivery_score(requirement, availability)
         
-        # Risk check with clear WARN semantics
+        risk_result = None
         if risk_engine:
             risk_result = await self.calculate_risk_score(
                 requirement, availability, risk_engine
             )
-            
+        
+        return await self._combine_scores(
+            requirement=requirement,
+            availability=availability,
+            quality_result=quality_result,
+            price_result=price_result,
+            delivery_result=delivery_result,
+            risk_result=risk_result,
+            use_ml=use_ml
+        )
+    
+    async def _combine_scores(
+        self,
+        requirement: Requirement,
+        availability: Availability,
+        quality_result: Dict[str, Any],
+        price_result: Dict[str, Any],
+        delivery_result: Dict[str, Any],
+        risk_result: Optional[Dict[str, Any]],
+        use_ml: bool = True,
+        weights: Optional[Dict[str, float]] = None,
+        recommended_seller_ids: Optional[List[UUID]] = None
+    ) -> Dict[str, Any]:
+        """
+        Combine component scores into the final match score dict.
+        
+        Shared by calculate_match_score (single pair) and score_candidates
+        (batch). risk_result=None means risk check was skipped.
+        weights / recommended_seller_ids may be precomputed per requirement.
+        """
+        # Risk check with clear WARN semantics
+        if risk_result is not None:
             # Map risk status to score
             risk_status = risk_result.get("risk_status", "UNKNOWN")
             if risk_status == "PASS":
@@ -140,8 +196,10 @@ class MatchScorer:
         # FALLBACK TO RULE-BASED SCORING
         if ml_prediction is None:
             # Get commodity-specific weights
-            commodity_code = requirement.commodity.code if requirement.commodity else "default"
-            weights = self.config.get_scoring_weights(commodity_code)
+            if weights is None:
+                commodity = getattr(requirement, "commodity", None)  # Not mapped on Requirement
+                commodity_code = commodity.code if commodity else "default"
+                weights = self.config.get_scoring_weights(commodity_code)
             
             # Calculate base score (weighted average)
             base_score = (
@@ -166,12 +224,8 @@ class MatchScorer:
             requirement.ai_recommended_sellers
         ):
             # Check if this seller is in AI pre-scored recommendations
-            from uuid import UUID
-            recommended_seller_ids = [
-                UUID(rec.get('seller_id')) 
-                for rec in requirement.ai_recommended_sellers.get('recommendations', [])
-                if rec.get('seller_id')
-            ]
+            if recommended_seller_ids is None:
+                recommended_seller_ids = self._get_recommended_seller_ids(requirement)
             
             if availability.party_id in recommended_seller_ids:
                 ai_boost = self.config.AI_RECOMMENDATION_SCORE_BOOST
@@ -221,6 +275,314 @@ class MatchScorer:
             "blocked": False
         }
     
+    def _get_recommended_seller_ids(self, requirement: Requirement) -> List[UUID]:
+        """Extract AI pre-scored seller IDs from requirement.ai_recommended_sellers."""
+        if not requirement.ai_recommended_sellers:
+            return []
+        return [
+            UUID(rec.get('seller_id')) 
+            for rec in requirement.ai_recommended_sellers.get('recommendations', [])
+            if rec.get('seller_id')
+        ]
+    
+    # ========================================================================
+    # BATCH SCORING (VECTORIZED) ⭐ PERFORMANCE
+    # ========================================================================
+    
+    async def score_candidates(
+        self,
+        requirement: Requirement,
+        availabilities: Sequence[Availability],
+        risk_engine: Optional[RiskEngine] = None,
+        use_ml: bool = True
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Score one requirement against a whole candidate set in one pass.
+        
+        Quality, price and delivery components and the buyer-to-seller
+        haversine distance are computed over NumPy arrays packed from all
+        candidates, so per-pair dict building is avoided. Risk is assessed
+        once per run via calculate_risk_scores_batch; ML prediction still
+        runs per candidate.
+        
+        Returns a list aligned with `availabilities`. Each entry has the same
+        shape as calculate_match_score() plus "distance_km" (nearest buyer
+        delivery location, None if coordinates unknown). An entry is None if
+        scoring that candidate raised (logged, same as the per-pair path).
+        """
+        n = len(availabilities)
+        if n == 0:
+            return []
+        
+        quality_scores = self._quality_scores_batch(requirement, availabilities)
+        price_scores, price_pass = self._price_scores_batch(requirement, availabilities)
+        delivery_scores = self._delivery_scores_batch(requirement, availabilities)
+        distances = self._delivery_distances_batch(requirement, availabilities)
+        
+        # Per-requirement values hoisted out of the candidate loop
+        commodity = getattr(requirement, "commodity", None)  # Not mapped on Requirement
+        commodity_code = commodity.code if commodity else "default"
+        weights = self.config.get_scoring_weights(commodity_code)
+        recommended_seller_ids = (
+            self._get_recommended_seller_ids(requirement)
+            if self.config.ENABLE_AI_SCORE_BOOST else []
+        )
+        
+        # Risk: one batched assessment per run (buyer once, sellers memoized)
+        risk_results: Dict[UUID, Dict[str, Any]] = {}
+        if risk_engine:
+            risk_results = await self.calculate_risk_scores_batch(
+                requirement, availabilities, risk_engine
+            )
+        
+        results: List[Optional[Dict[str, Any]]] = []
+        for i, availability in enumerate(availabilities):
+            quality = float(quality_scores[i])
+            delivery = float(delivery_scores[i])
+            try:
+                if np.isnan(quality):
+                    raise TypeError("incomparable quality parameter values")
+                
+                result = await self._combine_scores(
+                    requirement=requirement,
+                    availability=availability,
+                    quality_result={"score": quality, "pass": quality >= 0.6},
+                    price_result={"score": float(price_scores[i]), "pass": bool(price_pass[i])},
+                    delivery_result={"score": delivery, "pass": delivery >= 0.6},
+                    risk_result=risk_results.get(availability.id) if risk_engine else None,
+                    use_ml=use_ml,
+                    weights=weights,
+                    recommended_seller_ids=recommended_seller_ids
+                )
+                result["distance_km"] = (
+                    None if np.isnan(distances[i]) else round(float(distances[i]), 2)
+                )
+                results.append(result)
+            except Exception as e:
+                logger.error(
+                    f"Error scoring match: req={requirement.id}, "
+                    f"avail={availability.id}, error={e}"
+                )
+                results.append(None)
+        
+        return results
+    
+    def _quality_scores_batch(
+        self,
+        requirement: Requirement,
+        availabilities: Sequence[Availability]
+    ) -> np.ndarray:
+        """
+        Vectorized calculate_quality_score() - returns score per candidate.
+        
+        Numeric seller values are scored as arrays; non-numeric values
+        (e.g. grade strings) fall back to _score_quality_param per element.
+        NaN marks a candidate whose values could not be compared.
+        """
+        n = len(availabilities)
+        buyer_quality = requirement.quality_params or {}
+        
+        total = np.zeros(n, dtype=np.float64)
+        param_count = 0
+        
+        for param_name, param_spec in buyer_quality.items():
+            if not isinstance(param_spec, dict):
+                continue
+            
+            raw_values = [
+                (availability.quality_params or {}).get(param_name)
+                for availability in availabilities
+            ]
+            numeric_mask = np.array([_is_number(v) for v in raw_values], dtype=bool)
+            values = np.array(
+                [float(v) if m else np.nan for v, m in zip(raw_values, numeric_mask)],
+                dtype=np.float64
+            )
+            
+            buyer_min = param_spec.get("min")
+            buyer_max = param_spec.get("max")
+            buyer_preferred = param_spec.get("preferred")
+            
+            scores = np.zeros(n, dtype=np.float64)
+            vectorizable = False
+            
+            if buyer_min is not None and buyer_max is not None:
+                if _is_number(buyer_min) and _is_number(buyer_max) and (
+                    buyer_preferred is None or _is_number(buyer_preferred)
+                ):
+                    vectorizable = True
+                    # NaN (missing/non-numeric) compares False -> 0.0
+                    in_range = (values >= float(buyer_min)) & (values <= float(buyer_max))
+                    range_size = float(buyer_max) - float(buyer_min)
+                    if buyer_preferred is not None and range_size > 0:
+                        closeness = 1.0 - np.minimum(
+                            np.abs(values - float(buyer_preferred)) / range_size, 0.5
+                        )
+                        scores = np.where(in_range, closeness, 0.0)
+                    else:
+                        scores = np.where(in_range, 1.0, 0.0)
+            elif buyer_preferred is None or _is_number(buyer_preferred):
+                vectorizable = True
+                if buyer_preferred is not None:
+                    scores = np.where(values == float(buyer_preferred), 1.0, 0.8)
+                else:
+                    scores = np.full(n, 0.8)
+                scores = np.where(np.isnan(values), 0.0, scores)
+            
+            # Per-element fallback for values the vector path can't score
+            fallback = ~numeric_mask if vectorizable else np.ones(n, dtype=bool)
+            for i in np.flatnonzero(fallback):
+                try:
+                    scores[i] = self._score_quality_param(param_spec, raw_values[i])
+                except (TypeError, ValueError):
+                    # Incomparable values - surfaces as a per-candidate error
+                    scores[i] = np.nan
+            
+            total += scores
+            param_count += 1
+        
+        if param_count == 0:
+            return np.ones(n, dtype=np.float64)
+        return total / param_count
+    
+    @staticmethod
+    def _score_quality_param(param_spec: Dict[str, Any], seller_value: Any) -> float:
+        """Score a single quality parameter (same rules as calculate_quality_score)."""
+        if seller_value is None:
+            return 0.0
+        
+        buyer_min = param_spec.get("min")
+        buyer_max = param_spec.get("max")
+        buyer_preferred = param_spec.get("preferred")
+        
+        if buyer_min is not None and buyer_max is not None:
+            if not (buyer_min <= seller_value <= buyer_max):
+                return 0.0
+            score = 1.0
+            if buyer_preferred is not None:
+                range_size = buyer_max - buyer_min
+                if range_size > 0:
+                    score = 1.0 - min(abs(seller_value - buyer_preferred) / range_size, 0.5)
+            return score
+        
+        return 1.0 if seller_value == buyer_preferred else 0.8
+    
+    def _price_scores_batch(
+        self,
+        requirement: Requirement,
+        availabilities: Sequence[Availability]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized calculate_price_score() - returns (scores, pass flags).
+        
+        Tier checks are done division-free (|price - target| * 100 <= pct * target)
+        so boundaries like exactly 2% land in the same tier as the Decimal path.
+        """
+        n = len(availabilities)
+        prices = np.array(
+            [float(a.base_price) if a.base_price else np.nan for a in availabilities],
+            dtype=np.float64
+        )
+        has_price = ~np.isnan(prices)
+        
+        buyer_max_budget = requirement.max_budget
+        if not buyer_max_budget:
+            # No price constraints - perfect match (if seller priced)
+            scores = np.where(has_price, 1.0, 0.0)
+            return scores, has_price
+        
+        max_budget = float(Decimal(str(buyer_max_budget)))
+        if requirement.preferred_budget:
+            target = float(Decimal(str(requirement.preferred_budget)))
+        else:
+            target = float(Decimal(str(buyer_max_budget)) * Decimal("0.90"))
+        
+        diff_pct = np.abs(prices - target) * 100.0
+        if target > 0:
+            within = lambda pct: diff_pct <= pct * target  # noqa: E731
+        else:
+            within = lambda pct: np.ones(n, dtype=bool)  # noqa: E731
+        
+        scores = np.select(
+            [
+                ~has_price,
+                prices > max_budget,
+                prices == target,
+                within(2.0),
+                within(5.0),
+                within(10.0),
+            ],
+            [0.0, 0.0, 1.0, 0.95, 0.85, 0.70],
+            default=0.60
+        )
+        return scores, has_price & (scores >= 0.6)
+    
+    def _delivery_scores_batch(
+        self,
+        requirement: Requirement,
+        availabilities: Sequence[Availability]
+    ) -> np.ndarray:
+        """Vectorized calculate_delivery_score() - returns score per candidate."""
+        n = len(availabilities)
+        location_score = timeline_score = terms_score = 1.0
+        
+        if requirement.destination_country is None:
+            return np.full(
+                n,
+                location_score * 0.40 + timeline_score * 0.30 + terms_score * 0.30,
+                dtype=np.float64
+            )
+        
+        incoterm_scores = np.array(
+            [self._calculate_incoterm_match(requirement, a) for a in availabilities],
+            dtype=np.float64
+        )
+        port_scores = np.array(
+            [self._calculate_port_distance_score(requirement, a) for a in availabilities],
+            dtype=np.float64
+        )
+        return (
+            location_score * 0.25 +
+            timeline_score * 0.20 +
+            terms_score * 0.20 +
+            incoterm_scores * 0.20 +
+            port_scores * 0.15
+        )
+    
+    def _delivery_distances_batch(
+        self,
+        requirement: Requirement,
+        availabilities: Sequence[Availability]
+    ) -> np.ndarray:
+        """
+        Distance (km) from each candidate's location to the nearest buyer
+        delivery location. NaN where either side has no coordinates.
+        """
+        n = len(availabilities)
+        buyer_coords = [
+            (loc.get("latitude"), loc.get("longitude"))
+            for loc in (requirement.delivery_locations or [])
+            if loc.get("latitude") is not None and loc.get("longitude") is not None
+        ]
+        if not buyer_coords:
+            return np.full(n, np.nan)
+        
+        seller_lat = np.full(n, np.nan)
+        seller_lon = np.full(n, np.nan)
+        for i, availability in enumerate(availabilities):
+            location = getattr(availability, "location", None)
+            if location is not None and location.latitude is not None and location.longitude is not None:
+                seller_lat[i] = float(location.latitude)
+                seller_lon[i] = float(location.longitude)
+        
+        buyer = np.array(buyer_coords, dtype=np.float64)
+        # (n_candidates, n_buyer_locations) distance matrix, min over buyer locations
+        distances = haversine_km(
+            seller_lat[:, None], seller_lon[:, None],
+            buyer[None, :, 0], buyer[None, :, 1]
+        )
+        return np.min(distances, axis=1)
+    
     # ========================================================================
     # QUALITY SCORING (40% weight) - STRICT PARAMETER MATCHING
     # ========================================================================
@@ -707,41 +1069,111 @@ class MatchScorer:
         }
         """
         try:
+            trade_quantity, trade_price = self._trade_terms(requirement, availability)
+            
             # Call risk engine
             risk_assessment = await risk_engine.assess_trade_risk(
                 requirement=requirement,
                 availability=availability,
-                trade_quantity=min(
-                    requirement.preferred_quantity or requirement.min_quantity,
-                    availability.remaining_quantity or Decimal(0)
-                ),
-                trade_price=availability.base_price,
+                trade_quantity=trade_quantity,
+                trade_price=trade_price,
                 buyer_data={"partner_id": requirement.buyer_partner_id},
                 seller_data={"partner_id": availability.seller_id},
                 user_id=None  # System matching
             )
             
-            overall_status = risk_assessment.get("overall_status", "UNKNOWN")
-            risk_score_value = risk_assessment.get("overall_risk_score", 100)
-            
-            return {
-                "risk_status": overall_status,
-                "risk_score": risk_score_value,
-                "violations": risk_assessment.get("violations", []),
-                "warnings": risk_assessment.get("warnings", []),
-                "details": risk_assessment
-            }
+            return self._format_risk_result(risk_assessment)
             
         except Exception as e:
             logger.error(f"Risk engine error: {e}")
-            # Default to WARN on error (conservative)
-            return {
-                "risk_status": "WARN",
-                "risk_score": 70,
-                "violations": [],
-                "warnings": [f"Risk engine error: {str(e)}"],
-                "details": {}
-            }
+            return self._risk_error_result(e)
+    
+    async def calculate_risk_scores_batch(
+        self,
+        requirement: Requirement,
+        availabilities: Sequence[Availability],
+        risk_engine: RiskEngine
+    ) -> Dict[UUID, Dict[str, Any]]:
+        """
+        Risk results for a whole matching run, keyed by availability ID.
+        
+        Uses RiskEngine.assess_trade_risk_batch: the buyer and all candidate
+        sellers are loaded in one query (credit data and party links), and
+        the buyer is assessed once, instead of ~3 round trips per pair.
+        
+        Same result shape and WARN-on-error semantics as calculate_risk_score;
+        an unpriced candidate only fails its own pair, as it does there.
+        """
+        if not availabilities:
+            return {}
+        
+        trade_terms = {
+            availability.id: self._trade_terms(requirement, availability)
+            for availability in availabilities
+        }
+        results = {}
+        priced = []
+        for availability in availabilities:
+            if trade_terms[availability.id][1] is None:
+                results[availability.id] = self._risk_error_result(
+                    ValueError(f"no base price for availability {availability.id}")
+                )
+            else:
+                priced.append(availability)
+        if not priced:
+            return results
+        
+        try:
+            assessments = await risk_engine.assess_trade_risk_batch(
+                requirement=requirement,
+                availabilities=priced,
+                trade_terms=trade_terms,
+                user_id=None  # System matching
+            )
+        except Exception as e:
+            logger.error(f"Risk engine error: {e}")
+            results.update({availability.id: self._risk_error_result(e) for availability in priced})
+            return results
+        
+        results.update({
+            availability_id: self._format_risk_result(assessment)
+            for availability_id, assessment in assessments.items()
+        })
+        return results
+    
+    def _trade_terms(
+        self,
+        requirement: Requirement,
+        availability: Availability
+    ) -> Tuple[Decimal, Decimal]:
+        """Proposed (trade_quantity, trade_price) used for risk assessment."""
+        trade_quantity = min(
+            requirement.preferred_quantity or requirement.min_quantity,
+            availability.remaining_quantity or Decimal(0)
+        )
+        return trade_quantity, availability.base_price
+    
+    @staticmethod
+    def _format_risk_result(risk_assessment: Dict[str, Any]) -> Dict[str, Any]:
+        """Map a RiskEngine trade assessment to the scorer's risk result."""
+        return {
+            "risk_status": risk_assessment.get("overall_status", "UNKNOWN"),
+            "risk_score": risk_assessment.get("overall_risk_score", 100),
+            "violations": risk_assessment.get("violations", []),
+            "warnings": risk_assessment.get("warnings", []),
+            "details": risk_assessment
+        }
+    
+    @staticmethod
+    def _risk_error_result(error: Exception) -> Dict[str, Any]:
+        """Default to WARN on risk engine error (conservative)."""
+        return {
+            "risk_status": "WARN",
+            "risk_score": 70,
+            "violations": [],
+            "warnings": [f"Risk engine error: {str(error)}"],
+            "details": {}
+        }
     
     # ========================================================================
     # WARN PENALTY HELPER (for testing)
@@ -10,6 +10,7 @@ from backend.modules.trade_desk.models.requirement_embedding import RequirementE
 from backend.modules.trade_desk.models.availability import Availability
 from backend.modules.trade_desk.models.requirement import Requirement
 from backend.modules.trade_desk.models.match_outcome import MatchOutcome
+from backend.modules.trade_desk.models.match_audit_trail import MatchAuditTrail
 from backend.modules.trade_desk.models.negotiation import Negotiation
 from backend.modules.trade_desk.models.negotiation_offer import NegotiationOffer
 from backend.modules.trade_desk.models.negotiation_message import NegotiationMessage
@@ -23,6 +24,7 @@ __all__ = [
     "AvailabilityEmbedding",
     "RequirementEmbedding",
     "MatchOutcome",
+    "MatchAuditTrail",
     "MatchToken",
     "Negotiation",
     "NegotiationOffer",
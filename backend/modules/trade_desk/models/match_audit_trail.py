@@ -0,0 +1,77 @@
+"""
+Match Audit Trail Model - Explainability for every match produced
+
+One row per (requirement, availability) match returned by the matching
+engine, with the full score breakdown and risk details.
+
+Written in bulk by MatchAuditWriter (COPY / multi-row INSERT), never
+per match on the request path. Also backs the duplicate detection time
+window: (commodity_id, created_at) index answers "which buyer-seller
+pairs were matched for this commodity in the last N minutes".
+"""
+
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import Boolean, Column, DateTime, Index, Numeric, String, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PostgreSQLUUID
+
+from backend.db.session import Base
+
+
+class MatchAuditTrail(Base):
+    """
+    Append-only audit record of a match.
+
+    No foreign keys on purpose: rows are bulk-copied off the hot path and
+    must outlive cancelled/deleted postings.
+    """
+
+    __tablename__ = "match_audit_trail"
+
+    id = Column(
+        PostgreSQLUUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4,
+        server_default=text("gen_random_uuid()")
+    )
+
+    # Matched pair
+    requirement_id = Column(PostgreSQLUUID(as_uuid=True), nullable=False, index=True)
+    availability_id = Column(PostgreSQLUUID(as_uuid=True), nullable=False, index=True)
+    commodity_id = Column(PostgreSQLUUID(as_uuid=True), nullable=True)
+
+    # Which side's matching run produced it ("requirement" / "availability")
+    triggered_by = Column(String(20), nullable=False)
+
+    # Duplicate detection key (commodity:buyer:seller)
+    duplicate_key = Column(String(200), nullable=False)
+
+    # Scores
+    score = Column(Numeric(5, 4), nullable=False, comment="Final score after WARN penalty")
+    base_score = Column(Numeric(5, 4), nullable=False)
+    warn_penalty_applied = Column(Boolean, nullable=False, default=False)
+    risk_status = Column(String(20), nullable=True)
+
+    # Explainability
+    score_breakdown = Column(JSONB, nullable=True)
+    pass_fail = Column(JSONB, nullable=True)
+    risk_details = Column(JSONB, nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=text("now()")
+    )
+
+    __table_args__ = (
+        # Duplicate window lookup: recent pairs per commodity
+        Index("ix_match_audit_trail_commodity_created", "commodity_id", "created_at"),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<MatchAuditTrail(requirement={self.requirement_id}, "
+            f"availability={self.availability_id}, score={self.score})>"
+        )
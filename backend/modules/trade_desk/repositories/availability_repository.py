@@ -10,7 +10,7 @@ Features:
 - Real-time matching queries for Matching Engine (Engine 3)
 
 AI-Powered Queries:
-1. Vector Similarity: Find similar commodities using ai_score_vector
+1. Vector Similarity: Nearest neighbours over availability_embeddings (pgvector HNSW)
 2. Quality Fuzzy Match: Tolerance-based quality parameter matching
 3. Price Range Search: With anomaly detection filtering
 4. Geo-Proximity: Distance-based location scoring
@@ -27,15 +27,18 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Union
 from uuid import UUID
 
+import numpy as np
+
 from sqlalchemy import and_, desc, func, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from backend.db.vector_search import widen_hnsw_scan
 from backend.modules.trade_desk.enums import AvailabilityStatus, MarketVisibility
-from backend.modules.trade_desk.models import Availability
+from backend.modules.trade_desk.models import Availability, AvailabilityEmbedding
 
 
 class AvailabilityRepository:
@@ -90,6 +93,136 @@ class AvailabilityRepository:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
     
+    async def get_by_ids(
+        self,
+        availability_ids: List[UUID],
+        status: Optional[str] = AvailabilityStatus.ACTIVE.value,
+        load_relationships: bool = False
+    ) -> List[Availability]:
+        """
+        Get availabilities by primary key (single IN query).
+        
+        Used by matching engine to load candidates returned by the
+        in-memory candidate index.
+        
+        Args:
+            availability_ids: Availability UUIDs
+            status: Only return rows in this status (None = any)
+            load_relationships: If True, eager load commodity, location, seller
+        
+        Returns:
+            Matching availabilities (missing/filtered IDs are omitted)
+        """
+        if not availability_ids:
+            return []
+        
+        query = select(Availability).where(
+            and_(
+                Availability.id.in_(availability_ids),
+                Availability.is_deleted == False  # noqa: E712
+            )
+        )
+        
+        if status:
+            query = query.where(Availability.status == status)
+        
+        if load_relationships:
+            query = query.options(
+                joinedload(Availability.commodity),
+                joinedload(Availability.location),
+                joinedload(Availability.seller)
+            )
+        
+        result = await self.db.execute(query)
+        return list(result.unique().scalars().all())
+    
+    async def get_by_locations(
+        self,
+        location_ids: Sequence[UUID],
+        commodity_id: UUID,
+        status: str = AvailabilityStatus.ACTIVE.value,
+        load_relationships: bool = False
+    ) -> List[Availability]:
+        """
+        Get availabilities of a commodity at any of the given locations.
+        
+        Used by batched matching to load the seller side once per commodity
+        (the union of the batch's delivery locations) when the candidate
+        index is not available.
+        
+        Args:
+            location_ids: Location UUIDs
+            commodity_id: Commodity UUID
+            status: Availability status (default ACTIVE)
+            load_relationships: If True, eager load commodity, location, seller
+        
+        Returns:
+            List of availabilities, newest first
+        """
+        if not location_ids:
+            return []
+        
+        query = select(Availability).where(
+            and_(
+                Availability.location_id.in_(list(location_ids)),
+                Availability.commodity_id == commodity_id,
+                Availability.status == status,
+                Availability.is_deleted == False  # noqa: E712
+            )
+        ).order_by(desc(Availability.created_at))
+        
+        if load_relationships:
+            query = query.options(
+                joinedload(Availability.commodity),
+                joinedload(Availability.location),
+                joinedload(Availability.seller)
+            )
+        
+        result = await self.db.execute(query)
+        return list(result.unique().scalars().all())
+    
+    async def get_changed_since(
+        self,
+        commodity_id: UUID,
+        since: datetime,
+        load_relationships: bool = False
+    ) -> List[Availability]:
+        """
+        Get availabilities of a commodity created or updated since a time.
+        
+        Used by matching workers to pick up rows written by other processes
+        since the candidate index was last loaded. Any status is returned so
+        the index can evict rows that stopped being ACTIVE.
+        
+        Args:
+            commodity_id: Commodity UUID
+            since: Lower bound on created_at / updated_at
+            load_relationships: If True, eager load commodity, location, seller
+        
+        Returns:
+            Changed availabilities (soft-deleted rows omitted)
+        """
+        query = select(Availability).where(
+            and_(
+                Availability.commodity_id == commodity_id,
+                or_(
+                    Availability.created_at >= since,
+                    Availability.updated_at >= since
+                ),
+                Availability.is_deleted == False  # noqa: E712
+            )
+        )
+        
+        if load_relationships:
+            query = query.options(
+                joinedload(Availability.commodity),
+                joinedload(Availability.location),
+                joinedload(Availability.seller)
+            )
+        
+        result = await self.db.execute(query)
+        return list(result.unique().scalars().all())
+    
     async def get_by_seller(
         self,
         seller_id: UUID,
@@ -182,7 +315,7 @@ class AvailabilityRepository:
     
     async def smart_search(
         self,
-        query_vector: Optional[Dict[str, Any]] = None,
+        query_vector: Optional[Union[Sequence[float], Dict[str, Any]]] = None,
         commodity_id: Optional[UUID] = None,
         quality_params: Optional[Dict[str, Any]] = None,
         quality_tolerance: Optional[Dict[str, float]] = None,
@@ -215,7 +348,10 @@ class AvailabilityRepository:
         - Improves compliance and UX (no manual filtering needed)
         
         Args:
-            query_vector: AI embedding vector for commodity similarity (JSONB)
+            query_vector: 384-dim query embedding (EmbeddingService.encode), or a
+                dict carrying it under "embedding". When given, only availabilities
+                with a stored embedding are searched, nearest first (top-k via the
+                HNSW index), and similarity contributes to match_score
             commodity_id: Exact commodity filter
             quality_params: Desired quality parameters
             quality_tolerance: Tolerance for each quality param (e.g., {"length": 0.5})
@@ -379,23 +515,41 @@ class AvailabilityRepository:
             joinedload(Availability.seller)
         )
         
-        # Order by created_at (newest first) - AI scoring happens post-query
-        query = query.order_by(desc(Availability.created_at))
+        embedding = self._query_embedding(query_vector)
+        if embedding is not None:
+            # Nearest neighbours first: ORDER BY distance ASC lets pgvector's
+            # index produce the top-k instead of scoring every candidate.
+            # The filters above and OFFSET apply after the index scan, so
+            # widen it to cover skip + limit rows
+            await widen_hnsw_scan(self.db, skip + limit)
+            distance = AvailabilityEmbedding.embedding.cosine_distance(embedding)
+            query = (
+                query
+                .join(AvailabilityEmbedding, AvailabilityEmbedding.availability_id == Availability.id)
+                .add_columns((1 - distance).label("vector_similarity"))
+                .order_by(distance)
+            )
+        else:
+            # Order by created_at (newest first) - AI scoring happens post-query
+            query = query.order_by(desc(Availability.created_at))
         
         # Pagination
         query = query.offset(skip).limit(limit)
         
         # Execute query
         result = await self.db.execute(query)
-        availabilities = list(result.scalars().all())
+        if embedding is not None:
+            rows = [(availability, float(similarity)) for availability, similarity in result.all()]
+        else:
+            rows = [(availability, None) for availability in result.scalars().all()]
         
         # Post-processing: Calculate match scores and distances
         enriched_results = []
         
-        for availability in availabilities:
+        for availability, vector_similarity in rows:
             match_score = await self._calculate_match_score(
                 availability,
-                query_vector=query_vector,
+                vector_similarity=vector_similarity,
                 quality_params=quality_params,
                 quality_tolerance=quality_tolerance,
                 target_price=max_price,
@@ -413,6 +567,7 @@ class AvailabilityRepository:
             enriched_results.append({
                 "availability": availability,
                 "match_score": match_score,
+                "vector_similarity": vector_similarity,
                 "distance_km": distance_km,
                 "ai_confidence": availability.ai_confidence_score,
                 "ai_suggested_price": availability.ai_suggested_price
@@ -426,7 +581,7 @@ class AvailabilityRepository:
     async def _calculate_match_score(
         self,
         availability: Availability,
-        query_vector: Optional[Dict[str, Any]] = None,
+        vector_similarity: Optional[float] = None,
         quality_params: Optional[Dict[str, Any]] = None,
         quality_tolerance: Optional[Dict[str, float]] = None,
         target_price: Optional[Decimal] = None,
@@ -436,14 +591,14 @@ class AvailabilityRepository:
         Calculate AI match score (0.0 to 1.0).
         
         Combines:
-        1. Vector similarity (if query_vector provided)
+        1. Vector similarity (if searched with a query embedding)
         2. Quality parameter closeness
         3. Price competitiveness
         4. AI confidence score
         
         Args:
             availability: Availability instance
-            query_vector: AI embedding vector for similarity
+            vector_similarity: Cosine similarity to the query embedding (-1 to 1)
             quality_params: Desired quality parameters
             quality_tolerance: Tolerance dict
             target_price: Target price for scoring
@@ -455,11 +610,8 @@ class AvailabilityRepository:
         scores = []
         
         # 1. Vector similarity score (if AI embeddings available)
-        if query_vector and availability.ai_score_vector:
-            vector_score = await self._cosine_similarity(
-                query_vector,
-                availability.ai_score_vector
-            )
+        if vector_similarity is not None:
+            vector_score = min(max(vector_similarity, 0.0), 1.0)
             scores.append(("vector", vector_score, 0.4))  # 40% weight
         
         # 2. Quality parameter closeness score
@@ -493,25 +645,24 @@ class AvailabilityRepository:
         
         return weighted_sum / total_weight if total_weight > 0 else 0.5
     
-    async def _cosine_similarity(
-        self,
-        vector_a: Dict[str, Any],
-        vector_b: Dict[str, Any]
-    ) -> float:
+    @staticmethod
+    def _query_embedding(
+        query_vector: Optional[Union[Sequence[float], Dict[str, Any]]]
+    ) -> Optional[List[float]]:
         """
-        Calculate cosine similarity between two JSONB vectors.
+        Normalize a smart_search query vector to a list of floats.
         
         Args:
-            vector_a: First vector (JSONB dict)
-            vector_b: Second vector (JSONB dict)
+            query_vector: Sequence/ndarray of floats, or dict with an "embedding" key
         
         Returns:
-            Similarity score 0.0 to 1.0
+            Embedding as list, or None if no usable vector was given
         """
-        # TODO: Implement proper vector similarity using pgvector extension
-        # For now, return placeholder score
-        # In production: Use pgvector's <=> operator for embeddings
-        return 0.75  # Placeholder
+        if isinstance(query_vector, dict):
+            query_vector = query_vector.get("embedding")
+        if query_vector is None or len(query_vector) == 0:
+            return None
+        return np.asarray(query_vector, dtype=np.float32).tolist()
     
     def _quality_match_score(
         self,
@@ -13,7 +13,7 @@ Features:
 - Multi-delivery location proximity scoring
 - Market visibility access control
 - Intent-based routing for autonomous trade engine
-- AI market context embedding search (1536-dim vectors)
+- AI market context embedding search (384-dim vectors, pgvector HNSW)
 - Commodity equivalents matching (Cotton→Yarn, Paddy→Rice)
 - Real-time fulfillment status tracking
 - Event-driven architecture
@@ -29,7 +29,7 @@ AI-Powered Queries:
 Architecture:
 - AsyncSession for high concurrency
 - JSONB GIN indexes for quality_requirements
-- pgvector for market_context_embedding similarity
+- pgvector HNSW index on requirement_embeddings for similarity search
 - Geo-spatial indexes for delivery_locations
 - Event-driven: Returns data for real-time WebSocket updates
 """
@@ -38,13 +38,14 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 from uuid import UUID
 
 from sqlalchemy import and_, desc, func, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from backend.db.vector_search import widen_hnsw_scan
 from backend.modules.trade_desk.enums import (
     IntentType,
     MarketVisibility,
@@ -52,6 +53,7 @@ from backend.modules.trade_desk.enums import (
     UrgencyLevel,
 )
 from backend.modules.trade_desk.models.requirement import Requirement
+from backend.modules.trade_desk.models.requirement_embedding import RequirementEmbedding
 
 
 class RequirementRepository:
@@ -85,7 +87,7 @@ class RequirementRepository:
         
         Args:
             requirement_id: Requirement UUID
-            load_relationships: If True, eager load commodity, buyer, created_by
+            load_relationships: If True, eager load buyer
         
         Returns:
             Requirement if found, None otherwise
@@ -95,16 +97,128 @@ class RequirementRepository:
         )
         
         if load_relationships:
-            query = query.options(
-                joinedload(Requirement.buyer_partner),
-                joinedload(Requirement.commodity),
-                joinedload(Requirement.variety),
-                joinedload(Requirement.created_by_user)
-            )
+            # commodity/variety/created_by_user are not mapped on Requirement
+            query = query.options(joinedload(Requirement.buyer_partner))
         
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
     
+    async def get_by_ids(
+        self,
+        requirement_ids: List[UUID],
+        statuses: Optional[List[str]] = None,
+        load_relationships: bool = False
+    ) -> List[Requirement]:
+        """
+        Get requirements by primary key (single IN query).
+        
+        Used by matching engine to load candidates returned by the
+        in-memory candidate index.
+        
+        Args:
+            requirement_ids: Requirement UUIDs
+            statuses: Only return rows in these statuses (None = any)
+            load_relationships: If True, eager load buyer
+        
+        Returns:
+            Matching requirements (missing/filtered IDs are omitted)
+        """
+        if not requirement_ids:
+            return []
+        
+        query = select(Requirement).where(Requirement.id.in_(requirement_ids))
+        
+        if statuses:
+            query = query.where(Requirement.status.in_(statuses))
+        
+        if load_relationships:
+            query = query.options(joinedload(Requirement.buyer_partner))
+        
+        result = await self.db.execute(query)
+        return list(result.unique().scalars().all())
+    
+    async def get_by_delivery_locations(
+        self,
+        location_ids: Sequence[UUID],
+        commodity_id: UUID,
+        statuses: Optional[List[str]] = None,
+        load_relationships: bool = False
+    ) -> List[Requirement]:
+        """
+        Get requirements of a commodity accepting delivery at any given location.
+        
+        Used by batched matching to load the buyer side once per commodity
+        (the union of the batch's seller locations) when the candidate index
+        is not available. Same containment test as search_by_delivery_locations.
+        
+        Args:
+            location_ids: Location UUIDs
+            commodity_id: Commodity UUID
+            statuses: Only return rows in these statuses (None = any)
+            load_relationships: If True, eager load buyer
+        
+        Returns:
+            List of requirements, newest first
+        """
+        if not location_ids:
+            return []
+        
+        query = select(Requirement).where(
+            and_(
+                Requirement.commodity_id == commodity_id,
+                or_(*[
+                    Requirement.delivery_locations.contains([{"location_id": str(location_id)}])
+                    for location_id in location_ids
+                ])
+            )
+        ).order_by(desc(Requirement.created_at))
+        
+        if statuses:
+            query = query.where(Requirement.status.in_(statuses))
+        
+        if load_relationships:
+            query = query.options(joinedload(Requirement.buyer_partner))
+        
+        result = await self.db.execute(query)
+        return list(result.unique().scalars().all())
+    
+    async def get_changed_since(
+        self,
+        commodity_id: UUID,
+        since: datetime,
+        load_relationships: bool = False
+    ) -> List[Requirement]:
+        """
+        Get requirements of a commodity created or updated since a time.
+        
+        Used by matching workers to pick up rows written by other processes
+        since the candidate index was last loaded. Any status is returned so
+        the index can evict rows that stopped being ACTIVE.
+        
+        Args:
+            commodity_id: Commodity UUID
+            since: Lower bound on created_at / updated_at
+            load_relationships: If True, eager load buyer
+        
+        Returns:
+            Changed requirements
+        """
+        query = select(Requirement).where(
+            and_(
+                Requirement.commodity_id == commodity_id,
+                or_(
+                    Requirement.created_at >= since,
+                    Requirement.updated_at >= since
+                )
+            )
+        )
+        
+        if load_relationships:
+            query = query.options(joinedload(Requirement.buyer_partner))
+        
+        result = await self.db.execute(query)
+        return list(result.unique().scalars().all())
+    
     async def get_by_buyer(
         self,
         buyer_id: UUID,
@@ -267,8 +381,9 @@ class RequirementRepository:
         """
         🚀 Vector similarity search using AI market context embeddings.
         
-        Uses pgvector extension for semantic similarity matching.
-        Finds requirements with similar market context, sentiment, and patterns.
+        Nearest-neighbour search over requirement_embeddings (pgvector,
+        HNSW cosine index): the database returns the top max_results by
+        cosine distance, so no per-row scoring happens in Python.
         
         Critical for:
         - Cross-commodity pattern detection
@@ -277,92 +392,55 @@ class RequirementRepository:
         - Autonomous trade engine decision making
         
         Args:
-            query_embedding: 1536-dim vector (OpenAI ada-002 compatible)
+            query_embedding: 384-dim vector (EmbeddingService.encode)
             similarity_threshold: Minimum cosine similarity (0.0 to 1.0)
             commodity_id: Optional commodity filter
             max_results: Maximum number of results
         
         Returns:
-            List of dicts with requirement + similarity_score
+            List of dicts with requirement + similarity_score, most similar first
         
         Example:
             # Find requirements with similar market context
-            embedding = await ai_service.generate_embedding("urgent cotton need, quality critical")
+            embedding = get_embedding_service().encode("urgent cotton need, quality critical")
             results = await repo.search_with_market_embedding(
-                query_embedding=embedding,
+                query_embedding=embedding.tolist(),
                 similarity_threshold=0.75,
                 commodity_id=cotton_uuid
             )
         """
-        # Note: Requires pgvector extension and vector column
-        # For now, return placeholder - will be fully implemented when pgvector is enabled
-        
-        # TODO: Implement pgvector similarity search when extension is active
-        # Example query with pgvector:
-        # SELECT *, 
-        #   1 - (market_context_embedding <=> :query_vector) as similarity
-        # FROM requirements
-        # WHERE 1 - (market_context_embedding <=> :query_vector) > :threshold
-        # ORDER BY market_context_embedding <=> :query_vector
-        # LIMIT :max_results
-        
-        query = select(Requirement).where(
-            and_(
-                Requirement.status == RequirementStatus.ACTIVE.value,
-                Requirement.market_context_embedding.isnot(None)
+        distance = RequirementEmbedding.embedding.cosine_distance(query_embedding)
+        
+        query = (
+            select(Requirement, (1 - distance).label("similarity"))
+            .join(RequirementEmbedding, RequirementEmbedding.requirement_id == Requirement.id)
+            .where(
+                and_(
+                    Requirement.status == RequirementStatus.ACTIVE.value,
+                    distance <= 1 - similarity_threshold
+                )
             )
         )
         
         if commodity_id:
             query = query.where(Requirement.commodity_id == commodity_id)
         
-        query = query.limit(max_results)
+        # ORDER BY distance ASC (not similarity DESC) so the index serves top-k;
+        # the WHERE filters apply after the scan, so widen it to max_results
+        query = query.order_by(distance).limit(max_results)
+        await widen_hnsw_scan(self.db, max_results)
         
         result = await self.db.execute(query)
-        requirements = list(result.scalars().all())
-        
-        # Calculate similarity scores (placeholder - use pgvector in production)
-        enriched_results = []
-        for req in requirements:
-            similarity_score = await self._calculate_embedding_similarity(
-                query_embedding,
-                req.market_context_embedding
-            )
-            
-            if similarity_score >= similarity_threshold:
-                enriched_results.append({
-                    "requirement": req,
-                    "similarity_score": similarity_score,
-                    "buyer_priority_score": req.buyer_priority_score,
-                    "intent_type": req.intent_type
-                })
         
-        # Sort by similarity (highest first)
-        enriched_results.sort(key=lambda x: x["similarity_score"], reverse=True)
-        
-        return enriched_results
-    
-    async def _calculate_embedding_similarity(
-        self,
-        embedding_a: List[float],
-        embedding_b: Optional[List[float]]
-    ) -> float:
-        """
-        Calculate cosine similarity between embeddings.
-        
-        Args:
-            embedding_a: First embedding vector
-            embedding_b: Second embedding vector
-        
-        Returns:
-            Similarity score 0.0 to 1.0
-        """
-        if not embedding_b:
-            return 0.0
-        
-        # TODO: Use pgvector's <=> operator in production
-        # Placeholder: Return random similarity for demo
-        return 0.8  # Placeholder
+        return [
+            {
+                "requirement": req,
+                "similarity_score": float(similarity),
+                "buyer_priority_score": req.buyer_priority_score,
+                "intent_type": req.intent_type
+            }
+            for req, similarity in result.all()
+        ]
     
     # ========================================================================
     # SMART SEARCH WITH QUALITY TOLERANCE & BUDGET MATCHING
@@ -522,13 +600,8 @@ class RequirementRepository:
             if quality_conditions:
                 query = query.where(and_(*quality_conditions))
         
-        # Eager load relationships
-        query = query.options(
-            joinedload(Requirement.buyer_partner),
-            joinedload(Requirement.commodity),
-            joinedload(Requirement.variety),
-            joinedload(Requirement.created_by_user)
-        )
+        # Eager load relationships (buyer is the only one mapped)
+        query = query.options(joinedload(Requirement.buyer_partner))
         
         # Order by urgency, priority score, and created date
         query = query.order_by(
@@ -6,7 +6,7 @@ Features:
 - Query by negotiation, partner, commodity
 - Status-based filtering (ACTIVE, COMPLETED, etc.)
 - Branch-aware queries (ship-to, bill-to, ship-from)
-- Trade number generation with sequential numbering
+- Trade number generation (block-reserved per-year sequence)
 - Address snapshot management
 
 Architecture:
@@ -27,9 +27,13 @@ from sqlalchemy import and_, desc, func, or_, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
+from backend.core.sequences import get_sequence_allocator
 from backend.modules.trade_desk.models import Trade
 
 
+TRADE_NUMBER_SEQUENCE = "trade_number"
+
+
 class TradeRepository:
     """
     Repository for Trade (Contract) management.
@@ -209,6 +213,10 @@ class TradeRepository:
         """
         Generate sequential trade number: TR-2025-00001
         
+        Allocated from the per-year "trade_number" sequence in blocks
+        (core/sequences): unique across workers, no query per trade. Numbers
+        are increasing per worker but may have gaps.
+        
         Args:
             year: Optional year (default: current year)
         
@@ -218,19 +226,7 @@ class TradeRepository:
         if year is None:
             year = datetime.now(timezone.utc).year
         
-        # Get last trade number for this year
-        query = select(func.max(Trade.trade_number)).where(
-            Trade.trade_number.like(f"TR-{year}-%")
-        )
-        result = await self.db.execute(query)
-        last_number = result.scalar_one_or_none()
-        
-        if last_number:
-            # Extract sequence: TR-2025-00001 → 00001 → 1
-            sequence = int(last_number.split('-')[-1])
-            next_sequence = sequence + 1
-        else:
-            next_sequence = 1
+        next_sequence = await get_sequence_allocator().next_value(TRADE_NUMBER_SEQUENCE, str(year))
         
         # Format: TR-2025-00001 (zero-padded 5 digits)
         return f"TR-{year}-{next_sequence:05d}"
@@ -28,6 +28,7 @@ Architecture:
 from __future__ import annotations
 
 import json
+import logging
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Any, Dict, List, Optional, Tuple
@@ -46,12 +47,19 @@ from backend.modules.trade_desk.enums import (
 )
 from backend.modules.trade_desk.models import Availability
 from backend.modules.trade_desk.repositories import AvailabilityRepository
+from backend.modules.trade_desk.services.enrichment import (
+    EnrichmentPipeline,
+    EnrichmentStep,
+)
 from backend.modules.settings.commodities.unit_converter import UnitConverter
 from backend.modules.settings.commodities.models import Commodity, CommodityParameter
 from backend.modules.settings.locations.models import Location
 from backend.core.validators.insider_trading import InsiderTradingValidator
 
 
+logger = logging.getLogger(__name__)
+
+
 class AvailabilityService:
     """
     Service layer for Availability Engine with AI-powered features.
@@ -132,6 +140,10 @@ class AvailabilityService:
         12. Emit availability.created event
         13. Flush events to event store
         
+        Steps 1, 2 and 6-10 run as an EnrichmentPipeline: AI steps run
+        concurrently with validation and fall back when they time out or
+        fail (see _build_enrichment_pipeline).
+        
         Args:
             seller_id: Business partner UUID (SELLER or TRADER)
             commodity_id: Commodity UUID
@@ -191,66 +203,18 @@ class AvailabilityService:
                     "Please update commodity master data."
                 )
         
-        # 1. Validate and resolve location (registered OR ad-hoc)
-        actual_location_id = None
-        delivery_latitude = None
-        delivery_longitude = None
-        delivery_region = None
-        
-        if location_id:
-            # SCENARIO 1: Using registered location from settings table
-            await self._validate_seller_location(seller_id, location_id)
-            actual_location_id = location_id
-            
-            # Fetch coordinates from registered location
-            delivery_coords = await self._get_delivery_coordinates(location_id)
-            delivery_latitude = delivery_coords.get("latitude")
-            delivery_longitude = delivery_coords.get("longitude")
-            delivery_region = delivery_coords.get("region")
-        else:
+        # 1. Resolve location (registered OR ad-hoc)
+        if not location_id:
             # SCENARIO 2: Using ad-hoc location (Google Maps coordinates)
             if not all([location_address, location_latitude is not None, location_longitude is not None]):
                 raise ValueError(
                     "Ad-hoc location requires: location_address, location_latitude, location_longitude"
                 )
             
-            # Use ad-hoc coordinates directly (no location_id stored)
-            actual_location_id = None  # NULL in database
-            delivery_latitude = location_latitude
-            delivery_longitude = location_longitude
-            delivery_region = location_region  # May be None
-            
             # Update delivery_address if not provided
             if not delivery_address:
                 delivery_address = location_address
         
-        # ====================================================================
-        # 1A: 🚀 CAPABILITY VALIDATION (CDPS - Capability-Driven Partner System)
-        # Validate partner has SELL capability based on verified documents
-        # Uses partner.capabilities JSONB (NOT deprecated partner_type)
-        # ====================================================================
-        from backend.modules.trade_desk.validators.capability_validator import TradeCapabilityValidator
-        
-        # Get location country for capability check
-        if actual_location_id:
-            location_country = await self._get_location_country(actual_location_id)
-        else:
-            # Ad-hoc location: derive country from region or default to India
-            location_country = location_region if location_region else "India"
-        
-        capability_validator = TradeCapabilityValidator(self.db)
-        await capability_validator.validate_sell_capability(
-            partner_id=seller_id,
-            location_country=location_country,
-            raise_exception=True  # Will raise CapabilityValidationError if invalid
-        )
-        # Capability validation checks:
-        # ✅ Service providers blocked (entity_class="service_provider")
-        # ✅ Indian entities need domestic_sell_india=True (from GST+PAN)
-        # ✅ Foreign entities need domestic_sell_home_country=True (from tax docs)
-        # ✅ Foreign entities CANNOT sell in India (must establish Indian entity)
-        # ✅ Export requires export_allowed=True (from IEC+GST+PAN or foreign license)
-        
         # ====================================================================
         # 1B: Calculate estimated trade value (for risk check later)
         # ====================================================================
@@ -287,12 +251,10 @@ class AvailabilityService:
             price_per_base_unit = base_price / Decimal(str(conversion_factor))
         
         # ====================================================================
-        # 2B: 🚀 QUALITY PARAMETER VALIDATION (Against CommodityParameter)
-        # Validate min_value, max_value, is_mandatory constraints
+        # 2B: AI extraction placeholders (test report OCR, media CV)
         # ====================================================================
         test_report_data = None
         ai_detected_params = None
-        manual_override_params = False
         
         # Extract parameters from test_report if provided
         if test_report_url:
@@ -306,52 +268,48 @@ class AvailabilityService:
             # This will be implemented in Phase 2 with AI integration
             ai_detected_params = {"source": "manual", "note": "AI CV not yet implemented"}
         
-        # Validate quality_params against CommodityParameter constraints
-        if quality_params:
-            await self._validate_quality_params(commodity_id, quality_params)
-            
-            # Check if user manually overrode AI-detected parameters
-            if ai_detected_params:
-                manual_override_params = True
+        # Check if user manually overrode AI-detected parameters
+        manual_override_params = bool(quality_params and ai_detected_params)
+        
+        # ====================================================================
+        # 1, 1A, 2C, 3, 4: Location + capability + quality validation and AI
+        # enrichment (concurrent, see enrichment.py)
+        # ====================================================================
+        enrichment = await self._build_enrichment_pipeline(
+            seller_id=seller_id,
+            commodity_id=commodity_id,
+            location_id=location_id,
+            location_region=location_region,
+            base_price=base_price,
+            quality_params=quality_params,
+        ).run()
+        
+        if location_id:
+            # SCENARIO 1: Registered location - coordinates from settings table
+            actual_location_id = location_id
+            delivery_coords = enrichment["location"]
+            delivery_latitude = delivery_coords.get("latitude")
+            delivery_longitude = delivery_coords.get("longitude")
+            delivery_region = delivery_coords.get("region")
         else:
-            # If no quality_params provided, check if commodity has mandatory parameters
-            mandatory_params = await self._get_mandatory_parameters(commodity_id)
-            if mandatory_params:
-                raise ValueError(
-                    f"Quality parameters are mandatory for this commodity. "
-                    f"Required parameters: {', '.join(mandatory_params)}"
-                )
+            # Use ad-hoc coordinates directly (no location_id stored)
+            actual_location_id = None  # NULL in database
+            delivery_latitude = location_latitude
+            delivery_longitude = location_longitude
+            delivery_region = location_region  # May be None
         
-        # 2C. Auto-normalize quality parameters (AI standardization)
-        if quality_params:
-            quality_params = await self.normalize_quality_params(
-                commodity_id,
-                quality_params
-            )
+        quality_params = enrichment["quality"]
         
-        # 3. Detect price anomalies
-        price_anomaly_flag = False
-        ai_suggested_price = None
-        ai_confidence_score = None
+        # 3. Price anomalies
+        anomaly_result = enrichment.get("price_anomaly") or {}
+        price_anomaly_flag = anomaly_result.get("is_anomaly", False)
+        ai_suggested_price = anomaly_result.get("suggested_price")
+        ai_confidence_score = anomaly_result.get("confidence_score")
         
-        if base_price:
-            anomaly_result = await self.detect_price_anomaly(
-                commodity_id,
-                base_price,
-                quality_params
-            )
-            price_anomaly_flag = anomaly_result["is_anomaly"]
-            ai_suggested_price = anomaly_result.get("suggested_price")
-            ai_confidence_score = anomaly_result.get("confidence_score")
-        
-        # 4. Calculate AI score vector (embeddings for ML matching)
-        ai_score_vector = await self.calculate_ai_score_vector(
-            commodity_id,
-            quality_params,
-            base_price or Decimal(0)
-        )
+        # 4. AI score vector (embeddings for ML matching)
+        ai_score_vector = enrichment["score_vector"]
         
-        # 5. Delivery coordinates already fetched in step 1 (registered or ad-hoc)
+        # 5. Delivery coordinates resolved in step 1 (registered or ad-hoc)
         # delivery_latitude, delivery_longitude, delivery_region are ready
         
         # 6. Determine price type
@@ -463,23 +421,14 @@ class AvailabilityService:
         # Trigger instant matching - find buyers immediately
         # This is NOT marketplace - no browsing/listing allowed
         try:
-            from backend.modules.trade_desk.services.matching_service import MatchingService, MatchPriority
-            from backend.modules.trade_desk.matching.matching_engine import MatchingEngine
-            from backend.modules.trade_desk.matching.validators import MatchValidator
-            from backend.modules.trade_desk.config.matching_config import MatchingConfig
-            
-            # Initialize matching components
-            matching_engine = MatchingEngine(self.db)
-            validator = MatchValidator(self.db)
-            config = MatchingConfig()
-            matching_service = MatchingService(
-                db=self.db,
-                matching_engine=matching_engine,
-                validator=validator,
-                config=config,
-                redis_client=self.redis_client
+            from backend.modules.trade_desk.services.matching_service import (
+                MatchPriority,
+                get_background_matching_service,
             )
             
+            # Enqueue on the long-lived service; its workers match in their own session
+            matching_service = get_background_matching_service()
+            
             # 🔥 INSTANT MATCH - High priority (user just posted)
             await matching_service.on_availability_created(
                 availability_id=availability.id,
@@ -497,6 +446,20 @@ class AvailabilityService:
         
         return availability
     
+    async def _queue_rematch(self, availability_id: UUID) -> None:
+        """
+        Tell matching workers the availability changed.
+        
+        Workers re-index it in the candidate index (or evict it once no
+        longer ACTIVE) and re-run matching. Never fails the caller.
+        """
+        try:
+            from backend.modules.trade_desk.services.matching_service import get_background_matching_service
+            
+            await get_background_matching_service().on_availability_updated(availability_id)
+        except Exception as e:
+            logger.error(f"Failed to queue re-match for availability {availability_id}: {e}")
+    
     async def update_availability(
         self,
         availability_id: UUID,
@@ -614,6 +577,8 @@ class AvailabilityService:
         # Flush events
         await availability.flush_events(self.db)
         
+        await self._queue_rematch(availability.id)
+        
         return availability
     
     async def approve_availability(
@@ -847,12 +812,128 @@ class AvailabilityService:
         # Flush events
         await availability.flush_events(self.db)
         
+        await self._queue_rematch(availability.id)
+        
         return availability
     
     # ========================
     # AI-Powered Features
     # ========================
     
+    def _build_enrichment_pipeline(
+        self,
+        *,
+        seller_id: UUID,
+        commodity_id: UUID,
+        location_id: Optional[UUID],
+        location_region: Optional[str],
+        base_price: Optional[Decimal],
+        quality_params: Optional[Dict[str, Any]],
+    ) -> EnrichmentPipeline:
+        """
+        Validation and AI enrichment steps of create_availability.
+        
+        Location, capability and quality validation are required and raise
+        (they share the session, so they run one at a time). Price anomaly
+        detection and the score vector fall back when they time out or fail.
+        """
+        from backend.modules.trade_desk.validators.capability_validator import TradeCapabilityValidator
+        
+        async def resolve_location(r: Dict[str, Any]) -> Dict[str, Any]:
+            # SCENARIO 1: Using registered location from settings table
+            await self._validate_seller_location(seller_id, location_id)
+            return await self._get_delivery_coordinates(location_id)
+        
+        async def resolve_location_country(r: Dict[str, Any]) -> str:
+            if location_id:
+                return await self._get_location_country(location_id)
+            # Ad-hoc location: derive country from region or default to India
+            return location_region if location_region else "India"
+        
+        async def validate_capability(r: Dict[str, Any]) -> None:
+            # 🚀 CDPS: SELL capability from verified documents (partner.capabilities JSONB)
+            # ✅ Service providers blocked (entity_class="service_provider")
+            # ✅ Indian entities need domestic_sell_india=True (from GST+PAN)
+            # ✅ Foreign entities need domestic_sell_home_country=True (from tax docs)
+            # ✅ Foreign entities CANNOT sell in India (must establish Indian entity)
+            # ✅ Export requires export_allowed=True (from IEC+GST+PAN or foreign license)
+            capability_validator = TradeCapabilityValidator(self.db)
+            await capability_validator.validate_sell_capability(
+                partner_id=seller_id,
+                location_country=r["location_country"],
+                raise_exception=True  # Will raise CapabilityValidationError if invalid
+            )
+        
+        async def validate_quality(r: Dict[str, Any]) -> None:
+            # Validate min_value, max_value, is_mandatory (CommodityParameter)
+            if quality_params:
+                await self._validate_quality_params(commodity_id, quality_params)
+                return
+            
+            # If no quality_params provided, check if commodity has mandatory parameters
+            mandatory_params = await self._get_mandatory_parameters(commodity_id)
+            if mandatory_params:
+                raise ValueError(
+                    f"Quality parameters are mandatory for this commodity. "
+                    f"Required parameters: {', '.join(mandatory_params)}"
+                )
+        
+        async def normalize_quality(r: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            # Auto-normalize quality parameters (AI standardization)
+            if not quality_params:
+                return quality_params
+            return await self.normalize_quality_params(commodity_id, quality_params)
+        
+        # Validation steps share the session, so they run in sequence
+        # anyway; chaining them keeps the original order of checks (and errors)
+        steps = [
+            # Validation (required)
+            EnrichmentStep(
+                "location_country",
+                resolve_location_country,
+                depends_on=("location",) if location_id else (),
+                uses_session=bool(location_id),
+            ),
+            EnrichmentStep(
+                "capability",
+                validate_capability,
+                depends_on=("location_country",),
+                uses_session=True,
+            ),
+            EnrichmentStep(
+                "quality_validation",
+                validate_quality,
+                depends_on=("capability",),
+                uses_session=True,
+            ),
+            EnrichmentStep("quality", normalize_quality),
+            # AI enrichment (degrade gracefully)
+            EnrichmentStep(
+                "score_vector",
+                lambda r: self.calculate_ai_score_vector(
+                    commodity_id,
+                    r["quality"],
+                    base_price or Decimal(0)
+                ),
+                depends_on=("quality",),
+                fallback=None,
+            ),
+        ]
+        
+        if location_id:
+            steps.insert(0, EnrichmentStep("location", resolve_location, uses_session=True))
+        
+        # Detect price anomalies (statistical + AI)
+        if base_price:
+            steps.append(EnrichmentStep(
+                "price_anomaly",
+                lambda r: self.detect_price_anomaly(commodity_id, base_price, r["quality"]),
+                depends_on=("quality",),
+                fallback=lambda r: {"is_anomaly": False},
+            ))
+        
+        return EnrichmentPipeline("availability", steps)
+    
     async def normalize_quality_params(
         self,
         commodity_id: UUID,
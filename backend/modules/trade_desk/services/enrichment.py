@@ -0,0 +1,210 @@
+"""
+Enrichment Pipeline
+
+create_requirement / create_availability used to await every validation
+and AI enrichment step in sequence, so posting took the SUM of all step
+latencies. Most steps only read the input payload. Each step now declares
+the steps it depends on and the pipeline runs everything else concurrently,
+so posting takes roughly the longest dependency chain.
+
+Per step:
+- depends_on: names of steps whose results it reads (results[name])
+- timeout: seconds (optional steps default to the pipeline's timeout,
+  settings.ENRICHMENT_STEP_TIMEOUT_SECONDS)
+- fallback: value (or callable(results) -> value) used when the step
+  times out or fails. Steps without a fallback are REQUIRED: their error
+  cancels the rest of the pipeline and propagates (validation steps).
+- uses_session: the step queries the request's AsyncSession. A session
+  cannot run two statements at once, so these steps take turns on one lock
+  while the session-free steps keep running.
+
+Every run records per-step timings (duration, status) on the result and
+logs them in one line for observability.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from backend.core.settings.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class _Required:
+    def __repr__(self) -> str:
+        return "REQUIRED"
+
+
+REQUIRED: Any = _Required()
+
+
+@dataclass
+class EnrichmentStep:
+    """One unit of work: run(results) -> value, results holding its dependencies."""
+    name: str
+    run: Callable[[Dict[str, Any]], Awaitable[Any]]
+    depends_on: Tuple[str, ...] = ()
+    timeout: Optional[float] = None
+    fallback: Any = REQUIRED
+    uses_session: bool = False
+
+    @property
+    def required(self) -> bool:
+        return self.fallback is REQUIRED
+
+
+@dataclass
+class StepTiming:
+    """How one step went: ok, timeout (fallback used), error (fallback used)."""
+    name: str
+    status: str
+    duration_ms: float
+    error: Optional[str] = None
+
+
+@dataclass
+class EnrichmentResult:
+    """Step results by name, plus timings."""
+    values: Dict[str, Any]
+    timings: List[StepTiming] = field(default_factory=list)
+    duration_ms: float = 0.0
+
+    def __getitem__(self, name: str) -> Any:
+        return self.values[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.values.get(name, default)
+
+    @property
+    def degraded(self) -> List[str]:
+        """Steps that fell back instead of producing a result."""
+        return [t.name for t in self.timings if t.status != "ok"]
+
+
+class EnrichmentPipeline:
+    """Runs EnrichmentSteps concurrently in dependency order."""
+
+    def __init__(
+        self,
+        name: str,
+        steps: Sequence[EnrichmentStep],
+        default_timeout: Optional[float] = None,
+    ):
+        self.name = name
+        self.steps = list(steps)
+        self.default_timeout = (
+            default_timeout if default_timeout is not None else settings.ENRICHMENT_STEP_TIMEOUT_SECONDS
+        )
+        self._validate()
+
+    def _validate(self) -> None:
+        """Reject duplicate names, unknown dependencies and cycles."""
+        names = [step.name for step in self.steps]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate step names in {self.name} pipeline")
+
+        known = set(names)
+        for step in self.steps:
+            unknown = set(step.depends_on) - known
+            if unknown:
+                raise ValueError(f"Step {step.name} depends on unknown steps: {sorted(unknown)}")
+
+        # Steps may be listed in any order; they must form a DAG
+        resolved: set = set()
+        remaining = list(self.steps)
+        while remaining:
+            ready = [s for s in remaining if set(s.depends_on) <= resolved]
+            if not ready:
+                raise ValueError(f"Dependency cycle in {self.name} pipeline: {[s.name for s in remaining]}")
+            resolved.update(s.name for s in ready)
+            remaining = [s for s in remaining if s.name not in resolved]
+
+    async def run(self) -> EnrichmentResult:
+        """
+        Run all steps.
+
+        Returns:
+            EnrichmentResult with every step's value (or fallback)
+
+        Raises:
+            Whatever a required step raised (remaining steps are cancelled)
+        """
+        start = time.perf_counter()
+        session_lock = asyncio.Lock()
+        timings: Dict[str, StepTiming] = {}
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_step(step: EnrichmentStep) -> Any:
+            results = {dep: await tasks[dep] for dep in step.depends_on}
+            timeout = step.timeout if step.timeout is not None or step.required else self.default_timeout
+
+            step_start = time.perf_counter()
+            try:
+                if step.uses_session:
+                    async with session_lock:
+                        value = await asyncio.wait_for(step.run(results), timeout)
+                else:
+                    value = await asyncio.wait_for(step.run(results), timeout)
+            except asyncio.TimeoutError:
+                timings[step.name] = StepTiming(step.name, "timeout", _ms(step_start), f"timed out after {timeout}s")
+                if step.required:
+                    raise
+                return _fallback(step, results)
+            except Exception as e:
+                timings[step.name] = StepTiming(step.name, "error", _ms(step_start), str(e))
+                if step.required:
+                    raise
+                logger.warning(f"{self.name} enrichment step {step.name} failed, using fallback: {e}")
+                return _fallback(step, results)
+
+            timings[step.name] = StepTiming(step.name, "ok", _ms(step_start))
+            return value
+
+        # Dependencies are awaited inside run_step; creating every task up
+        # front is safe because tasks only start running at the first await
+        for step in self.steps:
+            tasks[step.name] = asyncio.ensure_future(run_step(step))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+
+        result = EnrichmentResult(
+            values={name: task.result() for name, task in tasks.items()},
+            timings=[timings[step.name] for step in self.steps if step.name in timings],
+            duration_ms=_ms(start),
+        )
+        self._log(result)
+        return result
+
+    def _log(self, result: EnrichmentResult) -> None:
+        steps = ", ".join(
+            f"{t.name}={t.duration_ms:.1f}ms" + ("" if t.status == "ok" else f" ({t.status})")
+            for t in result.timings
+        )
+        logger.info(
+            f"{self.name} enrichment: {result.duration_ms:.1f}ms [{steps}]",
+            extra={
+                "enrichment_pipeline": self.name,
+                "enrichment_duration_ms": result.duration_ms,
+                "enrichment_steps": {t.name: {"status": t.status, "duration_ms": t.duration_ms} for t in result.timings},
+            },
+        )
+
+
+def _fallback(step: EnrichmentStep, results: Dict[str, Any]) -> Any:
+    return step.fallback(results) if callable(step.fallback) else step.fallback
+
+
+def _ms(start: float) -> float:
+    return (time.perf_counter() - start) * 1000
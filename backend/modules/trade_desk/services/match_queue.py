@@ -0,0 +1,374 @@
+"""
+Match Request Queues
+
+Priority queues feeding MatchingService workers.
+
+Implementations:
+    InMemoryMatchQueue: asyncio-based, single process (dev/tests, Redis down)
+    RedisMatchQueue: durable, shared by every API/worker node
+
+Redis layout (RedisMatchQueue):
+    {key}            ZSET  member="entity_type:entity_id", score=priority rank + enqueue time
+    {key}:inflight   ZSET  member -> lease deadline (unix seconds)
+    {key}:delayed    ZSET  member -> not-before time (unix seconds) of a retry
+    {key}:payload    HASH  member -> JSON request (priority, created_at, retry_count, not_before)
+
+A dequeued request is moved to the in-flight set atomically and stays there
+until ack(). If a worker dies mid-request, requeue_expired() puts it back
+once its lease runs out, so requests survive restarts and crashes
+(at-least-once delivery).
+
+A request with a future not_before (retry backoff) is parked in the
+delayed set instead and moved into the queue once it is due, so the worker
+that failed it can ack and move on instead of sleeping on the lease.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+import redis.asyncio as redis
+
+
+logger = logging.getLogger(__name__)
+
+
+class MatchPriority(str, Enum):
+    """Priority levels for match processing queue"""
+    HIGH = "HIGH"      # User-triggered, risk_status.changed
+    MEDIUM = "MEDIUM"  # Requirement/availability created
+    LOW = "LOW"        # Background re-matching, cron fallback
+
+
+PRIORITY_ORDER = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+
+
+@dataclass
+class MatchRequest:
+    """Request for matching operation in priority queue"""
+    priority: MatchPriority
+    entity_type: str  # "requirement" or "availability"
+    entity_id: UUID
+    created_at: datetime
+    retry_count: int = 0
+    not_before: Optional[float] = None  # Unix seconds; backoff before the next attempt
+
+    def __lt__(self, other):
+        """Priority comparison for queue ordering"""
+        if PRIORITY_ORDER[self.priority.value] != PRIORITY_ORDER[other.priority.value]:
+            return PRIORITY_ORDER[self.priority.value] < PRIORITY_ORDER[other.priority.value]
+        return self.created_at < other.created_at
+
+    @property
+    def key(self) -> str:
+        """Dedup key - one pending request per entity"""
+        return f"{self.entity_type}:{self.entity_id}"
+
+    @property
+    def is_delayed(self) -> bool:
+        return self.not_before is not None and self.not_before > time.time()
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "priority": self.priority.value,
+            "entity_type": self.entity_type,
+            "entity_id": str(self.entity_id),
+            "created_at": self.created_at.isoformat(),
+            "retry_count": self.retry_count,
+            "not_before": self.not_before
+        })
+
+    @classmethod
+    def from_json(cls, raw: str) -> "MatchRequest":
+        data = json.loads(raw)
+        return cls(
+            priority=MatchPriority(data["priority"]),
+            entity_type=data["entity_type"],
+            entity_id=UUID(data["entity_id"]),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            retry_count=data.get("retry_count", 0),
+            not_before=data.get("not_before")
+        )
+
+
+class MatchQueue:
+    """
+    Interface for match request queues.
+
+    put() is idempotent per entity while a request is pending; re-enqueueing
+    with a higher priority promotes the pending request.
+    """
+
+    async def put(self, request: MatchRequest) -> bool:
+        """
+        Enqueue request. Returns False if an equal/higher request is already pending.
+
+        A request with a future not_before becomes visible to get() only once
+        it is due; it is dropped if the entity is already pending. An
+        immediate request supersedes a parked retry of the same entity.
+        """
+        raise NotImplementedError
+
+    async def get(self, timeout: float) -> Optional[MatchRequest]:
+        """Dequeue highest-priority request, or None after timeout."""
+        raise NotImplementedError
+
+    async def ack(self, request: MatchRequest) -> None:
+        """Mark a dequeued request as done."""
+        raise NotImplementedError
+
+    async def requeue_expired(self) -> int:
+        """Return requests whose worker died back to the queue. Returns count."""
+        return 0
+
+    async def size(self) -> int:
+        raise NotImplementedError
+
+    async def inflight(self) -> int:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+
+class InMemoryMatchQueue(MatchQueue):
+    """Process-local priority queue (not durable, single consumer process)."""
+
+    def __init__(self):
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._pending: Dict[str, MatchRequest] = {}
+        self._inflight: Dict[str, MatchRequest] = {}
+        self._delayed: List[Tuple[float, int, MatchRequest]] = []  # (not_before, seq, request) heap
+        self._delayed_seq = 0
+
+    async def put(self, request: MatchRequest) -> bool:
+        pending = self._pending.get(request.key)
+        if request.is_delayed:
+            if pending is not None:
+                return False
+            self._delayed_seq += 1
+            heapq.heappush(self._delayed, (request.not_before, self._delayed_seq, request))
+            return True
+
+        if any(entry[2].key == request.key for entry in self._delayed):
+            self._delayed = [entry for entry in self._delayed if entry[2].key != request.key]
+            heapq.heapify(self._delayed)
+
+        if pending is not None and not request < pending:
+            return False
+
+        # Newer entry wins; the superseded one is skipped on get()
+        self._pending[request.key] = request
+        await self._queue.put(request)
+        return True
+
+    async def _promote_due(self) -> Optional[float]:
+        """Move due delayed requests into the queue; return seconds until the next one."""
+        now = time.time()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, _, request = heapq.heappop(self._delayed)
+            if request.key not in self._pending:
+                self._pending[request.key] = request
+                await self._queue.put(request)
+        return self._delayed[0][0] - now if self._delayed else None
+
+    async def get(self, timeout: float) -> Optional[MatchRequest]:
+        deadline = time.monotonic() + timeout
+        while True:
+            next_due = await self._promote_due()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            wait = remaining if next_due is None else min(remaining, next_due)
+            try:
+                request = await asyncio.wait_for(self._queue.get(), timeout=wait)
+            except asyncio.TimeoutError:
+                if wait < remaining:
+                    continue  # A delayed request became due
+                return None
+
+            if self._pending.get(request.key) is not request:
+                continue  # Superseded by a higher-priority entry
+
+            del self._pending[request.key]
+            self._inflight[request.key] = request
+            return request
+
+    async def ack(self, request: MatchRequest) -> None:
+        self._inflight.pop(request.key, None)
+
+    async def size(self) -> int:
+        return len(self._pending) + len(self._delayed)
+
+    async def inflight(self) -> int:
+        return len(self._inflight)
+
+
+class RedisMatchQueue(MatchQueue):
+    """Durable priority queue in Redis, safe for many consumers across nodes."""
+
+    # Scores: rank * 10^13 + enqueue epoch-ms (epoch-ms < 10^13 until year 2286)
+    _RANK_FACTOR = 10 ** 13
+
+    # LT: only add new members or promote to a better (lower) score; an
+    # immediate request supersedes a parked retry of the same entity
+    _PUT_SCRIPT = """
+    redis.call('ZREM', KEYS[3], ARGV[2])
+    local changed = redis.call('ZADD', KEYS[1], 'LT', 'CH', ARGV[1], ARGV[2])
+    if changed == 1 then redis.call('HSET', KEYS[2], ARGV[2], ARGV[3]) end
+    return changed
+    """
+
+    # Pop lowest score and lease it in one atomic step
+    _POP_SCRIPT = """
+    local item = redis.call('ZPOPMIN', KEYS[1])
+    if #item == 0 then return nil end
+    redis.call('ZADD', KEYS[2], ARGV[1], item[1])
+    return {item[1], redis.call('HGET', KEYS[3], item[1])}
+    """
+
+    # Park a retry until ARGV[1] unless the entity is already pending
+    _DELAY_SCRIPT = """
+    if redis.call('ZSCORE', KEYS[1], ARGV[2]) then return 0 end
+    redis.call('ZADD', KEYS[2], ARGV[1], ARGV[2])
+    redis.call('HSET', KEYS[3], ARGV[2], ARGV[3])
+    return 1
+    """
+
+    # Release lease; keep payload if the entity was re-enqueued or delayed meanwhile
+    _ACK_SCRIPT = """
+    redis.call('ZREM', KEYS[2], ARGV[1])
+    if not redis.call('ZSCORE', KEYS[1], ARGV[1]) and not redis.call('ZSCORE', KEYS[4], ARGV[1]) then
+        redis.call('HDEL', KEYS[3], ARGV[1])
+    end
+    return 1
+    """
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        key: str = "trade_desk:match_queue",
+        lease_seconds: int = 300,
+        poll_interval: float = 0.25
+    ):
+        self.redis = redis_client
+        self.key = key
+        self.inflight_key = f"{key}:inflight"
+        self.delayed_key = f"{key}:delayed"
+        self.payload_key = f"{key}:payload"
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self._put = redis_client.register_script(self._PUT_SCRIPT)
+        self._pop = redis_client.register_script(self._POP_SCRIPT)
+        self._ack = redis_client.register_script(self._ACK_SCRIPT)
+        self._delay = redis_client.register_script(self._DELAY_SCRIPT)
+
+    def _score(self, request: MatchRequest) -> int:
+        created_at = request.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)  # utcnow() values
+        return (
+            PRIORITY_ORDER[request.priority.value] * self._RANK_FACTOR
+            + int(created_at.timestamp() * 1000)
+        )
+
+    async def put(self, request: MatchRequest) -> bool:
+        if request.is_delayed:
+            parked = await self._delay(
+                keys=[self.key, self.delayed_key, self.payload_key],
+                args=[request.not_before, request.key, request.to_json()]
+            )
+            return bool(parked)
+
+        changed = await self._put(
+            keys=[self.key, self.payload_key, self.delayed_key],
+            args=[self._score(request), request.key, request.to_json()]
+        )
+        return bool(changed)
+
+    async def get(self, timeout: float) -> Optional[MatchRequest]:
+        deadline = time.monotonic() + timeout
+        while True:
+            await self._promote_due()
+            result = await self._pop(
+                keys=[self.key, self.inflight_key, self.payload_key],
+                args=[time.time() + self.lease_seconds]
+            )
+            if result:
+                member, payload = (_decode(v) for v in result)
+                if payload is None:
+                    # Payload lost (manual cleanup) - nothing to process
+                    await self._ack(
+                        keys=[self.key, self.inflight_key, self.payload_key, self.delayed_key], args=[member]
+                    )
+                    continue
+                return MatchRequest.from_json(payload)
+
+            if time.monotonic() + self.poll_interval > deadline:
+                return None
+            await asyncio.sleep(self.poll_interval)
+
+    async def ack(self, request: MatchRequest) -> None:
+        await self._ack(
+            keys=[self.key, self.inflight_key, self.payload_key, self.delayed_key],
+            args=[request.key]
+        )
+
+    async def _promote_due(self) -> int:
+        """Move delayed retries whose not-before time has passed into the queue."""
+        due = await self.redis.zrangebyscore(self.delayed_key, "-inf", time.time())
+        promoted = 0
+        for raw_member in due:
+            member = _decode(raw_member)
+            # ZREM returns 1 for exactly one consumer when several nodes race
+            if not await self.redis.zrem(self.delayed_key, member):
+                continue
+            payload = await self.redis.hget(self.payload_key, member)
+            if payload is None:
+                continue
+            request = MatchRequest.from_json(_decode(payload))
+            await self.redis.zadd(self.key, {member: self._score(request)}, nx=True)
+            promoted += 1
+        return promoted
+
+    async def requeue_expired(self) -> int:
+        expired = await self.redis.zrangebyscore(self.inflight_key, "-inf", time.time())
+        requeued = 0
+        for raw_member in expired:
+            member = _decode(raw_member)
+            # ZREM returns 1 for exactly one reaper when several nodes race
+            if not await self.redis.zrem(self.inflight_key, member):
+                continue
+            payload = await self.redis.hget(self.payload_key, member)
+            if payload is None:
+                continue
+            request = MatchRequest.from_json(_decode(payload))
+            await self.redis.zadd(self.key, {member: self._score(request)}, nx=True)
+            requeued += 1
+
+        if requeued:
+            logger.warning(f"Requeued {requeued} match requests with expired leases")
+        return requeued
+
+    async def size(self) -> int:
+        return await self.redis.zcard(self.key) + await self.redis.zcard(self.delayed_key)
+
+    async def inflight(self) -> int:
+        return await self.redis.zcard(self.inflight_key)
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+
+def _decode(value) -> Optional[str]:
+    """Redis clients may or may not be created with decode_responses."""
+    if isinstance(value, bytes):
+        return value.decode("utf-8")
+    return value
@@ -23,15 +23,16 @@ Dependencies:
 
 import asyncio
 import json
-from dataclasses import dataclass
-from typing import List, Dict, Optional, Set
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Dict, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from uuid import UUID
-from enum import Enum
 import logging
 
 import redis.asyncio as redis
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy import select, and_, or_
 
 from backend.core.outbox import OutboxRepository
@@ -40,39 +41,25 @@ from backend.ai.orchestrators.factory import get_orchestrator
 from backend.modules.trade_desk.models.requirement import Requirement
 from backend.modules.trade_desk.models.availability import Availability
 from backend.modules.trade_desk.matching.matching_engine import MatchingEngine, MatchResult
+from backend.modules.trade_desk.matching.candidate_index import CandidateIndex, get_candidate_index
+from backend.modules.trade_desk.matching.audit_writer import close_match_audit_writer, get_match_audit_writer
 from backend.modules.trade_desk.matching.validators import MatchValidator
-from backend.modules.trade_desk.config.matching_config import MatchingConfig
+from backend.modules.trade_desk.config.matching_config import MatchingConfig, get_matching_config
 from backend.modules.trade_desk.repositories.requirement_repository import RequirementRepository
 from backend.modules.trade_desk.repositories.availability_repository import AvailabilityRepository
+from backend.modules.trade_desk.services.match_queue import (
+    InMemoryMatchQueue,
+    MatchPriority,
+    MatchQueue,
+    MatchRequest,
+    RedisMatchQueue,
+)
+from backend.modules.risk.risk_engine import RiskEngine
 
 
 logger = logging.getLogger(__name__)
 
 
-class MatchPriority(str, Enum):
-    """Priority levels for match processing queue"""
-    HIGH = "HIGH"      # User-triggered, risk_status.changed
-    MEDIUM = "MEDIUM"  # Requirement/availability created
-    LOW = "LOW"        # Background re-matching, cron fallback
-
-
-@dataclass
-class MatchRequest:
-    """Request for matching operation in priority queue"""
-    priority: MatchPriority
-    entity_type: str  # "requirement" or "availability"
-    entity_id: UUID
-    created_at: datetime
-    retry_count: int = 0
-    
-    def __lt__(self, other):
-        """Priority comparison for queue ordering"""
-        priority_order = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
-        if priority_order[self.priority.value] != priority_order[other.priority.value]:
-            return priority_order[self.priority.value] < priority_order[other.priority.value]
-        return self.created_at < other.created_at
-
-
 class MatchingService:
     """
     Event-driven matching orchestration service
@@ -86,16 +73,25 @@ class MatchingService:
     - Micro-batching for high-volume scenarios
     - Safety cron fallback for missed events
     
+    Two modes:
+    - Request-scoped (db + matching_engine): used by API routes for lookups
+    - Background (session_factory + queue): one process-wide instance, see
+      get_background_matching_service(). N workers share the queue and each
+      match runs in its own DB session.
+    
     All 13 user iterations + AI integration incorporated.
     """
     
     def __init__(
         self,
-        db: AsyncSession,
-        matching_engine: MatchingEngine,
-        validator: MatchValidator,
+        db: Optional[AsyncSession],
+        matching_engine: Optional[MatchingEngine],
+        validator: Optional[MatchValidator],
         config: MatchingConfig,
-        redis_client: Optional[redis.Redis] = None
+        redis_client: Optional[redis.Redis] = None,
+        queue: Optional[MatchQueue] = None,
+        session_factory: Optional[async_sessionmaker] = None,
+        worker_count: Optional[int] = None
     ):
         self.db = db
         self.matching_engine = matching_engine
@@ -110,15 +106,23 @@ class MatchingService:
         except Exception:
             self.ai_orchestrator = None  # Fallback to rule-based matching
         
-        # Priority queue for match requests
-        self._match_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        # Priority queue for match requests (dedups pending entities itself)
+        self._match_queue: MatchQueue = queue or InMemoryMatchQueue()
+        
+        # Fresh DB session per background match (request sessions are short-lived)
+        self._session_factory = session_factory
+        self._worker_count = worker_count or config.MATCH_WORKER_COUNT
+        
+        # In-memory candidate index (background mode only - needs warm-up)
+        self._candidate_index: Optional[CandidateIndex] = (
+            get_candidate_index()
+            if session_factory is not None and config.CANDIDATE_INDEX_ENABLED
+            else None
+        )
         
         # Rate limiting tracking (user_id -> last_notification_time)
         self._last_notification_time: Dict[UUID, datetime] = {}
         
-        # Duplicate detection (avoid re-processing same entity)
-        self._processing_entities: Set[UUID] = set()
-        
         # Metrics
         self._metrics = {
             "total_processed": 0,
@@ -127,11 +131,13 @@ class MatchingService:
             "low_priority": 0,
             "throttled": 0,
             "notifications_sent": 0,
-            "notifications_skipped": 0
+            "notifications_skipped": 0,
+            "batches_processed": 0,
+            "batched_requests": 0
         }
         
-        # Background worker task
-        self._worker_task: Optional[asyncio.Task] = None
+        # Background worker tasks
+        self._worker_tasks: List[asyncio.Task] = []
         self._running = False
     
     # ========================================================================
@@ -184,6 +190,52 @@ class MatchingService:
             entity_id=availability_id
         )
     
+    async def on_requirement_updated(
+        self,
+        requirement_id: UUID,
+        priority: MatchPriority = MatchPriority.MEDIUM
+    ) -> None:
+        """
+        Event handler: requirement.updated / cancelled / expired
+        
+        Re-queues the requirement so workers re-index it (or evict it from
+        the candidate index once no longer ACTIVE) and re-match it.
+        
+        Args:
+            requirement_id: Changed requirement UUID
+            priority: Queue priority (default MEDIUM)
+        """
+        logger.info(f"Event: requirement.updated - {requirement_id}")
+        
+        await self._enqueue_match_request(
+            priority=priority,
+            entity_type="requirement",
+            entity_id=requirement_id
+        )
+    
+    async def on_availability_updated(
+        self,
+        availability_id: UUID,
+        priority: MatchPriority = MatchPriority.MEDIUM
+    ) -> None:
+        """
+        Event handler: availability.updated / sold / expired
+        
+        Re-queues the availability so workers re-index it (or evict it from
+        the candidate index once no longer ACTIVE) and re-match it.
+        
+        Args:
+            availability_id: Changed availability UUID
+            priority: Queue priority (default MEDIUM)
+        """
+        logger.info(f"Event: availability.updated - {availability_id}")
+        
+        await self._enqueue_match_request(
+            priority=priority,
+            entity_type="availability",
+            entity_id=availability_id
+        )
+    
     async def on_risk_status_changed(
         self,
         requirement_id: Optional[UUID] = None,
@@ -236,11 +288,6 @@ class MatchingService:
             entity_type: "requirement" or "availability"
             entity_id: Entity UUID
         """
-        # Avoid duplicate processing
-        if entity_id in self._processing_entities:
-            logger.debug(f"Entity {entity_id} already in queue, skipping")
-            return
-        
         request = MatchRequest(
             priority=priority,
             entity_type=entity_type,
@@ -248,8 +295,10 @@ class MatchingService:
             created_at=datetime.utcnow()
         )
         
-        await self._match_queue.put(request)
-        self._processing_entities.add(entity_id)
+        # Queue skips entities that already have an equal/higher request pending
+        if not await self._match_queue.put(request):
+            logger.debug(f"Entity {entity_id} already in queue, skipping")
+            return
         
         logger.debug(
             f"Enqueued {priority.value} priority match: "
@@ -258,9 +307,9 @@ class MatchingService:
     
     async def start_worker(self) -> None:
         """
-        Start background worker for processing match queue
+        Start background workers for processing match queue
         
-        Worker loop:
+        Starts MATCH_WORKER_COUNT concurrent workers. Worker loop:
         1. Dequeue match request (priority order)
         2. Process matching
         3. Send notifications (rate-limited)
@@ -270,56 +319,71 @@ class MatchingService:
             logger.warning("Worker already running")
             return
         
+        if self._session_factory is None and self.matching_engine is None:
+            raise RuntimeError("MatchingService needs session_factory or matching_engine to run workers")
+        
         self._running = True
-        self._worker_task = asyncio.create_task(self._process_match_queue())
-        logger.info("Matching service worker started")
+        await self._refresh_candidate_index()
+        self._worker_tasks = [
+            asyncio.create_task(self._process_match_queue(worker_index))
+            for worker_index in range(self._worker_count)
+        ]
+        logger.info(f"Matching service started {self._worker_count} workers")
     
     async def stop_worker(self) -> None:
-        """Stop background worker gracefully"""
+        """Stop background workers gracefully"""
         if not self._running:
             return
         
         self._running = False
-        if self._worker_task:
-            self._worker_task.cancel()
-            try:
-                await self._worker_task
-            except asyncio.CancelledError:
-                pass
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
         
         logger.info("Matching service worker stopped")
     
-    async def _process_match_queue(self) -> None:
+    async def _process_match_queue(self, worker_index: int = 0) -> None:
         """
         Background worker loop for processing match queue
         
         Implements:
         - Priority-based processing (HIGH → MEDIUM → LOW)
-        - Backpressure handling (throttle when queue full)
-        - Micro-batching (1-3s delay for grouping)
+        - Micro-batching: requests arriving within MATCH_BATCH_DELAY_MS are
+          coalesced (up to MATCH_BATCH_SIZE) and matched per commodity
+        - At-least-once delivery (request acked only after processing)
+        - Lease recovery for requests of crashed workers (worker 0 only)
         - Error handling with retry logic
         """
+        loop = asyncio.get_running_loop()
+        last_requeue_check = 0.0
+        last_index_refresh = loop.time()
+        
         while self._running:
             try:
-                # Get next request (blocks if empty)
-                request = await asyncio.wait_for(
-                    self._match_queue.get(),
-                    timeout=1.0
-                )
+                # Reclaim requests leased by dead workers/nodes
+                if worker_index == 0 and loop.time() - last_requeue_check >= self.config.MATCH_QUEUE_LEASE_SECONDS / 2:
+                    last_requeue_check = loop.time()
+                    await self._match_queue.requeue_expired()
                 
-                # Process request
-                await self._process_match_request(request)
+                # Reconcile candidate index with changes made by other processes
+                if worker_index == 0 and loop.time() - last_index_refresh >= self.config.CANDIDATE_INDEX_REFRESH_SECONDS:
+                    last_index_refresh = loop.time()
+                    await self._refresh_candidate_index()
                 
-                # Remove from processing set
-                self._processing_entities.discard(request.entity_id)
+                # Get next request (None if queue stays empty)
+                request = await self._match_queue.get(timeout=1.0)
+                if request is None:
+                    continue
                 
-                # Micro-batching delay (configurable)
-                if self.config.MATCH_BATCH_DELAY_MS > 0:
-                    await asyncio.sleep(self.config.MATCH_BATCH_DELAY_MS / 1000)
+                # Coalesce the burst behind it (same-commodity requests share one pass)
+                batch = await self._collect_batch(request)
+                try:
+                    await self._process_match_batch(batch)
+                finally:
+                    for item in batch:
+                        await self._match_queue.ack(item)
                 
-            except asyncio.TimeoutError:
-                # No requests in queue, continue
-                continue
             except asyncio.CancelledError:
                 break
             except Exception as e:
@@ -338,12 +402,15 @@ class MatchingService:
             self._metrics["total_processed"] += 1
             self._metrics[f"{request.priority.value.lower()}_priority"] += 1
             
-            # Execute matching based on entity type
-            if request.entity_type == "requirement":
-                matches = await self._match_requirement(request.entity_id)
-            elif request.entity_type == "availability":
-                matches = await self._match_availability(request.entity_id)
+            if self._session_factory is not None:
+                # Background mode: own session per request
+                async with self._session_scope() as db:
+                    matches = await self._execute_match(request, db, self._build_matching_engine(db))
+                    await db.commit()
             else:
+                matches = await self._execute_match(request, self.db, self.matching_engine)
+            
+            if matches is None:
                 logger.error(f"Unknown entity type: {request.entity_type}")
                 return
             
@@ -363,42 +430,231 @@ class MatchingService:
                 exc_info=True
             )
             
-            # Retry logic (max 3 attempts)
-            if request.retry_count < 3:
-                request.retry_count += 1
-                await asyncio.sleep(2 ** request.retry_count)  # Exponential backoff
-                await self._match_queue.put(request)
-                logger.info(f"Retrying match request (attempt {request.retry_count})")
+            await self._retry_request(request)
+    
+    async def _retry_request(self, request: MatchRequest) -> None:
+        """
+        Re-enqueue a failed request (max 3 attempts, exponential backoff).
+        
+        The backoff is a not-before time on the queued request, so the worker
+        acks and moves on instead of sleeping while it holds the lease.
+        """
+        if request.retry_count < 3:
+            request.retry_count += 1
+            request.not_before = time.time() + 2 ** request.retry_count  # Exponential backoff
+            await self._match_queue.put(request)
+            logger.info(f"Retrying match request (attempt {request.retry_count})")
+    
+    # ========================================================================
+    # MICRO-BATCHING
+    # ========================================================================
+    
+    async def _collect_batch(self, first: MatchRequest) -> List[MatchRequest]:
+        """
+        Drain requests queued within MATCH_BATCH_DELAY_MS of the first one.
+        
+        HIGH priority (user just posted) never waits - it only takes along
+        what is already queued.
+        """
+        batch = [first]
+        if self.config.MATCH_BATCH_SIZE <= 1:
+            return batch
+        
+        loop = asyncio.get_running_loop()
+        window = 0.0 if first.priority == MatchPriority.HIGH else self.config.MATCH_BATCH_DELAY_MS / 1000
+        deadline = loop.time() + window
+        
+        while len(batch) < self.config.MATCH_BATCH_SIZE:
+            request = await self._match_queue.get(timeout=max(deadline - loop.time(), 0.001))
+            if request is None:
+                break
+            batch.append(request)
+        return batch
+    
+    async def _process_match_batch(self, batch: List[MatchRequest]) -> None:
+        """
+        Process coalesced requests with one bipartite pass per commodity.
+        
+        Falls back to per-request processing (with retries) if the batch
+        pass fails as a whole.
+        """
+        if len(batch) == 1:
+            await self._process_match_request(batch[0])
+            return
+        
+        try:
+            async with self._session_scope() as db:
+                if self._session_factory is not None:
+                    matching_engine = self._build_matching_engine(db)
+                else:
+                    matching_engine = self.matching_engine
+                results, missing = await self._execute_match_batch(batch, db, matching_engine)
+                if self._session_factory is not None:
+                    await db.commit()
+        except Exception as e:
+            logger.error(f"Batch match failed ({len(batch)} requests), processing individually: {e}", exc_info=True)
+            for request in batch:
+                await self._process_match_request(request)
+            return
+        
+        self._metrics["batches_processed"] += 1
+        self._metrics["batched_requests"] += len(batch)
+        
+        for request in batch:
+            self._metrics["total_processed"] += 1
+            self._metrics[f"{request.priority.value.lower()}_priority"] += 1
+            if request in missing:
+                continue
+            
+            matches = results.get(request.entity_id, [])
+            if matches:
+                await self._notify_matches(matches, request.entity_type)
+        
+        # Creating transactions may not be committed yet
+        await asyncio.gather(*(self._retry_request(request) for request in missing))
+        
+        logger.info(
+            f"Processed match batch: {len(batch)} requests, "
+            f"{sum(len(m) for m in results.values())} matches found"
+        )
+    
+    async def _execute_match_batch(
+        self,
+        batch: List[MatchRequest],
+        db: AsyncSession,
+        matching_engine: MatchingEngine
+    ) -> Tuple[Dict[UUID, List[MatchResult]], List[MatchRequest]]:
+        """
+        Load all batch entities in two queries, group by commodity and match.
+        
+        Returns:
+            (matches per entity_id, requests whose entity was not found)
+        """
+        requirement_ids = [r.entity_id for r in batch if r.entity_type == "requirement"]
+        availability_ids = [r.entity_id for r in batch if r.entity_type == "availability"]
+        
+        requirements = await RequirementRepository(db).get_by_ids(
+            requirement_ids, load_relationships=True
+        )
+        availabilities = await AvailabilityRepository(db).get_by_ids(
+            availability_ids, status=None, load_relationships=True
+        )
+        
+        found = {e.id for e in requirements} | {e.id for e in availabilities}
+        missing = [
+            r for r in batch
+            if r.entity_type in ("requirement", "availability") and r.entity_id not in found
+        ]
+        
+        # Group ACTIVE entities by commodity (index learns every status change)
+        groups: Dict[UUID, Tuple[List[Requirement], List[Availability]]] = defaultdict(lambda: ([], []))
+        for requirement in requirements:
+            if self._candidate_index is not None:
+                self._candidate_index.upsert_requirement(requirement)
+            if requirement.status == "ACTIVE":
+                groups[requirement.commodity_id][0].append(requirement)
+        for availability in availabilities:
+            if self._candidate_index is not None:
+                self._candidate_index.upsert_availability(availability)
+            if availability.status == "ACTIVE":
+                groups[availability.commodity_id][1].append(availability)
+        
+        results: Dict[UUID, List[MatchResult]] = {}
+        for commodity_requirements, commodity_availabilities in groups.values():
+            results.update(await matching_engine.find_matches_batch(
+                requirements=commodity_requirements,
+                availabilities=commodity_availabilities
+            ))
+        return results, missing
+    
+    async def _execute_match(
+        self,
+        request: MatchRequest,
+        db: AsyncSession,
+        matching_engine: MatchingEngine
+    ) -> Optional[List[MatchResult]]:
+        """Run matching for the request's entity. None for unknown entity types."""
+        if request.entity_type == "requirement":
+            return await self._match_requirement(request.entity_id, db, matching_engine)
+        if request.entity_type == "availability":
+            return await self._match_availability(request.entity_id, db, matching_engine)
+        return None
+    
+    async def _refresh_candidate_index(self) -> None:
+        """(Re)load the candidate index; engine falls back to DB search until ready."""
+        if self._candidate_index is None:
+            return
+        try:
+            async with self._session_scope() as db:
+                await self._candidate_index.load(db)
+        except Exception as e:
+            logger.error(f"Candidate index load failed: {e}", exc_info=True)
+    
+    @asynccontextmanager
+    async def _session_scope(self) -> AsyncIterator[AsyncSession]:
+        """Worker-owned session in background mode, else the request session."""
+        if self._session_factory is None:
+            yield self.db
+            return
+        async with self._session_factory() as db:
+            yield db
+    
+    def _build_matching_engine(self, db: AsyncSession) -> MatchingEngine:
+        """Matching engine bound to a worker-owned session."""
+        return MatchingEngine(
+            db=db,
+            risk_engine=RiskEngine(db),
+            requirement_repo=RequirementRepository(db),
+            availability_repo=AvailabilityRepository(db),
+            config=self.config,
+            candidate_index=self._candidate_index,
+            audit_writer=get_match_audit_writer()
+        )
     
     # ========================================================================
     # MATCHING EXECUTION
     # ========================================================================
     
-    async def _match_requirement(self, requirement_id: UUID) -> List[MatchResult]:
+    async def _match_requirement(
+        self,
+        requirement_id: UUID,
+        db: AsyncSession,
+        matching_engine: MatchingEngine
+    ) -> List[MatchResult]:
         """
         Find matches for requirement (buyer seeking sellers)
         
         Args:
             requirement_id: Requirement UUID
+            db: Session to load the requirement with
+            matching_engine: Engine bound to the same session
             
         Returns:
             List of MatchResult sorted by score (highest first)
         """
         # Get requirement
-        req_repo = RequirementRepository(self.db)
+        req_repo = RequirementRepository(db)
         requirement = await req_repo.get_by_id(requirement_id)
         
-        if not requirement or requirement.status != "ACTIVE":
+        if not requirement:
+            # Creating transaction may not be committed yet - retried by caller
+            raise LookupError(f"Requirement {requirement_id} not found")
+        
+        if self._candidate_index is not None:
+            self._candidate_index.upsert_requirement(requirement)  # Evicts if not ACTIVE
+        
+        if requirement.status != "ACTIVE":
             logger.debug(f"Requirement {requirement_id} not active, skipping")
             return []
         
         # Execute matching
-        matches = await self.matching_engine.find_matches_for_requirement(
-            requirement
+        matches = await matching_engine.find_matches_for_requirement(
+            requirement.id
         )
         
         # Apply min score threshold
-        commodity_code = requirement.commodity.code if requirement.commodity else "default"
+        commodity = getattr(requirement, "commodity", None)  # Not mapped on Requirement
+        commodity_code = commodity.code if commodity else "default"
         min_threshold = self.config.get_min_score_threshold(commodity_code)
         
         matches = [m for m in matches if m.score >= min_threshold]
@@ -409,27 +665,41 @@ class MatchingService:
         
         return matches
     
-    async def _match_availability(self, availability_id: UUID) -> List[MatchResult]:
+    async def _match_availability(
+        self,
+        availability_id: UUID,
+        db: AsyncSession,
+        matching_engine: MatchingEngine
+    ) -> List[MatchResult]:
         """
         Find matches for availability (seller seeking buyers)
         
         Args:
             availability_id: Availability UUID
+            db: Session to load the availability with
+            matching_engine: Engine bound to the same session
             
         Returns:
             List of MatchResult sorted by score (highest first)
         """
         # Get availability
-        avail_repo = AvailabilityRepository(self.db)
-        availability = await avail_repo.get_by_id(availability_id)
+        avail_repo = AvailabilityRepository(db)
+        availability = await avail_repo.get_by_id(availability_id, load_relationships=True)
+        
+        if not availability:
+            # Creating transaction may not be committed yet - retried by caller
+            raise LookupError(f"Availability {availability_id} not found")
         
-        if not availability or availability.status != "ACTIVE":
+        if self._candidate_index is not None:
+            self._candidate_index.upsert_availability(availability)  # Evicts if not ACTIVE
+        
+        if availability.status != "ACTIVE":
             logger.debug(f"Availability {availability_id} not active, skipping")
             return []
         
         # Execute matching
-        matches = await self.matching_engine.find_matches_for_availability(
-            availability
+        matches = await matching_engine.find_matches_for_availability(
+            availability.id
         )
         
         # Apply min score threshold
@@ -615,40 +885,39 @@ class MatchingService:
             # Find active requirements created in last 5 minutes
             cutoff_time = datetime.utcnow() - timedelta(minutes=5)
             
-            req_repo = RequirementRepository(self.db)
-            recent_requirements = await self.db.execute(
-                select(Requirement).where(
-                    and_(
-                        Requirement.status == "ACTIVE",
-                        Requirement.created_at >= cutoff_time
+            async with self._session_scope() as db:
+                recent_requirements = await db.execute(
+                    select(Requirement).where(
+                        and_(
+                            Requirement.status == "ACTIVE",
+                            Requirement.created_at >= cutoff_time
+                        )
                     )
                 )
-            )
-            
-            for requirement in recent_requirements.scalars():
-                await self._enqueue_match_request(
-                    priority=MatchPriority.LOW,
-                    entity_type="requirement",
-                    entity_id=requirement.id
-                )
-            
-            # Find active availabilities created in last 5 minutes
-            avail_repo = AvailabilityRepository(self.db)
-            recent_availabilities = await self.db.execute(
-                select(Availability).where(
-                    and_(
-                        Availability.status == "ACTIVE",
-                        Availability.created_at >= cutoff_time
+                
+                for requirement in recent_requirements.scalars():
+                    await self._enqueue_match_request(
+                        priority=MatchPriority.LOW,
+                        entity_type="requirement",
+                        entity_id=requirement.id
+                    )
+                
+                # Find active availabilities created in last 5 minutes
+                recent_availabilities = await db.execute(
+                    select(Availability).where(
+                        and_(
+                            Availability.status == "ACTIVE",
+                            Availability.created_at >= cutoff_time
+                        )
                     )
                 )
-            )
-            
-            for availability in recent_availabilities.scalars():
-                await self._enqueue_match_request(
-                    priority=MatchPriority.LOW,
-                    entity_type="availability",
-                    entity_id=availability.id
-                )
+                
+                for availability in recent_availabilities.scalars():
+                    await self._enqueue_match_request(
+                        priority=MatchPriority.LOW,
+                        entity_type="availability",
+                        entity_id=availability.id
+                    )
             
             logger.debug("Safety cron completed")
             
@@ -659,7 +928,7 @@ class MatchingService:
     # METRICS & MONITORING
     # ========================================================================
     
-    def get_metrics(self) -> Dict[str, any]:
+    async def get_metrics(self) -> Dict[str, any]:
         """
         Get service metrics for monitoring
         
@@ -668,9 +937,11 @@ class MatchingService:
         """
         return {
             **self._metrics,
-            "queue_size": self._match_queue.qsize(),
-            "processing_entities": len(self._processing_entities),
-            "worker_running": self._running
+            "queue_size": await self._match_queue.size(),
+            "processing_entities": await self._match_queue.inflight(),
+            "worker_count": len(self._worker_tasks),
+            "worker_running": self._running,
+            "candidate_index": self._candidate_index.stats() if self._candidate_index else None
         }
     
     async def health_check(self) -> Dict[str, any]:
@@ -682,8 +953,9 @@ class MatchingService:
         """
         return {
             "status": "healthy" if self._running else "stopped",
-            "queue_size": self._match_queue.qsize(),
+            "queue_size": await self._match_queue.size(),
             "worker_running": self._running,
+            "worker_count": len(self._worker_tasks),
             "total_processed": self._metrics["total_processed"]
         }
     
@@ -702,3 +974,64 @@ class MatchingService:
         from backend.modules.trade_desk.repositories import AvailabilityRepository
         avail_repo = AvailabilityRepository(self.db)
         return await avail_repo.get_by_id(availability_id)
+
+
+# ============================================================================
+# PROCESS-WIDE BACKGROUND SERVICE
+# ============================================================================
+
+_background_service: Optional[MatchingService] = None
+
+
+def _create_match_queue(config: MatchingConfig) -> MatchQueue:
+    """Shared Redis queue, or in-process queue when MATCH_QUEUE_BACKEND='memory'."""
+    if config.MATCH_QUEUE_BACKEND == "redis":
+        from backend.core.settings.config import settings
+        
+        return RedisMatchQueue(
+            redis.from_url(settings.REDIS_URL, decode_responses=True),
+            lease_seconds=config.MATCH_QUEUE_LEASE_SECONDS,
+            poll_interval=config.MATCH_QUEUE_POLL_INTERVAL_MS / 1000
+        )
+    return InMemoryMatchQueue()
+
+
+def get_background_matching_service() -> MatchingService:
+    """
+    Get the long-lived MatchingService used for event-driven matching.
+    
+    Services enqueue into it; workers are started by start_background_matching()
+    (API process) or backend.workers.matching_worker (dedicated process).
+    """
+    global _background_service
+    if _background_service is None:
+        from backend.db.async_session import AsyncSessionLocal
+        
+        config = get_matching_config()
+        _background_service = MatchingService(
+            db=None,
+            matching_engine=None,
+            validator=None,
+            config=config,
+            queue=_create_match_queue(config),
+            session_factory=AsyncSessionLocal
+        )
+    return _background_service
+
+
+async def start_background_matching() -> MatchingService:
+    """Start matching workers on the process-wide service."""
+    service = get_background_matching_service()
+    await service.start_worker()
+    return service
+
+
+async def stop_background_matching() -> None:
+    """Stop workers and release the queue connection."""
+    global _background_service
+    if _background_service is None:
+        return
+    await _background_service.stop_worker()
+    await _background_service._match_queue.close()
+    await close_match_audit_writer()
+    _background_service = None
@@ -48,6 +48,7 @@ Architecture:
 from __future__ import annotations
 
 import json
+import logging
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Any, Dict, List, Optional, Tuple
@@ -68,6 +69,13 @@ from backend.modules.trade_desk.models.requirement import Requirement
 from backend.modules.trade_desk.repositories.requirement_repository import (
     RequirementRepository,
 )
+from backend.modules.trade_desk.services.enrichment import (
+    EnrichmentPipeline,
+    EnrichmentStep,
+)
+
+
+logger = logging.getLogger(__name__)
 
 
 class RequirementService:
@@ -166,6 +174,10 @@ class RequirementService:
         Step 11: Emit requirement.created event
         Step 12: Route to correct engine based on intent_type
         
+        Steps 1-9 run as an EnrichmentPipeline: independent steps run
+        concurrently, AI steps have timeouts and fall back to neutral
+        defaults (see _build_enrichment_pipeline).
+        
         Args:
             buyer_id: Business partner UUID (BUYER or TRADER)
             commodity_id: Commodity UUID
@@ -206,28 +218,7 @@ class RequirementService:
             ValueError: If validation fails
         """
         # ====================================================================
-        # STEP 1: Validate buyer permissions & location constraints
-        # ====================================================================
-        await self._validate_buyer_locations(buyer_id, delivery_locations)
-        
-        # ====================================================================
-        # STEP 1A: 🚀 CAPABILITY VALIDATION (CDPS - Capability-Driven Partner System)
-        # Validate partner has permission to buy based on verified documents
-        # ====================================================================
-        from backend.modules.trade_desk.validators.capability_validator import TradeCapabilityValidator
-        
-        # Get delivery country for capability check
-        delivery_country = await self._get_delivery_country(delivery_locations)
-        
-        capability_validator = TradeCapabilityValidator(self.db)
-        await capability_validator.validate_buy_capability(
-            partner_id=buyer_id,
-            delivery_country=delivery_country,
-            raise_exception=True  # Will raise CapabilityValidationError if invalid
-        )
-        
-        # ====================================================================
-        # STEP 1B: Calculate estimated trade value (for risk check later)
+        # Calculate estimated trade value (for risk check later)
         # ====================================================================
         estimated_trade_value = None
         if preferred_quantity and max_budget_per_unit:
@@ -236,73 +227,44 @@ class RequirementService:
             estimated_trade_value = min_quantity * max_budget_per_unit
         
         # ====================================================================
-        # STEP 2: Auto-normalize quality requirements (AI standardization)
+        # STEPS 1-12: Validation + AI enrichment (concurrent, see enrichment.py)
         # ====================================================================
-        quality_requirements = await self.normalize_quality_requirements(
-            commodity_id,
-            quality_requirements
-        )
+        enrichment = await self._build_enrichment_pipeline(
+            buyer_id=buyer_id,
+            commodity_id=commodity_id,
+            min_quantity=min_quantity,
+            max_quantity=max_quantity,
+            max_budget_per_unit=max_budget_per_unit,
+            quality_requirements=quality_requirements,
+            intent_type=intent_type,
+            delivery_locations=delivery_locations,
+            market_visibility=market_visibility,
+            urgency_level=urgency_level,
+            commodity_equivalents=commodity_equivalents,
+            negotiation_preferences=negotiation_preferences,
+            notes=notes,
+        ).run()
         
-        # ====================================================================
-        # STEP 3: AI price suggestion based on market data
-        # ====================================================================
-        ai_price_result = await self.suggest_market_price(
-            commodity_id,
-            quality_requirements,
-            min_quantity,
-            max_quantity,
-            urgency_level
-        )
+        # 🚀 Risk precheck inputs (credit limit, buyer rating, payment performance)
+        buyer_credit_limit_remaining = enrichment["credit_limit"]
+        buyer_rating_score = enrichment["buyer_rating"]
+        buyer_payment_performance_score = enrichment["payment_performance"]
         
+        # AI price suggestion
+        ai_price_result = enrichment["price"]
         ai_suggested_max_price = ai_price_result.get("suggested_max_price")
         ai_confidence_score = ai_price_result.get("confidence_score")
         ai_price_alert_flag = ai_price_result.get("is_unrealistic", False)
         ai_alert_reason = ai_price_result.get("alert_reason")
         
-        # ====================================================================
-        # STEP 4: 🚀 Calculate buyer priority score (trust weighting)
-        # ====================================================================
-        buyer_priority_score = await self.calculate_buyer_priority_score(
-            buyer_id
-        )
-        
-        # ====================================================================
-        # STEP 5: Detect unrealistic budget constraints
-        # ====================================================================
-        if max_budget_per_unit and ai_suggested_max_price:
-            budget_validation = await self.validate_budget_realism(
-                max_budget_per_unit,
-                ai_suggested_max_price,
-                commodity_id
-            )
-            
-            if budget_validation["is_unrealistic"]:
-                ai_price_alert_flag = True
-                ai_alert_reason = budget_validation["reason"]
-        
-        # ====================================================================
-        # STEP 6: 🚀 Generate market context embedding (1536-dim vector)
-        # ====================================================================
-        market_context_embedding = await self.generate_market_context_embedding(
-            commodity_id,
-            quality_requirements,
-            urgency_level,
-            intent_type,
-            max_budget_per_unit,
-            notes
-        )
-        
-        # ====================================================================
-        # STEP 7: 🚀 ENHANCEMENT - Market sentiment adjustment
-        # ====================================================================
-        sentiment_adjustment = await self.adjust_for_market_sentiment(
-            commodity_id,
-            max_budget_per_unit,
-            urgency_level,
-            quality_requirements
-        )
+        # Unrealistic budget constraints
+        budget_validation = enrichment["budget"]
+        if budget_validation and budget_validation["is_unrealistic"]:
+            ai_price_alert_flag = True
+            ai_alert_reason = budget_validation["reason"]
         
         # Apply sentiment adjustment to AI suggested price
+        sentiment_adjustment = enrichment["sentiment"]
         if ai_suggested_max_price and sentiment_adjustment["adjustment_factor"] != 1.0:
             adjusted_price = ai_suggested_max_price * Decimal(str(sentiment_adjustment["adjustment_factor"]))
             ai_suggested_max_price = adjusted_price
@@ -312,63 +274,14 @@ class RequirementService:
                 ai_alert_reason = ""
             ai_alert_reason += f" | Market Sentiment: {sentiment_adjustment['sentiment']} ({sentiment_adjustment['reason']})"
         
-        # ====================================================================
-        # STEP 8: 🚀 ENHANCEMENT - Dynamic tolerance recommendation
-        # ====================================================================
-        tolerance_recommendations = await self.recommend_quality_tolerances(
-            commodity_id,
-            quality_requirements,
-            urgency_level,
-            market_visibility
-        )
-        
-        # Inject tolerance recommendations into quality_requirements
-        for param_name, tolerance_info in tolerance_recommendations.items():
-            if param_name in quality_requirements:
-                # Add tolerance metadata (AI-suggested)
-                if isinstance(quality_requirements[param_name], dict):
-                    quality_requirements[param_name]["ai_suggested_tolerance"] = tolerance_info["tolerance"]
-                    quality_requirements[param_name]["ai_tolerance_reason"] = tolerance_info["reason"]
-        
-        # ====================================================================
-        # STEP 9: Auto-suggest commodity equivalents (if not provided)
-        # ====================================================================
-        if not commodity_equivalents:
-            commodity_equivalents = await self.suggest_commodity_equivalents(
-                commodity_id,
-                quality_requirements
-            )
-        
-        # ====================================================================
-        # STEP 10: Auto-suggest negotiation preferences (if not provided)
-        # ====================================================================
-        if not negotiation_preferences and intent_type in [IntentType.NEGOTIATION.value, IntentType.DIRECT_BUY.value]:
-            negotiation_preferences = await self.suggest_negotiation_preferences(
-                buyer_id,
-                max_budget_per_unit,
-                urgency_level
-            )
-        
-        # ====================================================================
-        # STEP 11: Generate AI-recommended sellers (pre-scoring)
-        # ====================================================================
-        ai_recommended_sellers = await self.recommend_sellers(
-            commodity_id,
-            quality_requirements,
-            delivery_locations,
-            max_budget_per_unit
-        )
-        
-        # ====================================================================
-        # STEP 12: Build AI score vector for ML matching
-        # ====================================================================
-        ai_score_vector = await self.calculate_ai_score_vector(
-            commodity_id,
-            quality_requirements,
-            max_budget_per_unit,
-            urgency_level,
-            intent_type
-        )
+        # Quality requirements with AI-suggested tolerances injected
+        quality_requirements = enrichment["quality_with_tolerances"]
+        buyer_priority_score = enrichment["priority"]
+        market_context_embedding = enrichment["embedding"]
+        commodity_equivalents = enrichment.get("equivalents", commodity_equivalents)
+        negotiation_preferences = enrichment.get("negotiation", negotiation_preferences)
+        ai_recommended_sellers = enrichment["sellers"]
+        ai_score_vector = enrichment["score_vector"]
         
         # ====================================================================
         # CREATE REQUIREMENT MODEL
@@ -546,23 +459,14 @@ class RequirementService:
         # Trigger instant matching - find sellers immediately
         # This is NOT marketplace - no browsing/listing allowed
         try:
-            from backend.modules.trade_desk.services.matching_service import MatchingService, MatchPriority
-            from backend.modules.trade_desk.matching.matching_engine import MatchingEngine
-            from backend.modules.trade_desk.matching.validators import MatchValidator
-            from backend.modules.trade_desk.config.matching_config import MatchingConfig
-            
-            # Initialize matching components
-            matching_engine = MatchingEngine(self.db)
-            validator = MatchValidator(self.db)
-            config = MatchingConfig()
-            matching_service = MatchingService(
-                db=self.db,
-                matching_engine=matching_engine,
-                validator=validator,
-                config=config,
-                redis_client=self.redis_client
+            from backend.modules.trade_desk.services.matching_service import (
+                MatchPriority,
+                get_background_matching_service,
             )
             
+            # Enqueue on the long-lived service; its workers match in their own session
+            matching_service = get_background_matching_service()
+            
             # 🔥 INSTANT MATCH - High priority (user just posted)
             await matching_service.on_requirement_created(
                 requirement_id=requirement.id,
@@ -584,6 +488,20 @@ class RequirementService:
     # UPDATE & LIFECYCLE OPERATIONS
     # ========================================================================
     
+    async def _queue_rematch(self, requirement_id: UUID) -> None:
+        """
+        Tell matching workers the requirement changed.
+        
+        Workers re-index it in the candidate index (or evict it once no
+        longer ACTIVE) and re-run matching. Never fails the caller.
+        """
+        try:
+            from backend.modules.trade_desk.services.matching_service import get_background_matching_service
+            
+            await get_background_matching_service().on_requirement_updated(requirement_id)
+        except Exception as e:
+            logger.error(f"Failed to queue re-match for requirement {requirement_id}: {e}")
+    
     async def update_requirement(
         self,
         requirement_id: UUID,
@@ -692,6 +610,8 @@ class RequirementService:
         # Flush events
         await requirement.flush_events(self.db)
         
+        await self._queue_rematch(requirement.id)
+        
         return requirement
     
     async def publish_requirement(
@@ -843,6 +763,8 @@ class RequirementService:
                 }
             )
         
+        await self._queue_rematch(requirement.id)
+        
         return requirement
     
     async def update_fulfillment(
@@ -1013,6 +935,190 @@ class RequirementService:
     # AI-POWERED FEATURES (12-STEP PIPELINE COMPONENTS)
     # ========================================================================
     
+    def _build_enrichment_pipeline(
+        self,
+        *,
+        buyer_id: UUID,
+        commodity_id: UUID,
+        min_quantity: Decimal,
+        max_quantity: Decimal,
+        max_budget_per_unit: Decimal,
+        quality_requirements: Dict[str, Any],
+        intent_type: str,
+        delivery_locations: Optional[List[Dict[str, Any]]],
+        market_visibility: str,
+        urgency_level: str,
+        commodity_equivalents: Optional[Dict[str, Any]],
+        negotiation_preferences: Optional[Dict[str, Any]],
+        notes: Optional[str],
+    ) -> EnrichmentPipeline:
+        """
+        Validation and AI enrichment steps of create_requirement.
+        
+        Validation steps (locations, capability, quality normalization) are
+        required and raise. AI steps fall back to neutral defaults when they
+        time out or fail, so a slow model never blocks posting.
+        """
+        from backend.modules.trade_desk.validators.capability_validator import TradeCapabilityValidator
+        
+        async def validate_capability(r: Dict[str, Any]) -> None:
+            # 🚀 CDPS: partner must hold the buy capability for the delivery country
+            capability_validator = TradeCapabilityValidator(self.db)
+            await capability_validator.validate_buy_capability(
+                partner_id=buyer_id,
+                delivery_country=r["delivery_country"],
+                raise_exception=True  # Will raise CapabilityValidationError if invalid
+            )
+        
+        async def validate_budget(r: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            ai_suggested_max_price = r["price"].get("suggested_max_price")
+            if not (max_budget_per_unit and ai_suggested_max_price):
+                return None
+            return await self.validate_budget_realism(
+                max_budget_per_unit,
+                ai_suggested_max_price,
+                commodity_id
+            )
+        
+        async def inject_tolerances(r: Dict[str, Any]) -> Dict[str, Any]:
+            # Copy: steps reading r["quality"] may still be running
+            quality = {k: dict(v) if isinstance(v, dict) else v for k, v in r["quality"].items()}
+            for param_name, tolerance_info in r["tolerances"].items():
+                if isinstance(quality.get(param_name), dict):
+                    # Add tolerance metadata (AI-suggested)
+                    quality[param_name]["ai_suggested_tolerance"] = tolerance_info["tolerance"]
+                    quality[param_name]["ai_tolerance_reason"] = tolerance_info["reason"]
+            return quality
+        
+        # Validation steps share the session, so they run in sequence
+        # anyway; chaining them keeps the original order of checks (and errors)
+        steps = [
+            # Validation (required)
+            EnrichmentStep(
+                "locations",
+                lambda r: self._validate_buyer_locations(buyer_id, delivery_locations),
+                uses_session=True,
+            ),
+            EnrichmentStep(
+                "delivery_country",
+                lambda r: self._get_delivery_country(delivery_locations),
+                depends_on=("locations",),
+                uses_session=True,
+            ),
+            EnrichmentStep(
+                "capability",
+                validate_capability,
+                depends_on=("delivery_country",),
+                uses_session=True,
+            ),
+            EnrichmentStep(
+                "quality",
+                lambda r: self.normalize_quality_requirements(commodity_id, quality_requirements),
+            ),
+            EnrichmentStep("quality_with_tolerances", inject_tolerances, depends_on=("quality", "tolerances")),
+            # 🚀 Risk precheck inputs
+            EnrichmentStep("credit_limit", lambda r: self._fetch_buyer_credit_limit(buyer_id), fallback=None),
+            EnrichmentStep("buyer_rating", lambda r: self._fetch_buyer_rating(buyer_id), fallback=None),
+            EnrichmentStep("payment_performance", lambda r: self._fetch_payment_performance(buyer_id), fallback=None),
+            # AI enrichment (degrade gracefully)
+            EnrichmentStep(
+                "price",
+                lambda r: self.suggest_market_price(
+                    commodity_id,
+                    r["quality"],
+                    min_quantity,
+                    max_quantity,
+                    urgency_level
+                ),
+                depends_on=("quality",),
+                fallback=lambda r: {},
+            ),
+            EnrichmentStep("budget", validate_budget, depends_on=("price",), fallback=None),
+            EnrichmentStep("priority", lambda r: self.calculate_buyer_priority_score(buyer_id), fallback=1.0),
+            EnrichmentStep(
+                "embedding",
+                lambda r: self.generate_market_context_embedding(
+                    commodity_id,
+                    r["quality"],
+                    urgency_level,
+                    intent_type,
+                    max_budget_per_unit,
+                    notes
+                ),
+                depends_on=("quality",),
+                fallback=None,
+            ),
+            EnrichmentStep(
+                "sentiment",
+                lambda r: self.adjust_for_market_sentiment(
+                    commodity_id,
+                    max_budget_per_unit,
+                    urgency_level,
+                    r["quality"]
+                ),
+                depends_on=("quality",),
+                fallback=lambda r: {
+                    "sentiment": "neutral",
+                    "adjustment_factor": 1.0,
+                    "reason": "Market sentiment unavailable",
+                    "confidence": 0.0
+                },
+            ),
+            EnrichmentStep(
+                "tolerances",
+                lambda r: self.recommend_quality_tolerances(
+                    commodity_id,
+                    r["quality"],
+                    urgency_level,
+                    market_visibility
+                ),
+                depends_on=("quality",),
+                fallback=lambda r: {},
+            ),
+            EnrichmentStep(
+                "sellers",
+                lambda r: self.recommend_sellers(
+                    commodity_id,
+                    r["quality_with_tolerances"],
+                    delivery_locations,
+                    max_budget_per_unit
+                ),
+                depends_on=("quality_with_tolerances",),
+                fallback=None,
+            ),
+            EnrichmentStep(
+                "score_vector",
+                lambda r: self.calculate_ai_score_vector(
+                    commodity_id,
+                    r["quality_with_tolerances"],
+                    max_budget_per_unit,
+                    urgency_level,
+                    intent_type
+                ),
+                depends_on=("quality_with_tolerances",),
+                fallback=None,
+            ),
+        ]
+        
+        # Auto-suggest commodity equivalents (if not provided)
+        if not commodity_equivalents:
+            steps.append(EnrichmentStep(
+                "equivalents",
+                lambda r: self.suggest_commodity_equivalents(commodity_id, r["quality_with_tolerances"]),
+                depends_on=("quality_with_tolerances",),
+                fallback=None,
+            ))
+        
+        # Auto-suggest negotiation preferences (if not provided)
+        if not negotiation_preferences and intent_type in [IntentType.NEGOTIATION.value, IntentType.DIRECT_BUY.value]:
+            steps.append(EnrichmentStep(
+                "negotiation",
+                lambda r: self.suggest_negotiation_preferences(buyer_id, max_budget_per_unit, urgency_level),
+                fallback=None,
+            ))
+        
+        return EnrichmentPipeline("requirement", steps)
+    
     async def normalize_quality_requirements(
         self,
         commodity_id: UUID,
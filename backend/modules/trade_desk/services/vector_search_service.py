@@ -7,9 +7,10 @@ using cosine distance on 384-dimensional embeddings.
 
 from typing import List, Dict, Any, Optional
 from uuid import UUID
-from sqlalchemy import select, func
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.db.vector_search import widen_hnsw_scan
 from backend.modules.trade_desk.models.requirement_embedding import RequirementEmbedding
 from backend.modules.trade_desk.models.availability_embedding import AvailabilityEmbedding
 from backend.modules.trade_desk.models.requirement import Requirement
@@ -58,13 +59,16 @@ class VectorSearchService:
         if exclude_ids:
             query = query.where(~Requirement.id.in_(exclude_ids))
         
-        # Filter by similarity threshold and order by similarity
+        # Filter by similarity threshold; ORDER BY distance ASC so the
+        # HNSW index returns the top-k without scoring every row
+        distance = RequirementEmbedding.embedding.cosine_distance(query_embedding)
         query = (
             query
-            .having(func.literal(1) - RequirementEmbedding.embedding.cosine_distance(query_embedding) >= similarity_threshold)
-            .order_by((1 - RequirementEmbedding.embedding.cosine_distance(query_embedding)).desc())
+            .where(distance <= 1 - similarity_threshold)
+            .order_by(distance)
             .limit(limit)
         )
+        await widen_hnsw_scan(self.db, limit)
         
         result = await self.db.execute(query)
         rows = result.all()
@@ -113,13 +117,16 @@ class VectorSearchService:
         if exclude_ids:
             query = query.where(~Availability.id.in_(exclude_ids))
         
-        # Filter by similarity threshold and order by similarity
+        # Filter by similarity threshold; ORDER BY distance ASC so the
+        # HNSW index returns the top-k without scoring every row
+        distance = AvailabilityEmbedding.embedding.cosine_distance(query_embedding)
         query = (
             query
-            .having(func.literal(1) - AvailabilityEmbedding.embedding.cosine_distance(query_embedding) >= similarity_threshold)
-            .order_by((1 - AvailabilityEmbedding.embedding.cosine_distance(query_embedding)).desc())
+            .where(distance <= 1 - similarity_threshold)
+            .order_by(distance)
             .limit(limit)
         )
+        await widen_hnsw_scan(self.db, limit)
         
         result = await self.db.execute(query)
         rows = result.all()
@@ -0,0 +1,405 @@
+"""
+Unit Tests: Vectorized Batch Scoring (MatchScorer.score_candidates)
+
+Batch path must produce the same score breakdown as the per-pair
+calculate_match_score() path.
+"""
+
+import pytest
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+from sqlalchemy.orm import raiseload
+
+from backend.modules.risk.risk_engine import RiskEngine
+from backend.modules.trade_desk.matching.candidate_index import CandidateIndex
+from backend.modules.trade_desk.matching.matching_engine import MatchingEngine
+from backend.modules.trade_desk.matching.scoring import MatchScorer, haversine_km
+from backend.modules.trade_desk.config.matching_config import MatchingConfig
+from backend.modules.trade_desk.models.availability import Availability
+from backend.modules.trade_desk.models.requirement import Requirement
+from backend.modules.trade_desk.repositories import availability_repository, requirement_repository
+from backend.modules.trade_desk.repositories.availability_repository import AvailabilityRepository
+from backend.modules.trade_desk.repositories.requirement_repository import RequirementRepository
+from backend.modules.trade_desk.services.match_queue import InMemoryMatchQueue, MatchPriority, MatchRequest
+from backend.modules.trade_desk.services.matching_service import MatchingService
+
+
+def _requirement(**overrides):
+    data = dict(
+        id=uuid4(),
+        commodity=SimpleNamespace(code="COTTON"),
+        quality_params={
+            "staple_length": {"min": 28.0, "max": 32.0, "preferred": 30.0},
+            "moisture": {"min": 6.0, "max": 10.0},
+            "grade": {"preferred": "A"},
+        },
+        max_budget=Decimal("50000"),
+        preferred_budget=Decimal("45000"),
+        destination_country=None,
+        preferred_incoterm=None,
+        import_port=None,
+        ai_recommended_sellers=None,
+        delivery_locations=[{"latitude": 21.1458, "longitude": 79.0882}],
+    )
+    data.update(overrides)
+    return SimpleNamespace(**data)
+
+
+def _availability(price, quality, lat=21.1458, lon=79.0882, **overrides):
+    data = dict(
+        id=uuid4(),
+        party_id=uuid4(),
+        base_price=price,
+        quality_params=quality,
+        supported_incoterms=None,
+        export_port=None,
+        location=SimpleNamespace(latitude=lat, longitude=lon),
+    )
+    data.update(overrides)
+    return SimpleNamespace(**data)
+
+
+@pytest.fixture
+def scorer():
+    return MatchScorer(config=MatchingConfig())
+
+
+@pytest.fixture
+def candidates():
+    return [
+        _availability(Decimal("45000"), {"staple_length": 30.0, "moisture": 8.0, "grade": "A"}),
+        _availability(Decimal("45900"), {"staple_length": 31.5, "moisture": 9.5, "grade": "B"}),
+        _availability(Decimal("47000"), {"staple_length": 29, "grade": "A"}, lat=20.7453, lon=78.6022),
+        _availability(Decimal("49500"), {"staple_length": 27.0, "moisture": 7.0}),
+        _availability(Decimal("51000"), {"staple_length": 30.0, "moisture": 8.0, "grade": "A"}),
+        _availability(None, {"staple_length": 30.0}),
+    ]
+
+
+class TestScoreCandidates:
+    """Batch vs per-pair equivalence."""
+
+    @pytest.mark.asyncio
+    async def test_matches_per_pair_scores(self, scorer, candidates):
+        requirement = _requirement()
+
+        batch = await scorer.score_candidates(requirement, candidates)
+
+        assert len(batch) == len(candidates)
+        for availability, result in zip(candidates, batch):
+            single = await scorer.calculate_match_score(requirement, availability)
+            assert result["breakdown"] == single["breakdown"]
+            assert result["pass_fail"] == single["pass_fail"]
+            assert result["total_score"] == single["total_score"]
+
+    @pytest.mark.asyncio
+    async def test_international_delivery_scores(self, scorer, candidates):
+        requirement = _requirement(
+            destination_country="BD", preferred_incoterm="FOB", import_port="CHITTAGONG"
+        )
+        candidates[0].supported_incoterms = ["fob", "CIF"]
+        candidates[1].export_port = "chittagong"
+
+        batch = await scorer.score_candidates(requirement, candidates)
+
+        for availability, result in zip(candidates, batch):
+            single = await scorer.calculate_match_score(requirement, availability)
+            assert result["breakdown"]["delivery_score"] == single["breakdown"]["delivery_score"]
+
+    @pytest.mark.asyncio
+    async def test_distance_to_nearest_delivery_location(self, scorer, candidates):
+        batch = await scorer.score_candidates(_requirement(), candidates)
+
+        assert batch[0]["distance_km"] == 0.0
+        expected = scorer.calculate_distance_km(21.1458, 79.0882, 20.7453, 78.6022)
+        assert batch[2]["distance_km"] == pytest.approx(expected, abs=0.01)
+
+    @pytest.mark.asyncio
+    async def test_incomparable_values_yield_none(self, scorer):
+        requirement = _requirement(quality_params={"staple_length": {"min": 28.0, "max": 32.0}})
+        candidates = [
+            _availability(Decimal("45000"), {"staple_length": "long"}),
+            _availability(Decimal("45000"), {"staple_length": 30.0}),
+        ]
+
+        batch = await scorer.score_candidates(requirement, candidates)
+
+        assert batch[0] is None
+        assert batch[1]["breakdown"]["quality_score"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_empty_candidate_set(self, scorer):
+        assert await scorer.score_candidates(_requirement(), []) == []
+
+    @pytest.mark.asyncio
+    async def test_risk_assessed_once_per_run(self, scorer, candidates):
+        requirement, partners = self._risk_fixtures(candidates)
+        db = Mock()
+        db.execute = AsyncMock(return_value=Mock(
+            scalars=Mock(return_value=Mock(all=Mock(return_value=partners)))
+        ))
+
+        batch = await scorer.score_candidates(requirement, candidates, risk_engine=RiskEngine(db))
+
+        # Buyer/seller credit data and party links come from one query
+        assert db.execute.await_count == 1
+        statuses = [result["risk_details"]["risk_status"] for result in batch]
+        assert statuses == ["PASS", "WARN", "FAIL", "PASS", "WARN", "WARN"]
+        assert batch[0]["breakdown"]["risk_score"] == 1.0
+        assert batch[0]["warn_penalty_applied"] is False
+        assert batch[1]["warn_penalty_applied"] is True
+        assert "Insufficient seller credit limit" in (
+            batch[1]["risk_details"]["details"]["seller_assessment"]["risk_factors"][0]
+        )
+        assert batch[2]["blocked"] is True
+        assert batch[2]["risk_details"]["details"]["party_links_severity"] == "BLOCK"
+        # Unpriced candidate fails only its own pair
+        assert batch[5]["risk_details"]["warnings"][0].startswith("Risk engine error: no base price")
+
+    @pytest.mark.asyncio
+    async def test_risk_engine_error_defaults_to_warn(self, scorer, candidates):
+        requirement, _ = self._risk_fixtures(candidates)
+        db = Mock()
+        db.execute = AsyncMock(side_effect=ConnectionError("database unavailable"))
+
+        batch = await scorer.score_candidates(requirement, candidates, risk_engine=RiskEngine(db))
+
+        assert db.execute.await_count == 1
+        assert all(result["risk_details"]["risk_status"] == "WARN" for result in batch)
+        assert batch[0]["risk_details"]["warnings"] == ["Risk engine error: database unavailable"]
+
+    @staticmethod
+    def _risk_fixtures(candidates):
+        """
+        Requirement plus partner rows: a buyer with credit headroom, and
+        sellers cycling through clean / no credit limit / same PAN as buyer.
+        """
+        def partner(pan, credit_limit):
+            return SimpleNamespace(
+                id=uuid4(), pan_number=pan, tax_id_number=None,
+                primary_contact_phone=None, primary_contact_email=None,
+                credit_limit=credit_limit, credit_utilized=Decimal("0")
+            )
+
+        def risk_methods():
+            return dict(
+                calculate_estimated_trade_value=lambda: Decimal("100000"),
+                update_risk_precheck=lambda **kwargs: {}
+            )
+
+        buyer = partner("ABCDE1234F", Decimal("1000000"))
+        sellers = [
+            partner("FGHIJ5678K", Decimal("1000000")),
+            partner("KLMNO9012P", None),
+            partner("ABCDE1234F", Decimal("1000000")),
+        ]
+        requirement = _requirement(
+            buyer_partner_id=buyer.id, buyer_branch_id=None, blocked_internal_trades=False,
+            preferred_quantity=Decimal("100"), min_quantity=Decimal("10"), **risk_methods()
+        )
+        for i, availability in enumerate(candidates):
+            availability.seller_id = sellers[i % len(sellers)].id
+            availability.seller_branch_id = None
+            availability.blocked_for_branches = None
+            availability.remaining_quantity = Decimal("50")
+            availability.__dict__.update(risk_methods())
+        return requirement, [buyer, *sellers]
+
+
+class TestFindMatchesBatch:
+    """Coalesced bipartite pass vs one find_matches_for_availability per entity."""
+
+    def _engine(self, requirements, index):
+        requirement_repo = Mock()
+        requirement_repo.get_by_ids = AsyncMock(
+            side_effect=lambda ids, **kwargs: [r for r in requirements if r.id in set(ids)]
+        )
+        requirement_repo.get_changed_since = AsyncMock(return_value=[])
+        availability_repo = Mock()
+        availability_repo.get_changed_since = AsyncMock(return_value=[])
+        return MatchingEngine(
+            db=None,
+            risk_engine=None,
+            requirement_repo=requirement_repo,
+            availability_repo=availability_repo,
+            config=MatchingConfig(),
+            candidate_index=index
+        )
+
+    @pytest.mark.asyncio
+    async def test_batch_equals_per_entity_results(self):
+        commodity_id = uuid4()
+        nagpur = {"state": "Maharashtra", "city": "Nagpur", "latitude": 21.1458, "longitude": 79.0882}
+        requirements = [
+            _requirement(
+                commodity_id=commodity_id, status="ACTIVE", buyer_partner_id=uuid4(),
+                delivery_locations=[dict(nagpur, max_distance_km=radius)]
+            )
+            for radius in (10, 100, 300)
+        ]
+        availabilities = [
+            _availability(
+                price, {"staple_length": 30.0, "moisture": 8.0, "grade": "A"}, lat=lat, lon=lon,
+                commodity_id=commodity_id, status="ACTIVE", seller_id=uuid4(),
+                country_of_origin=None, location_id=uuid4(), commodity=SimpleNamespace(code="COTTON")
+            )
+            for price, lat, lon in ((Decimal("45000"), 21.1458, 79.0882), (Decimal("46000"), 20.7453, 78.6022))
+        ]
+        for availability in availabilities:
+            availability.location.state, availability.location.city = "Maharashtra", "Wardha"
+        availabilities[0].location.city = "Nagpur"
+
+        index = CandidateIndex()
+        index.ready = True
+        for requirement in requirements:
+            index.upsert_requirement(requirement)
+        engine = self._engine(requirements, index)
+
+        batch = await engine.find_matches_batch([], availabilities, include_risk_check=False)
+
+        for availability in availabilities:
+            engine.availability_repo.get_by_id = AsyncMock(return_value=availability)
+            single = await engine.find_matches_for_availability(availability.id, include_risk_check=False)
+            assert [(m.requirement_id, m.score) for m in batch[availability.id]] == \
+                sorted([(m.requirement_id, m.score) for m in single], key=lambda x: -x[1])
+        assert len(batch[availabilities[0].id]) == 3
+        assert len(batch[availabilities[1].id]) == 2  # Wardha is ~65km from Nagpur
+
+    @pytest.mark.asyncio
+    async def test_pairs_of_existing_entities_not_scored(self):
+        commodity_id = uuid4()
+        requirement = _requirement(commodity_id=commodity_id, status="ACTIVE", buyer_partner_id=uuid4(), delivery_locations=None)
+        index = CandidateIndex()
+        index.ready = True
+        index.upsert_requirement(requirement)
+        engine = self._engine([requirement], index)
+        engine.scorer.score_candidates = AsyncMock(return_value=[])
+
+        assert await engine.find_matches_batch([], []) == {}
+        engine.scorer.score_candidates.assert_not_awaited()
+
+
+    @pytest.mark.asyncio
+    async def test_fallback_loads_counterparties_by_location(self):
+        commodity_id = uuid4()
+        nagpur_id, wardha_id = uuid4(), uuid4()
+        requirement = _requirement(
+            commodity_id=commodity_id, status="ACTIVE", buyer_partner_id=uuid4(),
+            delivery_locations=[{"location_id": str(nagpur_id), "state": "Maharashtra", "city": "Nagpur"}]
+        )
+        availability = _availability(
+            Decimal("45000"), {"staple_length": 30.0}, commodity_id=commodity_id, status="ACTIVE",
+            seller_id=uuid4(), country_of_origin=None, location_id=wardha_id
+        )
+        availability.location.state, availability.location.city = "Maharashtra", "Wardha"
+        engine = self._engine([], index=None)
+        engine.availability_repo.get_by_locations = AsyncMock(return_value=[])
+        engine.requirement_repo.get_by_delivery_locations = AsyncMock(return_value=[])
+
+        await engine.find_matches_batch([requirement], [availability], include_risk_check=False)
+
+        assert engine.availability_repo.get_by_locations.await_args.args[:2] == ([nagpur_id], commodity_id)
+        assert engine.requirement_repo.get_by_delivery_locations.await_args.args[:2] == ([wardha_id], commodity_id)
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalar_one_or_none(self):
+        return self.rows[0] if self.rows else None
+
+    def unique(self):
+        return self
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class _Session:
+    """Answers ORM selects with the rows of the selected table; records them."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+        return _Result(self.rows.get(stmt.columns_clause_froms[0].name, []))
+
+
+class TestSingleEntityPath:
+    """Lone/HIGH/retried requests: MatchingService -> engine -> real repositories."""
+
+    @pytest.fixture(autouse=True)
+    def _eager_loads(self, monkeypatch):
+        # Building joinedload() options configures every mapper, which the
+        # unit environment cannot do (not all mapped modules import here);
+        # the option is never compiled against the fake session anyway.
+        for module in (availability_repository, requirement_repository):
+            monkeypatch.setattr(module, "joinedload", lambda attribute: raiseload("*"))
+
+    def _entities(self):
+        commodity_id, location_id = uuid4(), uuid4()
+        requirement = _requirement(
+            commodity_id=commodity_id, status="ACTIVE", buyer_partner_id=uuid4(), party_id=None,
+            delivery_locations=[{
+                "location_id": str(location_id), "state": "Maharashtra", "city": "Nagpur",
+                "latitude": 21.1458, "longitude": 79.0882,
+            }]
+        )
+        del requirement.commodity  # Requirement has no commodity relationship
+        availability = _availability(
+            Decimal("45000"), {"staple_length": 30.0, "moisture": 8.0, "grade": "A"},
+            commodity_id=commodity_id, status="ACTIVE", seller_id=uuid4(), party_id=None,
+            country_of_origin=None, location_id=location_id, commodity=SimpleNamespace(code="COTTON")
+        )
+        availability.location.state, availability.location.city = "Maharashtra", "Nagpur"
+        return requirement, availability
+
+    def _service(self, session):
+        engine = MatchingEngine(
+            db=session,
+            risk_engine=None,
+            requirement_repo=RequirementRepository(session),
+            availability_repo=AvailabilityRepository(session),
+            config=MatchingConfig()
+        )
+        service = MatchingService(
+            db=session, matching_engine=engine, validator=None,
+            config=MatchingConfig(), queue=InMemoryMatchQueue()
+        )
+        service._notify_matches = AsyncMock()
+        return service
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("entity_type", ["requirement", "availability"])
+    async def test_lone_request_matched_through_real_repositories(self, entity_type):
+        requirement, availability = self._entities()
+        session = _Session({Requirement.__tablename__: [requirement], Availability.__tablename__: [availability]})
+        service = self._service(session)
+        entity = requirement if entity_type == "requirement" else availability
+        request = MatchRequest(
+            priority=MatchPriority.HIGH, entity_type=entity_type, entity_id=entity.id,
+            created_at=datetime(2025, 1, 1)
+        )
+
+        await service._process_match_request(request)
+
+        assert await service._match_queue.size() == 0  # Not failed into a retry
+        (matches, notified_type), _ = service._notify_matches.await_args
+        assert notified_type == entity_type
+        assert [(m.requirement_id, m.availability_id) for m in matches] == [(requirement.id, availability.id)]
+
+
+def test_haversine_km_matches_scalar():
+    scorer = MatchScorer(config=MatchingConfig())
+    expected = scorer.calculate_distance_km(19.0760, 72.8777, 18.5204, 73.8567)
+    assert float(haversine_km(19.0760, 72.8777, 18.5204, 73.8567)) == pytest.approx(expected)
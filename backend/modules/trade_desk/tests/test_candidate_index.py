@@ -0,0 +1,247 @@
+"""
+Unit Tests: In-Memory Candidate Index
+
+Index lookups must return exactly the candidates MatchingEngine._location_matches
+accepts, in both directions, while staying in sync with upserts/evictions.
+"""
+
+import random
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+from backend.modules.trade_desk.config.matching_config import MatchingConfig
+from backend.modules.trade_desk.matching.candidate_index import CandidateIndex
+from backend.modules.trade_desk.matching.matching_engine import MatchingEngine
+
+
+COMMODITY = uuid4()
+
+CITIES = [
+    # (state, city, lat, lon)
+    ("Maharashtra", "Nagpur", 21.1458, 79.0882),
+    ("Maharashtra", "Wardha", 20.7453, 78.6022),
+    ("Maharashtra", "Mumbai", 19.0760, 72.8777),
+    ("Gujarat", "Rajkot", 22.3039, 70.8022),
+    ("Gujarat", "Ahmedabad", 23.0225, 72.5714),
+    ("Madhya Pradesh", "Chhindwara", 22.0574, 78.9382),
+]
+
+LOCATION_IDS = {city: str(uuid4()) for _, city, _, _ in CITIES}
+
+
+def _availability(state, city, lat, lon, status="ACTIVE", commodity_id=COMMODITY):
+    return SimpleNamespace(
+        id=uuid4(),
+        commodity_id=commodity_id,
+        status=status,
+        location_id=LOCATION_IDS.get(city),
+        location=SimpleNamespace(state=state, city=city, latitude=lat, longitude=lon),
+    )
+
+
+def _requirement(delivery_locations, status="ACTIVE", commodity_id=COMMODITY):
+    return SimpleNamespace(
+        id=uuid4(),
+        commodity_id=commodity_id,
+        status=status,
+        delivery_locations=delivery_locations,
+    )
+
+
+def _delivery(state, city, lat, lon, **extra):
+    loc = {"state": state, "city": city, "latitude": lat, "longitude": lon}
+    loc.update(extra)
+    return loc
+
+
+@pytest.fixture
+def engine():
+    return MatchingEngine(
+        db=None,
+        risk_engine=None,
+        requirement_repo=None,
+        availability_repo=None,
+        config=MatchingConfig()
+    )
+
+
+@pytest.fixture
+def index():
+    idx = CandidateIndex(cell_km=25.0)
+    idx.ready = True
+    return idx
+
+
+class TestIndexMatchesLocationRules:
+
+    def test_same_city_and_radius(self, index):
+        nagpur, wardha, mumbai, rajkot = (_availability(*c) for c in CITIES[:4])
+        for availability in (nagpur, wardha, mumbai, rajkot):
+            index.upsert_availability(availability)
+
+        requirement = _requirement([_delivery(*CITIES[0], max_distance_km=100)])
+
+        assert index.availability_ids_for(requirement) == {nagpur.id, wardha.id}
+
+    def test_cross_state_blocked_even_when_close(self, index):
+        chhindwara = _availability(*CITIES[5])
+        index.upsert_availability(chhindwara)
+
+        requirement = _requirement([_delivery(*CITIES[0], max_distance_km=200)])
+
+        assert index.availability_ids_for(requirement) == set()
+
+    def test_exact_location_id_ignores_state(self, index):
+        rajkot = _availability(*CITIES[3])
+        index.upsert_availability(rajkot)
+
+        requirement = _requirement([{"location_id": LOCATION_IDS["Rajkot"], "state": "Maharashtra"}])
+
+        assert index.availability_ids_for(requirement) == {rajkot.id}
+
+    def test_randomized_equivalence_both_directions(self, index, engine):
+        rng = random.Random(7)
+        availabilities = []
+        for _ in range(120):
+            state, city, lat, lon = rng.choice(CITIES)
+            availability = _availability(
+                rng.choice([state, state.upper() + " ", None]),
+                rng.choice([city, city.lower(), None]),
+                lat + rng.uniform(-0.8, 0.8),
+                lon + rng.uniform(-0.8, 0.8)
+            )
+            availabilities.append(availability)
+            index.upsert_availability(availability)
+
+        requirements = []
+        for _ in range(60):
+            locations = []
+            for _ in range(rng.randint(0, 3)):
+                state, city, lat, lon = rng.choice(CITIES)
+                loc = _delivery(
+                    rng.choice([state, None]),
+                    rng.choice([city, None]),
+                    lat,
+                    lon,
+                    max_distance_km=rng.choice([10, 60, 250, 900])
+                )
+                if rng.random() < 0.2:
+                    loc["location_id"] = LOCATION_IDS[city]
+                locations.append(loc)
+            requirement = _requirement(locations)
+            requirements.append(requirement)
+            index.upsert_requirement(requirement)
+
+        for requirement in requirements:
+            expected = {a.id for a in availabilities if engine._location_matches(requirement, a)}
+            assert index.availability_ids_for(requirement) == expected
+
+        for availability in availabilities:
+            expected = {r.id for r in requirements if engine._location_matches(r, availability)}
+            assert index.requirement_ids_for(availability) == expected
+
+
+class TestIndexMaintenance:
+
+    def test_status_change_evicts(self, index):
+        availability = _availability(*CITIES[0])
+        index.upsert_availability(availability)
+        requirement = _requirement([_delivery(*CITIES[0])])
+        assert index.availability_ids_for(requirement) == {availability.id}
+
+        availability.status = "SOLD"
+        index.upsert_availability(availability)
+
+        assert index.availability_ids_for(requirement) == set()
+        assert index.stats()["availabilities"] == 0
+
+    def test_moved_location_reindexed(self, index):
+        availability = _availability(*CITIES[0])
+        index.upsert_availability(availability)
+
+        availability.location = SimpleNamespace(
+            state="Gujarat", city="Rajkot", latitude=22.3039, longitude=70.8022
+        )
+        index.upsert_availability(availability)
+
+        assert index.availability_ids_for(_requirement([_delivery(*CITIES[0])])) == set()
+        assert index.availability_ids_for(_requirement([_delivery(*CITIES[3])])) == {availability.id}
+
+    def test_requirement_without_delivery_locations_matches_nothing(self, index, engine):
+        availability = _availability(*CITIES[0])
+        index.upsert_availability(availability)
+        requirement = _requirement(None)
+        index.upsert_requirement(requirement)
+
+        assert index.availability_ids_for(requirement) == set()
+        assert index.requirement_ids_for(availability) == set()
+        assert not engine._location_matches(requirement, availability)
+
+    def test_other_commodity_not_returned(self, index):
+        index.upsert_availability(_availability(*CITIES[0], commodity_id=uuid4()))
+
+        assert index.availability_ids_for(_requirement([_delivery(*CITIES[0])])) == set()
+
+
+class TestEngineUsesIndex:
+
+    @pytest.mark.asyncio
+    async def test_stale_candidates_evicted_on_load(self, index):
+        live = _availability(*CITIES[0])
+        stale = _availability(*CITIES[1])
+        index.upsert_availability(live)
+        index.upsert_availability(stale)
+
+        availability_repo = Mock()
+        availability_repo.get_by_ids = AsyncMock(return_value=[live])  # stale expired in DB
+        availability_repo.get_changed_since = AsyncMock(return_value=[])
+        engine = MatchingEngine(
+            db=None,
+            risk_engine=None,
+            requirement_repo=None,
+            availability_repo=availability_repo,
+            config=MatchingConfig(),
+            candidate_index=index
+        )
+        requirement = _requirement([_delivery(*CITIES[0], max_distance_km=100)])
+
+        candidates = await engine._indexed_availabilities(requirement)
+
+        assert candidates == [live]
+        assert index.availability_ids_for(requirement) == {live.id}
+
+    @pytest.mark.asyncio
+    async def test_rows_written_by_other_processes_found_before_reload(self, index):
+        from datetime import datetime, timedelta, timezone
+
+        index.loaded_at = datetime.now(timezone.utc) - timedelta(minutes=5)
+        remote = _availability(*CITIES[0])  # Created on another node, never upserted here
+        fetched = []
+
+        async def changed_since(commodity_id, since, **kwargs):
+            fetched.append(since)
+            return [remote]
+
+        availability_repo = Mock()
+        availability_repo.get_changed_since = AsyncMock(side_effect=changed_since)
+        availability_repo.get_by_ids = AsyncMock(
+            side_effect=lambda ids, **kwargs: [remote] if remote.id in ids else []
+        )
+        engine = MatchingEngine(
+            db=None,
+            risk_engine=None,
+            requirement_repo=None,
+            availability_repo=availability_repo,
+            config=MatchingConfig(),
+            candidate_index=index
+        )
+        requirement = _requirement([_delivery(*CITIES[0])])
+
+        assert await engine._indexed_availabilities(requirement) == [remote]
+        await engine._indexed_availabilities(requirement)
+
+        # First catch-up starts at the load, the next one only re-reads the overlap
+        assert fetched[0] == index.loaded_at - index.sync_overlap
+        assert fetched[1] > fetched[0]
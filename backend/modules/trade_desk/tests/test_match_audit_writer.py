@@ -0,0 +1,209 @@
+"""
+Unit Tests: Buffered Match Audit Trail
+
+Covers buffering/bulk flush, re-buffering on failure and the duplicate
+time window served to the matching engine.
+"""
+
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+from backend.modules.trade_desk.config.matching_config import MatchingConfig
+from backend.modules.trade_desk.matching.audit_writer import MatchAuditWriter
+from backend.modules.trade_desk.matching.matching_engine import MatchingEngine
+
+
+def _match(commodity_id, key=None):
+    return SimpleNamespace(
+        requirement_id=uuid4(),
+        availability_id=uuid4(),
+        requirement=SimpleNamespace(commodity_id=commodity_id),
+        duplicate_detection_key=key or f"{commodity_id}:{uuid4()}:{uuid4()}",
+        score=0.8123456,
+        base_score=0.9,
+        warn_penalty_applied=True,
+        risk_status="WARN",
+        score_breakdown={"quality": 0.9},
+        pass_fail={"quality": True},
+        risk_details={"exposure": 1},
+    )
+
+
+class _FakeSession:
+    """Session without an asyncpg driver, so flush() takes the INSERT path."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.executed = []
+        self.committed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def connection(self):
+        connection = MagicMock()
+        connection.get_raw_connection = AsyncMock(return_value=SimpleNamespace(driver_connection=None))
+        return connection
+
+    async def execute(self, statement, params=None):
+        if self.fail:
+            raise ConnectionError("db down")
+        self.executed.append(params)
+
+    async def commit(self):
+        self.committed = True
+
+
+class _SavepointSession:
+    """Caller's session; records how each begin_nested() block was left."""
+
+    def __init__(self):
+        self.savepoints = []
+
+    def begin_nested(self):
+        session = self
+
+        class _Savepoint:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, exc_type, exc, tb):
+                session.savepoints.append(exc_type)
+                return False
+
+        return _Savepoint()
+
+
+class TestMatchAuditWriter:
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_buffer_in_one_statement(self):
+        session = _FakeSession()
+        writer = MatchAuditWriter(lambda: session, flush_interval=60)
+        commodity_id = uuid4()
+
+        writer.record([_match(commodity_id) for _ in range(3)], "requirement")
+        written = await writer.flush()
+        await writer.close()
+
+        assert written == 3
+        assert len(session.executed) == 1
+        assert len(session.executed[0]) == 3
+        assert session.committed
+        assert writer.metrics["rows_written"] == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_rebuffers_rows(self):
+        writer = MatchAuditWriter(lambda: _FakeSession(fail=True), flush_interval=60)
+        writer.record([_match(uuid4())], "availability")
+
+        assert await writer.flush() == 0
+        assert len(writer._buffer) == 1
+        assert writer.metrics["flush_errors"] == 1
+        writer._flusher.cancel()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_keys_only_while_rows_are_buffered(self):
+        session = _FakeSession(fail=True)
+        writer = MatchAuditWriter(lambda: session, flush_interval=60, max_buffer_rows=1)
+        commodity_id = uuid4()
+        writer.record([_match(commodity_id, key="first")], "requirement")
+
+        assert await writer.flush() == 0
+        assert not writer._recent  # Nothing committed
+        assert await writer.recent_duplicate_keys(commodity_id) == {"first"}  # Still buffered
+
+        writer.record([_match(commodity_id, key="second")], "requirement")  # Cap drops "first"
+        assert await writer.recent_duplicate_keys(commodity_id) == {"second"}
+
+        session.fail = False
+        assert await writer.flush() == 1
+        assert not writer._buffer
+        assert await writer.recent_duplicate_keys(commodity_id) == {"second"}  # Now from written rows
+        writer._flusher.cancel()
+
+    @pytest.mark.asyncio
+    async def test_buffer_cap_drops_oldest(self):
+        writer = MatchAuditWriter(lambda: _FakeSession(), flush_interval=60, max_buffer_rows=2)
+        commodity_id = uuid4()
+        matches = [_match(commodity_id) for _ in range(3)]
+
+        writer.record(matches, "requirement")
+
+        assert [row["requirement_id"] for row in writer._buffer] == [m.requirement_id for m in matches[1:]]
+        assert writer.metrics["rows_dropped"] == 1
+        writer._flusher.cancel()
+
+    @pytest.mark.asyncio
+    async def test_recent_keys_respect_window(self):
+        writer = MatchAuditWriter(lambda: _FakeSession(), flush_interval=60, duplicate_window_minutes=5)
+        commodity_id = uuid4()
+        writer.record([_match(commodity_id, key="fresh")], "requirement")
+        writer._recent[commodity_id].appendleft((time.monotonic() - 600, "stale"))
+
+        assert await writer.recent_duplicate_keys(commodity_id) == {"fresh"}
+        assert await writer.recent_duplicate_keys(uuid4()) == set()
+        writer._flusher.cancel()
+
+    @pytest.mark.asyncio
+    async def test_recent_keys_include_database_rows(self):
+        writer = MatchAuditWriter(lambda: _FakeSession(), flush_interval=60)
+        db = _SavepointSession()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = ["other-node"]
+        db.execute = AsyncMock(return_value=result)
+
+        assert await writer.recent_duplicate_keys(uuid4(), db) == {"other-node"}
+        assert db.savepoints == [None]
+
+    @pytest.mark.asyncio
+    async def test_failed_lookup_rolls_back_savepoint_only(self):
+        writer = MatchAuditWriter(lambda: _FakeSession(), flush_interval=60)
+        db = _SavepointSession()
+        db.execute = AsyncMock(side_effect=ConnectionError("db down"))
+
+        assert await writer.recent_duplicate_keys(uuid4(), db) == set()
+        # Error left the savepoint (rolled back there), not the caller's transaction
+        assert db.savepoints == [ConnectionError]
+
+
+class TestEngineDuplicateWindow:
+
+    @pytest.mark.asyncio
+    async def test_seen_set_seeded_from_audit_window(self):
+        writer = MatchAuditWriter(lambda: _FakeSession(), flush_interval=60)
+        commodity_id = uuid4()
+        writer.record([_match(commodity_id, key="k1")], "requirement")
+        engine = MatchingEngine(
+            db=None,
+            risk_engine=None,
+            requirement_repo=None,
+            availability_repo=None,
+            config=MatchingConfig(),
+            audit_writer=writer
+        )
+
+        seen = await engine._recent_duplicate_keys(commodity_id)
+
+        assert await engine._is_duplicate("k1", seen, uuid4(), uuid4())
+        assert not await engine._is_duplicate("k2", seen, uuid4(), uuid4())
+        writer._flusher.cancel()
+
+    @pytest.mark.asyncio
+    async def test_no_writer_means_empty_window(self):
+        engine = MatchingEngine(
+            db=None,
+            risk_engine=None,
+            requirement_repo=None,
+            availability_repo=None,
+            config=MatchingConfig()
+        )
+
+        assert await engine._recent_duplicate_keys(uuid4()) == set()
+        engine._save_match_audit_trail([_match(uuid4())], "requirement")  # No-op
@@ -0,0 +1,371 @@
+"""
+Unit Tests: Match Queue + Multi-Worker MatchingService
+
+Covers priority ordering, per-entity dedup, ack/lease handling (in-memory
+and Redis backends) and concurrent workers draining one shared queue.
+"""
+
+import asyncio
+import time
+import fakeredis
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+from backend.modules.trade_desk.config.matching_config import MatchingConfig
+from backend.modules.trade_desk.services import match_queue
+from backend.modules.trade_desk.services.match_queue import (
+    InMemoryMatchQueue,
+    MatchPriority,
+    MatchRequest,
+    RedisMatchQueue,
+)
+from backend.modules.trade_desk.services.matching_service import MatchingService
+
+
+def _request(priority=MatchPriority.MEDIUM, entity_id=None, entity_type="requirement", offset_s=0):
+    return MatchRequest(
+        priority=priority,
+        entity_type=entity_type,
+        entity_id=entity_id or uuid4(),
+        created_at=datetime(2025, 1, 1) + timedelta(seconds=offset_s)
+    )
+
+
+def _clock_ahead(mp, seconds):
+    """Make the queue see a wall clock `seconds` in the future."""
+    now = time.time()
+    mp.setattr(match_queue, "time", SimpleNamespace(time=lambda: now + seconds, monotonic=time.monotonic))
+
+
+class TestInMemoryMatchQueue:
+
+    @pytest.mark.asyncio
+    async def test_priority_then_fifo_order(self):
+        queue = InMemoryMatchQueue()
+        low = _request(MatchPriority.LOW, offset_s=0)
+        medium_late = _request(MatchPriority.MEDIUM, offset_s=2)
+        medium_early = _request(MatchPriority.MEDIUM, offset_s=1)
+        high = _request(MatchPriority.HIGH, offset_s=3)
+        for request in (low, medium_late, medium_early, high):
+            assert await queue.put(request)
+
+        order = [await queue.get(timeout=0.1) for _ in range(4)]
+
+        assert order == [high, medium_early, medium_late, low]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_pending_entity_skipped(self):
+        queue = InMemoryMatchQueue()
+        entity_id = uuid4()
+
+        assert await queue.put(_request(MatchPriority.MEDIUM, entity_id))
+        assert not await queue.put(_request(MatchPriority.LOW, entity_id, offset_s=1))
+        assert await queue.size() == 1
+
+    @pytest.mark.asyncio
+    async def test_higher_priority_promotes_pending_entity(self):
+        queue = InMemoryMatchQueue()
+        entity_id = uuid4()
+        await queue.put(_request(MatchPriority.LOW, entity_id))
+        await queue.put(_request(MatchPriority.HIGH, entity_id, offset_s=1))
+
+        first = await queue.get(timeout=0.1)
+
+        assert first.priority == MatchPriority.HIGH
+        assert await queue.get(timeout=0.05) is None  # Superseded entry skipped
+
+    @pytest.mark.asyncio
+    async def test_inflight_until_ack(self):
+        queue = InMemoryMatchQueue()
+        await queue.put(_request())
+
+        request = await queue.get(timeout=0.1)
+        assert await queue.inflight() == 1
+
+        await queue.ack(request)
+        assert await queue.inflight() == 0
+
+    @pytest.mark.asyncio
+    async def test_get_times_out_when_empty(self):
+        assert await InMemoryMatchQueue().get(timeout=0.01) is None
+
+    @pytest.mark.asyncio
+    async def test_delayed_request_hidden_until_due(self):
+        queue = InMemoryMatchQueue()
+        request = _request()
+        request.not_before = time.time() + 0.1
+
+        assert await queue.put(request)
+        assert await queue.get(timeout=0.02) is None
+
+        started = time.monotonic()
+        assert await queue.get(timeout=1.0) is request
+        assert time.monotonic() - started < 0.5  # Woken when due, not at the timeout
+
+    @pytest.mark.asyncio
+    async def test_delayed_retry_dropped_while_entity_pending(self):
+        queue = InMemoryMatchQueue()
+        entity_id = uuid4()
+        retry = _request(entity_id=entity_id)
+        retry.not_before = time.time() + 60
+
+        await queue.put(_request(entity_id=entity_id))
+
+        assert not await queue.put(retry)
+        assert await queue.size() == 1
+
+    @pytest.mark.asyncio
+    async def test_immediate_request_supersedes_delayed_retry(self, monkeypatch):
+        queue = InMemoryMatchQueue()
+        entity_id = uuid4()
+        retry = _request(entity_id=entity_id)
+        retry.not_before = time.time() + 60
+        await queue.put(retry)
+
+        assert await queue.put(_request(entity_id=entity_id))
+        await queue.ack(await queue.get(timeout=0.1))
+
+        _clock_ahead(monkeypatch, 61)
+        assert await queue.get(timeout=0.02) is None
+        assert await queue.size() == 0
+
+
+class TestRedisMatchQueue:
+    """Same contract as the in-memory queue, on the Lua scripts (fakeredis)."""
+
+    @pytest.fixture
+    def queue(self):
+        return RedisMatchQueue(fakeredis.FakeAsyncRedis(), lease_seconds=30, poll_interval=0.01)
+
+    @pytest.mark.asyncio
+    async def test_priority_then_fifo_order(self, queue):
+        low = _request(MatchPriority.LOW, offset_s=0)
+        medium_late = _request(MatchPriority.MEDIUM, offset_s=2)
+        medium_early = _request(MatchPriority.MEDIUM, offset_s=1)
+        high = _request(MatchPriority.HIGH, offset_s=3)
+        for request in (low, medium_late, medium_early, high):
+            assert await queue.put(request)
+
+        order = [await queue.get(timeout=0.1) for _ in range(4)]
+
+        assert [r.key for r in order] == [r.key for r in (high, medium_early, medium_late, low)]
+
+    @pytest.mark.asyncio
+    async def test_higher_priority_promotes_pending_entity(self, queue):
+        entity_id = uuid4()
+        await queue.put(_request(MatchPriority.LOW, entity_id))
+
+        assert await queue.put(_request(MatchPriority.HIGH, entity_id, offset_s=1))
+        assert not await queue.put(_request(MatchPriority.LOW, entity_id, offset_s=2))
+        assert await queue.size() == 1
+
+        first = await queue.get(timeout=0.1)
+        assert first.priority == MatchPriority.HIGH
+        assert await queue.get(timeout=0.02) is None
+
+    @pytest.mark.asyncio
+    async def test_duplicate_pending_entity_skipped(self, queue):
+        entity_id = uuid4()
+
+        assert await queue.put(_request(MatchPriority.MEDIUM, entity_id))
+        assert not await queue.put(_request(MatchPriority.MEDIUM, entity_id, offset_s=1))
+        assert await queue.size() == 1
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_requeued(self, queue, monkeypatch):
+        request = _request()
+        await queue.put(request)
+        assert (await queue.get(timeout=0.1)).key == request.key
+        assert await queue.inflight() == 1
+
+        assert await queue.requeue_expired() == 0  # Lease still held
+
+        _clock_ahead(monkeypatch, 31)
+        assert await queue.requeue_expired() == 1
+        assert await queue.inflight() == 0
+        assert (await queue.get(timeout=0.1)).key == request.key
+
+    @pytest.mark.asyncio
+    async def test_delayed_retry_visible_once_due(self, queue, monkeypatch):
+        retry = _request()
+        retry.retry_count = 2
+        retry.not_before = time.time() + 60
+
+        assert await queue.put(retry)
+        assert await queue.get(timeout=0.02) is None
+        assert await queue.size() == 1
+
+        _clock_ahead(monkeypatch, 61)
+        due = await queue.get(timeout=0.1)
+        assert (due.key, due.retry_count) == (retry.key, 2)
+
+    @pytest.mark.asyncio
+    async def test_delayed_retry_dropped_while_entity_pending(self, queue):
+        entity_id = uuid4()
+        retry = _request(entity_id=entity_id)
+        retry.not_before = time.time() + 60
+        await queue.put(_request(entity_id=entity_id))
+
+        assert not await queue.put(retry)
+        assert await queue.size() == 1
+
+    @pytest.mark.asyncio
+    async def test_ack_keeps_payload_of_reenqueued_entity(self, queue):
+        entity_id = uuid4()
+        await queue.put(_request(MatchPriority.LOW, entity_id))
+        first = await queue.get(timeout=0.1)
+
+        # Entity changes again while the first request is being processed
+        assert await queue.put(_request(MatchPriority.HIGH, entity_id, offset_s=1))
+        await queue.ack(first)
+
+        second = await queue.get(timeout=0.1)
+        assert second.priority == MatchPriority.HIGH
+        assert await queue.inflight() == 1
+
+    @pytest.mark.asyncio
+    async def test_immediate_request_supersedes_delayed_retry(self, queue, monkeypatch):
+        entity_id = uuid4()
+        retry = _request(entity_id=entity_id)
+        retry.not_before = time.time() + 60
+        await queue.put(retry)
+
+        assert await queue.put(_request(MatchPriority.HIGH, entity_id))
+        request = await queue.get(timeout=0.1)
+        assert request.priority == MatchPriority.HIGH
+        await queue.ack(request)
+
+        # Not processed a second time once the old retry would have been due
+        _clock_ahead(monkeypatch, 61)
+        assert await queue.get(timeout=0.02) is None
+        assert await queue.size() == 0
+
+
+class TestMatchingServiceWorkers:
+
+    def _service(self, queue, worker_count=3, **config):
+        return MatchingService(
+            db=None,
+            matching_engine=AsyncMock(),
+            validator=None,
+            config=MatchingConfig(**config),
+            queue=queue,
+            worker_count=worker_count
+        )
+
+    @pytest.mark.asyncio
+    async def test_workers_process_concurrently(self):
+        queue = InMemoryMatchQueue()
+        service = self._service(queue, worker_count=3, MATCH_BATCH_SIZE=1)
+        running = 0
+        peak = 0
+
+        async def slow_match(request, db, engine):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return []
+
+        service._execute_match = slow_match
+        for _ in range(6):
+            await service.on_requirement_created(uuid4())
+
+        await service.start_worker()
+        for _ in range(100):
+            if service._metrics["total_processed"] == 6 and await queue.inflight() == 0:
+                break
+            await asyncio.sleep(0.01)
+        await service.stop_worker()
+
+        assert service._metrics["total_processed"] == 6
+        assert peak == 3
+        assert await queue.size() == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_request_is_retried(self):
+        queue = InMemoryMatchQueue()
+        service = self._service(queue, worker_count=1)
+        service._execute_match = AsyncMock(side_effect=LookupError("not committed yet"))
+        request = _request()
+
+        await queue.put(request)
+        dequeued = await queue.get(timeout=0.1)
+        with pytest.MonkeyPatch.context() as mp:
+            sleep = AsyncMock()
+            mp.setattr(asyncio, "sleep", sleep)
+            await service._process_match_request(dequeued)
+        await queue.ack(dequeued)
+
+        sleep.assert_not_awaited()  # Backoff does not hold the worker or the lease
+        assert await queue.inflight() == 0
+        assert await queue.get(timeout=0.01) is None
+        with pytest.MonkeyPatch.context() as mp:
+            _clock_ahead(mp, 2)
+            retried = await queue.get(timeout=0.1)
+        assert retried.entity_id == request.entity_id
+        assert retried.retry_count == 1
+
+    @pytest.mark.asyncio
+    async def test_burst_coalesced_into_one_batch(self):
+        queue = InMemoryMatchQueue()
+        service = self._service(queue, worker_count=1, MATCH_BATCH_DELAY_MS=50)
+        batches = []
+
+        async def execute_batch(batch, db, engine):
+            batches.append(len(batch))
+            return {}, []
+
+        service._execute_match_batch = execute_batch
+        for _ in range(5):
+            await service.on_availability_created(uuid4())
+
+        await service.start_worker()
+        for _ in range(100):
+            if service._metrics["total_processed"] == 5:
+                break
+            await asyncio.sleep(0.01)
+        await service.stop_worker()
+
+        assert batches == [5]
+        assert service._metrics["batches_processed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_high_priority_does_not_wait_for_window(self):
+        queue = InMemoryMatchQueue()
+        service = self._service(queue, MATCH_BATCH_DELAY_MS=10_000)
+        first = _request(MatchPriority.HIGH)
+        queued = _request(MatchPriority.MEDIUM)
+        await queue.put(queued)
+
+        batch = await asyncio.wait_for(service._collect_batch(first), timeout=1.0)
+
+        assert batch == [first, queued]
+
+    @pytest.mark.asyncio
+    async def test_missing_entities_retried_individually(self):
+        queue = InMemoryMatchQueue()
+        service = self._service(queue)
+        found, missing = _request(), _request(entity_type="availability")
+        service._execute_match_batch = AsyncMock(return_value=({}, [missing]))
+
+        await service._process_match_batch([found, missing])
+
+        with pytest.MonkeyPatch.context() as mp:
+            _clock_ahead(mp, 2)
+            retried = await queue.get(timeout=0.1)
+            assert await queue.get(timeout=0.01) is None
+        assert retried.entity_id == missing.entity_id
+        assert retried.retry_count == 1
+
+    @pytest.mark.asyncio
+    async def test_start_requires_engine_or_session_factory(self):
+        service = MatchingService(
+            db=None, matching_engine=None, validator=None, config=MatchingConfig()
+        )
+        with pytest.raises(RuntimeError):
+            await service.start_worker()
@@ -179,9 +179,8 @@ class RequirementWebSocketService:
             RequirementChannelPatterns.requirement_updates_channel(),
         ]
         
-        for channel in channels:
-            message.channel = channel
-            await self.connection_manager.broadcast_to_channel(channel, message)
+        # One delivery per connection, one pipelined Redis round trip
+        await self.connection_manager.broadcast_to_channels(channels, message)
     
     async def broadcast_requirement_published(
         self,
@@ -219,20 +218,20 @@ class RequirementWebSocketService:
             }
         )
         
-        # Broadcast to multiple channels
+        # Broadcast to multiple channels (intent first: a connection that is
+        # also on other channels still sees the routing channel label)
         channels = [
+            RequirementChannelPatterns.intent_requirements_channel(intent_type),  # 🚀 Intent routing
             RequirementChannelPatterns.requirement_channel(requirement_id),
             RequirementChannelPatterns.buyer_requirements_channel(buyer_id),
             RequirementChannelPatterns.commodity_requirements_channel(commodity_id),
-            RequirementChannelPatterns.intent_requirements_channel(intent_type),  # 🚀 Intent routing
             RequirementChannelPatterns.urgency_requirements_channel(urgency_level),
             RequirementChannelPatterns.requirement_updates_channel(),
             RequirementChannelPatterns.requirement_intent_updates_channel(),  # 🚀 Global intent
         ]
         
-        for channel in channels:
-            message.channel = channel
-            await self.connection_manager.broadcast_to_channel(channel, message)
+        # One delivery per connection, one pipelined Redis round trip
+        await self.connection_manager.broadcast_to_channels(channels, message)
         
         logger.info(
             f"Requirement {requirement_id} published - Intent: {intent_type} - "
@@ -271,9 +270,8 @@ class RequirementWebSocketService:
             RequirementChannelPatterns.requirement_updates_channel(),
         ]
         
-        for channel in channels:
-            message.channel = channel
-            await self.connection_manager.broadcast_to_channel(channel, message)
+        # One delivery per connection, one pipelined Redis round trip
+        await self.connection_manager.broadcast_to_channels(channels, message)
     
     async def broadcast_fulfillment_updated(
         self,
@@ -305,9 +303,8 @@ class RequirementWebSocketService:
             RequirementChannelPatterns.requirement_fulfillment_updates_channel(),
         ]
         
-        for channel in channels:
-            message.channel = channel
-            await self.connection_manager.broadcast_to_channel(channel, message)
+        # One delivery per connection, one pipelined Redis round trip
+        await self.connection_manager.broadcast_to_channels(channels, message)
     
     async def broadcast_requirement_fulfilled(
         self,
@@ -339,9 +336,8 @@ class RequirementWebSocketService:
             RequirementChannelPatterns.requirement_fulfillment_updates_channel(),
         ]
         
-        for channel in channels:
-            message.channel = channel
-            await self.connection_manager.broadcast_to_channel(channel, message)
+        # One delivery per connection, one pipelined Redis round trip
+        await self.connection_manager.broadcast_to_channels(channels, message)
     
     async def broadcast_requirement_cancelled(
         self,
@@ -373,9 +369,8 @@ class RequirementWebSocketService:
             RequirementChannelPatterns.requirement_updates_channel(),
         ]
         
-        for channel in channels:
-            message.channel = channel
-            await self.connection_manager.broadcast_to_channel(channel, message)
+        # One delivery per connection, one pipelined Redis round trip
+        await self.connection_manager.broadcast_to_channels(channels, message)
     
     async def broadcast_ai_adjusted(
         self,
@@ -409,9 +404,8 @@ class RequirementWebSocketService:
             RequirementChannelPatterns.requirement_updates_channel(),
         ]
         
-        for channel in channels:
-            message.channel = channel
-            await self.connection_manager.broadcast_to_channel(channel, message)
+        # One delivery per connection, one pipelined Redis round trip
+        await self.connection_manager.broadcast_to_channels(channels, message)
     
     async def broadcast_risk_alert(
         self,
@@ -451,9 +445,8 @@ class RequirementWebSocketService:
             RequirementChannelPatterns.requirement_risk_alerts_channel(),
         ]
         
-        for channel in channels:
-            message.channel = channel
-            await self.connection_manager.broadcast_to_channel(channel, message)
+        # One delivery per connection, one pipelined Redis round trip
+        await self.connection_manager.broadcast_to_channels(channels, message)
         
         logger.warning(
             f"Risk alert for requirement {requirement_id}: {risk_status} "
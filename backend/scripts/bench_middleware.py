@@ -0,0 +1,170 @@
+"""
+Middleware stack micro-benchmark.
+
+Drives a small JSON endpoint in-process (httpx ASGITransport, no network)
+through the middleware chain and reports p50/p99 latency and throughput:
+
+- bare:      no middleware
+- base_http: the pure ASGI stack with every layer wrapped in a pass-through
+             BaseHTTPMiddleware, and the idempotency layer draining and
+             rebuilding keyed responses - i.e. the per-request cost the
+             BaseHTTPMiddleware implementations had
+- asgi:      the pure ASGI stack (RequestID -> Auth -> Idempotency ->
+             DataIsolation -> SecureHeaders)
+
+Redis and the user lookup are replaced by in-memory stand-ins so only
+middleware overhead is measured.
+
+Usage:
+    PYTHONPATH=.. python scripts/bench_middleware.py --requests 5000 --concurrency 50
+    PYTHONPATH=.. python scripts/bench_middleware.py --idempotency-key   # keyed POSTs (cache misses)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from backend.app.middleware import auth as auth_module
+from backend.app.middleware.auth import AuthMiddleware
+from backend.app.middleware.idempotency import IdempotencyMiddleware
+from backend.app.middleware.isolation import DataIsolationMiddleware
+from backend.app.middleware.security import RequestIDMiddleware, SecureHeadersMiddleware
+from backend.core.auth.jwt import create_token
+from backend.core.auth.principal_cache import PrincipalCache
+
+
+class _MemoryRedis:
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+
+class _PassThrough(BaseHTTPMiddleware):
+    async def dispatch(self, request, call_next):
+        return await call_next(request)
+
+
+class _DrainingPassThrough(BaseHTTPMiddleware):
+    """Former IdempotencyMiddleware miss path: drain and rebuild the body."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        if not request.headers.get("Idempotency-Key"):
+            return response
+        body = b""
+        async for chunk in response.body_iterator:
+            body += chunk
+        return JSONResponse(content=body.decode(), status_code=response.status_code,
+                            headers=dict(response.headers))
+
+
+def _endpoint_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/api/v1/bench")
+    async def bench():
+        return {"ok": True, "items": [1, 2, 3]}
+
+    return app
+
+
+def _stack(mode: str):
+    app = _endpoint_app()
+    if mode == "bare":
+        return app
+
+    def wrap(layer, drain=False):
+        if mode != "base_http":
+            return layer
+        return (_DrainingPassThrough if drain else _PassThrough)(layer)
+
+    idempotency = IdempotencyMiddleware
+    asgi = wrap(SecureHeadersMiddleware(app))
+    asgi = wrap(DataIsolationMiddleware(asgi))
+    idem = idempotency(asgi)
+    idem._redis = _MemoryRedis()
+    asgi = wrap(idem, drain=True)
+    asgi = wrap(AuthMiddleware(asgi))
+    asgi = wrap(RequestIDMiddleware(asgi))
+    return asgi
+
+
+async def _run(asgi_app, requests: int, concurrency: int, token: str, keyed: bool):
+    latencies = []
+    transport = httpx.ASGITransport(app=asgi_app)
+    queue: asyncio.Queue = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            while not queue.empty():
+                queue.get_nowait()
+                headers = {"Authorization": f"Bearer {token}"}
+                if keyed:
+                    headers["Idempotency-Key"] = uuid.uuid4().hex
+                started = time.perf_counter()
+                response = await client.post("/api/v1/bench", headers=headers)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.text
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "rps": requests / elapsed,
+    }
+
+
+async def main(requests: int, concurrency: int, keyed: bool) -> None:
+    logging.disable(logging.CRITICAL)
+
+    user = SimpleNamespace(
+        id=uuid.uuid4(), user_type="SUPER_ADMIN", business_partner_id=None, organization_id=None,
+        parent_user_id=None, allowed_modules=None, email="bench@example.com", mobile_number=None,
+        full_name="Bench", role=None, is_active=True, is_verified=True, two_fa_enabled=False,
+    )
+    token = create_token(sub=str(user.id), org_id="default")
+    cache = PrincipalCache(redis=None, local_ttl=3600)
+
+    async def load_user(user_id):
+        return user
+
+    with patch.object(auth_module, "get_principal_cache", return_value=cache), \
+            patch.object(AuthMiddleware, "_load_user", staticmethod(load_user)):
+        print(f"{'mode':<10} {'p50 ms':>8} {'p99 ms':>8} {'req/s':>9}")
+        for mode in ("bare", "base_http", "asgi"):
+            app = _stack(mode)
+            await _run(app, min(200, requests), concurrency, token, keyed)  # Warm-up
+            result = await _run(app, requests, concurrency, token, keyed)
+            print(f"{mode:<10} {result['p50_ms']:>8.3f} {result['p99_ms']:>8.3f} {result['rps']:>9.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--idempotency-key", action="store_true", help="Send a fresh Idempotency-Key per request")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.idempotency_key))
@@ -8,6 +8,7 @@ Tests all 4 critical validations + ML model + API endpoints.
 import pytest
 from datetime import date, datetime, timedelta
 from decimal import Decimal
+from types import SimpleNamespace
 from uuid import UUID, uuid4
 from unittest.mock import Mock, AsyncMock, patch
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -541,6 +542,127 @@ class TestRiskAPIEndpoints:
         pass
 
 
+# ========================================
+# TEST 8: BATCHED MATCHING RISK PATH
+# ========================================
+
+def _partner(partner_id, pan=None, tax_id=None, phone=None, email=None):
+    return Mock(
+        id=partner_id, pan_number=pan, tax_id_number=tax_id,
+        primary_contact_phone=phone, primary_contact_email=email
+    )
+
+
+class TestBatchTradeRisk:
+    """Test one-query party links and once-per-run buyer assessment."""
+
+    @pytest.mark.asyncio
+    async def test_party_links_batch_single_query(self, risk_engine, db_session):
+        """All sellers are resolved with one IN (...) query."""
+        buyer_id, linked_id, clean_id = uuid4(), uuid4(), uuid4()
+        mock_result = Mock()
+        mock_result.scalars.return_value.all.return_value = [
+            _partner(buyer_id, pan="ABCDE1234F"),
+            _partner(linked_id, pan="ABCDE1234F"),
+            _partner(clean_id, pan="FGHIJ5678K"),
+        ]
+        db_session.execute = AsyncMock(return_value=mock_result)
+
+        result = await risk_engine.check_party_links_batch(
+            buyer_partner_id=buyer_id,
+            seller_partner_ids=[linked_id, clean_id, linked_id]
+        )
+
+        assert db_session.execute.await_count == 1
+        assert set(result) == {linked_id, clean_id}
+        assert result[linked_id]["severity"] == "BLOCK"
+        assert result[clean_id]["severity"] == "PASS"
+
+    @pytest.mark.asyncio
+    async def test_assess_trade_risk_batch_assesses_buyer_once(self, risk_engine, db_session):
+        """Buyer side runs once; each pair gets its own risk factor list."""
+        buyer_id, seller_id = uuid4(), uuid4()
+        requirement = Mock(buyer_partner_id=buyer_id, blocked_internal_trades=False)
+        availabilities = [
+            Mock(id=uuid4(), seller_id=seller_id, blocked_for_branches=False)
+            for _ in range(3)
+        ]
+        buyer_assessment = {"status": "PASS", "score": 90, "risk_factors": []}
+        seller_assessment = {"status": "PASS", "score": 90, "risk_factors": []}
+        risk_engine.assess_buyer_risk = AsyncMock(return_value=buyer_assessment)
+        risk_engine.assess_seller_risk = AsyncMock(return_value=seller_assessment)
+        risk_engine.check_party_links_batch = AsyncMock(return_value={
+            seller_id: {
+                "linked": True, "severity": "WARN", "violations": [],
+                "warn_violations": [{"type": "SAME_MOBILE"}],
+                "recommended_action": "REVIEW"
+            }
+        })
+        db_session.execute = AsyncMock(return_value=Mock(
+            scalars=Mock(return_value=Mock(all=Mock(return_value=[])))
+        ))
+        party_data = {
+            "credit_limit": Decimal("1000000"), "current_exposure": Decimal("0"),
+            "rating": Decimal("4.5"), "payment_performance": 90, "delivery_performance": 90
+        }
+
+        results = await risk_engine.assess_trade_risk_batch(
+            requirement=requirement,
+            availabilities=availabilities,
+            trade_terms={a.id: (Decimal("10"), Decimal("100")) for a in availabilities},
+            buyer_data=party_data,
+            seller_data={seller_id: party_data},
+            user_id=None
+        )
+
+        assert risk_engine.assess_buyer_risk.await_count == 1
+        assert risk_engine.check_party_links_batch.await_count == 1
+        assert len(results) == 3
+        for availability in availabilities:
+            assessment = results[availability.id]
+            assert assessment["overall_status"] == "WARN"
+            assert assessment["trade_value"] == Decimal("1000")
+            assert assessment["buyer_assessment"]["risk_factors"] == ["Party link warning: SAME_MOBILE"]
+        assert buyer_assessment["risk_factors"] == []
+
+    @pytest.mark.asyncio
+    async def test_assess_trade_risk_batch_loads_party_data(self, risk_engine, db_session):
+        """Credit data comes from the same single query as the party links."""
+        # Rows carry no rating/performance scores: neutral defaults apply
+        buyer = SimpleNamespace(
+            id=uuid4(), pan_number="ABCDE1234F", tax_id_number=None,
+            primary_contact_phone=None, primary_contact_email=None,
+            credit_limit=Decimal("50000"), credit_utilized=Decimal("45000")
+        )
+        seller = SimpleNamespace(
+            id=uuid4(), pan_number="FGHIJ5678K", tax_id_number=None,
+            primary_contact_phone=None, primary_contact_email=None,
+            credit_limit=Decimal("1000000"), credit_utilized=None
+        )
+        mock_result = Mock()
+        mock_result.scalars.return_value.all.return_value = [buyer, seller]
+        db_session.execute = AsyncMock(return_value=mock_result)
+        requirement = Mock(buyer_partner_id=buyer.id, blocked_internal_trades=False)
+        requirement.calculate_estimated_trade_value.return_value = Decimal("10000")
+        availability = Mock(id=uuid4(), seller_id=seller.id, blocked_for_branches=False)
+        availability.calculate_estimated_trade_value.return_value = Decimal("10000")
+
+        results = await risk_engine.assess_trade_risk_batch(
+            requirement=requirement,
+            availabilities=[availability],
+            trade_terms={availability.id: (Decimal("10"), Decimal("1000"))},
+            user_id=None
+        )
+
+        assert db_session.execute.await_count == 1
+        assessment = results[availability.id]
+        # Buyer: 45k of 50k used, 10k trade -> over limit (-40)
+        assert assessment["buyer_assessment"]["score"] == 60
+        assert assessment["buyer_assessment"]["credit_limit_remaining"] == Decimal("5000")
+        assert assessment["seller_assessment"]["score"] == 100
+        assert assessment["overall_status"] == "WARN"
+
+
 # ========================================
 # RUN TESTS
 # ========================================
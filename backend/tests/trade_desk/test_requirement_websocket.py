@@ -52,7 +52,7 @@ class TestRequirementWebSocketService:
     async def test_broadcast_requirement_created(self):
         """Test broadcasting requirement.created event."""
         mock_connection_manager = Mock()
-        mock_connection_manager.broadcast_to_channel = AsyncMock()
+        mock_connection_manager.broadcast_to_channels = AsyncMock()
         
         ws_service = RequirementWebSocketService(mock_connection_manager)
         
@@ -74,11 +74,11 @@ class TestRequirementWebSocketService:
         )
         
         # Verify broadcast to 4 channels
-        assert mock_connection_manager.broadcast_to_channel.call_count == 4
+        mock_connection_manager.broadcast_to_channels.assert_awaited_once()
+        channels = mock_connection_manager.broadcast_to_channels.call_args[0][0]
+        assert len(channels) == 4
         
         # Verify channels
-        calls = mock_connection_manager.broadcast_to_channel.call_args_list
-        channels = [call[0][0] for call in calls]
         assert f"requirement:{requirement_id}" in channels
         assert f"buyer:{buyer_id}:requirements" in channels
         assert f"commodity:{commodity_id}:requirements" in channels
@@ -87,7 +87,7 @@ class TestRequirementWebSocketService:
     async def test_broadcast_requirement_published_with_intent_routing(self):
         """Test broadcasting requirement.published triggers intent routing."""
         mock_connection_manager = Mock()
-        mock_connection_manager.broadcast_to_channel = AsyncMock()
+        mock_connection_manager.broadcast_to_channels = AsyncMock()
         
         ws_service = RequirementWebSocketService(mock_connection_manager)
         
@@ -110,11 +110,11 @@ class TestRequirementWebSocketService:
         )
         
         # Verify broadcast to 7 channels (including intent routing)
-        assert mock_connection_manager.broadcast_to_channel.call_count == 7
+        mock_connection_manager.broadcast_to_channels.assert_awaited_once()
+        channels = mock_connection_manager.broadcast_to_channels.call_args[0][0]
+        assert len(channels) == 7
         
         # Verify intent routing channels
-        calls = mock_connection_manager.broadcast_to_channel.call_args_list
-        channels = [call[0][0] for call in calls]
         assert "intent:NEGOTIATION:requirements" in channels  # 🚀 Intent routing
         assert "urgency:URGENT:requirements" in channels
         assert "requirement:intent_updates" in channels  # 🚀 Global intent
@@ -126,7 +126,7 @@ class TestRequirementWebSocketService:
     async def test_broadcast_fulfillment_updated(self):
         """Test broadcasting fulfillment progress."""
         mock_connection_manager = Mock()
-        mock_connection_manager.broadcast_to_channel = AsyncMock()
+        mock_connection_manager.broadcast_to_channels = AsyncMock()
         
         ws_service = RequirementWebSocketService(mock_connection_manager)
         
@@ -144,10 +144,10 @@ class TestRequirementWebSocketService:
         )
         
         # Verify broadcast to 3 channels
-        assert mock_connection_manager.broadcast_to_channel.call_count == 3
+        mock_connection_manager.broadcast_to_channels.assert_awaited_once()
+        channels = mock_connection_manager.broadcast_to_channels.call_args[0][0]
+        assert len(channels) == 3
         
-        calls = mock_connection_manager.broadcast_to_channel.call_args_list
-        channels = [call[0][0] for call in calls]
         assert f"requirement:{requirement_id}" in channels
         assert f"buyer:{buyer_id}:requirements" in channels
         assert "requirement:fulfillment_updates" in channels
@@ -155,7 +155,7 @@ class TestRequirementWebSocketService:
     async def test_broadcast_requirement_fulfilled(self):
         """Test broadcasting requirement fulfilled."""
         mock_connection_manager = Mock()
-        mock_connection_manager.broadcast_to_channel = AsyncMock()
+        mock_connection_manager.broadcast_to_channels = AsyncMock()
         
         ws_service = RequirementWebSocketService(mock_connection_manager)
         
@@ -173,10 +173,10 @@ class TestRequirementWebSocketService:
         )
         
         # Verify broadcast to 3 channels
-        assert mock_connection_manager.broadcast_to_channel.call_count == 3
+        mock_connection_manager.broadcast_to_channels.assert_awaited_once()
+        channels = mock_connection_manager.broadcast_to_channels.call_args[0][0]
+        assert len(channels) == 3
         
-        calls = mock_connection_manager.broadcast_to_channel.call_args_list
-        channels = [call[0][0] for call in calls]
         assert f"requirement:{requirement_id}" in channels
         assert f"buyer:{buyer_id}:requirements" in channels
         assert "requirement:fulfillment_updates" in channels
@@ -184,7 +184,7 @@ class TestRequirementWebSocketService:
     async def test_broadcast_requirement_cancelled(self):
         """Test broadcasting requirement cancelled."""
         mock_connection_manager = Mock()
-        mock_connection_manager.broadcast_to_channel = AsyncMock()
+        mock_connection_manager.broadcast_to_channels = AsyncMock()
         
         ws_service = RequirementWebSocketService(mock_connection_manager)
         
@@ -201,10 +201,10 @@ class TestRequirementWebSocketService:
         )
         
         # Verify broadcast to 3 channels
-        assert mock_connection_manager.broadcast_to_channel.call_count == 3
+        mock_connection_manager.broadcast_to_channels.assert_awaited_once()
+        channels = mock_connection_manager.broadcast_to_channels.call_args[0][0]
+        assert len(channels) == 3
         
-        calls = mock_connection_manager.broadcast_to_channel.call_args_list
-        channels = [call[0][0] for call in calls]
         assert f"requirement:{requirement_id}" in channels
         assert f"buyer:{buyer_id}:requirements" in channels
         assert "requirement:updates" in channels
@@ -212,7 +212,7 @@ class TestRequirementWebSocketService:
     async def test_broadcast_ai_adjusted(self):
         """Test broadcasting AI adjustment event."""
         mock_connection_manager = Mock()
-        mock_connection_manager.broadcast_to_channel = AsyncMock()
+        mock_connection_manager.broadcast_to_channels = AsyncMock()
         
         ws_service = RequirementWebSocketService(mock_connection_manager)
         
@@ -233,23 +233,23 @@ class TestRequirementWebSocketService:
         )
         
         # Verify broadcast to 3 channels
-        assert mock_connection_manager.broadcast_to_channel.call_count == 3
+        mock_connection_manager.broadcast_to_channels.assert_awaited_once()
+        channels = mock_connection_manager.broadcast_to_channels.call_args[0][0]
+        assert len(channels) == 3
         
-        calls = mock_connection_manager.broadcast_to_channel.call_args_list
-        channels = [call[0][0] for call in calls]
         assert f"requirement:{requirement_id}" in channels
         assert f"buyer:{buyer_id}:requirements" in channels
         assert "requirement:updates" in channels
         
         # Verify event data
-        message = calls[0][0][1]
+        message = mock_connection_manager.broadcast_to_channels.call_args[0][1]
         assert message.event == "requirement.ai_adjusted"
         assert message.data["ai_confidence"] == 0.85
     
     async def test_broadcast_risk_alert(self):
         """Test broadcasting risk alert."""
         mock_connection_manager = Mock()
-        mock_connection_manager.broadcast_to_channel = AsyncMock()
+        mock_connection_manager.broadcast_to_channels = AsyncMock()
         
         ws_service = RequirementWebSocketService(mock_connection_manager)
         
@@ -269,16 +269,16 @@ class TestRequirementWebSocketService:
         )
         
         # Verify broadcast to 3 channels including risk_alerts
-        assert mock_connection_manager.broadcast_to_channel.call_count == 3
+        mock_connection_manager.broadcast_to_channels.assert_awaited_once()
+        channels = mock_connection_manager.broadcast_to_channels.call_args[0][0]
+        assert len(channels) == 3
         
-        calls = mock_connection_manager.broadcast_to_channel.call_args_list
-        channels = [call[0][0] for call in calls]
         assert f"requirement:{requirement_id}" in channels
         assert f"buyer:{buyer_id}:requirements" in channels
         assert "requirement:risk_alerts" in channels  # 🚀 Risk alert channel
         
         # Verify event data
-        message = calls[0][0][1]
+        message = mock_connection_manager.broadcast_to_channels.call_args[0][1]
         assert message.event == "requirement.risk_alert"
         assert message.data["risk_status"] == "FAIL"
         assert message.data["risk_score"] == 35
@@ -287,7 +287,7 @@ class TestRequirementWebSocketService:
     async def test_broadcast_updated(self):
         """Test broadcasting requirement updated."""
         mock_connection_manager = Mock()
-        mock_connection_manager.broadcast_to_channel = AsyncMock()
+        mock_connection_manager.broadcast_to_channels = AsyncMock()
         
         ws_service = RequirementWebSocketService(mock_connection_manager)
         
@@ -302,10 +302,10 @@ class TestRequirementWebSocketService:
         )
         
         # Verify broadcast to 3 channels
-        assert mock_connection_manager.broadcast_to_channel.call_count == 3
+        mock_connection_manager.broadcast_to_channels.assert_awaited_once()
+        channels = mock_connection_manager.broadcast_to_channels.call_args[0][0]
+        assert len(channels) == 3
         
-        calls = mock_connection_manager.broadcast_to_channel.call_args_list
-        channels = [call[0][0] for call in calls]
         assert f"requirement:{requirement_id}" in channels
         assert f"buyer:{buyer_id}:requirements" in channels
         assert "requirement:updates" in channels
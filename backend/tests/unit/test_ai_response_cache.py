@@ -0,0 +1,179 @@
+"""
+Test the AI response cache: normalised keys, TTL, single-flight execution
+of concurrent identical requests and its use by BaseAIOrchestrator.execute().
+"""
+
+import asyncio
+
+import pytest
+
+from backend.ai.orchestrators.base import (
+    AIProvider,
+    AIRequest,
+    AIResponse,
+    AITaskType,
+    BaseAIOrchestrator,
+)
+from backend.ai.orchestrators.cache import AIResponseCache
+
+
+class FakeModelOrchestrator(BaseAIOrchestrator):
+    """Answers every prompt after a short delay, counting model calls."""
+
+    def __init__(self, cache, delay=0.01, fail=False):
+        super().__init__(
+            provider=AIProvider.CUSTOM,
+            enable_guardrails=False,
+            enable_memory=False,
+            response_cache=cache,
+            model_name="fake-1",
+        )
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def _execute_impl(self, request: AIRequest) -> AIResponse:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("model unavailable")
+        return AIResponse(
+            result={"answer": request.prompt.upper()},
+            provider=self.provider,
+            model="fake-1",
+            task_type=request.task_type,
+            tokens_used=42,
+            cost=0.01,
+        )
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+        self.ttls[key] = ex
+
+
+def price_request(prompt="Suggest a price for  Shankar-6 cotton", **kwargs):
+    return AIRequest(task_type=AITaskType.RECOMMENDATION, prompt=prompt, **kwargs)
+
+
+class TestCacheKey:
+    def test_whitespace_is_normalised(self):
+        cache = AIResponseCache()
+
+        a = cache.key(price_request("Suggest a price\n for cotton "), AIProvider.OPENAI)
+        b = cache.key(price_request("Suggest a price for cotton"), AIProvider.OPENAI)
+
+        assert a == b
+
+    def test_parameters_and_model_are_part_of_the_key(self):
+        cache = AIResponseCache()
+        base = cache.key(price_request(), AIProvider.OPENAI, "gpt-4")
+
+        assert cache.key(price_request(temperature=0.9), AIProvider.OPENAI, "gpt-4") != base
+        assert cache.key(price_request(), AIProvider.OPENAI, "gpt-3.5") != base
+        assert cache.key(price_request(model="gpt-3.5"), AIProvider.OPENAI, "gpt-4") != base
+        assert cache.key(
+            price_request(conversation_history=[{"role": "user", "content": "hi"}]), AIProvider.OPENAI, "gpt-4"
+        ) != base
+
+
+class TestOrchestratorCaching:
+    @pytest.mark.asyncio
+    async def test_repeated_prompt_is_served_from_cache(self):
+        cache = AIResponseCache()
+        orchestrator = FakeModelOrchestrator(cache)
+
+        first = await orchestrator.execute(price_request())
+        second = await orchestrator.execute(price_request())
+
+        assert orchestrator.calls == 1
+        assert not first.cached
+        assert second.cached
+        assert second.result == first.result
+        assert second.tokens_used == 0 and second.cost == 0.0
+        assert cache.metrics["hits"] == 1 and cache.metrics["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_requests_share_one_call(self):
+        cache = AIResponseCache()
+        orchestrator = FakeModelOrchestrator(cache, delay=0.05)
+
+        responses = await asyncio.gather(*(orchestrator.execute(price_request()) for _ in range(10)))
+
+        assert orchestrator.calls == 1
+        assert {r.result["answer"] for r in responses} == {"SUGGEST A PRICE FOR  SHANKAR-6 COTTON"}
+        assert sum(r.cached for r in responses) == 9
+        assert cache.metrics["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_failures_reach_every_waiter_and_are_not_cached(self):
+        cache = AIResponseCache()
+        orchestrator = FakeModelOrchestrator(cache, delay=0.02, fail=True)
+
+        results = await asyncio.gather(
+            *(orchestrator.execute(price_request()) for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert orchestrator.calls == 1
+
+        orchestrator.fail = False
+        response = await orchestrator.execute(price_request())
+        assert not response.cached
+        assert orchestrator.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_opt_out_bypasses_cache(self):
+        cache = AIResponseCache()
+        orchestrator = FakeModelOrchestrator(cache)
+
+        await orchestrator.execute(price_request(metadata={"cache": False}))
+        await orchestrator.execute(price_request(metadata={"cache": False}))
+
+        assert orchestrator.calls == 2
+        assert cache.metrics["misses"] == 0
+
+    @pytest.mark.asyncio
+    async def test_local_entries_expire(self):
+        cache = AIResponseCache(ttl=0)
+        orchestrator = FakeModelOrchestrator(cache)
+
+        await orchestrator.execute(price_request())
+        await orchestrator.execute(price_request())
+
+        assert orchestrator.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_backend_stores_with_ttl(self):
+        redis = FakeRedis()
+        orchestrator = FakeModelOrchestrator(AIResponseCache(redis=redis, ttl=600))
+
+        await orchestrator.execute(price_request())
+        shared = FakeModelOrchestrator(AIResponseCache(redis=redis, ttl=600))
+        response = await shared.execute(price_request())
+
+        assert response.cached
+        assert shared.calls == 0
+        assert list(redis.ttls.values()) == [600]
+
+    @pytest.mark.asyncio
+    async def test_stats(self):
+        cache = AIResponseCache()
+        orchestrator = FakeModelOrchestrator(cache)
+
+        await orchestrator.execute(price_request())
+        await orchestrator.execute(price_request())
+        stats = cache.stats()
+
+        assert stats["hit_ratio"] == 0.5
+        assert stats["avg_miss_latency_ms"] > 0
+        assert stats["backend"] == "local"
@@ -0,0 +1,338 @@
+"""
+Test the pure ASGI middleware stack (request id, secure headers,
+streaming-safe idempotency with in-flight locking, isolation rejections).
+"""
+
+import asyncio
+import json
+import zlib
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+
+from backend.app.middleware.idempotency import IdempotencyMiddleware
+from backend.app.middleware.isolation import DataIsolationMiddleware
+from backend.app.middleware.security import RequestIDMiddleware, SecureHeadersMiddleware
+from backend.core.audit.logger import request_id_ctx
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.expires_at = {}
+
+    def _expire(self, key):
+        deadline = self.expires_at.get(key)
+        if deadline is not None and asyncio.get_running_loop().time() >= deadline:
+            self.data.pop(key, None)
+            self.expires_at.pop(key, None)
+
+    async def get(self, key):
+        self._expire(key)
+        return self.data.get(key)
+
+    async def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    async def set(self, key, value, nx=False, px=None):
+        self._expire(key)
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        if px is not None:
+            self.expires_at[key] = asyncio.get_running_loop().time() + px / 1000
+        return True
+
+    def register_script(self, script):
+        async def release(keys, args):
+            self._expire(keys[0])
+            if self.data.get(keys[0]) == args[0]:
+                del self.data[keys[0]]
+                return 1
+            return 0
+
+        async def extend(keys, args):
+            self._expire(keys[0])
+            if self.data.get(keys[0]) == args[0]:
+                self.expires_at[keys[0]] = asyncio.get_running_loop().time() + int(args[1]) / 1000
+                return 1
+            return 0
+
+        return extend if "PEXPIRE" in script else release
+
+
+def _app():
+    app = FastAPI()
+    calls = {"n": 0}
+
+    @app.post("/api/v1/orders")
+    async def create_order():
+        calls["n"] += 1
+        return {"order": calls["n"], "request_id": request_id_ctx.get()}
+
+    @app.post("/api/v1/slow")
+    async def slow():
+        calls["n"] += 1
+        await asyncio.sleep(0.2)
+        return {"order": calls["n"]}
+
+    @app.post("/api/v1/flaky")
+    async def flaky():
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return JSONResponse({"detail": "try again"}, status_code=503)
+        return {"order": calls["n"]}
+
+    @app.post("/api/v1/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield json.dumps({"chunk": i}).encode()
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    @app.post("/api/v1/text")
+    async def text():
+        return PlainTextResponse("ok")
+
+    @app.post("/api/v1/big")
+    async def big():
+        return {"blob": "x" * (IdempotencyMiddleware.MAX_CACHED_BODY_BYTES + 10)}
+
+    @app.get("/api/v1/private")
+    async def private(request: Request):
+        return {}
+
+    app.state.calls = calls
+    return app
+
+
+def _idempotent(app, redis):
+    middleware = IdempotencyMiddleware(app)
+    middleware._redis = redis
+    return middleware
+
+
+def _authenticated(asgi_app, user_id):
+    """Stand-in for AuthMiddleware: set request.state.user"""
+    async def app(scope, receive, send):
+        if user_id is not None:
+            scope.setdefault("state", {})["user"] = SimpleNamespace(id=user_id)
+        await asgi_app(scope, receive, send)
+    return app
+
+
+async def _post(asgi_app, path, key=None, user="user-1", **kwargs):
+    headers = {"Idempotency-Key": key} if key else {}
+    transport = httpx.ASGITransport(app=_authenticated(asgi_app, user))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.post(path, headers=headers, **kwargs)
+
+
+class TestHeaderMiddleware:
+
+    @pytest.mark.asyncio
+    async def test_request_id_propagated_to_handler_and_response(self):
+        app = RequestIDMiddleware(_app())
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.post("/api/v1/orders", headers={"X-Request-ID": "rid-1"})
+
+        assert response.headers["X-Request-ID"] == "rid-1"
+        assert response.json()["request_id"] == "rid-1"
+
+    @pytest.mark.asyncio
+    async def test_secure_headers_added(self):
+        response = await _post(SecureHeadersMiddleware(_app()), "/api/v1/orders")
+
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert response.headers["Content-Security-Policy"] == "default-src 'none'"
+
+    @pytest.mark.asyncio
+    async def test_non_http_scope_passes_through(self):
+        seen = []
+
+        async def inner(scope, receive, send):
+            seen.append(scope["type"])
+
+        for middleware in (RequestIDMiddleware, SecureHeadersMiddleware, IdempotencyMiddleware,
+                           DataIsolationMiddleware):
+            await middleware(inner)({"type": "lifespan"}, None, None)
+
+        assert seen == ["lifespan"] * 4
+
+
+class TestIdempotency:
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit_replays_body(self):
+        redis = FakeRedis()
+        inner = _app()
+        app = _idempotent(inner, redis)
+
+        first = await _post(app, "/api/v1/orders", key="k1")
+        second = await _post(app, "/api/v1/orders", key="k1")
+
+        assert first.headers["X-Idempotency-Cache"] == "MISS"
+        assert second.headers["X-Idempotency-Cache"] == "HIT"
+        assert second.content == first.content
+        assert second.headers["content-length"] == str(len(first.content))
+        assert inner.state.calls["n"] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_key_streams_untouched(self):
+        redis = FakeRedis()
+        response = await _post(_idempotent(_app(), redis), "/api/v1/stream")
+
+        assert response.content == b'{"chunk": 0}{"chunk": 1}{"chunk": 2}'
+        assert "X-Idempotency-Cache" not in response.headers
+        assert not redis.data
+
+    @pytest.mark.asyncio
+    async def test_non_json_and_oversized_not_cached(self):
+        redis = FakeRedis()
+        app = _idempotent(_app(), redis)
+
+        text = await _post(app, "/api/v1/text", key="k2")
+        big = await _post(app, "/api/v1/big", key="k3")
+
+        assert text.text == "ok"
+        assert len(big.content) > IdempotencyMiddleware.MAX_CACHED_BODY_BYTES
+        assert not redis.data  # Nothing cached, in-progress markers released
+
+    @pytest.mark.asyncio
+    async def test_keys_scoped_to_principal(self):
+        redis = FakeRedis()
+        inner = _app()
+        app = _idempotent(inner, redis)
+
+        mine = await _post(app, "/api/v1/orders", key="shared", user="user-1")
+        theirs = await _post(app, "/api/v1/orders", key="shared", user="user-2")
+
+        assert theirs.headers["X-Idempotency-Cache"] == "MISS"
+        assert theirs.json()["order"] != mine.json()["order"]
+        assert inner.state.calls["n"] == 2
+
+    @pytest.mark.asyncio
+    async def test_unauthenticated_requests_never_cached(self):
+        redis = FakeRedis()
+        inner = _app()
+        app = _idempotent(inner, redis)
+        await _post(app, "/api/v1/orders", key="anon", user="user-1")
+
+        first = await _post(app, "/api/v1/orders", key="anon", user=None)
+        second = await _post(app, "/api/v1/orders", key="anon", user=None)
+
+        assert "X-Idempotency-Cache" not in first.headers
+        assert "X-Idempotency-Cache" not in second.headers
+        assert inner.state.calls["n"] == 3
+        assert len(redis.data) == 1
+
+    @pytest.mark.asyncio
+    async def test_legacy_cache_entries_replayed(self):
+        redis = FakeRedis()
+        app = _idempotent(_app(), redis)
+        key = app._generate_cache_key("old", "POST", "/api/v1/orders", "user-1")
+        redis.data[key] = json.dumps({"status_code": 201, "body": {"order": 7}, "headers": {}})
+
+        response = await _post(app, "/api/v1/orders", key="old")
+
+        assert response.status_code == 201
+        assert response.json() == {"order": 7}
+
+    @pytest.mark.asyncio
+    async def test_stored_compressed_without_volatile_headers(self):
+        redis = FakeRedis()
+        app = _idempotent(RequestIDMiddleware(_app()), redis)
+
+        await _post(app, "/api/v1/orders", key="k4")
+
+        (payload,) = redis.data.values()
+        assert payload.startswith(b"IZ1")
+        raw = zlib.decompress(payload[3:])
+        assert b"x-request-id" not in raw.lower()
+        assert b"content-type" in raw
+
+    @pytest.mark.asyncio
+    async def test_compressed_size_cap(self):
+        redis = FakeRedis()
+        app = _idempotent(_app(), redis)
+        app.MAX_STORED_BYTES = 10
+
+        response = await _post(app, "/api/v1/orders", key="k5")
+
+        assert response.status_code == 200
+        assert not redis.data
+
+
+class TestIdempotencyInFlight:
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_execute_once(self):
+        redis = FakeRedis()
+        inner = _app()
+        app = _idempotent(inner, redis)
+
+        responses = await asyncio.gather(*(_post(app, "/api/v1/slow", key="dup") for _ in range(3)))
+
+        assert inner.state.calls["n"] == 1
+        assert {r.json()["order"] for r in responses} == {1}
+        assert sorted(r.headers["X-Idempotency-Cache"] for r in responses) == ["HIT", "HIT", "MISS"]
+        assert all(not k.endswith(":lock") for k in redis.data)
+
+    @pytest.mark.asyncio
+    async def test_failed_first_attempt_lets_retry_execute(self):
+        redis = FakeRedis()
+        inner = _app()
+        app = _idempotent(inner, redis)
+
+        first = await _post(app, "/api/v1/flaky", key="retry")
+        second = await _post(app, "/api/v1/flaky", key="retry")
+
+        assert first.status_code == 503
+        assert second.status_code == 200 and second.json() == {"order": 2}
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_holds_marker_past_lock_ttl(self):
+        redis = FakeRedis()
+        inner = _app()
+        app = _idempotent(inner, redis)
+        app.LOCK_TTL = app.LOCK_TTL / 600  # 50ms, handler takes 200ms
+        app.LOCK_HEARTBEAT_INTERVAL = app.LOCK_HEARTBEAT_INTERVAL / 1000  # 10ms
+
+        first = asyncio.create_task(_post(app, "/api/v1/slow", key="long"))
+        await asyncio.sleep(0.1)
+        retry = await _post(app, "/api/v1/slow", key="long")
+        first = await first
+
+        assert inner.state.calls["n"] == 1
+        assert retry.json() == first.json()
+        assert retry.headers["X-Idempotency-Cache"] == "HIT"
+        assert all(not k.endswith(":lock") for k in redis.data)
+
+    @pytest.mark.asyncio
+    async def test_wait_timeout_returns_409(self):
+        redis = FakeRedis()
+        app = _idempotent(_app(), redis)
+        app.LOCK_WAIT_TIMEOUT = app.LOCK_WAIT_TIMEOUT / 1000  # 10ms
+        redis.data[app._generate_cache_key("busy", "POST", "/api/v1/orders", "user-1") + ":lock"] = "other"
+
+        response = await _post(app, "/api/v1/orders", key="busy")
+
+        assert response.status_code == 409
+        assert response.headers["Retry-After"] == "1"
+
+
+class TestIsolationRejection:
+
+    @pytest.mark.asyncio
+    async def test_unauthenticated_gets_json_401(self):
+        transport = httpx.ASGITransport(app=DataIsolationMiddleware(_app()))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/api/v1/private")
+
+        assert response.status_code == 401
+        assert response.json() == {"detail": "Authentication required"}
+        assert response.headers["WWW-Authenticate"] == "Bearer"
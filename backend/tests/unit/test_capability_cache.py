@@ -0,0 +1,208 @@
+"""
+Test the effective capability cache (local LRU + Redis, per-user and
+global role version stamps, expiry-bounded entries) and its use by
+CapabilityService and the capability decorators.
+"""
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from backend.core.auth.capabilities.cache import CapabilityCache
+from backend.core.auth.capabilities.decorators import RequireCapability
+from backend.core.auth.capabilities.definitions import Capabilities
+from backend.core.auth.capabilities.service import CapabilityService
+
+
+class FakeRedis:
+    """Strings + MGET + INCR + pipeline + the fill script, evaluated in Python."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+
+    async def mget(self, *keys):
+        return [self.data.get(k) for k in keys]
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, "0")) + 1)
+        return int(self.data[key])
+
+    def register_script(self, script):
+        async def fill(keys, args):
+            user_version, roles_version, payload, ttl = args
+            if self.data.get(keys[1], "0") == user_version and self.data.get(keys[2], "0") == roles_version:
+                self.data[keys[0]] = payload
+                self.ttls[keys[0]] = ttl
+                return 1
+            return 0
+        return fill
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class _Pipeline:
+            def __init__(self):
+                self.ops = []
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def incr(self, key):
+                self.ops.append(("incr", key))
+
+            def delete(self, key):
+                self.ops.append(("delete", key))
+
+            async def execute(self):
+                for op, key in self.ops:
+                    if op == "incr":
+                        redis.data[key] = str(int(redis.data.get(key, "0")) + 1)
+                    else:
+                        redis.data.pop(key, None)
+
+        return _Pipeline()
+
+
+class CountingLoader:
+    def __init__(self, codes, valid_until=None):
+        self.codes = set(codes)
+        self.valid_until = valid_until
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return set(self.codes), self.valid_until
+
+
+class TestCapabilityCache:
+
+    @pytest.mark.asyncio
+    async def test_local_then_redis_then_loader(self):
+        redis = FakeRedis()
+        user_id = uuid.uuid4()
+        loader = CountingLoader({"A", "B"})
+        cache = CapabilityCache(redis=redis)
+
+        assert await cache.get(user_id, loader) == {"A", "B"}
+        assert await cache.get(user_id, loader) == {"A", "B"}
+        other_process = CapabilityCache(redis=redis)
+        assert await other_process.get(user_id, loader) == {"A", "B"}
+
+        assert loader.calls == 1
+        assert cache.metrics["local_hits"] == 1
+        assert other_process.metrics["redis_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_user_invalidation(self):
+        redis = FakeRedis()
+        user_id = uuid.uuid4()
+        loader = CountingLoader({"A"})
+        cache = CapabilityCache(redis=redis)
+        await cache.get(user_id, loader)
+
+        loader.codes = {"A", "B"}
+        await cache.invalidate(user_id)
+
+        assert await CapabilityCache(redis=redis).get(user_id, loader) == {"A", "B"}
+        assert loader.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_role_invalidation_rejects_every_entry(self):
+        redis = FakeRedis()
+        first, second = uuid.uuid4(), uuid.uuid4()
+        loader = CountingLoader({"A"})
+        cache = CapabilityCache(redis=redis)
+        await cache.get(first, loader)
+        await cache.get(second, loader)
+
+        await cache.invalidate_roles()
+        other_process = CapabilityCache(redis=redis)
+        await other_process.get(first, loader)
+        await other_process.get(second, loader)
+
+        assert loader.calls == 4
+        assert other_process.metrics["redis_hits"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fill_racing_invalidation_is_not_stored(self):
+        redis = FakeRedis()
+        user_id = uuid.uuid4()
+        cache = CapabilityCache(redis=redis)
+
+        async def racing_loader():
+            await cache.invalidate(user_id)  # Revoked while loading
+            return {"STALE"}, None
+
+        await cache.get(user_id, racing_loader)
+
+        assert cache._keys(str(user_id))[0] not in redis.data
+
+    @pytest.mark.asyncio
+    async def test_entries_bounded_by_earliest_expiry(self):
+        redis = FakeRedis()
+        user_id = uuid.uuid4()
+        cache = CapabilityCache(redis=redis, local_ttl=60, redis_ttl=300)
+        expiring = CountingLoader({"TEMP"}, valid_until=datetime.utcnow() + timedelta(seconds=30))
+
+        await cache.get(user_id, expiring)
+        deadline, _ = cache._local[str(user_id)]
+
+        assert 0 < redis.ttls[cache._keys(str(user_id))[0]] <= 30
+        assert deadline <= expiring.valid_until.timestamp() + 1
+
+        already_expired = CountingLoader({"TEMP"}, valid_until=datetime.utcnow() - timedelta(seconds=1))
+        cache.clear_local()
+        redis.data.clear()
+        await cache.get(user_id, already_expired)
+        await cache.get(user_id, already_expired)
+        assert already_expired.calls == 2
+
+    @pytest.mark.asyncio
+    async def test_redis_failure_falls_back_to_loader(self):
+        class BrokenRedis(FakeRedis):
+            async def mget(self, *keys):
+                raise ConnectionError("down")
+
+        cache = CapabilityCache(redis=BrokenRedis())
+
+        assert await cache.get(uuid.uuid4(), CountingLoader({"A"})) == {"A"}
+        assert cache.metrics["redis_errors"] == 1
+
+
+class TestCapabilityServiceResolution:
+
+    def _service(self, codes):
+        service = CapabilityService(session=None, cache=CapabilityCache())
+        loader = CountingLoader(codes)
+        service._load_user_capabilities = lambda user_id: loader()
+        return service, loader
+
+    @pytest.mark.asyncio
+    async def test_checks_share_one_load(self):
+        service, loader = self._service({Capabilities.AVAILABILITY_CREATE.value})
+        user_id = uuid.uuid4()
+
+        assert await service.user_has_capability(user_id, Capabilities.AVAILABILITY_CREATE)
+        assert not await service.user_has_capability(user_id, "UNKNOWN_CAPABILITY")
+        assert loader.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_require_capability_resolves_once(self, monkeypatch):
+        service, loader = self._service({Capabilities.AVAILABILITY_CREATE.value})
+        monkeypatch.setattr(
+            "backend.core.auth.capabilities.decorators.CapabilityService", lambda db: service
+        )
+        user = {"id": uuid.uuid4()}
+
+        await RequireCapability(Capabilities.AVAILABILITY_CREATE, Capabilities.PUBLIC_ACCESS)(user, None)
+        with pytest.raises(HTTPException) as exc:
+            await RequireCapability(Capabilities.AVAILABILITY_CREATE, "MISSING")(user, None)
+
+        assert exc.value.status_code == 403
+        assert loader.calls == 1
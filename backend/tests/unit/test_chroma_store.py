@@ -0,0 +1,133 @@
+"""
+Test the ChromaDB store adapter: collection calls run off the event loop,
+concurrent adds coalesce into batched upserts, multi-query search.
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from backend.ai.embeddings.chromadb.store import ChromaDBStore, shutdown_chroma_executor
+
+
+class FakeEmbeddings:
+    async def aembed_documents(self, texts):
+        return [[float(len(t)), 1.0] for t in texts]
+
+    async def aembed_query(self, text):
+        return [float(len(text)), 1.0]
+
+
+class FakeCollection:
+    """Records calls and the thread each one ran on."""
+
+    def __init__(self, fail_upsert=False):
+        self.fail_upsert = fail_upsert
+        self.upserts = []
+        self.queries = []
+        self.threads = set()
+
+    def upsert(self, embeddings, documents, metadatas, ids):
+        self.threads.add(threading.get_ident())
+        if self.fail_upsert:
+            raise RuntimeError("disk full")
+        self.upserts.append(list(ids))
+
+    def query(self, query_embeddings, n_results, where=None):
+        self.threads.add(threading.get_ident())
+        self.queries.append(query_embeddings)
+        n = len(query_embeddings)
+        return {
+            "ids": [[f"q{q}-{i}" for i in range(n_results)] for q in range(n)],
+            "documents": [[f"doc {i}" for i in range(n_results)] for q in range(n)],
+            "metadatas": [[None] * n_results for q in range(n)],
+            "distances": [[0.1 * i for i in range(n_results)] for q in range(n)],
+        }
+
+    def count(self):
+        self.threads.add(threading.get_ident())
+        return 7
+
+
+class FakeClient:
+    def __init__(self, collection):
+        self._collection = collection
+
+    def get_or_create_collection(self, name, metadata=None):
+        return self._collection
+
+
+@pytest.fixture
+def collection():
+    return FakeCollection()
+
+
+@pytest.fixture
+def store(collection):
+    store = ChromaDBStore(
+        collection_name="test",
+        embedding_model=FakeEmbeddings(),
+        client=FakeClient(collection),
+    )
+    yield store
+    shutdown_chroma_executor()
+
+
+class TestWrites:
+    @pytest.mark.asyncio
+    async def test_concurrent_adds_share_one_upsert(self, store, collection):
+        ids = await asyncio.gather(
+            store.add_documents(["a"], ids=["1"]),
+            store.add_documents(["b", "c"], ids=["2", "3"]),
+            store.add_documents(["d"], ids=["4"]),
+        )
+
+        assert ids == [["1"], ["2", "3"], ["4"]]
+        assert collection.upserts == [["1", "2", "3", "4"]]
+        assert threading.get_ident() not in collection.threads
+
+    @pytest.mark.asyncio
+    async def test_batches_split_at_max_batch(self, store, collection):
+        store.max_batch = 2
+
+        await asyncio.gather(*(store.add_documents([str(i)], ids=[str(i)]) for i in range(5)))
+
+        assert all(len(batch) <= 2 for batch in collection.upserts)
+        assert sorted(i for batch in collection.upserts for i in batch) == ["0", "1", "2", "3", "4"]
+
+    @pytest.mark.asyncio
+    async def test_upsert_failure_reaches_every_caller(self, store, collection):
+        collection.fail_upsert = True
+
+        results = await asyncio.gather(
+            store.add_documents(["a"], ids=["1"]),
+            store.add_documents(["b"], ids=["2"]),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+class TestSearch:
+    @pytest.mark.asyncio
+    async def test_batch_search_is_one_query(self, store, collection):
+        results = await store.similarity_search_batch(["cotton", "yarn", "bales"], k=2)
+
+        assert len(collection.queries) == 1
+        assert len(collection.queries[0]) == 3
+        assert [r[0]["id"] for r in results] == ["q0-0", "q1-0", "q2-0"]
+        assert results[0][0]["metadata"] == {}
+
+    @pytest.mark.asyncio
+    async def test_single_search_runs_off_loop(self, store, collection):
+        results = await store.similarity_search("cotton", k=3)
+
+        assert len(results) == 3
+        assert threading.get_ident() not in collection.threads
+
+    @pytest.mark.asyncio
+    async def test_stats(self, store):
+        stats = await store.get_collection_stats()
+
+        assert stats["document_count"] == 7
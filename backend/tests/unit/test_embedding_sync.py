@@ -0,0 +1,227 @@
+"""
+Test the batched embedding sync pipeline: text_hash dedup, model-sized
+batches encoded off the event loop, one bulk upsert per batch.
+"""
+
+import asyncio
+import threading
+import uuid
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from sqlalchemy.sql.dml import Insert
+from sqlalchemy.sql.selectable import Select
+
+from backend.ai.jobs.vector_sync import (
+    AVAILABILITY,
+    REQUIREMENT,
+    EmbeddingSyncJob,
+    availability_text,
+    requirement_text,
+    text_hash,
+)
+from backend.ai.services.embedding_service import EmbeddingService, shutdown_embedding_executor
+
+
+class FakeEmbeddingService:
+    model_name = "all-MiniLM-L6-v2"
+
+    def __init__(self, failing=()):
+        self.batches = []
+        self.failing = set(failing)
+
+    async def encode_batch_async(self, texts, batch_size=32, normalize=True):
+        self.batches.append(list(texts))
+        # Like EmbeddingService.encode_batch on a model error: all-zero rows
+        return np.array([
+            np.zeros(384) if text in self.failing else np.ones(384) for text in texts
+        ], dtype=np.float32).reshape(len(texts), 384)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+
+class FakeSession:
+    """Stored text hashes by id; records upserted rows and commits."""
+
+    def __init__(self, stored=None, commit_delay=0.0, fail_on_write=None):
+        self.stored = dict(stored or {})
+        self.commit_delay = commit_delay
+        self.fail_on_write = fail_on_write
+        self.upserts = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    async def execute(self, stmt):
+        if isinstance(stmt, Insert):
+            if self.fail_on_write == len(self.upserts) + 1:
+                self.upserts.append([])
+                raise RuntimeError("deadlock detected")
+            rows = [{getattr(k, "key", k): v for k, v in row.items()} for row in stmt._multi_values[0]]
+            self.upserts.append(rows)
+            return FakeResult([])
+        if isinstance(stmt, Select):
+            return FakeResult(list(self.stored.items()))
+        raise AssertionError(f"unexpected statement {stmt}")
+
+    async def commit(self):
+        await asyncio.sleep(self.commit_delay)
+        self.commits += 1
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+def _items(count):
+    return [(uuid.uuid4(), f"Cotton lot {i}") for i in range(count)]
+
+
+def _job(db, batch_size=4, depth=2):
+    job = EmbeddingSyncJob(db, embedding_service=FakeEmbeddingService())
+    job.batch_size = batch_size
+    job.pipeline_depth = depth
+    return job
+
+
+class TestEmbeddingSync:
+
+    @pytest.mark.asyncio
+    async def test_model_sized_batches_and_bulk_upserts(self):
+        db = FakeSession()
+        job = _job(db, batch_size=4)
+
+        stats = await job.sync_embeddings(REQUIREMENT, _items(10))
+
+        assert [len(batch) for batch in job.embedding_service.batches] == [4, 4, 2]
+        assert [len(rows) for rows in db.upserts] == [4, 4, 2]
+        assert db.commits == 3
+        assert stats["processed"] == stats["success"] == 10
+        assert stats["rows_per_second"] > 0
+
+    @pytest.mark.asyncio
+    async def test_unchanged_text_hash_is_skipped(self):
+        items = _items(3)
+        db = FakeSession(stored={items[0][0]: text_hash(items[0][1]), items[1][0]: "stale"})
+        job = _job(db)
+
+        stats = await job.sync_embeddings(AVAILABILITY, items)
+
+        assert stats["skipped"] == 1
+        upserted = db.upserts[0]
+        assert [row["availability_id"] for row in upserted] == [items[1][0], items[2][0]]
+        assert upserted[0]["text_hash"] == text_hash(items[1][1])
+        assert upserted[0]["model_version"] == "all-MiniLM-L6-v2"
+
+    @pytest.mark.asyncio
+    async def test_force_refresh_reembeds_everything(self):
+        items = _items(2)
+        db = FakeSession(stored={item_id: text_hash(text) for item_id, text in items})
+
+        stats = await _job(db).sync_embeddings(REQUIREMENT, items, force_refresh=True)
+
+        assert stats["success"] == 2 and stats["skipped"] == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_rolls_back_and_pipeline_continues(self):
+        db = FakeSession(fail_on_write=1)
+
+        stats = await _job(db, batch_size=2).sync_embeddings(REQUIREMENT, _items(4))
+
+        assert (stats["failed"], stats["success"]) == (2, 2)
+        assert db.rollbacks == 1
+
+    @pytest.mark.asyncio
+    async def test_zero_vectors_are_not_stored(self):
+        items = _items(3)
+        db = FakeSession()
+        job = _job(db)
+        job.embedding_service.failing = {items[1][1]}
+
+        stats = await job.sync_embeddings(REQUIREMENT, items)
+
+        assert (stats["failed"], stats["success"]) == (1, 2)
+        assert [row["requirement_id"] for row in db.upserts[0]] == [items[0][0], items[2][0]]
+
+        # Nothing stored under its text_hash, so the next sync retries it
+        db.stored = {row["requirement_id"]: row["text_hash"] for row in db.upserts[0]}
+        job.embedding_service.failing = set()
+        stats = await job.sync_embeddings(REQUIREMENT, items)
+        assert (stats["skipped"], stats["success"]) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_single_row_api(self):
+        db = FakeSession()
+
+        assert await _job(db).sync_requirement_embedding(uuid.uuid4(), "Cotton MCU-5")
+        assert len(db.upserts) == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_writer_applies_backpressure(self):
+        db = FakeSession(commit_delay=0.01)
+        job = _job(db, batch_size=1, depth=1)
+
+        stats = await job.sync_embeddings(REQUIREMENT, _items(5))
+
+        assert stats["success"] == 5
+        assert stats["max_queue_depth"] <= 1
+        assert stats["backpressure_seconds"] > 0
+
+    @pytest.mark.asyncio
+    async def test_backfill_reports_per_kind(self):
+        db = FakeSession()
+        job = _job(db)
+
+        async def pages(kind, page_size):
+            yield _items(3)
+            yield _items(2)
+
+        job._source_pages = pages
+        stats = await job.backfill_all_embeddings(batch_size=3)
+
+        assert stats["requirements_processed"] == 5
+        assert stats["availabilities_success"] == 5
+        assert "requirements_rows_per_second" in stats
+        assert "availabilities_backpressure_seconds" in stats
+
+
+class TestEmbeddingText:
+
+    def test_requirement_text(self):
+        row = {
+            "commodity_name": "Cotton",
+            "variety_name": "MCU-5",
+            "quality_requirements": {"micronaire": {"min": 3.8}},
+        }
+        assert requirement_text(row) == "Cotton MCU-5 micronaire:{'min': 3.8}"
+
+    def test_availability_text_skips_missing_parts(self):
+        row = {"commodity_name": "Cotton", "quality_params": None, "state": "Gujarat", "district": None}
+        assert availability_text(row) == "Cotton Gujarat"
+
+
+class TestEncodeOffLoop:
+
+    @pytest.mark.asyncio
+    async def test_encode_batch_async_runs_on_inference_thread(self):
+        service = EmbeddingService()
+        threads = []
+
+        def encode(texts, **kwargs):
+            threads.append(threading.current_thread().name)
+            return np.zeros((len(texts), 384), dtype=np.float32)
+
+        service._model = Mock(encode=encode)
+        service._initialized = True
+        try:
+            vectors = await service.encode_batch_async(["a", "b"])
+        finally:
+            shutdown_embedding_executor()
+
+        assert vectors.shape == (2, 384)
+        assert threads[0].startswith("embedding")
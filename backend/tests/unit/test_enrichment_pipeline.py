@@ -0,0 +1,204 @@
+"""
+Test the enrichment pipeline behind create_requirement / create_availability:
+dependency ordering, concurrency, per-step timeouts with fallbacks,
+serialised session steps and per-step timings.
+"""
+
+import asyncio
+import time
+from decimal import Decimal
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from backend.modules.trade_desk.enums import IntentType, MarketVisibility, UrgencyLevel
+from backend.modules.trade_desk.services.enrichment import EnrichmentPipeline, EnrichmentStep
+from backend.modules.trade_desk.services.requirement_service import RequirementService
+
+
+def sleeper(delay, value=None, log=None, name=None):
+    async def run(*args):
+        if log is not None:
+            log.append(("start", name))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", name))
+        return value
+    return run
+
+
+class TestEnrichmentPipeline:
+    @pytest.mark.asyncio
+    async def test_independent_steps_run_concurrently(self):
+        pipeline = EnrichmentPipeline("test", [
+            EnrichmentStep(f"step{i}", sleeper(0.05, i), fallback=None) for i in range(5)
+        ], default_timeout=1.0)
+
+        start = time.perf_counter()
+        result = await pipeline.run()
+
+        assert time.perf_counter() - start < 0.15
+        assert [result[f"step{i}"] for i in range(5)] == [0, 1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_dependencies_receive_results(self):
+        async def double(results):
+            return results["base"] * 2
+
+        pipeline = EnrichmentPipeline("test", [
+            EnrichmentStep("doubled", double, depends_on=("base",)),
+            EnrichmentStep("base", sleeper(0.01, 21)),
+        ])
+
+        result = await pipeline.run()
+
+        assert result["doubled"] == 42
+
+    @pytest.mark.asyncio
+    async def test_optional_step_times_out_to_fallback(self):
+        pipeline = EnrichmentPipeline("test", [
+            EnrichmentStep("slow", sleeper(1.0, "late"), fallback=lambda r: {"neutral": True}),
+            EnrichmentStep("fast", sleeper(0.0, "ok"), fallback=None),
+        ], default_timeout=0.05)
+
+        result = await pipeline.run()
+
+        assert result["slow"] == {"neutral": True}
+        assert result["fast"] == "ok"
+        assert result.degraded == ["slow"]
+        assert {t.name: t.status for t in result.timings} == {"slow": "timeout", "fast": "ok"}
+
+    @pytest.mark.asyncio
+    async def test_optional_step_error_uses_fallback(self):
+        async def broken(results):
+            raise RuntimeError("model down")
+
+        pipeline = EnrichmentPipeline("test", [EnrichmentStep("broken", broken, fallback=1.0)])
+
+        result = await pipeline.run()
+
+        assert result["broken"] == 1.0
+        assert result.timings[0].status == "error"
+
+    @pytest.mark.asyncio
+    async def test_required_step_error_cancels_the_rest(self):
+        log = []
+
+        async def invalid(results):
+            raise ValueError("capability missing")
+
+        pipeline = EnrichmentPipeline("test", [
+            EnrichmentStep("validation", invalid),
+            EnrichmentStep("slow", sleeper(1.0, log=log, name="slow"), fallback=None),
+        ])
+
+        start = time.perf_counter()
+        with pytest.raises(ValueError, match="capability missing"):
+            await pipeline.run()
+
+        assert time.perf_counter() - start < 0.5
+        assert ("end", "slow") not in log
+
+    @pytest.mark.asyncio
+    async def test_session_steps_never_overlap(self):
+        log = []
+        pipeline = EnrichmentPipeline("test", [
+            EnrichmentStep("db1", sleeper(0.02, log=log, name="db1"), uses_session=True),
+            EnrichmentStep("db2", sleeper(0.02, log=log, name="db2"), uses_session=True),
+            EnrichmentStep("ai", sleeper(0.02, log=log, name="ai"), fallback=None),
+        ])
+
+        await pipeline.run()
+
+        db_events = [event for event in log if event[1] != "ai"]
+        assert db_events == [("start", "db1"), ("end", "db1"), ("start", "db2"), ("end", "db2")]
+        assert log.index(("start", "ai")) < log.index(("end", "db1"))
+
+    def test_rejects_unknown_dependencies_and_cycles(self):
+        with pytest.raises(ValueError):
+            EnrichmentPipeline("test", [EnrichmentStep("a", sleeper(0), depends_on=("missing",))])
+
+        with pytest.raises(ValueError):
+            EnrichmentPipeline("test", [
+                EnrichmentStep("a", sleeper(0), depends_on=("b",)),
+                EnrichmentStep("b", sleeper(0), depends_on=("a",)),
+            ])
+
+
+class TestRequirementEnrichment:
+    def service(self, delay):
+        service = RequirementService(AsyncMock())
+        service._validate_buyer_locations = AsyncMock()
+        service._get_delivery_country = AsyncMock(return_value="India")
+        service._fetch_buyer_credit_limit = AsyncMock(return_value=Decimal("1000000"))
+        service._fetch_buyer_rating = AsyncMock(return_value=Decimal("4.5"))
+        service._fetch_payment_performance = AsyncMock(return_value=90)
+        service.normalize_quality_requirements = AsyncMock(return_value={"staple_length": {"min": 28}})
+        service.suggest_market_price = AsyncMock(side_effect=sleeper(delay, {"suggested_max_price": Decimal("77000")}))
+        service.calculate_buyer_priority_score = AsyncMock(side_effect=sleeper(delay, 1.5))
+        service.generate_market_context_embedding = AsyncMock(side_effect=sleeper(delay, [0.1] * 4))
+        service.adjust_for_market_sentiment = AsyncMock(side_effect=sleeper(delay, {
+            "sentiment": "neutral", "adjustment_factor": 1.0, "reason": "Market stable"
+        }))
+        service.recommend_quality_tolerances = AsyncMock(return_value={
+            "staple_length": {"tolerance": 1.0, "reason": "NORMAL"}
+        })
+        service.recommend_sellers = AsyncMock(side_effect=sleeper(delay, []))
+        service.suggest_negotiation_preferences = AsyncMock(side_effect=sleeper(delay, {"max_rounds": 5}))
+        return service
+
+    def pipeline(self, service, **overrides):
+        params = dict(
+            buyer_id=uuid4(),
+            commodity_id=uuid4(),
+            min_quantity=Decimal("100"),
+            max_quantity=Decimal("500"),
+            max_budget_per_unit=Decimal("76500"),
+            quality_requirements={"staple_length": {"min": 28}},
+            intent_type=IntentType.DIRECT_BUY.value,
+            delivery_locations=None,
+            market_visibility=MarketVisibility.PUBLIC.value,
+            urgency_level=UrgencyLevel.NORMAL.value,
+            commodity_equivalents=None,
+            negotiation_preferences=None,
+            notes=None,
+        )
+        params.update(overrides)
+        return service._build_enrichment_pipeline(**params)
+
+    @pytest.mark.asyncio
+    async def test_ai_steps_run_concurrently(self, monkeypatch):
+        from backend.modules.trade_desk.validators import capability_validator
+
+        monkeypatch.setattr(
+            capability_validator.TradeCapabilityValidator, "validate_buy_capability", AsyncMock(return_value=True)
+        )
+        service = self.service(delay=0.05)
+
+        start = time.perf_counter()
+        result = await self.pipeline(service).run()
+
+        # Six 50ms AI steps: concurrent, not 300ms in sequence
+        assert time.perf_counter() - start < 0.2
+        assert result["credit_limit"] == Decimal("1000000")
+        assert result["priority"] == 1.5
+        assert result["quality_with_tolerances"]["staple_length"]["ai_suggested_tolerance"] == 1.0
+        assert result["negotiation"] == {"max_rounds": 5}
+
+    @pytest.mark.asyncio
+    async def test_slow_ai_step_degrades(self, monkeypatch):
+        from backend.modules.trade_desk.validators import capability_validator
+
+        monkeypatch.setattr(
+            capability_validator.TradeCapabilityValidator, "validate_buy_capability", AsyncMock(return_value=True)
+        )
+        service = self.service(delay=0.0)
+        service.adjust_for_market_sentiment = AsyncMock(side_effect=sleeper(5.0, {}))
+        pipeline = self.pipeline(service)
+        pipeline.default_timeout = 0.05
+
+        result = await pipeline.run()
+
+        assert result["sentiment"]["adjustment_factor"] == 1.0
+        assert result.degraded == ["sentiment"]
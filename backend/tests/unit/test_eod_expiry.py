@@ -0,0 +1,151 @@
+"""
+Test the set-based, chunked EOD expiry job: one UPDATE ... RETURNING and
+one multi-row outbox INSERT per chunk, each chunk committed on its own.
+"""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.sql.dml import Insert, Update
+
+from backend.modules.trade_desk.cron.eod_expiry import EODExpiryJob
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeSession:
+    """Due rows are handed out by UPDATE chunks; records inserts and commits."""
+
+    bind = None  # Skips NOTIFY
+
+    def __init__(self, due, fail_on_chunk=None):
+        self.due = list(due)
+        self.fail_on_chunk = fail_on_chunk
+        self.updates = []
+        self.inserts = []
+        self.commits = 0
+        self.rollbacks = 0
+        self.pending = []
+
+    async def execute(self, stmt):
+        if isinstance(stmt, Update):
+            self.updates.append(stmt)
+            if self.fail_on_chunk == len(self.updates):
+                raise RuntimeError("connection lost")
+            limit = stmt.whereclause.right.element._limit_clause.value
+            self.pending, self.due = self.due[:limit], self.due[limit:]
+            return FakeResult(self.pending)
+        if isinstance(stmt, Insert):
+            rows = [{getattr(k, "key", k): v for k, v in row.items()} for row in stmt._multi_values[0]]
+            self.inserts.append(rows)
+            return FakeResult([(row["id"],) for row in rows])
+        raise AssertionError(f"unexpected statement {stmt}")
+
+    async def commit(self):
+        self.commits += 1
+        self.pending = []
+
+    async def rollback(self):
+        self.rollbacks += 1
+        self.due = self.pending + self.due
+        self.pending = []
+
+
+def _due(count):
+    cutoff = datetime(2025, 12, 1, 18, 30, tzinfo=timezone.utc)
+    return [(uuid.uuid4(), uuid.uuid4(), cutoff) for _ in range(count)]
+
+
+class TestEODExpiryChunks:
+
+    @pytest.mark.asyncio
+    async def test_chunks_commit_with_one_outbox_insert_each(self):
+        db = FakeSession(_due(25))
+
+        expired = await EODExpiryJob(db, chunk_size=10).expire_availabilities()
+
+        assert expired == 25
+        assert len(db.updates) == 3
+        assert [len(rows) for rows in db.inserts] == [10, 10, 5]
+        assert db.commits == 3
+
+    @pytest.mark.asyncio
+    async def test_exact_multiple_ends_with_empty_chunk(self):
+        db = FakeSession(_due(20))
+
+        assert await EODExpiryJob(db, chunk_size=10).expire_requirements() == 20
+        assert len(db.inserts) == 2  # No insert for the empty last chunk
+
+    @pytest.mark.asyncio
+    async def test_interrupted_run_resumes(self):
+        db = FakeSession(_due(25), fail_on_chunk=2)
+        job = EODExpiryJob(db, chunk_size=10)
+
+        with pytest.raises(RuntimeError):
+            await job.expire_availabilities()
+
+        assert db.commits == 1 and db.rollbacks == 1
+        db.fail_on_chunk = None
+        assert await job.expire_availabilities() == 15
+
+    @pytest.mark.asyncio
+    async def test_expired_events(self):
+        due = _due(2)
+        db = FakeSession(due)
+
+        await EODExpiryJob(db).expire_requirements()
+
+        first = db.inserts[0][0]
+        assert first["event_type"] == "RequirementExpired"
+        assert first["topic_name"] == "requirement-events"
+        assert first["idempotency_key"] == f"requirement.expired:{due[0][0]}:eod:2025-12-01T18:30:00+00:00"
+        assert first["payload"]["buyer_id"] == str(due[0][1])
+        assert first["payload"]["reason"] == "EOD_CUTOFF"
+
+    @pytest.mark.asyncio
+    async def test_same_row_expired_on_two_cutoffs_gets_two_keys(self):
+        (row_id, partner_id, cutoff), = _due(1)
+        next_day = cutoff + timedelta(days=1)
+        db = FakeSession([(row_id, partner_id, cutoff)])
+        job = EODExpiryJob(db)
+
+        await job.expire_availabilities()
+        db.due = [(row_id, partner_id, next_day)]  # Re-activated, expires again next day
+        await job.expire_availabilities()
+
+        first, second = (rows[0]["idempotency_key"] for rows in db.inserts)
+        assert first != second
+        assert second.endswith(f":eod:{next_day.isoformat()}")
+
+    def test_cutoff_key_normalized_to_utc(self):
+        cutoff = datetime(2025, 12, 1, 18, 30, tzinfo=timezone.utc)
+        ist = cutoff.astimezone(timezone(timedelta(hours=5, minutes=30)))
+
+        assert EODExpiryJob._cutoff_key(ist) == EODExpiryJob._cutoff_key(cutoff)
+        assert EODExpiryJob._cutoff_key(cutoff.replace(tzinfo=None)) == EODExpiryJob._cutoff_key(cutoff)
+
+
+class TestEODExpirySQL:
+
+    @pytest.mark.asyncio
+    async def test_update_is_set_based_and_skip_locked(self):
+        db = FakeSession([])
+        await EODExpiryJob(db, chunk_size=500).expire_availabilities()
+
+        stmt = db.updates[0]
+        due = stmt.whereclause.right.element
+
+        assert stmt.table.name == "availabilities"
+        assert due._limit_clause.value == 500
+        assert due._for_update_arg.skip_locked
+        assert [col.key for col in stmt._returning] == ["id", "seller_partner_id", "eod_cutoff"]
@@ -0,0 +1,296 @@
+"""
+Test outbox publishing (concurrent batch publish, bulk status updates,
+NOTIFY wake-ups, partitioned per-aggregate ordered draining).
+"""
+
+import asyncio
+import threading
+import uuid
+from concurrent.futures import Future
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend.core.outbox.repository import OutboxRepository
+from backend.core.outbox.worker import OutboxWorker, publish_in_aggregate_order
+from backend.workers.event_processor import EventProcessor
+
+
+def _event(topic="trade-events", aggregate_id=None):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        event_type="trade.created",
+        aggregate_id=aggregate_id or uuid.uuid4(),
+        aggregate_type="trade",
+        payload={"n": 1},
+        event_metadata=None,
+        version=1,
+        idempotency_key=None,
+        topic_name=topic,
+    )
+
+
+class FakePublisher:
+    """Resolves publish futures from another thread, like the Pub/Sub client."""
+
+    def __init__(self, delay=0.05, fail_topics=()):
+        self.delay = delay
+        self.fail_topics = set(fail_topics)
+        self.published = []
+
+    def topic_path(self, project_id, topic):
+        return f"projects/{project_id}/topics/{topic}"
+
+    def publish(self, topic_path, data, **attributes):
+        future = Future()
+        self.published.append(topic_path)
+
+        def resolve():
+            if topic_path.rsplit("/", 1)[-1] in self.fail_topics:
+                future.set_exception(RuntimeError("unavailable"))
+            else:
+                future.set_result(f"msg-{len(self.published)}")
+
+        threading.Timer(self.delay, resolve).start()
+        return future
+
+
+def _worker(events, publisher):
+    session = MagicMock()
+    session.commit = AsyncMock()
+    worker = OutboxWorker(session, "proj", batch_size=10, publisher=publisher)
+    worker.repository = MagicMock()
+    worker.repository.claim_partitions = AsyncMock(return_value=[0, 1])
+    worker.repository.get_pending_events = AsyncMock(return_value=events)
+    worker.repository.mark_published_bulk = AsyncMock()
+    worker.repository.mark_failed_bulk = AsyncMock()
+    return worker
+
+
+class TestOutboxWorker:
+
+    @pytest.mark.asyncio
+    async def test_batch_published_concurrently(self):
+        events = [_event() for _ in range(10)]
+        worker = _worker(events, FakePublisher(delay=0.1))
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        processed = await worker.process_batch()
+        elapsed = loop.time() - started
+
+        assert processed == 10
+        assert elapsed < 0.5  # Serial would be >= 1s
+        published = worker.repository.mark_published_bulk.await_args.args[0]
+        assert set(published) == {e.id for e in events}
+        worker.session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failures_recorded_in_bulk(self):
+        ok, bad = _event(), _event(topic="broken")
+        worker = _worker([ok, bad], FakePublisher(delay=0, fail_topics={"broken"}))
+
+        processed = await worker.process_batch()
+
+        assert processed == 1
+        assert list(worker.repository.mark_published_bulk.await_args.args[0]) == [ok.id]
+        failed = worker.repository.mark_failed_bulk.await_args.args[0]
+        assert failed == {bad.id: "unavailable"}
+
+    @pytest.mark.asyncio
+    async def test_publish_timeout_is_a_failure(self):
+        event = _event()
+        worker = _worker([event], FakePublisher(delay=0.5))
+        worker.publish_timeout = 0.05
+
+        assert await worker.process_batch() == 0
+        assert event.id in worker.repository.mark_failed_bulk.await_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_only_claimed_partitions_fetched(self):
+        worker = _worker([_event()], FakePublisher(delay=0))
+
+        await worker.process_batch()
+
+        kwargs = worker.repository.get_pending_events.await_args.kwargs
+        assert kwargs["partitions"] == [0, 1]
+        assert kwargs["partition_count"] == worker.partition_count
+
+    @pytest.mark.asyncio
+    async def test_nothing_fetched_when_all_partitions_busy(self):
+        worker = _worker([_event()], FakePublisher(delay=0))
+        worker.repository.claim_partitions = AsyncMock(return_value=[])
+
+        assert await worker.process_batch() == 0
+        worker.repository.get_pending_events.assert_not_awaited()
+        worker.session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_drain_visits_every_partition_after_wakeup(self):
+        worker = _worker([], FakePublisher(delay=0))
+        assert worker.max_partitions < worker.partition_count
+        groups = [
+            list(range(n, n + worker.max_partitions))
+            for n in range(0, worker.partition_count, worker.max_partitions)
+        ]
+        # Other workers hold nothing: claims rotate through all partitions
+        worker.repository.claim_partitions = AsyncMock(side_effect=groups + [groups[0]])
+        pending = {partitions[0]: [_event()] for partitions in groups}
+        worker.repository.get_pending_events = AsyncMock(
+            side_effect=lambda **kwargs: pending.pop(kwargs["partitions"][0], [])
+        )
+
+        processed = await worker.drain()
+
+        assert processed == len(groups)  # One event per group, all short batches
+        assert not pending
+        assert worker.repository.claim_partitions.await_count == len(groups)
+
+    @pytest.mark.asyncio
+    async def test_drain_stops_when_rest_is_claimed_elsewhere(self):
+        worker = _worker([_event()], FakePublisher(delay=0))
+        worker.repository.claim_partitions = AsyncMock(side_effect=[[0, 1], [0, 1], []])
+
+        await worker.drain()
+
+        assert worker.repository.claim_partitions.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_event_processor_drain_visits_every_partition(self):
+        processor = EventProcessor.__new__(EventProcessor)
+        processor.partition_count, processor.max_partitions, processor.batch_size = 16, 4, 100
+        processor._running = True
+        claims = iter([[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11], [12, 13, 14, 15]])
+
+        async def process_batch():
+            processor.last_claimed_partitions = next(claims)
+            return 1
+
+        processor._process_batch = process_batch
+
+        assert await processor._drain() == 4
+
+    @pytest.mark.asyncio
+    async def test_notify_wakes_waiting_worker(self):
+        worker = _worker([], FakePublisher())
+        waiter = asyncio.create_task(worker._wait_for_events(timeout=10))
+        await asyncio.sleep(0)
+
+        worker._on_notify(None, 1234, "event_outbox", "")
+        await asyncio.wait_for(waiter, timeout=1)
+
+        assert not worker._wakeup.is_set()
+
+
+class TestAggregateOrdering:
+
+    @pytest.mark.asyncio
+    async def test_in_order_within_aggregate_parallel_across(self):
+        a, b = uuid.uuid4(), uuid.uuid4()
+        events = [_event(aggregate_id=a), _event(aggregate_id=b), _event(aggregate_id=a), _event(aggregate_id=b)]
+        log = []
+        running = 0
+        peak = 0
+
+        async def publish(event):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            log.append(event.id)
+            return f"m-{event.id}", None
+
+        published, failed = await publish_in_aggregate_order(events, publish)
+
+        assert len(published) == 4 and not failed
+        assert peak == 2
+        for aggregate in (a, b):
+            order = [e.id for e in events if e.aggregate_id == aggregate]
+            assert [i for i in log if i in order] == order
+
+    @pytest.mark.asyncio
+    async def test_failure_holds_back_rest_of_aggregate(self):
+        a = uuid.uuid4()
+        first, second = _event(aggregate_id=a), _event(aggregate_id=a)
+        other = _event()
+
+        async def publish(event):
+            return (None, "down") if event is first else ("m", None)
+
+        published, failed = await publish_in_aggregate_order([first, other, second], publish)
+
+        assert failed == {first.id: "down"}
+        assert set(published) == {other.id}  # second left PENDING
+
+
+class TestOutboxRepositoryBulk:
+
+    @staticmethod
+    def _sql(session):
+        statement = session.execute.await_args.args[0]
+        return str(statement.compile(dialect=postgresql.dialect()))
+
+    @pytest.mark.asyncio
+    async def test_mark_published_bulk_single_update(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+        session.flush = AsyncMock()
+
+        await OutboxRepository(session).mark_published_bulk({uuid.uuid4(): "m1", uuid.uuid4(): "m2"})
+
+        session.execute.assert_awaited_once()
+        sql = self._sql(session)
+        assert sql.startswith("UPDATE event_outbox")
+        assert "message_id=CASE event_outbox.id" in sql
+
+    @pytest.mark.asyncio
+    async def test_mark_failed_bulk_schedules_backoff(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+        session.flush = AsyncMock()
+
+        await OutboxRepository(session).mark_failed_bulk({uuid.uuid4(): "boom"})
+
+        sql = self._sql(session)
+        assert "retry_count=(event_outbox.retry_count +" in sql
+        assert "make_interval" in sql
+
+    @pytest.mark.asyncio
+    async def test_empty_batches_skip_database(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+        repository = OutboxRepository(session)
+
+        await repository.mark_published_bulk({})
+        await repository.mark_failed_bulk({})
+
+        session.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_pending_events_partitioned_and_ordered(self):
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=MagicMock())
+
+        await OutboxRepository(session).get_pending_events(partitions=[3], partition_count=8)
+
+        statement = session.execute.await_args.args[0]
+        where = str(statement.whereclause.compile(dialect=postgresql.dialect()))
+        assert "hashtext(CAST(event_outbox.aggregate_id AS VARCHAR))" in where
+        assert "NOT (EXISTS" in where  # Older pending event of the aggregate blocks
+        assert statement._for_update_arg.skip_locked
+
+    @pytest.mark.asyncio
+    async def test_claim_partitions_skips_locked(self):
+        session = MagicMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [2, 5]
+        session.execute = AsyncMock(return_value=result)
+
+        claimed = await OutboxRepository(session).claim_partitions(partition_count=8, max_partitions=2)
+
+        assert claimed == [2, 5]
+        assert session.execute.await_args_list[0].args[0]._for_update_arg.skip_locked
+        assert session.execute.await_count == 2  # claim + last_claimed_at touch
@@ -0,0 +1,130 @@
+"""
+Test off-loop password hashing (bounded thread pool) and transparent
+rehash on parameter upgrades.
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from backend.core.auth.passwords import PasswordHasher, get_hash_executor, shutdown_hash_executor
+from backend.core.settings.config import settings
+from backend.modules.settings.services import settings_services
+from backend.modules.settings.services.settings_services import AuthService
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pool():
+    shutdown_hash_executor()
+    yield
+    shutdown_hash_executor()
+
+
+class TestAsyncHashing:
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify_off_loop(self):
+        hasher = PasswordHasher("pbkdf2_sha256")
+        threads = []
+        original = hasher._ctx.hash
+
+        def recording_hash(secret):
+            threads.append(threading.current_thread().name)
+            return original(secret)
+
+        hasher._ctx.hash = recording_hash
+
+        hashed = await hasher.hash_async("s3cret")
+
+        assert await hasher.verify_async("s3cret", hashed)
+        assert not await hasher.verify_async("wrong", hashed)
+        assert threads[0].startswith("password-hash")
+
+    @pytest.mark.asyncio
+    async def test_event_loop_stays_responsive(self):
+        hasher = PasswordHasher("pbkdf2_sha256")
+        hasher._ctx.verify = lambda secret, hashed: time.sleep(0.1) or True
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        task = asyncio.create_task(ticker())
+        await asyncio.gather(*(hasher.verify_async("x", "y") for _ in range(4)))
+        task.cancel()
+
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_pool_bounded_by_setting(self, monkeypatch):
+        monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 2)
+        hasher = PasswordHasher("pbkdf2_sha256")
+        active = peak = 0
+        lock = threading.Lock()
+
+        def slow_verify(secret, hashed):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.03)
+            with lock:
+                active -= 1
+            return True
+
+        hasher._ctx.verify = slow_verify
+        await asyncio.gather(*(hasher.verify_async("x", "y") for _ in range(6)))
+
+        assert peak == 2
+        assert get_hash_executor()._max_workers == 2
+
+
+class TestRehash:
+
+    @pytest.mark.asyncio
+    async def test_weaker_rounds_rehashed(self, monkeypatch):
+        old = PasswordHasher("pbkdf2_sha256").hash("s3cret")
+        current_rounds = int(old.split("$")[2])
+        monkeypatch.setattr(settings, "PASSWORD_HASH_ROUNDS", current_rounds + 1000)
+        upgraded = PasswordHasher("pbkdf2_sha256")
+
+        valid, new_hash = await upgraded.verify_and_update_async("s3cret", old)
+
+        assert valid and new_hash is not None
+        assert int(new_hash.split("$")[2]) == current_rounds + 1000
+        assert await upgraded.verify_and_update_async("s3cret", new_hash) == (True, None)
+        assert await upgraded.verify_and_update_async("wrong", old) == (False, None)
+
+    def test_other_schemes_still_verifiable(self):
+        hasher = PasswordHasher("pbkdf2_sha256")
+
+        assert hasher._ctx.schemes() == ("pbkdf2_sha256", "bcrypt")
+        assert hasher._ctx.default_scheme() == "pbkdf2_sha256"
+
+    @pytest.mark.asyncio
+    async def test_login_persists_upgraded_hash(self, monkeypatch):
+        old = PasswordHasher("pbkdf2_sha256").hash("s3cret")
+        monkeypatch.setattr(settings, "PASSWORD_HASH_ROUNDS", int(old.split("$")[2]) + 1000)
+        monkeypatch.setattr(settings_services, "RefreshToken", lambda **kwargs: SimpleNamespace(**kwargs))
+        user = SimpleNamespace(
+            id=uuid.uuid4(), organization_id=uuid.uuid4(), user_type="INTERNAL",
+            is_active=True, password_hash=old,
+        )
+        db = SimpleNamespace(add=lambda obj: None, flush=AsyncMock())
+        service = AuthService(db)
+        service.hasher = PasswordHasher("pbkdf2_sha256")
+        service.user_repo.get_by_email = AsyncMock(return_value=user)
+
+        await service.login("a@example.com", "s3cret")
+
+        assert user.password_hash != old
+        assert service.hasher.verify("s3cret", user.password_hash)
+        assert not service.hasher.needs_update(user.password_hash)
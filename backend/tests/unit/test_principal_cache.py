@@ -0,0 +1,224 @@
+"""
+Test the authenticated principal cache (local LRU + Redis, version-stamped
+invalidation) and its use by AuthMiddleware.
+"""
+
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from backend.app.middleware.auth import AuthMiddleware
+from backend.core.auth.jwt import create_token
+from backend.core.auth.principal_cache import AuthenticatedPrincipal, PrincipalCache
+
+
+def _user(user_id=None, is_active=True):
+    return SimpleNamespace(
+        id=user_id or uuid.uuid4(),
+        user_type="EXTERNAL",
+        business_partner_id=uuid.uuid4(),
+        organization_id=None,
+        parent_user_id=None,
+        allowed_modules=["trade_desk"],
+        email="a@example.com",
+        mobile_number=None,
+        full_name="A",
+        role=None,
+        is_active=is_active,
+        is_verified=True,
+        two_fa_enabled=False,
+        password_hash="secret",
+    )
+
+
+class FakeRedis:
+    """Strings + MGET + pipeline + the fill script, evaluated in Python."""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+        self.fail = False
+
+    async def mget(self, *keys):
+        self._trip()
+        return [self.data.get(k) for k in keys]
+
+    def register_script(self, script):
+        async def fill(keys, args):
+            self._trip()
+            version, payload, _ttl = args
+            if self.data.get(keys[1], "0") == version:
+                self.data[keys[0]] = payload
+                return 1
+            return 0
+        return fill
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class _Pipeline:
+            def __init__(self):
+                self.ops = []
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def incr(self, key):
+                self.ops.append(("incr", key))
+
+            def delete(self, key):
+                self.ops.append(("delete", key))
+
+            async def execute(self):
+                redis._trip()
+                for op, key in self.ops:
+                    if op == "incr":
+                        redis.data[key] = str(int(redis.data.get(key, "0")) + 1)
+                    else:
+                        redis.data.pop(key, None)
+
+        return _Pipeline()
+
+    def _trip(self):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.round_trips += 1
+
+
+class TestPrincipalCache:
+
+    @pytest.mark.asyncio
+    async def test_local_hit_skips_redis_and_db(self):
+        redis = FakeRedis()
+        cache = PrincipalCache(redis)
+        user = _user()
+        loader = AsyncMock(return_value=user)
+
+        first = await cache.get(str(user.id), loader)
+        trips = redis.round_trips
+        second = await cache.get(str(user.id), loader)
+
+        assert first == second and first.id == user.id
+        assert loader.await_count == 1
+        assert redis.round_trips == trips
+        assert cache.metrics["local_hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_redis_shared_between_processes(self):
+        redis = FakeRedis()
+        user = _user()
+        await PrincipalCache(redis).get(str(user.id), AsyncMock(return_value=user))
+
+        loader = AsyncMock()
+        principal = await PrincipalCache(redis).get(str(user.id), loader)
+
+        loader.assert_not_awaited()
+        assert principal.business_partner_id == user.business_partner_id
+        assert principal.allowed_modules == ["trade_desk"]
+        assert "secret" not in redis.data[f"auth:principal:{user.id}"]
+
+    @pytest.mark.asyncio
+    async def test_invalidate_forces_reload(self):
+        redis = FakeRedis()
+        cache = PrincipalCache(redis)
+        user = _user()
+        await cache.get(str(user.id), AsyncMock(return_value=user))
+
+        await cache.invalidate(user.id)
+        disabled = await cache.get(str(user.id), AsyncMock(return_value=_user(user.id, is_active=False)))
+
+        assert disabled.is_active is False
+
+    @pytest.mark.asyncio
+    async def test_fill_racing_invalidation_not_cached(self):
+        redis = FakeRedis()
+        cache = PrincipalCache(redis)
+        user = _user()
+
+        async def stale_load():
+            await cache.invalidate(user.id)  # Lands while the old row is loaded
+            return user
+
+        await cache.get(str(user.id), stale_load)
+
+        assert f"auth:principal:{user.id}" not in redis.data
+
+    @pytest.mark.asyncio
+    async def test_redis_down_falls_back_to_loader(self):
+        redis = FakeRedis()
+        redis.fail = True
+        cache = PrincipalCache(redis)
+        user = _user()
+
+        principal = await cache.get(str(user.id), AsyncMock(return_value=user))
+        await cache.invalidate(user.id)
+
+        assert principal.id == user.id
+        assert cache.metrics["redis_errors"] == 3
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_not_cached(self):
+        cache = PrincipalCache(FakeRedis())
+
+        assert await cache.get(str(uuid.uuid4()), AsyncMock(return_value=None)) is None
+        assert not cache._local
+
+    def test_json_round_trip(self):
+        principal = AuthenticatedPrincipal.from_user(_user())
+
+        assert AuthenticatedPrincipal.from_json(principal.to_json()) == principal
+
+
+def _app():
+    app = FastAPI()
+    app.add_middleware(AuthMiddleware)
+
+    @app.get("/api/v1/ping")
+    async def ping(request: Request):
+        return {"user_type": request.state.user.user_type}
+
+    return app
+
+
+async def _get(app, token, times=1):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return [
+            await client.get("/api/v1/ping", headers={"Authorization": f"Bearer {token}"})
+            for _ in range(times)
+        ]
+
+
+class TestAuthMiddlewareCaching:
+
+    @pytest.mark.asyncio
+    async def test_repeat_requests_load_user_once(self):
+        user = _user()
+        token = create_token(sub=str(user.id), org_id="default")
+        load = AsyncMock(return_value=user)
+
+        with patch("backend.app.middleware.auth.get_principal_cache", return_value=PrincipalCache(redis=None)), \
+                patch.object(AuthMiddleware, "_load_user", load):
+            responses = await _get(_app(), token, times=3)
+
+        assert [r.status_code for r in responses] == [200, 200, 200]
+        assert responses[0].json() == {"user_type": "EXTERNAL"}
+        assert load.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_inactive_cached_user_rejected(self):
+        user = _user(is_active=False)
+        token = create_token(sub=str(user.id), org_id="default")
+
+        with patch("backend.app.middleware.auth.get_principal_cache", return_value=PrincipalCache(redis=None)), \
+                patch.object(AuthMiddleware, "_load_user", AsyncMock(return_value=user)):
+            responses = await _get(_app(), token)
+
+        assert responses[0].status_code == 401
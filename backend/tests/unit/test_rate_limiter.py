@@ -0,0 +1,199 @@
+"""
+Test the multi-window rate limiter (single storage round trip per check,
+all-or-nothing windows, local token leases).
+"""
+
+import time
+from typing import Dict, List
+
+import pytest
+
+from backend.core.rate_limiting.limiter import AdvancedRateLimiter, RateLimitTier
+from backend.core.rate_limiting.storage import (
+    RateLimitRule,
+    RateLimitStorage,
+    RedisRateLimitStorage,
+    RuleCheck,
+)
+
+
+class CountingStorage(RateLimitStorage):
+    """Fixed-budget counters with check_rules() semantics of the Lua script."""
+
+    def __init__(self):
+        self.used: Dict[str, int] = {}
+        self.calls: List[List[RateLimitRule]] = []
+
+    async def increment(self, key, window_seconds, max_requests):
+        self.used[key] = self.used.get(key, 0) + 1
+        count = self.used[key]
+        return count, max(0, max_requests - count), int(time.time()) + window_seconds
+
+    async def get_count(self, key):
+        return self.used.get(key, 0)
+
+    async def reset(self, key):
+        self.used.pop(key, None)
+
+    async def check_rules(self, rules):
+        self.calls.append(list(rules))
+        reset = int(time.time()) + 60
+        rejected = next(
+            (i for i, r in enumerate(rules) if self.used.get(r.key, 0) + r.cost > r.max_requests),
+            None,
+        )
+        if rejected is None:
+            for rule in rules:
+                self.used[rule.key] = self.used.get(rule.key, 0) + rule.cost
+        checks = [
+            RuleCheck(
+                allowed=rejected is None,
+                remaining=max(0, r.max_requests - self.used.get(r.key, 0)),
+                reset_timestamp=reset,
+                retry_after=None if rejected is None else 5,
+            )
+            for r in rules
+        ]
+        return rejected, checks
+
+
+class IncrementOnlyStorage(CountingStorage):
+    """Storage without a multi-rule fast path (base class fallback)."""
+
+    check_rules = RateLimitStorage.check_rules
+
+
+class TestSingleRoundTrip:
+
+    @pytest.mark.asyncio
+    async def test_all_windows_in_one_call(self):
+        storage = CountingStorage()
+        limiter = AdvancedRateLimiter(storage)
+
+        result = await limiter.check_limit(
+            user_id="u1", endpoint="/api/v1/data", ip_address="1.2.3.4",
+            tier=RateLimitTier.BASIC, ai_cost_cents=7,
+        )
+
+        assert result.allowed
+        assert len(storage.calls) == 1
+        assert [r.limit_type for r in storage.calls[0]] == [
+            "burst", "minute", "hour", "day", "ip_minute", "ai_cost",
+        ]
+        assert storage.calls[0][-1].cost == 7
+        assert result.limit == 30 and result.remaining == 29
+
+    @pytest.mark.asyncio
+    async def test_first_exceeded_window_reported(self):
+        storage = CountingStorage()
+        limiter = AdvancedRateLimiter(storage)
+
+        results = [await limiter.check_limit(user_id="u1") for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert results[-1].limit_type == "burst"
+        assert results[-1].retry_after == 5
+        # Rejected request consumed nothing in the other windows
+        assert storage.used["ratelimit:user:u1:global:minute"] == 3
+
+    @pytest.mark.asyncio
+    async def test_ai_cost_consumes_budget(self):
+        limiter = AdvancedRateLimiter(CountingStorage())
+
+        first = await limiter.check_limit(user_id="u1", ai_cost_cents=60)
+        second = await limiter.check_limit(user_id="u1", ai_cost_cents=60)
+
+        assert first.allowed
+        assert not second.allowed and second.limit_type == "ai_cost"
+
+    @pytest.mark.asyncio
+    async def test_fallback_uses_increment(self):
+        storage = IncrementOnlyStorage()
+        limiter = AdvancedRateLimiter(storage)
+
+        results = [await limiter.check_limit(user_id="u1") for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert results[-1].limit_type == "burst"
+
+    @pytest.mark.asyncio
+    async def test_usage_and_reset(self):
+        storage = CountingStorage()
+        limiter = AdvancedRateLimiter(storage)
+        await limiter.check_limit(user_id="u1")
+
+        assert (await limiter.get_usage("u1"))["minute_count"] == 1
+        await limiter.reset_user_limits("u1")
+        assert (await limiter.get_usage("u1"))["minute_count"] == 0
+
+
+class TestLocalLeases:
+
+    @pytest.mark.asyncio
+    async def test_far_from_limit_skips_storage(self):
+        storage = CountingStorage()
+        limiter = AdvancedRateLimiter(storage, local_lease_size=8)
+
+        results = [await limiter.check_limit(user_id="u1", tier=RateLimitTier.ADMIN) for _ in range(50)]
+
+        assert all(r.allowed for r in results)
+        assert len(storage.calls) < 15
+
+    @pytest.mark.asyncio
+    async def test_never_admits_over_limit(self):
+        storage = CountingStorage()
+        limiter = AdvancedRateLimiter(storage, local_lease_size=8)
+
+        # PREMIUM burst window: 20 per 10 seconds
+        results = [await limiter.check_limit(user_id="u1", tier=RateLimitTier.PREMIUM) for _ in range(40)]
+
+        assert sum(r.allowed for r in results) <= 20
+        assert sum(r.allowed for r in results) >= 15  # Forfeited lease tokens only
+        assert not results[-1].allowed and results[-1].limit_type == "burst"
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_goes_back_to_storage(self):
+        storage = CountingStorage()
+        limiter = AdvancedRateLimiter(storage, local_lease_size=8, local_lease_ttl=0)
+
+        for _ in range(5):
+            await limiter.check_limit(user_id="u1", tier=RateLimitTier.ADMIN)
+
+        assert len(storage.calls) == 5
+
+
+class FakeScriptRedis:
+    """register_script() returning canned GCRA script output."""
+
+    def __init__(self, output):
+        self.output = output
+        self.invocations = []
+
+    def register_script(self, script):
+        async def run(keys, args):
+            self.invocations.append((keys, args))
+            return self.output
+        return run
+
+
+class TestRedisStorage:
+
+    @pytest.mark.asyncio
+    async def test_one_script_call_for_all_rules(self):
+        now_ms = 1_700_000_000_000
+        redis = FakeScriptRedis([2, now_ms, 9, now_ms + 1000, 0, 0, now_ms + 60000, 4500])
+        storage = RedisRateLimitStorage(redis)
+        rules = [
+            RateLimitRule(key="a", window_seconds=10, max_requests=10, limit_type="burst"),
+            RateLimitRule(key="b", window_seconds=60, max_requests=60, limit_type="minute", cost=2),
+        ]
+
+        rejected, checks = await storage.check_rules(rules)
+
+        assert len(redis.invocations) == 1
+        keys, args = redis.invocations[0]
+        assert keys == ["gcra:a", "gcra:b"]
+        assert args == [10, 10000, 1, 60, 60000, 2]
+        assert rejected == 1
+        assert checks[1].allowed is False and checks[1].retry_after == 5
+        assert checks[0].remaining == 9
@@ -0,0 +1,118 @@
+"""
+Test RLS context propagation: one transaction-local set_config() statement
+per transaction, driven by the security context set in DataIsolationMiddleware.
+"""
+
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend.app.middleware.isolation import DataIsolationMiddleware
+from backend.core.security.context import (
+    SecurityError,
+    UserType,
+    current_user_id,
+    reset_security_context,
+)
+from backend.db import async_session
+from backend.db.async_session import (
+    AsyncSessionLocal,
+    RLSSession,
+    _apply_rls_context,
+    _SET_RLS_CONTEXT,
+    rls_context_parameters,
+)
+
+
+class RecordingConnection:
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, statement, parameters=None):
+        self.executed.append((statement, parameters))
+
+
+@pytest.fixture(autouse=True)
+def _clean_context():
+    reset_security_context()
+    yield
+    reset_security_context()
+
+
+def _user(user_type, **kwargs):
+    return SimpleNamespace(id=uuid.uuid4(), user_type=user_type, allowed_modules=None, **kwargs)
+
+
+class TestRLSStatement:
+
+    def test_single_parameterized_transaction_local_statement(self):
+        sql = str(_SET_RLS_CONTEXT.compile(dialect=postgresql.dialect()))
+
+        assert sql.startswith("SELECT ")
+        assert sql.count("set_config(") == 4
+        assert sql.count(", true)") == 4
+        assert "SET app." not in sql
+        for name in ("user_id", "user_type", "business_partner_id", "organization_id"):
+            assert f"%({name})s" in sql
+
+    def test_session_factory_uses_rls_session(self):
+        assert AsyncSessionLocal.kw["sync_session_class"] is RLSSession
+
+
+class TestRLSParameters:
+
+    def test_no_context_no_statement(self):
+        connection = RecordingConnection()
+
+        _apply_rls_context(None, None, connection)
+
+        assert rls_context_parameters() is None
+        assert connection.executed == []
+
+    def test_external_user(self):
+        user = _user("EXTERNAL", business_partner_id=uuid.uuid4())
+        DataIsolationMiddleware(None)._configure_isolation(user)
+        connection = RecordingConnection()
+
+        _apply_rls_context(None, None, connection)
+
+        (statement, parameters), = connection.executed
+        assert statement is _SET_RLS_CONTEXT
+        assert parameters == {
+            "user_id": str(user.id),
+            "user_type": "EXTERNAL",
+            "business_partner_id": str(user.business_partner_id),
+            "organization_id": "",
+        }
+
+    def test_internal_user(self):
+        user = _user("INTERNAL", organization_id=uuid.uuid4())
+        DataIsolationMiddleware(None)._configure_isolation(user)
+
+        parameters = rls_context_parameters()
+
+        assert parameters["user_type"] == UserType.INTERNAL.value
+        assert parameters["organization_id"] == str(user.organization_id)
+        assert parameters["business_partner_id"] == ""
+
+    def test_values_are_bound_not_interpolated(self):
+        current_user_id.set("x'; RESET ALL; --")
+
+        parameters = rls_context_parameters()
+
+        assert parameters["user_id"] == "x'; RESET ALL; --"
+        assert "x'" not in str(_SET_RLS_CONTEXT)
+
+    def test_invalid_external_user_rejected(self):
+        with pytest.raises(SecurityError):
+            DataIsolationMiddleware(None)._configure_isolation(_user("EXTERNAL", business_partner_id=None))
+
+
+class TestRLSListener:
+
+    def test_listener_registered_on_after_begin(self):
+        from sqlalchemy import event
+
+        assert event.contains(RLSSession, "after_begin", async_session._apply_rls_context)
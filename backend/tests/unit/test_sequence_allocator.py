@@ -0,0 +1,103 @@
+"""
+Test the block-reserving sequence allocator and trade number generation.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.core.sequences import allocator as allocator_module
+from backend.core.sequences.allocator import SequenceAllocator, _RESERVE_BLOCK
+from backend.modules.trade_desk.repositories.trade_repository import TradeRepository
+
+
+class FakeCounterTable:
+    """document_sequences semantics: next_value per (name, period), atomic upsert."""
+
+    def __init__(self):
+        self.rows = {}
+        self.statements = 0
+
+    async def reserve(self, name, period, count):
+        self.statements += 1
+        await asyncio.sleep(0)  # Let other tasks interleave
+        next_value = self.rows.get((name, period), 1) + count
+        self.rows[(name, period)] = next_value
+        return next_value - count
+
+
+def _allocator(table, block_size=10):
+    allocator = SequenceAllocator(block_size=block_size)
+    allocator._reserve = table.reserve
+    return allocator
+
+
+class TestSequenceAllocator:
+
+    @pytest.mark.asyncio
+    async def test_one_reservation_per_block(self):
+        table = FakeCounterTable()
+        allocator = _allocator(table, block_size=10)
+
+        values = [await allocator.next_value("trade_number", "2025") for _ in range(25)]
+
+        assert values == list(range(1, 26))
+        assert table.statements == 3
+
+    @pytest.mark.asyncio
+    async def test_concurrent_tasks_and_workers_never_collide(self):
+        table = FakeCounterTable()
+        workers = [_allocator(table, block_size=7) for _ in range(3)]
+
+        values = await asyncio.gather(*(
+            workers[i % 3].next_value("trade_number", "2025") for i in range(200)
+        ))
+
+        assert len(set(values)) == 200
+        assert min(values) == 1
+
+    @pytest.mark.asyncio
+    async def test_periods_and_names_independent(self):
+        table = FakeCounterTable()
+        allocator = _allocator(table)
+
+        assert await allocator.next_value("trade_number", "2025") == 1
+        assert await allocator.next_value("trade_number", "2026") == 1
+        assert await allocator.next_value("payment_number", "2025") == 1
+        assert await allocator.next_value("trade_number", "2025") == 2
+
+    @pytest.mark.asyncio
+    async def test_discard_skips_rest_of_block(self):
+        table = FakeCounterTable()
+        allocator = _allocator(table, block_size=10)
+        await allocator.next_value("contract_number")
+
+        allocator.discard()
+
+        assert await allocator.next_value("contract_number") == 11
+
+    def test_reservation_is_single_upsert(self):
+        sql = str(_RESERVE_BLOCK)
+
+        assert sql.startswith("INSERT INTO document_sequences")
+        assert "ON CONFLICT (sequence_name, period) DO UPDATE" in sql
+        assert "RETURNING next_value" in sql
+
+    def test_rejects_empty_blocks(self):
+        with pytest.raises(ValueError):
+            SequenceAllocator(block_size=0)
+
+
+class TestTradeNumber:
+
+    @pytest.mark.asyncio
+    async def test_generate_trade_number_uses_allocator(self, monkeypatch):
+        table = FakeCounterTable()
+        monkeypatch.setattr(allocator_module, "_sequence_allocator", _allocator(table))
+        repo = TradeRepository(db=None)  # No query on the hot path
+
+        first = await repo.generate_trade_number(year=2025)
+        second = await repo.generate_trade_number(year=2025)
+
+        assert (first, second) == ("TR-2025-00001", "TR-2025-00002")
+        assert table.rows == {("trade_number", "2025"): 11}
@@ -0,0 +1,128 @@
+"""
+Test streaming exports: real .xlsx / CSV produced chunk by chunk, and the
+partner export reading a server-side cursor in partitions.
+"""
+
+import csv
+import io
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import openpyxl
+import pytest
+
+from backend.core.export import stream_csv, stream_xlsx
+from backend.modules.partners.enums import KYCStatus, PartnerStatus
+from backend.modules.partners.services.analytics import (
+    EXPORT_HEADERS,
+    PartnerAnalyticsService,
+)
+
+
+HEADER = ["Name", "Score", "Since", "Status"]
+
+
+async def _chunks(chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def _collect(stream):
+    return [part async for part in stream]
+
+
+def _rows(count, start=0):
+    return [
+        (f"Partner {i}", Decimal("7.5") + i, date(2025, 1, 1), PartnerStatus.APPROVED)
+        for i in range(start, start + count)
+    ]
+
+
+class TestStreamXlsx:
+
+    @pytest.mark.asyncio
+    async def test_valid_workbook(self):
+        parts = await _collect(stream_xlsx(HEADER, _chunks([_rows(3), _rows(2, 3)]), "Partners"))
+
+        workbook = openpyxl.load_workbook(io.BytesIO(b"".join(parts)))
+        sheet = workbook["Partners"]
+        rows = list(sheet.iter_rows(values_only=True))
+
+        assert rows[0] == tuple(HEADER)
+        assert len(rows) == 6
+        assert rows[1] == ("Partner 0", 7.5, "2025-01-01", PartnerStatus.APPROVED.value)
+        assert rows[5][0] == "Partner 4"
+
+    @pytest.mark.asyncio
+    async def test_yields_per_chunk(self):
+        parts = await _collect(stream_xlsx(HEADER, _chunks([_rows(1)] * 4)))
+
+        # Package parts, one per chunk, central directory
+        assert len(parts) == 6
+
+    @pytest.mark.asyncio
+    async def test_escapes_and_strips_illegal_characters(self):
+        rows = [("<Cotton & Co> \"Ltd\"\x00\x1f", None, True, "")]
+
+        parts = await _collect(stream_xlsx(HEADER, _chunks([rows])))
+
+        sheet = openpyxl.load_workbook(io.BytesIO(b"".join(parts))).active
+        assert [cell.value for cell in sheet[2]][:3] == ['<Cotton & Co> "Ltd"', None, True]
+
+
+class TestStreamCsv:
+
+    @pytest.mark.asyncio
+    async def test_header_then_chunks(self):
+        timestamp = datetime(2025, 12, 1, 10, 30, tzinfo=timezone.utc)
+        rows = [("Cotton, Ltd", None, timestamp, KYCStatus.PENDING)]
+
+        parts = await _collect(stream_csv(HEADER, _chunks([rows, rows])))
+
+        assert len(parts) == 3
+        parsed = list(csv.reader(io.StringIO(b"".join(parts).decode("utf-8"))))
+        assert parsed[0] == HEADER
+        assert parsed[1] == ["Cotton, Ltd", "", timestamp.isoformat(), KYCStatus.PENDING.value]
+        assert len(parsed) == 3
+
+
+class FakeStreamResult:
+    def __init__(self, rows):
+        self.rows = rows
+        self.partition_sizes = []
+
+    async def partitions(self, size):
+        self.partition_sizes.append(size)
+        for i in range(0, len(self.rows), size):
+            yield self.rows[i:i + size]
+
+
+class FakeSession:
+    def __init__(self, rows):
+        self.result = FakeStreamResult(rows)
+        self.statements = []
+
+    async def stream(self, stmt):
+        self.statements.append(stmt)
+        return self.result
+
+
+class TestPartnerExportRows:
+
+    @pytest.mark.asyncio
+    async def test_streams_selected_columns_in_partitions(self):
+        rows = [tuple(range(len(EXPORT_HEADERS)))] * 5
+        db = FakeSession(rows)
+
+        chunks = await _collect(
+            PartnerAnalyticsService(db).iter_export_rows(
+                organization_id=None, status=PartnerStatus.APPROVED, chunk_size=2
+            )
+        )
+
+        assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+        stmt = db.statements[0]
+        assert [col.key for col in stmt.selected_columns][:2] == ["legal_name", "tax_id_number"]
+        assert len(stmt.selected_columns) == len(EXPORT_HEADERS)
+        assert stmt.get_execution_options()["yield_per"] == 2
+        assert db.result.partition_sizes == [2]
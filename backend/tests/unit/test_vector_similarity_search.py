@@ -0,0 +1,151 @@
+"""
+Test that semantic search ranks by pgvector cosine distance (nearest
+first, index-friendly ORDER BY) instead of constant placeholder scores.
+"""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from sqlalchemy.sql.elements import TextClause
+
+from backend.db.vector_search import HNSW_MAX_EF_SEARCH, reset_iterative_scan_probe, widen_hnsw_scan
+from backend.modules.trade_desk.repositories.availability_repository import AvailabilityRepository
+from backend.modules.trade_desk.repositories.requirement_repository import RequirementRepository
+from backend.modules.trade_desk.services.vector_search_service import VectorSearchService
+
+
+class FakeResult:
+    def __init__(self, rows, scalar=None):
+        self.rows = rows
+        self.scalar = scalar
+
+    def all(self):
+        return self.rows
+
+    def scalar_one_or_none(self):
+        return self.scalar
+
+
+class FakeSession:
+    """Answers the pgvector version probe; records set_config and the search query."""
+
+    def __init__(self, rows, pgvector_version="0.8.0"):
+        self.rows = rows
+        self.pgvector_version = pgvector_version
+        self.statements = []
+        self.settings = []
+
+    async def execute(self, stmt, params=None):
+        sql = stmt.text if isinstance(stmt, TextClause) else ""
+        if "pg_extension" in sql:
+            return FakeResult([], scalar=self.pgvector_version)
+        if "set_config" in sql:
+            self.settings.append((sql, params))
+            return FakeResult([])
+        self.statements.append(stmt)
+        return FakeResult(self.rows)
+
+
+@pytest.fixture(autouse=True)
+def _reset_probe():
+    reset_iterative_scan_probe()
+    yield
+    reset_iterative_scan_probe()
+
+
+def _requirement(priority):
+    return SimpleNamespace(buyer_priority_score=priority, intent_type="DIRECT_BUY")
+
+
+class TestMarketEmbeddingSearch:
+
+    @pytest.mark.asyncio
+    async def test_top_k_by_cosine_distance_in_database(self):
+        near, far = _requirement(0.9), _requirement(0.4)
+        db = FakeSession([(near, 0.93), (far, 0.71)])
+
+        results = await RequirementRepository(db).search_with_market_embedding(
+            query_embedding=[0.1] * 384, similarity_threshold=0.7, max_results=20
+        )
+
+        assert [r["similarity_score"] for r in results] == [0.93, 0.71]
+        assert results[0]["requirement"] is near
+
+        stmt = db.statements[0]
+        order = stmt._order_by_clauses[0]
+        assert order.operator.opstring == "<=>"  # Distance ASC, served by the index
+        assert stmt._limit_clause.value == 20
+        assert "requirement_embeddings" in str(stmt.whereclause)
+        assert "<=" in str(stmt.whereclause)
+        (sql, params), = db.settings
+        assert params == {"ef_search": "40"}  # Never below pgvector's default
+
+
+class TestHnswScanWidening:
+
+    @pytest.mark.asyncio
+    async def test_filtered_search_widens_scan_before_query(self):
+        excluded = [uuid4(), uuid4()]
+        db = FakeSession([(SimpleNamespace(), SimpleNamespace(), 0.91)])
+
+        results = await VectorSearchService(db).find_similar_availabilities(
+            query_embedding=[0.1] * 384, limit=5, exclude_ids=excluded
+        )
+
+        assert [r["similarity"] for r in results] == [0.91]
+        (sql, params), = db.settings
+        assert params == {"ef_search": "40"}
+        assert "hnsw.iterative_scan" in sql and "strict_order" in sql  # Keep scanning past filtered rows
+        stmt, = db.statements
+        assert "NOT IN" in str(stmt.whereclause)
+
+    @pytest.mark.asyncio
+    async def test_offset_pages_raise_ef_search_to_skip_plus_limit(self):
+        db = FakeSession([])
+
+        await widen_hnsw_scan(db, 200 + 50)
+
+        (sql, params), = db.settings
+        assert params == {"ef_search": "250"}  # Rows past the offset must be in the candidate set
+        assert "hnsw.iterative_scan" in sql
+
+    @pytest.mark.asyncio
+    async def test_old_pgvector_only_raises_ef_search_capped(self):
+        db = FakeSession([], pgvector_version="0.7.4")
+
+        await widen_hnsw_scan(db, 5000 + 100)
+        await widen_hnsw_scan(db, 10)
+
+        assert [params for _, params in db.settings] == [
+            {"ef_search": str(HNSW_MAX_EF_SEARCH)},
+            {"ef_search": "40"},
+        ]
+        assert all("iterative_scan" not in sql for sql, _ in db.settings)
+
+
+class TestAvailabilityVectorScore:
+
+    def test_query_embedding_accepts_lists_arrays_and_dicts(self):
+        vector = np.linspace(0, 1, 384, dtype=np.float32)
+
+        assert AvailabilityRepository._query_embedding(vector) == vector.tolist()
+        assert AvailabilityRepository._query_embedding({"embedding": list(vector)}) == vector.tolist()
+        assert AvailabilityRepository._query_embedding({"version": "v1_placeholder"}) is None
+        assert AvailabilityRepository._query_embedding([]) is None
+        assert AvailabilityRepository._query_embedding(None) is None
+
+    @pytest.mark.asyncio
+    async def test_match_score_uses_real_similarity(self):
+        repo = AvailabilityRepository(db=None)
+        availability = SimpleNamespace(quality_params=None, base_price=None, ai_confidence_score=None)
+
+        close = await repo._calculate_match_score(availability, vector_similarity=0.92)
+        distant = await repo._calculate_match_score(availability, vector_similarity=0.15)
+        opposite = await repo._calculate_match_score(availability, vector_similarity=-0.3)
+
+        assert close == pytest.approx(0.92)
+        assert distant == pytest.approx(0.15)
+        assert opposite == 0.0
+        assert await repo._calculate_match_score(availability) == 0.5
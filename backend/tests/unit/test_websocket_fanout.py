@@ -0,0 +1,274 @@
+"""
+Test WebSocket channel fan-out (serialize once, per-connection send
+queues, slow consumer policies, per-channel metrics).
+"""
+
+import asyncio
+import json
+import uuid
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+
+from backend.core.websocket.manager import (
+    ConnectionManager,
+    SlowConsumerPolicy,
+    WebSocketEvent,
+    WebSocketMessage,
+)
+
+
+class FakeWebSocket:
+    """Records sent frames; send_text blocks while `stalled` is set."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+        self.closed_with = None
+        self.stalled = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data: str):
+        while self.stalled.is_set():
+            await asyncio.sleep(0.01)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000):
+        self.closed_with = code
+
+
+@pytest_asyncio.fixture
+async def make_manager():
+    """ConnectionManager factory; teardown disconnects and reaps sender tasks."""
+    managers = []
+
+    def make(**kwargs):
+        managers.append(ConnectionManager(**kwargs))
+        return managers[-1]
+
+    yield make
+
+    for manager in managers:
+        for connection_id in list(manager.connection_metadata):
+            await manager.disconnect(connection_id)
+    # Cancelled senders, in-flight send_text calls and scheduled closes
+    current = asyncio.current_task()
+    pending = [task for task in asyncio.all_tasks() if task is not current]
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _connect(manager, channel, websocket=None):
+    websocket = websocket or FakeWebSocket()
+    connection_id = await manager.connect(websocket, uuid.uuid4())
+    await manager.subscribe(connection_id, channel)
+    return connection_id, websocket
+
+
+async def _drain(manager, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while any(not s.queue.empty() for s in manager._senders.values()):
+        if loop.time() > deadline:
+            return
+        await asyncio.sleep(0.01)
+    await asyncio.sleep(0.02)
+
+
+def _price(data=None):
+    return WebSocketMessage(event=WebSocketEvent.PRICE_UPDATE, data=data or {"price": 1})
+
+
+class TestChannelFanOut:
+
+    @pytest.mark.asyncio
+    async def test_message_serialized_once_per_broadcast(self, make_manager):
+        manager = make_manager()
+        for _ in range(20):
+            await _connect(manager, "market:cotton:prices")
+        await _drain(manager)
+
+        with patch.object(WebSocketMessage, "model_dump_json", autospec=True,
+                          side_effect=lambda self: '{"event":"price.update"}') as dump:
+            await manager.broadcast_to_channel("market:cotton:prices", _price())
+
+        assert dump.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_stall_channel(self, make_manager):
+        manager = make_manager()
+        _, slow = await _connect(manager, "market:cotton:prices")
+        fast = [(await _connect(manager, "market:cotton:prices"))[1] for _ in range(5)]
+        await _drain(manager)
+        slow.stalled.set()
+
+        await asyncio.wait_for(
+            manager.broadcast_to_channel("market:cotton:prices", _price()),
+            timeout=0.5,
+        )
+        await asyncio.sleep(0.05)
+
+        for websocket in fast:
+            assert json.loads(websocket.sent[-1])["event"] == "price.update"
+        assert all(json.loads(m)["event"] != "price.update" for m in slow.sent)
+        slow.stalled.clear()
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_keeps_latest(self, make_manager):
+        manager = make_manager(send_queue_size=2)
+        _, websocket = await _connect(manager, "market:cotton:prices")
+        await _drain(manager)
+        websocket.stalled.set()
+        await asyncio.sleep(0.02)
+
+        for price in range(5):
+            await manager.broadcast_to_channel("market:cotton:prices", _price({"price": price}))
+        websocket.stalled.clear()
+        await _drain(manager)
+
+        prices = [json.loads(m)["data"]["price"] for m in websocket.sent if "price" in json.loads(m)["data"]]
+        assert prices[-2:] == [3, 4]
+        assert manager.get_channel_metrics("market:cotton:prices")["dropped"] >= 2
+
+    @pytest.mark.asyncio
+    async def test_disconnect_policy_closes_slow_consumer(self, make_manager):
+        manager = make_manager(send_queue_size=1, slow_consumer_policy=SlowConsumerPolicy.DISCONNECT)
+        connection_id, websocket = await _connect(manager, "market:cotton:prices")
+        await _drain(manager)
+        websocket.stalled.set()
+        await asyncio.sleep(0.02)
+
+        for _ in range(3):
+            await manager.broadcast_to_channel("market:cotton:prices", _price())
+        await asyncio.sleep(0.05)
+
+        assert websocket.closed_with == 1013
+        assert connection_id not in manager.connection_metadata
+        assert connection_id not in manager._senders
+        websocket.stalled.clear()
+
+    @pytest.mark.asyncio
+    async def test_channel_latency_metrics(self, make_manager):
+        manager = make_manager()
+        for _ in range(3):
+            await _connect(manager, "market:cotton:prices")
+        await _drain(manager)
+
+        await manager.broadcast_to_channel("market:cotton:prices", _price())
+        await _drain(manager)
+
+        metrics = manager.get_stats()["channel_metrics"]["market:cotton:prices"]
+        assert metrics["broadcasts"] == 1
+        assert metrics["recipients"] == 3
+        assert metrics["delivered"] == 3
+        assert metrics["latency_max_ms"] >= metrics["latency_p50_ms"] >= 0
+
+    @pytest.mark.asyncio
+    async def test_exclude_user(self, make_manager):
+        manager = make_manager()
+        excluded_ws = FakeWebSocket()
+        user_id = uuid.uuid4()
+        connection_id = await manager.connect(excluded_ws, user_id)
+        await manager.subscribe(connection_id, "trade:1")
+        _, other = await _connect(manager, "trade:1")
+        await _drain(manager)
+
+        await manager.broadcast_to_channel("trade:1", _price(), exclude_user=user_id)
+        await _drain(manager)
+
+        assert json.loads(other.sent[-1])["event"] == "price.update"
+        assert all(json.loads(m)["event"] != "price.update" for m in excluded_ws.sent)
+
+
+class FakeRedis:
+    """Counts round trips: publish() directly vs pipelined execute()."""
+
+    def __init__(self):
+        self.round_trips = 0
+        self.published = []
+
+    async def publish(self, channel, payload):
+        self.round_trips += 1
+        self.published.append((channel, payload))
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class _Pipeline:
+            def __init__(self):
+                self.queued = []
+
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            def publish(self, channel, payload):
+                self.queued.append((channel, payload))
+
+            async def execute(self):
+                redis.round_trips += 1
+                redis.published.extend(self.queued)
+
+        return _Pipeline()
+
+
+class TestMultiChannelBroadcast:
+
+    @pytest.mark.asyncio
+    async def test_one_delivery_per_connection(self, make_manager):
+        manager = make_manager()
+        connection_id, both = await _connect(manager, "commodity:x:requirements")
+        await manager.subscribe(connection_id, "requirement:updates")
+        _, only_global = await _connect(manager, "requirement:updates")
+        await _drain(manager)
+        before = len(both.sent)
+
+        queued = await manager.broadcast_to_channels(
+            ["commodity:x:requirements", "requirement:updates"],
+            WebSocketMessage(event=WebSocketEvent.REQUIREMENT_PUBLISHED),
+        )
+        await _drain(manager)
+
+        assert queued == 2
+        received = [json.loads(m) for m in both.sent[before:]]
+        assert [m["channel"] for m in received] == ["commodity:x:requirements"]
+        assert json.loads(only_global.sent[-1])["channel"] == "requirement:updates"
+
+    @pytest.mark.asyncio
+    async def test_redis_publishes_pipelined(self, make_manager):
+        redis = FakeRedis()
+        manager = make_manager(redis=redis)
+        channels = [f"c{i}" for i in range(7)]
+
+        await manager.broadcast_to_channels(
+            channels, WebSocketMessage(event=WebSocketEvent.REQUIREMENT_PUBLISHED)
+        )
+
+        assert redis.round_trips == 1
+        assert [c for c, _ in redis.published] == [f"websocket:channel:{c}" for c in channels]
+        assert len({json.loads(p)["id"] for _, p in redis.published}) == 1
+
+    @pytest.mark.asyncio
+    async def test_remote_copies_deduped_by_message_id(self, make_manager):
+        manager = make_manager()
+        connection_id, websocket = await _connect(manager, "a")
+        await manager.subscribe(connection_id, "b")
+        await _drain(manager)
+        before = len(websocket.sent)
+        message = WebSocketMessage(event=WebSocketEvent.REQUIREMENT_PUBLISHED)
+
+        for channel in ("a", "b"):
+            message.channel = channel
+            payload = message.model_dump_json()
+            manager._fan_out(channel, payload, delivered=manager._remote_delivered(payload))
+        await _drain(manager)
+
+        assert len(websocket.sent) - before == 1
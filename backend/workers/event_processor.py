@@ -2,11 +2,15 @@
 Event Processor Worker
 
 Background worker that:
-1. Polls event_outbox table
-2. Publishes unpublished events to Pub/Sub
-3. Marks events as published
+1. Claims aggregate hash partitions of the event_outbox table
+2. Publishes their pending events to Pub/Sub (parallel across aggregates,
+   ordered within one)
+3. Marks events as published (one bulk UPDATE per batch)
 4. Retries failed events
 
+Scale by running more processes; each claims different partitions
+(SKIP LOCKED), so per-aggregate order holds across processes.
+
 Run as separate process:
     python -m backend.workers.event_processor
 """
@@ -17,16 +21,16 @@ import asyncio
 import logging
 import os
 import sys
-from datetime import datetime, timezone
-from typing import Optional
+from typing import List, Optional, Set, Tuple
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from backend.core.events.pubsub.publisher import PubSubPublisher
 from backend.core.events.pubsub.schemas import DomainEvent, EventType
-from backend.core.outbox import EventOutbox
+from backend.core.outbox import EventOutbox, OutboxRepository
+from backend.core.outbox.repository import DEFAULT_PARTITION_COUNT
+from backend.core.outbox.worker import publish_in_aggregate_order
 
 # Setup logging
 logging.basicConfig(
@@ -50,12 +54,16 @@ class EventProcessor:
         self,
         database_url: str,
         project_id: Optional[str] = None,
-        batch_size: int = 10,
+        batch_size: int = 100,
         poll_interval: int = 5,
+        partition_count: int = DEFAULT_PARTITION_COUNT,
+        max_partitions: int = 4,
     ):
         self.database_url = database_url
         self.batch_size = batch_size
         self.poll_interval = poll_interval
+        self.partition_count = partition_count
+        self.max_partitions = max_partitions
         
         # Create async engine
         self.engine = create_async_engine(
@@ -78,15 +86,19 @@ class EventProcessor:
         )
         
         self._running = False
+        self.last_claimed_partitions: List[int] = []
     
     async def start(self):
         """Start processing events."""
         self._running = True
+        async with self.async_session() as session:
+            await OutboxRepository(session).ensure_partitions(self.partition_count)
+            await session.commit()
         logger.info("Event processor started")
         
         while self._running:
             try:
-                await self._process_batch()
+                await self._drain()
                 await asyncio.sleep(self.poll_interval)
             except KeyboardInterrupt:
                 logger.info("Shutting down...")
@@ -96,48 +108,79 @@ class EventProcessor:
                 logger.error(f"Error processing events: {e}", exc_info=True)
                 await asyncio.sleep(self.poll_interval)
     
-    async def _process_batch(self):
-        """Process one batch of unpublished events."""
+    async def _drain(self) -> int:
+        """
+        Process batches until every partition has been visited once.
+        
+        Keeps going while batches come back full (backlog) or new partitions
+        are claimed, so events outside the first max_partitions partitions do
+        not wait a poll_interval per batch.
+        """
+        total = 0
+        visited: Set[int] = set()
+        while self._running:
+            processed = await self._process_batch()
+            total += processed
+            
+            newly_visited = set(self.last_claimed_partitions) - visited
+            visited |= newly_visited
+            
+            if processed >= self.batch_size:
+                continue
+            if newly_visited and len(visited) < self.partition_count:
+                continue
+            break
+        return total
+    
+    async def _process_batch(self) -> int:
+        """Process one batch from the partitions this process could claim."""
+        self.last_claimed_partitions = []
         async with self.async_session() as session:
-            # Get unpublished events (oldest first)
-            stmt = (
-                select(EventOutbox)
-                .where(EventOutbox.published_at.is_(None))
-                .order_by(EventOutbox.created_at.asc())
-                .limit(self.batch_size)
+            repository = OutboxRepository(session)
+            partitions = await repository.claim_partitions(
+                partition_count=self.partition_count,
+                max_partitions=self.max_partitions,
             )
+            self.last_claimed_partitions = partitions
+            if not partitions:
+                await session.commit()
+                return 0
             
-            result = await session.execute(stmt)
-            events = result.scalars().all()
+            # Oldest first; held back while an older event of the same
+            # aggregate is still pending
+            events = await repository.get_pending_events(
+                limit=self.batch_size,
+                lock=True,
+                partitions=partitions,
+                partition_count=self.partition_count,
+            )
             
             if not events:
-                return
+                await session.commit()
+                return 0
             
-            logger.info(f"Processing {len(events)} events")
+            logger.info(f"Processing {len(events)} events (partitions {partitions})")
             
-            # Publish each event
-            for event in events:
-                try:
-                    await self._publish_event(event)
-                    
-                    # Mark as published
-                    event.published_at = datetime.now(timezone.utc)
-                    session.add(event)
-                    
-                except Exception as e:
-                    logger.error(
-                        f"Failed to publish event {event.id} "
-                        f"(aggregate: {event.aggregate_type}:{event.aggregate_id}): {e}"
-                    )
-                    
-                    # Increment retry count
-                    event.retry_count = (event.retry_count or 0) + 1
-                    session.add(event)
+            published, failed = await publish_in_aggregate_order(events, self._try_publish)
             
+            await repository.mark_published_bulk(published)
+            await repository.mark_failed_bulk(failed)
             await session.commit()
+            return len(events)
+    
+    async def _try_publish(self, event: EventOutbox) -> Tuple[Optional[str], Optional[str]]:
+        """Publish one event; returns (message_id, None) or (None, error)."""
+        try:
+            return await self._publish_event(event), None
+        except Exception as e:
+            logger.error(
+                f"Failed to publish event {event.id} "
+                f"(aggregate: {event.aggregate_type}:{event.aggregate_id}): {e}"
+            )
+            return None, str(e) or type(e).__name__
     
-    async def _publish_event(self, event: EventOutbox):
-        """Publish single event to Pub/Sub."""
+    async def _publish_event(self, event: EventOutbox) -> str:
+        """Publish single event to Pub/Sub. Returns the message ID."""
         # Convert to Pub/Sub event
         try:
             event_type = EventType(event.event_type)
@@ -150,13 +193,13 @@ class EventProcessor:
             aggregate_type=event.aggregate_type,
             aggregate_id=str(event.aggregate_id),
             user_id=event.payload.get("user_id") if event.payload else None,
-            organization_id=event.metadata.get("organization_id") if event.metadata else None,
+            organization_id=event.event_metadata.get("organization_id") if event.event_metadata else None,
             payload=event.payload or {},
             timestamp=event.created_at,
         )
         
         # Publish
-        await self.publisher.publish_event(
+        message_id = await self.publisher.publish_event(
             pubsub_event,
             topic_name=event.topic_name or "domain-events",
             ordering_key=str(event.aggregate_id),  # Order by aggregate
@@ -166,6 +209,7 @@ class EventProcessor:
             f"Published event {event.id} "
             f"({event.event_type} for {event.aggregate_type}:{event.aggregate_id})"
         )
+        return message_id
     
     async def stop(self):
         """Stop processing."""
@@ -195,8 +239,10 @@ async def main():
     processor = EventProcessor(
         database_url=database_url,
         project_id=project_id,
-        batch_size=10,
+        batch_size=int(os.getenv("OUTBOX_BATCH_SIZE", "100")),
         poll_interval=5,  # Poll every 5 seconds
+        partition_count=int(os.getenv("OUTBOX_PARTITION_COUNT", str(DEFAULT_PARTITION_COUNT))),
+        max_partitions=int(os.getenv("OUTBOX_MAX_PARTITIONS_PER_WORKER", "4")),
     )
     
     try:
@@ -0,0 +1,52 @@
+"""
+Matching Worker
+
+Background worker that:
+1. Consumes the shared match queue (Redis)
+2. Runs matching for new/updated requirements and availabilities
+3. Sends match notifications
+
+Scale by running more processes; every process runs MATCH_WORKER_COUNT
+concurrent workers against the same queue.
+
+Run as separate process:
+    python -m backend.workers.matching_worker
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import signal
+
+from backend.modules.trade_desk.services.matching_service import (
+    start_background_matching,
+    stop_background_matching,
+)
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+async def main():
+    """Main entry point."""
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+    
+    service = await start_background_matching()
+    logger.info(f"Matching worker started ({service.config.MATCH_WORKER_COUNT} workers)")
+    
+    try:
+        await stop_event.wait()
+    finally:
+        await stop_background_matching()
+        logger.info("Matching worker stopped")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())